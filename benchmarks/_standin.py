@@ -0,0 +1,53 @@
+"""
+Helpers shared by the benchmark scripts.
+
+The stand-in server lives in `tests/mock_server.py`, this module puts it on the path
+and knows how to make a throwaway self-signed certificate for HTTPS runs.
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "tests"))
+sys.path.insert(0, str(ROOT))
+
+from mock_server import PAGES_DIR, MockResponse, MockServer  # noqa: E402
+
+
+def self_signed_cert() -> Tuple[str, str]:
+    """Creates a certificate valid for 127.0.0.1 using the openssl CLI."""
+    directory = Path(tempfile.mkdtemp(prefix="librus-apix-bench-"))
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", str(key), "-out", str(cert), "-days", "1",
+            "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return str(cert), str(key)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+    }
+
+
+__all__ = [
+    "PAGES_DIR",
+    "MockResponse",
+    "MockServer",
+    "self_signed_cert",
+    "summarize",
+]
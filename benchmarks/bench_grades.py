@@ -0,0 +1,65 @@
+"""
+Breaks the parse of the recorded grades page, the most polled one, down into its stages.
+
+For both parser backends it reports the median time to build the tree, to find the grade
+rows and to extract the numeric, average and descriptive grades from them in one pass.
+
+    python benchmarks/bench_grades.py [repeats]
+"""
+
+import sys
+import time
+from typing import Any, Callable, List
+
+from _standin import PAGES_DIR
+
+from librus_apix.grades import (
+    _REGION,
+    _ROWS,
+    _extract_grades,
+    _extract_grades_lxml,
+    parse_grades,
+)
+from librus_apix.helpers import make_soup, make_tree
+
+PAGE = (PAGES_DIR / "grades.html").read_bytes()
+
+
+def median_ms(repeats: int, fn: Callable[[], Any]) -> float:
+    samples: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[len(samples) // 2] * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 51
+    soup = make_soup(PAGE, parse_only=_REGION)
+    find_rows = lambda: soup.find_all(
+        "tr", attrs={"class": ["line0", "line1"], "id": None}
+    )
+    tree = make_tree(PAGE)
+    stages = {
+        "bs4": [
+            ("tree", lambda: make_soup(PAGE, parse_only=_REGION)),
+            ("rows", find_rows),
+            ("extract", lambda rows=find_rows(): _extract_grades(rows)),
+            ("total", lambda: parse_grades(PAGE, backend="bs4")),
+        ],
+        "lxml": [
+            ("tree", lambda: make_tree(PAGE)),
+            ("rows", lambda: _ROWS(tree)),
+            ("extract", lambda rows=_ROWS(tree): _extract_grades_lxml(rows)),
+            ("total", lambda: parse_grades(PAGE, backend="lxml")),
+        ],
+    }
+    print(f"{'backend':>8} " + " ".join(f"{name:>9}" for name, _ in stages["bs4"]))
+    for backend, runs in stages.items():
+        times = " ".join(f"{median_ms(repeats, fn):>7.2f}ms" for _, fn in runs)
+        print(f"{backend:>8} {times}")
+
+
+if __name__ == "__main__":
+    main()
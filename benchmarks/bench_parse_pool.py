@@ -0,0 +1,79 @@
+"""
+Measures how page parsing scales with cores, with and without a parse executor.
+
+A pool of threads stands in for the fetching threads of a multi-account sync: each one
+parses a mix of the recorded grades, attendance, timetable and message pages through
+`run_parser`, the way the `get_*` scrapers do. Without an executor every parse holds the
+GIL, so throughput stays at one core whatever the number of threads; with a
+`ProcessPoolExecutor` of as many workers the pages are parsed in parallel and only the
+records come back. Throughput is reported for 1, 2, 4, ... workers up to the core count.
+
+    python benchmarks/bench_parse_pool.py [pages] [max_workers]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Tuple
+
+from _standin import PAGES_DIR
+
+from librus_apix.attendance import parse_attendance
+from librus_apix.grades import parse_grades
+from librus_apix.helpers import run_parser, set_parse_executor
+from librus_apix.messages import parse, parse_message_content
+from librus_apix.timetable import parse_timetable
+
+PAGES: List[Tuple[Callable[..., Any], bytes]] = [
+    (parser, (PAGES_DIR / page).read_bytes())
+    for page, parser in (
+        ("grades.html", parse_grades),
+        ("attendance.html", parse_attendance),
+        ("timetable.html", parse_timetable),
+        ("messages.html", parse),
+        ("messages/40000.html", parse_message_content),
+    )
+]
+
+
+def throughput(workers: int, pages: int) -> float:
+    """Parses `pages` pages from `workers` threads, returns pages per second."""
+    jobs = [PAGES[i % len(PAGES)] for i in range(pages)]
+    with ThreadPoolExecutor(workers) as threads:
+        start = time.perf_counter()
+        list(threads.map(lambda job: run_parser(job[0], job[1]), jobs))
+        return pages / (time.perf_counter() - start)
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    cores = os.cpu_count() or 1
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else cores
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    print(f"{cores} cores, {pages} pages per run")
+    print(f"{'workers':>8} {'threads':>12} {'processes':>12} {'speedup':>8}")
+    baseline = None
+    for workers in counts:
+        inline = throughput(workers, pages)
+        with ProcessPoolExecutor(workers) as processes:
+            # start the workers before timing
+            list(processes.map(abs, range(workers)))
+            set_parse_executor(processes)
+            try:
+                pooled = throughput(workers, pages)
+            finally:
+                set_parse_executor(None)
+        baseline = baseline or inline
+        print(
+            f"{workers:>8} {inline:>8.1f}p/s {pooled:>8.1f}p/s {pooled / baseline:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compares the bs4 and lxml parser backends on the recorded pages in `tests/pages`.
+
+For every page with an lxml implementation it checks that both backends return the same
+result, then reports the median parse time and the peak memory allocated while parsing.
+The peak comes from tracemalloc, which doesn't see what libxml2 allocates for the tree itself.
+
+    python benchmarks/bench_parsers.py [repeats]
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from _standin import PAGES_DIR
+
+from librus_apix.attendance import parse_attendance
+from librus_apix.completed_lessons import parse_completed
+from librus_apix.grades import parse_grades
+from librus_apix.helpers import PARSER_BACKENDS
+from librus_apix.messages import parse, parse_message_content, parse_sent
+from librus_apix.schedule import parse_schedule
+from librus_apix.timetable import parse_timetable
+
+PAGES: Dict[str, Callable[..., Any]] = {
+    "grades.html": parse_grades,
+    "attendance.html": parse_attendance,
+    "timetable.html": parse_timetable,
+    "schedule.html": parse_schedule,
+    "completed.html": parse_completed,
+    "messages.html": parse,
+    "sent_messages.html": parse_sent,
+    "messages/40000.html": parse_message_content,
+}
+
+
+def median_ms(repeats: int, fn: Callable[[], Any]) -> float:
+    samples: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[len(samples) // 2] * 1000
+
+
+def peak_kb(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 21
+    header = " ".join(f"{f'{b} time':>11} {f'{b} peak':>11}" for b in PARSER_BACKENDS)
+    print(f"{'page':>20} {'size':>7} {header} {'speedup':>8}")
+    for page, parser in PAGES.items():
+        content = (PAGES_DIR / page).read_bytes()
+        results = [repr(parser(content, backend=b)) for b in PARSER_BACKENDS]
+        assert all(r == results[0] for r in results), f"backends disagree on {page}"
+        times, peaks = [], []
+        for backend in PARSER_BACKENDS:
+            run = lambda: parser(content, backend=backend)
+            times.append(median_ms(repeats, run))
+            peaks.append(peak_kb(run))
+        columns = " ".join(f"{t:>9.2f}ms {p:>9.0f}KB" for t, p in zip(times, peaks))
+        print(
+            f"{page:>20} {len(content) // 1024:>5}KB {columns} {times[0] / times[1]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Compares per-call connections with the pooled keep-alive transport.
+
+Runs a batch of GETs against a local HTTPS stand-in and reports how many TLS
+handshakes the server accepted and the request latency for both modes.
+
+    python benchmarks/bench_pooling.py [requests]
+"""
+
+import sys
+import time
+
+from _standin import MockResponse, MockServer, self_signed_cert, summarize
+
+from librus_apix.client import Client, Token
+
+PAGE = b"<html><body>" + b"<tr class='line0'><td>x</td></tr>" * 2000 + b"</body></html>"
+
+
+def run(server: MockServer, cert: str, keep_alive: bool, n: int):
+    server.reset()
+    server.route("/page", lambda _: MockResponse(body=PAGE))
+    client = Client(Token(API_Key="bench:mark"), base_url=server.url, keep_alive=keep_alive)
+    client._session.trust_env = False  # CA bundles from the environment would win over verify
+    client._session.verify = cert
+    samples = []
+    with client:
+        for _ in range(n):
+            start = time.perf_counter()
+            client.get(client.BASE_URL + "/page")
+            samples.append(time.perf_counter() - start)
+    return server.connections, summarize(samples)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    cert, key = self_signed_cert()
+    with MockServer(certfile=cert, keyfile=key) as server:
+        for label, keep_alive in (("per-call", False), ("pooled", True)):
+            handshakes, stats = run(server, cert, keep_alive, n)
+            print(
+                f"{label:>9}: {n} requests, {handshakes} handshakes, "
+                + ", ".join(f"{k}={v:.2f}" for k, v in stats.items())
+            )
+
+
+if __name__ == "__main__":
+    main()
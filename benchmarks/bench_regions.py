@@ -0,0 +1,89 @@
+"""
+Reports what limiting the soup to a parser's region saves, per recorded page in `tests/pages`.
+
+For every page whose bs4 parser builds its soup with `page_region`, it compares building
+the whole soup with building just the region: median time and peak memory allocated
+(from tracemalloc), and checks that the parser's selection finds the same elements in both.
+
+    python benchmarks/bench_regions.py [repeats]
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from _standin import PAGES_DIR
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from librus_apix import attendance, completed_lessons, grades, messages, timetable
+from librus_apix.helpers import make_soup
+
+# page: (region, what the parser selects first)
+PAGES: Dict[str, Tuple[SoupStrainer, Callable[[BeautifulSoup], Any]]] = {
+    "grades.html": (
+        grades._REGION,
+        lambda s: s.find_all("tr", attrs={"class": ["line0", "line1"], "id": None}),
+    ),
+    "attendance.html": (
+        attendance._REGION,
+        lambda s: s.find("table", attrs={"class": "center big decorated"}),
+    ),
+    "timetable.html": (
+        timetable._REGION,
+        lambda s: s.select("table.decorated.plan-lekcji > tr"),
+    ),
+    "completed.html": (
+        completed_lessons._REGION,
+        lambda s: s.select('table[class="decorated"] > tbody > tr'),
+    ),
+    "messages.html": (
+        messages._MESSAGES_REGION,
+        lambda s: s.find("table", attrs={"class": "decorated stretch"}),
+    ),
+    "sent_messages.html": (
+        messages._MESSAGES_REGION,
+        lambda s: s.find("table", attrs={"class": "decorated stretch"}),
+    ),
+}
+
+
+def median_ms(repeats: int, fn: Callable[[], Any]) -> float:
+    samples: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[len(samples) // 2] * 1000
+
+
+def peak_kb(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 21
+    columns = ("page time", "region time", "saved", "page peak", "region peak", "saved")
+    print(f"{'page':>20} {'size':>7} " + " ".join(f"{c:>11}" for c in columns))
+    for page, (region, select) in PAGES.items():
+        content = (PAGES_DIR / page).read_bytes()
+        whole = lambda: make_soup(content)
+        part = lambda: make_soup(content, parse_only=region)
+        assert str(select(whole())) == str(select(part())), f"region misses {page}"
+        times = [median_ms(repeats, whole), median_ms(repeats, part)]
+        peaks = [peak_kb(whole), peak_kb(part)]
+        print(
+            f"{page:>20} {len(content) // 1024:>5}KB "
+            f"{times[0]:>9.2f}ms {times[1]:>9.2f}ms {1 - times[1] / times[0]:>10.0%} "
+            f"{peaks[0]:>9.0f}KB {peaks[1]:>9.0f}KB {1 - peaks[1] / peaks[0]:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compares streaming parsing with parsing the whole page, on enlarged copies of the recorded pages.
+
+The data rows of `tests/pages/grades.html` and `attendance.html` are repeated `scale` times to
+stand in for a long school year. The page is handed over in 16 KB chunks, as
+`response.iter_content` would; the full parse joins them first, like `response.content`.
+Reported are the median time to the first record and to the last one, and the peak
+memory allocated while parsing. The peak comes from tracemalloc, which sees the joined
+body but not what libxml2 allocates for the tree itself.
+
+    python benchmarks/bench_streaming.py [repeats] [scale]
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+from _standin import PAGES_DIR
+from lxml import html
+
+from librus_apix.attendance import iter_parse_attendance, parse_attendance
+from librus_apix.grades import iter_parse_grades, parse_grades
+from librus_apix.helpers import STREAM_CHUNK_SIZE
+
+PAGES = {
+    "grades.html": (
+        lambda page: parse_grades(page, backend="lxml"),
+        iter_parse_grades,
+        "//tr[@class='line0' or @class='line1'][not(@id)][not(ancestor::tr)]",
+    ),
+    "attendance.html": (
+        lambda page: parse_attendance(page, backend="lxml"),
+        iter_parse_attendance,
+        # the semester markers stay single
+        "//table[@class='center big decorated']//tr[@class='line0' or @class='line1']"
+        "[not(.//td[@class='center bolded'])]",
+    ),
+}
+
+
+def enlarge(page: bytes, rows: str, scale: int) -> bytes:
+    """Repeats the rows matched by `rows` in place, `scale` times in all."""
+    root = html.document_fromstring(page)
+    for row in root.xpath(rows):
+        for _ in range(scale - 1):
+            row.addnext(html.fromstring(html.tostring(row)))
+    return html.tostring(root, encoding="utf-8")
+
+
+def chunked(page: bytes) -> Iterator[bytes]:
+    size = STREAM_CHUNK_SIZE
+    return (page[i : i + size] for i in range(0, len(page), size))
+
+
+def timed(run: Callable[[], Iterable[Any]]) -> Tuple[float, float]:
+    start = time.perf_counter()
+    first = None
+    for _ in run():
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return (total if first is None else first), total
+
+
+def medians(repeats: int, run: Callable[[], Iterable[Any]]) -> Tuple[float, float]:
+    samples: List[Tuple[float, float]] = [timed(run) for _ in range(repeats)]
+    firsts, totals = sorted(s[0] for s in samples), sorted(s[1] for s in samples)
+    return firsts[len(samples) // 2] * 1000, totals[len(samples) // 2] * 1000
+
+
+def peak_kb(run: Callable[[], Iterable[Any]]) -> float:
+    tracemalloc.start()
+    try:
+        for _ in run():
+            pass
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    scale = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(
+        f"{'page':>16} {'size':>8} {'mode':>7} {'first':>10} {'total':>10} {'peak':>10}"
+    )
+    for name, (parse, iter_parse, rows) in PAGES.items():
+        page = enlarge((PAGES_DIR / name).read_bytes(), rows, scale)
+        runs = {
+            # the full parse hands its records over only once the whole page is parsed
+            "full": lambda: [parse(b"".join(chunked(page)))],
+            "stream": lambda: iter_parse(chunked(page)),
+        }
+        for mode, run in runs.items():
+            first, total = medians(repeats, run)
+            print(
+                f"{name:>16} {len(page) // 1024:>6}KB {mode:>7}"
+                f" {first:>8.1f}ms {total:>8.1f}ms {peak_kb(run):>8.0f}KB"
+            )
+
+
+if __name__ == "__main__":
+    main()
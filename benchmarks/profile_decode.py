@@ -0,0 +1,91 @@
+"""
+Profiles how a fetched page becomes a parsed result, per page type.
+
+For every fixture page in `tests/pages` it compares the old path,
+`parser(response.text)` on a response without a declared charset (requests runs
+charset detection over the body, decodes it, and lxml parses the str), with the
+new one, `parser(response.content, response_encoding(response))`, and splits the
+old path into its detection, decoding and parsing steps.
+
+    python benchmarks/profile_decode.py [repeats]
+"""
+
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from _standin import PAGES_DIR
+
+from requests.models import Response
+
+from librus_apix.announcements import parse_announcements
+from librus_apix.attendance import parse_attendance
+from librus_apix.completed_lessons import parse_completed
+from librus_apix.grades import parse_grades
+from librus_apix.helpers import response_encoding
+from librus_apix.homework import parse_homework
+from librus_apix.messages import parse
+from librus_apix.schedule import parse_schedule
+from librus_apix.student_information import parse_student_information
+from librus_apix.timetable import parse_timetable
+
+PAGES: Dict[str, Callable[..., Any]] = {
+    "grades": parse_grades,
+    "attendance": parse_attendance,
+    "timetable": parse_timetable,
+    "schedule": parse_schedule,
+    "homework": parse_homework,
+    "completed": parse_completed,
+    "messages": parse,
+    "announcements": parse_announcements,
+    "student_info": parse_student_information,
+}
+
+
+def response(content: bytes, content_type: str = "") -> Response:
+    r = Response()
+    r.status_code = 200
+    r._content = content
+    if content_type:
+        r.headers["Content-Type"] = content_type
+    return r
+
+
+def median_ms(repeats: int, fn: Callable[[], Any]) -> float:
+    samples: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[len(samples) // 2] * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 21
+    columns = ("detect", "decode", "parse str", "old total", "new total", "saved")
+    print(f"{'page':>13} {'size':>7} " + " ".join(f"{c:>10}" for c in columns))
+    for name, parser in PAGES.items():
+        content = (PAGES_DIR / f"{name}.html").read_bytes()
+        text = content.decode("utf-8")
+        declared = response(content, "text/html; charset=UTF-8")
+        # requests caches the decoded text on the response, so build a fresh one per call
+        old = lambda: parser(response(content).text)
+        new = lambda: parser(declared.content, response_encoding(declared))
+        assert old() == new()
+        times = [
+            median_ms(repeats, lambda: response(content).apparent_encoding),
+            median_ms(repeats, lambda: content.decode("utf-8")),
+            median_ms(repeats, lambda: parser(text)),
+            median_ms(repeats, old),
+            median_ms(repeats, new),
+        ]
+        saved = times[3] - times[4]
+        print(
+            f"{name:>13} {len(content) // 1024:>5}KB "
+            + " ".join(f"{t:>8.2f}ms" for t in times)
+            + f" {saved:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ Classes:
 
 Functions:
     - get_announcements: Retrieves a list of announcements from the Librus API using a Client object.
+    - get_announcements_async: The same, using an AsyncClient.
+    - parse_announcements: Parses announcements from an already fetched page.
 
 Usage:
 ```python
@@ -21,13 +23,12 @@ announcements = get_announcements(client)
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Union
 
-from bs4 import BeautifulSoup
-
-from librus_apix.client import Client
+from librus_apix.client import AsyncClient, Client
 from librus_apix.exceptions import ParseError
-from librus_apix.helpers import no_access_check
+from librus_apix.helpers import make_soup, no_access_check, response_encoding
+from librus_apix.singleflight import coalesced, coalesced_async
 
 
 @dataclass
@@ -48,6 +49,7 @@ class Announcement:
     date: str = ""
 
 
+@coalesced
 def get_announcements(client: Client) -> List[Announcement]:
     """
     Retrieves a list of announcements from the client.
@@ -61,9 +63,45 @@ def get_announcements(client: Client) -> List[Announcement]:
     Raises:
         ParseError: If there is an error parsing the announcements.
     """
-    soup = no_access_check(
-        BeautifulSoup(client.get(client.ANNOUNCEMENTS_URL).text, "lxml")
-    )
+    response = client.get(client.ANNOUNCEMENTS_URL)
+    return parse_announcements(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def get_announcements_async(client: AsyncClient) -> List[Announcement]:
+    """
+    Async counterpart of get_announcements.
+
+    Args:
+        client (AsyncClient): The async client object used to make the request.
+
+    Returns:
+        List[Announcement]: A list of Announcement objects representing the retrieved announcements.
+
+    Raises:
+        ParseError: If there is an error parsing the announcements.
+    """
+    response = await client.get(client.ANNOUNCEMENTS_URL)
+    return parse_announcements(response.content, response_encoding(response))
+
+
+def parse_announcements(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> List[Announcement]:
+    """
+    Parses announcements from an already fetched announcements page.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+
+    Returns:
+        List[Announcement]: A list of Announcement objects representing the announcements.
+
+    Raises:
+        ParseError: If there is an error parsing the announcements.
+    """
+    soup = no_access_check(make_soup(document, encoding))
     if soup.select_one("div.container.border-red.resizeable.center > div > p"):
         return []
     announcements = []
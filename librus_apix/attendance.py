@@ -6,9 +6,17 @@ Classes:
 
 Functions:
     - get_detail: Retrieves attendance details from a specific URL suffix.
+    - get_details: Retrieves many attendance details concurrently.
     - get_gateway_attendance: Retrieves attendance data from the Librus gateway API.
     - get_attendance_frequency: Calculates attendance frequency for each semester and overall.
+    - get_subject_frequency: Calculates attendance percentage for every subject.
     - get_attendance: Retrieves attendance records from Librus based on specified sorting criteria.
+    - parse_attendance_detail: Parses attendance details from an already fetched page.
+    - parse_attendance: Parses attendance records from an already fetched page.
+    - iter_attendance: Streams the attendance page, yielding each record as soon as its row is downloaded.
+    - iter_parse_attendance: Parses attendance records from a page read in chunks, yielding them as their rows close.
+
+    Every fetching function above except iter_attendance has an `*_async` counterpart taking an AsyncClient.
 
 Usage:
 ```python
@@ -36,15 +44,46 @@ attendance_records = get_attendance(client, sort_by="all")
 import asyncio
 from collections import defaultdict
 from collections.abc import Coroutine
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
-
-from aiohttp import ClientSession
-from bs4 import BeautifulSoup, NavigableString, Tag
-
-from librus_apix.client import Client
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from bs4 import NavigableString, Tag
+from lxml import etree, html
+from requests.models import Response
+
+from librus_apix.client import AsyncClient, AsyncResponse, Client
+from librus_apix.concurrency import AdaptiveLimit
 from librus_apix.exceptions import ArgumentError, ParseError
-from librus_apix.helpers import no_access_check
+from librus_apix.helpers import (
+    class_is,
+    current_parser_backend,
+    has_class,
+    iter_closed,
+    make_soup,
+    make_tree,
+    no_access_check,
+    node_text,
+    page_region,
+    parse_results,
+    response_encoding,
+    run_parser,
+    run_parser_async,
+    stream_records,
+    tree_no_access_check,
+)
+from librus_apix.singleflight import coalesced, coalesced_async
 
 
 @dataclass
@@ -77,26 +116,26 @@ class Attendance:
     subject: str
 
 
-def get_detail(client: Client, detail_url: str) -> Dict[str, str]:
+def parse_attendance_detail(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> Dict[str, str]:
     """
-    Retrieves attendance details from the specified detail URL suffix.
+    Parses an already fetched attendance detail page.
 
     Args:
-        client (Client): The client object used to make the request.
-        detail_url (str): The URL for fetching the attendance details.
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
 
     Returns:
-        Dict[str, str]: A dictionary containing the attendance details.
+        Dict[str, str]: A dictionary containing the detailed attendance information.
 
     Raises:
         ParseError: If there is an error parsing the attendance details.
     """
     details = {}
-    div = no_access_check(
-        BeautifulSoup(
-            client.get(client.ATTENDANCE_DETAILS_URL + detail_url).text, "lxml"
-        )
-    ).find("div", attrs={"class": "container-background"})
+    div = no_access_check(make_soup(document, encoding)).find(
+        "div", attrs={"class": "container-background"}
+    )
     if div is None or isinstance(div, NavigableString):
         raise ParseError("Error in parsing attendance details")
     line = div.find_all("tr", attrs={"class": ["line0", "line1"]})
@@ -111,7 +150,118 @@ def get_detail(client: Client, detail_url: str) -> Dict[str, str]:
     return details
 
 
-async def _get_subject_attendance(client):
+@coalesced
+def get_detail(client: Client, detail_url: str) -> Dict[str, str]:
+    """
+    Retrieves attendance details from the specified detail URL suffix.
+
+    Args:
+        client (Client): The client object used to make the request.
+        detail_url (str): The URL for fetching the attendance details.
+
+    Returns:
+        Dict[str, str]: A dictionary containing the attendance details.
+
+    Raises:
+        ParseError: If there is an error parsing the attendance details.
+    """
+    response = client.get(client.ATTENDANCE_DETAILS_URL + detail_url)
+    return parse_attendance_detail(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def get_detail_async(client: AsyncClient, detail_url: str) -> Dict[str, str]:
+    """
+    Async counterpart of get_detail.
+
+    Args:
+        client (AsyncClient): The async client object used to make the request.
+        detail_url (str): The URL for fetching the attendance details.
+
+    Returns:
+        Dict[str, str]: A dictionary containing the attendance details.
+
+    Raises:
+        ParseError: If there is an error parsing the attendance details.
+    """
+    response = await client.get(client.ATTENDANCE_DETAILS_URL + detail_url)
+    return parse_attendance_detail(response.content, response_encoding(response))
+
+
+def get_details(
+    client: Client,
+    detail_urls: Iterable[str],
+    max_concurrency: Union[int, AdaptiveLimit] = 8,
+) -> List[Union[Dict[str, str], Exception]]:
+    """
+    Batch form of get_detail, fetching attendance details concurrently.
+
+    Args:
+        client (Client): The client object used to make the requests.
+        detail_urls (Iterable[str]): The URL suffixes of the attendance details.
+        max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight,
+            or an adaptive limit. Defaults to 8.
+
+    Returns:
+        List[Union[Dict[str, str], Exception]]: The result of every request in input order,
+            or the exception it raised.
+    """
+    results = client.fetch_many(
+        [client.ATTENDANCE_DETAILS_URL + url for url in detail_urls], max_concurrency
+    )
+    return parse_results(results, parse_attendance_detail)
+
+
+async def get_details_async(
+    client: AsyncClient,
+    detail_urls: Iterable[str],
+    max_concurrency: Union[int, AdaptiveLimit] = 8,
+) -> List[Union[Dict[str, str], Exception]]:
+    """
+    Async counterpart of get_details.
+
+    Args:
+        client (AsyncClient): The async client object used to make the requests.
+        detail_urls (Iterable[str]): The URL suffixes of the attendance details.
+        max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight,
+            or an adaptive limit. Defaults to 8.
+
+    Returns:
+        List[Union[Dict[str, str], Exception]]: The result of every request in input order,
+            or the exception it raised.
+    """
+    results = await client.fetch_many(
+        [client.ATTENDANCE_DETAILS_URL + url for url in detail_urls], max_concurrency
+    )
+    return parse_results(results, parse_attendance_detail)
+
+
+# the gateway API answers an expired oauth token with 401
+GATEWAY_AUTH_FAILURE = 401
+
+
+def _gateway_get(client: Client, url: str) -> Response:
+    """GETs a gateway API url, refreshing the oauth token only when it expired or was refused."""
+    oauth = client.ensure_oauth()
+    response = client.get(url)
+    if response.status_code == GATEWAY_AUTH_FAILURE:
+        client.ensure_oauth(rejected=oauth)
+        response = client.get(url)
+    return response
+
+
+async def _gateway_get_async(client: AsyncClient, url: str) -> AsyncResponse:
+    oauth = await client.ensure_oauth()
+    response = await client.get(url)
+    if response.status_code == GATEWAY_AUTH_FAILURE:
+        await client.ensure_oauth(rejected=oauth)
+        response = await client.get(url)
+    return response
+
+
+async def _get_subject_attendance(
+    client: AsyncClient, concurrency: Optional[AdaptiveLimit] = None
+):
     types = {
         "1": "nb",
         "2": "sp",
@@ -123,55 +273,67 @@ async def _get_subject_attendance(client):
         "2829": "sz",
     }
 
-    client.refresh_oauth()
-    attendances = client.get(client.GATEWAY_API_ATTENDANCE).json()["Attendances"]
+    attendances = (
+        await _gateway_get_async(client, client.GATEWAY_API_ATTENDANCE)
+    ).json()["Attendances"]
 
-    cookies = client._session.cookies
-    headers = client._session.headers
     base_url = client.BASE_URL
 
     lesson_cache = {}
     subject_cache = {}
 
-    async def req(session: ClientSession, url: str, retries=5, delay=0.5):
-        for attempt in range(retries):
-            try:
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    return await response.json()
-            except:
-                if attempt == retries - 1:
-                    raise
-                await asyncio.sleep(delay * (2**attempt))
-
-    async def _lesson_attendance(session: ClientSession, attendance: dict):
+    if concurrency is None:
+        # aiohttp treats a limit of 0 as unlimited
+        per_host = client.limit_per_host or 32
+        concurrency = AdaptiveLimit(initial=min(4, per_host), max_limit=per_host)
+
+    # failed lookups are retried by the client's retry_policy, if it has one
+    async def req(url: str):
+        token = await concurrency.acquire_async()
+        started = time.monotonic()
+        response = error = None
+        try:
+            response = await _gateway_get_async(client, url)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            concurrency.release(token, started, response, error)
+
+    async def _lesson_attendance(attendance: dict):
         lesson_id = attendance["Lesson"]["Id"]
         absence_type = types.get(str(attendance["Type"]["Id"]), "unknown")
 
         if lesson_id in lesson_cache:
             return (lesson_cache[lesson_id], absence_type)
 
-        lesson_resp = await req(
-            session, f"{base_url}/gateway/api/2.0/Lessons/{lesson_id}"
-        )
+        lesson_resp = await req(f"{base_url}/gateway/api/2.0/Lessons/{lesson_id}")
         sub_id = lesson_resp["Lesson"]["Subject"]["Id"]
 
         if sub_id in subject_cache:
             subject_name = subject_cache[sub_id]
         else:
-            sub_resp = await req(
-                session, f"{base_url}/gateway/api/2.0/Subjects/{sub_id}"
-            )
+            sub_resp = await req(f"{base_url}/gateway/api/2.0/Subjects/{sub_id}")
             subject_name = sub_resp["Subject"]["Name"]
             subject_cache[sub_id] = subject_name
 
         lesson_cache[lesson_id] = subject_name
         return (subject_name, absence_type)
 
-    async with ClientSession(cookies=cookies, headers=headers) as session:
-        results = await asyncio.gather(
-            *[_lesson_attendance(session, attendance) for attendance in attendances]
-        )
+    tasks = [
+        asyncio.ensure_future(_lesson_attendance(attendance))
+        for attendance in attendances
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # don't leave lookups running on a client about to be closed
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
 
     counts = defaultdict(lambda: defaultdict(int))
     for subject, absence in results:
@@ -180,20 +342,119 @@ async def _get_subject_attendance(client):
     return {subject: dict(types) for subject, types in counts.items()}
 
 
-def get_subject_frequency(client: Client, attendances=None) -> Dict[str, float]:
-    if not attendances:
-        attendances = asyncio.run(_get_subject_attendance(client))
+async def _get_subject_attendance_from(
+    client: Client, concurrency: Optional[AdaptiveLimit] = None
+):
+    async with AsyncClient.from_client(client) as async_client:
+        attendances = await _get_subject_attendance(async_client, concurrency)
+    # a login or oauth refresh of the async client replaced its token
+    client.token = async_client.token
+    return attendances
+
+
+def _run_blocking(coroutine: Coroutine) -> Any:
+    """
+    Runs a coroutine to completion from sync code.
+
+    asyncio.run can't be used while an event loop is already running in this thread,
+    in that case the coroutine runs on its own loop in a worker thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def _subject_frequency(attendances: Dict[str, Dict[str, int]]) -> Dict[str, float]:
     frequency = {}
     for sub in attendances:
         attended = attendances[sub].get("ob", 0) + attendances[sub].get("sp", 0)
         unattended = (
-            attendances[sub].get("nb", 0) + attendances[sub].get("u", 0) + attendances[sub].get("zw", 0)
+            attendances[sub].get("nb", 0)
+            + attendances[sub].get("u", 0)
+            + attendances[sub].get("zw", 0)
         )
         total = attended + unattended
         frequency[sub] = round(attended / total * 100, 2) if total > 0 else 100.0
     return frequency
 
 
+def get_subject_frequency(
+    client: Client, attendances=None, concurrency: Optional[AdaptiveLimit] = None
+) -> Dict[str, float]:
+    """
+    Calculates attendance percentage for every subject.
+
+    The subject of every attendance is looked up in the gateway API, with a concurrency
+    adapting to how Librus copes, see `librus_apix.concurrency`.
+
+    Args:
+        client (Client): The client object used to make the requests.
+        attendances (dict, optional): Already fetched per subject attendance counts.
+        concurrency (AdaptiveLimit, optional): The limit of the gateway lookups, reuse it to keep
+            what it learned. Defaults to a new limit of up to `limit_per_host` lookups.
+
+    Returns:
+        Dict[str, float]: Attendance percentage for every subject.
+    """
+    if not attendances:
+        attendances = _run_blocking(_get_subject_attendance_from(client, concurrency))
+    return _subject_frequency(attendances)
+
+
+async def get_subject_frequency_async(
+    client: AsyncClient,
+    attendances=None,
+    concurrency: Optional[AdaptiveLimit] = None,
+) -> Dict[str, float]:
+    """
+    Async counterpart of get_subject_frequency.
+
+    Args:
+        client (AsyncClient): The async client object used to make the requests.
+        attendances (dict, optional): Already fetched per subject attendance counts.
+        concurrency (AdaptiveLimit, optional): The limit of the gateway lookups.
+            Defaults to a new limit of up to `limit_per_host` lookups.
+
+    Returns:
+        Dict[str, float]: Attendance percentage for every subject.
+    """
+    if not attendances:
+        attendances = await _get_subject_attendance(client, concurrency)
+    return _subject_frequency(attendances)
+
+
+_GATEWAY_TYPES = {
+    "1": {"short": "nb", "name": "Nieobecność"},
+    "2": {"short": "sp", "name": "Spóźnienie"},
+    "3": {"short": "u", "name": "Nieobecność uspr."},
+    "4": {"short": "zw", "name": "Zwolnienie"},
+    "100": {"short": "ob", "name": "Obecność"},
+    "1266": {"short": "wy", "name": "Wycieczka"},
+    "2022": {"short": "k", "name": "Konkurs szkolny"},
+    "2829": {"short": "sz", "name": "Szkolenie"},
+}
+
+
+def _parse_gateway_attendance(
+    data: Dict[str, Any],
+) -> List[Tuple[Tuple[str, str], str, str]]:
+    attendances = data["Attendances"]
+    _attendance = []
+    for a in attendances:
+        type_id = a["Type"]["Id"]
+        type_data = tuple(_GATEWAY_TYPES[str(type_id)].values())
+        lesson_number = a["LessonNo"]
+        semester = a["Semester"]
+
+        _attendance.append((type_data, lesson_number, semester))
+
+    return _attendance
+
+
+@coalesced
 def get_gateway_attendance(client: Client) -> List[Tuple[Tuple[str, str], str, str]]:
     """
     Retrieves attendance data from the gateway API.
@@ -201,8 +462,8 @@ def get_gateway_attendance(client: Client) -> List[Tuple[Tuple[str, str], str, s
     The gateway API data is typically updated every 3 hours.
     Accessing api.librus.pl requires a private key.
 
-    Requires:
-        oauth token to be refreshed with client.refresh_oauth()
+    The oauth token is refreshed only when it expired or the API refused it, see
+    `Client.ensure_oauth`.
 
     Args:
         client (Client): The client object used to make the request.
@@ -218,50 +479,33 @@ def get_gateway_attendance(client: Client) -> List[Tuple[Tuple[str, str], str, s
         ValueError: If the OAuth token is missing.
         AuthorizationError: If there is an authorization error while accessing the API.
     """
-    types = {
-        "1": {"short": "nb", "name": "Nieobecność"},
-        "2": {"short": "sp", "name": "Spóźnienie"},
-        "3": {"short": "u", "name": "Nieobecność uspr."},
-        "4": {"short": "zw", "name": "Zwolnienie"},
-        "100": {"short": "ob", "name": "Obecność"},
-        "1266": {"short": "wy", "name": "Wycieczka"},
-        "2022": {"short": "k", "name": "Konkurs szkolny"},
-        "2829": {"short": "sz", "name": "Szkolenie"},
-    }
-    oauth = client.token.oauth
-    if oauth == "":
-        oauth = client.refresh_oauth()
-    client.cookies["oauth_token"] = oauth
-    response = client.get(client.GATEWAY_API_ATTENDANCE)
+    response = _gateway_get(client, client.GATEWAY_API_ATTENDANCE)
+    return _parse_gateway_attendance(response.json())
 
-    attendances = response.json()["Attendances"]
-    _attendance = []
-    for a in attendances:
-        type_id = a["Type"]["Id"]
-        type_data = tuple(types[str(type_id)].values())
-        lesson_number = a["LessonNo"]
-        semester = a["Semester"]
 
-        _attendance.append((type_data, lesson_number, semester))
-
-    return _attendance
-
-
-def get_attendance_frequency(client: Client) -> Tuple[float, float, float]:
+@coalesced_async
+async def get_gateway_attendance_async(
+    client: AsyncClient,
+) -> List[Tuple[Tuple[str, str], str, str]]:
     """
-    Calculates the attendance frequency for each semester and overall.
+    Async counterpart of get_gateway_attendance.
 
     Args:
-        client (Client): The client object used to retrieve attendance data.
+        client (AsyncClient): The async client object used to make the request.
 
     Returns:
-        Tuple[float, float, float]: A tuple containing the attendance frequencies for the first semester, second semester, and overall.
-            Each frequency is a float value between 0 and 1, representing the ratio of attended lessons to total lessons.
+        List[Tuple[Tuple[str, str], str, str]]: A list of tuples containing attendance data.
 
     Raises:
-        ValueError: If there is an error retrieving attendance data.
+        AuthorizationError: If there is an authorization error while accessing the API.
     """
-    attendance = get_gateway_attendance(client)
+    response = await _gateway_get_async(client, client.GATEWAY_API_ATTENDANCE)
+    return _parse_gateway_attendance(response.json())
+
+
+def _attendance_frequency(
+    attendance: List[Tuple[Tuple[str, str], str, str]],
+) -> Tuple[float, float, float]:
     first_semester = [a for a in attendance if a[2] == 1]
     second_semester = [a for a in attendance if a[2] == 2]
     f_attended = len([a for a in first_semester if a[0][0] in ["wy", "ob", "sp"]])
@@ -274,9 +518,41 @@ def get_attendance_frequency(client: Client) -> Tuple[float, float, float]:
         else 1
     )
     return f_freq, s_freq, overall_freq
+
+
+def get_attendance_frequency(client: Client) -> Tuple[float, float, float]:
+    """
+    Calculates the attendance frequency for each semester and overall.
+
+    Args:
+        client (Client): The client object used to retrieve attendance data.
+
+    Returns:
+        Tuple[float, float, float]: A tuple containing the attendance frequencies for the first semester, second semester, and overall.
+            Each frequency is a float value between 0 and 1, representing the ratio of attended lessons to total lessons.
+
+    Raises:
+        ValueError: If there is an error retrieving attendance data.
+    """
+    return _attendance_frequency(get_gateway_attendance(client))
     # ADD Lesson frequency
 
 
+async def get_attendance_frequency_async(
+    client: AsyncClient,
+) -> Tuple[float, float, float]:
+    """
+    Async counterpart of get_attendance_frequency.
+
+    Args:
+        client (AsyncClient): The async client object used to retrieve attendance data.
+
+    Returns:
+        Tuple[float, float, float]: The attendance frequencies for the first semester, second semester, and overall.
+    """
+    return _attendance_frequency(await get_gateway_attendance_async(client))
+
+
 def _extract_title_pairs(title: str):
     sanitize_title = (
         title.replace("</b>", "<br>").replace("<br/>", "").strip().split("<br>")
@@ -308,12 +584,13 @@ def _sanitize_onclick_href(onclick: str):
     return href[3]
 
 
-def _create_attendance(single: Tag, semester: int):
+def _create_attendance(attrs: Mapping[str, str], text: str, semester: int):
     """
     Creates an Attendance object from a single attendance record.
 
     Args:
-        single (Tag): The BeautifulSoup Tag representing a single attendance record.
+        attrs (Mapping[str, str]): The attributes of the record's anchor, a bs4 Tag or an lxml element.
+        text (str): The text of the record's anchor.
         semester (int): The semester number to which the attendance record belongs.
 
     Returns:
@@ -322,9 +599,9 @@ def _create_attendance(single: Tag, semester: int):
     Raises:
         ParseError: If there is an error parsing the attendance record.
     """
-    if single.attrs.get("title") is None:
+    if attrs.get("title") is None:
         raise ParseError("Absence anchor title is None")
-    pairs = _extract_title_pairs(single.attrs["title"])
+    pairs = _extract_title_pairs(attrs["title"])
     attributes = _sanitize_pairs(pairs)
 
     date = attributes.get("Data", "").split(" ")[0]
@@ -335,10 +612,10 @@ def _create_attendance(single: Tag, semester: int):
     excursion = True if attributes.get("Czy wycieczka", "") == "Tak" else False
     teacher = attributes.get("Nauczyciel", "")
 
-    href = _sanitize_onclick_href(single.attrs.get("onclick", ""))
+    href = _sanitize_onclick_href(attrs.get("onclick", ""))
 
     return Attendance(
-        single.text,
+        text,
         href,
         semester,
         date,
@@ -351,43 +628,99 @@ def _create_attendance(single: Tag, semester: int):
     )
 
 
-def get_attendance(client: Client, sort_by: str = "all") -> List[List[Attendance]]:
+_SORT: Dict[str, Dict[str, str]] = {
+    "all": {"zmiany_logowanie_wszystkie": ""},
+    "week": {"zmiany_logowanie_tydzien": "zmiany_logowanie_tydzien"},
+    "last_login": {"zmiany_logowanie": "zmiany_logowanie"},
+}
+
+
+def _attendance_payload(sort_by: str) -> Dict[str, str]:
+    if sort_by not in _SORT.keys():
+        raise ArgumentError(
+            "Wrong value for sort_by it can be either all, week or last_login"
+        )
+    return _SORT[sort_by]
+
+
+_REGION = page_region("table")
+_TABLE = etree.XPath(f"(//table[{class_is('center big decorated')}])[1]")
+_DAYS = etree.XPath(f".//tr[{has_class('line0')} or {has_class('line1')}]")
+_NEW_SEMESTER = etree.XPath(f"boolean(.//td[{class_is('center bolded')}])")
+_CELLS = etree.XPath(f".//td[{has_class('center')}]")
+_ANCHORS = etree.XPath(".//a")
+
+
+# while streaming, rows nested in other rows of the table come with the row holding them
+_TABLE_ROW = etree.XPath(
+    f"boolean(ancestor::table[{class_is('center big decorated')}])"
+    f" and not(ancestor::tr[ancestor::table[{class_is('center big decorated')}]])"
+)
+_DAYS_WITHIN = etree.XPath(
+    f"descendant-or-self::tr[{has_class('line0')} or {has_class('line1')}]"
+)
+
+
+def _day_lxml(day: html.HtmlElement, semester: int) -> Tuple[int, List[Attendance]]:
+    """Returns the semester counter after a day's row and the records in it."""
+    if _NEW_SEMESTER(day):
+        semester += 1
+    records = []
+    for absence in _CELLS(day):
+        for single in _ANCHORS(absence):
+            records.append(
+                _create_attendance(single.attrib, node_text(single), semester)
+            )
+    return semester, records
+
+
+def _parse_attendance_lxml(root: html.HtmlElement) -> List[List[Attendance]]:
+    # the lxml counterpart of parse_attendance, keep the two in sync
+    table = _TABLE(root)
+    if not table:
+        raise ParseError("Error parsing attendance (table).")
+
+    attendance_semesters = [[] for _ in range(2)]
+    semester = -1
+    for day in _DAYS(table[0]):
+        semester, records = _day_lxml(day, semester)
+        if records:
+            attendance_semesters[semester].extend(records)
+    match semester:
+        case 0:
+            return list(attendance_semesters)
+        case 1:
+            return list(reversed(attendance_semesters))
+        case _:
+            raise ParseError("Couldn't find attendance semester")
+
+
+def parse_attendance(
+    document: Union[str, bytes],
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> List[List[Attendance]]:
     """
-    Retrieves attendance records from librus.
+    Parses attendance records from an already fetched attendance page.
 
     Args:
-        client (Client): The client object used to fetch attendance data.
-        sort_by (str, optional): The sorting criteria for attendance records.
-            It can be one of the following values:
-            - "all": Sort by all attendance records.
-            - "week": Sort by attendance records for the current week.
-            - "last_login": Sort by attendance records since the last login.
-            Defaults to "all".
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+        backend (str, optional): "bs4" or "lxml". Defaults to the backend in effect,
+            see `librus_apix.helpers.parser_backend`.
 
     Returns:
-        List[List[Attendance]]: A list containing attendance records grouped by semester.
-            Each inner list represents attendance records for a specific semester.
+        List[List[Attendance]]: A list containing two lists of Attendance objects, one for each semester.
 
     Raises:
-        ArgumentError: If an invalid value is provided for the sort_by parameter.
+        ArgumentError: If the backend is unknown.
         ParseError: If there is an error parsing the attendance data.
     """
-    SORT: Dict[str, Dict[str, str]] = {
-        "all": {"zmiany_logowanie_wszystkie": ""},
-        "week": {"zmiany_logowanie_tydzien": "zmiany_logowanie_tydzien"},
-        "last_login": {"zmiany_logowanie": "zmiany_logowanie"},
-    }
-    if sort_by not in SORT.keys():
-        raise ArgumentError(
-            "Wrong value for sort_by it can be either all, week or last_login"
+    if current_parser_backend(backend) == "lxml":
+        return _parse_attendance_lxml(
+            tree_no_access_check(make_tree(document, encoding))
         )
-
-    soup = no_access_check(
-        BeautifulSoup(
-            client.post(client.ATTENDANCE_URL, data=SORT[sort_by]).text,
-            "lxml",
-        )
-    )
+    soup = no_access_check(make_soup(document, encoding, _REGION))
     table = soup.find("table", attrs={"class": "center big decorated"})
     if table is None or isinstance(table, NavigableString):
         raise ParseError("Error parsing attendance (table).")
@@ -404,7 +737,7 @@ def get_attendance(client: Client, sort_by: str = "all") -> List[List[Attendance
             a_elem: List[Tag] = absence.find_all("a")
             for single in a_elem:
                 attendance_semesters[semester].append(
-                    _create_attendance(single, semester)
+                    _create_attendance(single.attrs, single.text, semester)
                 )
     match semester:
         case 0:
@@ -413,3 +746,110 @@ def get_attendance(client: Client, sort_by: str = "all") -> List[List[Attendance
             return list(reversed(attendance_semesters))
         case _:
             raise ParseError("Couldn't find attendance semester")
+
+
+@coalesced
+def get_attendance(client: Client, sort_by: str = "all") -> List[List[Attendance]]:
+    """
+    Retrieves attendance records from librus.
+
+    Args:
+        client (Client): The client object used to fetch attendance data.
+        sort_by (str, optional): The sorting criteria for attendance records.
+            It can be one of the following values:
+            - "all": Sort by all attendance records.
+            - "week": Sort by attendance records for the current week.
+            - "last_login": Sort by attendance records since the last login.
+            Defaults to "all".
+
+    Returns:
+        List[List[Attendance]]: A list containing attendance records grouped by semester.
+            Each inner list represents attendance records for a specific semester.
+
+    Raises:
+        ArgumentError: If an invalid value is provided for the sort_by parameter.
+        ParseError: If there is an error parsing the attendance data.
+    """
+    payload = _attendance_payload(sort_by)
+    response = client.post(client.ATTENDANCE_URL, data=payload)
+    return run_parser(parse_attendance, response.content, response_encoding(response))
+
+
+def iter_parse_attendance(
+    chunks: Iterable[bytes], encoding: Optional[str] = None
+) -> Iterator[Attendance]:
+    """
+    Parses attendance records from an attendance page read in chunks, yielding them as their rows close.
+
+    The records come in page order; unlike `parse_attendance` they aren't grouped, their
+    `semester` tells which group they belong to.
+
+    Args:
+        chunks (Iterable[bytes]): The raw page, e.g. `response.iter_content()`.
+        encoding (str, optional): Encoding of the page. Defaults to UTF-8.
+
+    Yields:
+        Attendance: The attendance records.
+
+    Raises:
+        TokenError: If the page says "Brak dostępu".
+        ParseError: If the page has no semester marker, once it is read.
+    """
+    semester = -1
+    for outer in iter_closed(chunks, "tr", _TABLE_ROW, encoding):
+        for day in _DAYS_WITHIN(outer):
+            semester, records = _day_lxml(day, semester)
+            yield from records
+    if semester not in (0, 1):
+        raise ParseError("Couldn't find attendance semester")
+
+
+def iter_attendance(client: Client, sort_by: str = "all") -> Iterator[Attendance]:
+    """
+    Streams the attendance page and yields each record as soon as its row is downloaded.
+
+    The page is parsed while it downloads and what was already yielded is dropped, so the
+    first records arrive before the page is complete and memory stays flat. The request is
+    never cached or coalesced with other callers.
+
+    Args:
+        client (Client): The client object used to fetch attendance data.
+        sort_by (str, optional): The sorting criteria for attendance records, "all", "week"
+            or "last_login". Defaults to "all".
+
+    Returns:
+        Iterator[Attendance]: The attendance records, in page order.
+
+    Raises:
+        ArgumentError: If an invalid value is provided for the sort_by parameter.
+        ParseError: If there is an error parsing the attendance data, once the page is read.
+    """
+    payload = _attendance_payload(sort_by)
+    return stream_records(
+        client, "POST", client.ATTENDANCE_URL, payload, iter_parse_attendance
+    )
+
+
+@coalesced_async
+async def get_attendance_async(
+    client: AsyncClient, sort_by: str = "all"
+) -> List[List[Attendance]]:
+    """
+    Async counterpart of get_attendance.
+
+    Args:
+        client (AsyncClient): The async client object used to fetch attendance data.
+        sort_by (str, optional): Either "all", "week" or "last_login". Defaults to "all".
+
+    Returns:
+        List[List[Attendance]]: A list containing attendance records grouped by semester.
+
+    Raises:
+        ArgumentError: If an invalid value is provided for the sort_by parameter.
+        ParseError: If there is an error parsing the attendance data.
+    """
+    payload = _attendance_payload(sort_by)
+    response = await client.post(client.ATTENDANCE_URL, data=payload)
+    return await run_parser_async(
+        parse_attendance, response.content, response_encoding(response)
+    )
@@ -0,0 +1,552 @@
+"""
+This module provides a response cache for pages that rarely or never change.
+
+Student information, recipient groups, past timetable weeks and the contents of already
+fetched messages do not change between polls, so a client given a cache serves them
+locally until their TTL runs out. Entries are keyed by method, URL, form data and
+token identity, so two accounts sharing a cache never see each other's pages.
+
+Classes:
+    - CacheRule: A TTL for the requests matching a URL prefix.
+    - CachePolicy: The set of rules deciding which requests are cached and for how long.
+    - CachedResponse: A stored response.
+    - CacheStats: Hit, miss and eviction counters of a cache.
+    - ResponseCache: Base class of the cache backends, LRU-bounded by entry count and bytes.
+    - MemoryCache: An in-process cache backend.
+    - DiskCache: A cache backend storing entries as files, surviving restarts.
+
+Functions:
+    - cache_key: Builds the key of a request.
+    - default_cache_policy: Returns the rules for a client's rarely changing endpoints.
+    - past_week: Checks whether a timetable payload asks for a week that has ended.
+
+Usage:
+```python
+from librus_apix.cache import DiskCache, MemoryCache
+from librus_apix.client import new_client
+
+client = new_client(token=token, cache=MemoryCache(max_entries=256, max_bytes=16 * 2**20))
+info = get_student_information(client)  # fetched
+info = get_student_information(client)  # served from the cache
+print(client.cache.stats.hits, client.cache.stats.hit_ratio("student_information"))
+
+# or keep the pages between runs
+client = new_client(token=token, cache=DiskCache("~/.cache/librus_apix"))
+```
+"""
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+DAY = 24 * 60 * 60
+
+
+def cache_key(
+    method: str, url: str, data: Optional[Dict[str, Any]], api_key: str
+) -> str:
+    """
+    Builds the key of a request.
+
+    The API key is only hashed, so on-disk entries do not reveal it.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The requested URL.
+        data (Dict[str, Any], optional): Form data of a POST request.
+        api_key (str): The API key of the token the request is made with.
+
+    Returns:
+        str: A hex digest identifying the request.
+    """
+    digest = hashlib.sha256()
+    for part in (method.upper(), url, api_key):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    for key, value in sorted((data or {}).items(), key=lambda item: str(item[0])):
+        digest.update(f"{key}={value}".encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def past_week(data: Optional[Dict[str, Any]]) -> bool:
+    """
+    Checks whether a timetable payload asks for a week that has already ended.
+
+    Args:
+        data (Dict[str, Any], optional): The form data of a timetable request.
+
+    Returns:
+        bool: True if the requested week ended before today.
+    """
+    week = str((data or {}).get("tydzien", ""))
+    _, _, sunday = week.partition("_")
+    try:
+        return datetime.strptime(sunday, "%Y-%m-%d").date() < datetime.now().date()
+    except ValueError:
+        return False
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """
+    A TTL for the requests matching a URL prefix.
+
+    Attributes:
+        name (str): The endpoint name statistics are reported under.
+        url (str): The URL, or URL prefix if `prefix` is set, the rule applies to.
+        ttl (float): Seconds a response stays fresh, `math.inf` to keep it until evicted.
+        method (str): The HTTP method the rule applies to. Defaults to "GET".
+        prefix (bool): Match every URL starting with `url`. Defaults to False.
+        when (Callable[[Optional[Dict[str, Any]]], bool], optional): An extra check on the form data.
+    """
+
+    name: str
+    url: str
+    ttl: float
+    method: str = "GET"
+    prefix: bool = False
+    when: Optional[Callable[[Optional[Dict[str, Any]]], bool]] = None
+
+    def matches(self, method: str, url: str, data: Optional[Dict[str, Any]]) -> bool:
+        if method.upper() != self.method.upper():
+            return False
+        if not (url.startswith(self.url) if self.prefix else url == self.url):
+            return False
+        return self.when is None or self.when(data)
+
+
+class CachePolicy:
+    """
+    The rules deciding which requests are cached and for how long.
+
+    Requests matching no rule bypass the cache. The first matching rule wins.
+
+    Attributes:
+        rules (List[CacheRule]): The rules in match order.
+    """
+
+    def __init__(self, rules: Iterable[CacheRule] = ()):
+        self.rules = list(rules)
+
+    def __repr__(self) -> str:
+        return f"<CachePolicy {[rule.name for rule in self.rules]}>"
+
+    def match(
+        self, method: str, url: str, data: Optional[Dict[str, Any]] = None
+    ) -> Optional[CacheRule]:
+        """
+        Returns the rule a request falls under, if any.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The requested URL.
+            data (Dict[str, Any], optional): Form data of a POST request.
+
+        Returns:
+            CacheRule | None: The first matching rule.
+        """
+        for rule in self.rules:
+            if rule.matches(method, url, data):
+                return rule
+        return None
+
+
+def default_cache_policy(client: Any) -> CachePolicy:
+    """
+    Returns the rules for the rarely changing endpoints of a client.
+
+    - student_information: INFO_URL, one day.
+    - recipient_groups: RECIPIENT_GROUPS_URL, one day.
+    - message_content: pages under MESSAGE_URL + "/", until evicted.
+    - past_timetable: TIMETABLE_URL weeks that have ended, until evicted.
+
+    Args:
+        client (Any): A Client or AsyncClient to read the endpoint URLs from.
+
+    Returns:
+        CachePolicy: The policy for the client's URLs.
+    """
+    return CachePolicy(
+        [
+            CacheRule("student_information", client.INFO_URL, DAY),
+            CacheRule("recipient_groups", client.RECIPIENT_GROUPS_URL, DAY),
+            CacheRule(
+                "message_content", client.MESSAGE_URL + "/", math.inf, prefix=True
+            ),
+            CacheRule(
+                "past_timetable",
+                client.TIMETABLE_URL,
+                math.inf,
+                method="POST",
+                when=past_week,
+            ),
+        ]
+    )
+
+
+@dataclass
+class CachedResponse:
+    """
+    A stored response.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        url (str): The final URL of the response.
+        headers (Dict[str, str]): The response headers.
+        content (bytes): The decoded response body.
+        encoding (str | None): The charset of the response, if known.
+        expires (float): The `time.time()` after which the entry is stale.
+    """
+
+    status_code: int
+    url: str
+    headers: Dict[str, str]
+    content: bytes
+    encoding: Optional[str]
+    expires: float
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires
+
+    @classmethod
+    def from_response(cls, response: Any, ttl: float) -> "CachedResponse":
+        """
+        Snapshots a fully read response.
+
+        Args:
+            response (Any): A `requests.Response` or `librus_apix.client.AsyncResponse`.
+            ttl (float): Seconds the entry stays fresh.
+
+        Returns:
+            CachedResponse: The entry to store.
+        """
+        headers = {
+            key: value
+            for key, value in response.headers.items()
+            # the stored body is already decoded
+            if key.lower() not in ("content-encoding", "content-length", "set-cookie")
+        }
+        return cls(
+            response.status_code,
+            str(response.url),
+            headers,
+            response.content,
+            response.encoding,
+            time.time() + ttl,
+        )
+
+    def to_response(self) -> Response:
+        """
+        Rebuilds a `requests.Response` from the entry.
+
+        Returns:
+            Response: A response the scrapers can parse like a fetched one.
+        """
+        response = Response()
+        response.status_code = self.status_code
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response._content = self.content
+        return response
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a cache, per endpoint name where it applies.
+
+    Attributes:
+        hits (Counter): Fresh entries served, per endpoint.
+        misses (Counter): Lookups that went to the network, per endpoint.
+        stores (int): Entries written.
+        evictions (int): Entries dropped to stay within the entry or byte bound.
+        expirations (int): Entries dropped because their TTL ran out.
+    """
+
+    hits: Counter = field(default_factory=Counter)
+    misses: Counter = field(default_factory=Counter)
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def hit_ratio(self, endpoint: Optional[str] = None) -> float:
+        """
+        Returns the share of lookups served from the cache.
+
+        Args:
+            endpoint (str, optional): Limit the ratio to one endpoint. Defaults to all of them.
+
+        Returns:
+            float: Hits per lookup, 0.0 before the first lookup.
+        """
+        if endpoint is None:
+            hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        else:
+            hits, misses = self.hits[endpoint], self.misses[endpoint]
+        lookups = hits + misses
+        return hits / lookups if lookups else 0.0
+
+    def reset(self) -> None:
+        self.hits.clear()
+        self.misses.clear()
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+class ResponseCache:
+    """
+    Base class of the cache backends.
+
+    Keeps the LRU order and the size of every entry and evicts the least recently used
+    entries once `max_entries` or `max_bytes` is exceeded. Subclasses only load, save and
+    delete single entries. All methods are thread-safe.
+
+    Attributes:
+        max_entries (int): The maximum number of entries.
+        max_bytes (int): The maximum total size of the stored bodies.
+        stats (CacheStats): Hit, miss and eviction counters.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+        # key -> size of the entry, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def size(self) -> int:
+        """The total size of the stored bodies in bytes."""
+        return self._bytes
+
+    def _load(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    def _save(self, key: str, entry: CachedResponse) -> None:
+        raise NotImplementedError
+
+    def _delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _track(self, key: str, size: int) -> None:
+        self._bytes += size - self._index.pop(key, 0)
+        self._index[key] = size
+
+    def _drop(self, key: str) -> None:
+        self._bytes -= self._index.pop(key, 0)
+        self._delete(key)
+
+    def get(self, key: str, endpoint: str = "") -> Optional[CachedResponse]:
+        """
+        Returns a fresh entry and marks it as recently used.
+
+        Args:
+            key (str): The key from `cache_key`.
+            endpoint (str, optional): The endpoint name the lookup is counted under.
+
+        Returns:
+            CachedResponse | None: The entry, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._load(key) if key in self._index else None
+            if entry is not None and entry.expired:
+                self._drop(key)
+                self.stats.expirations += 1
+                entry = None
+            if entry is None:
+                self.stats.misses[endpoint] += 1
+                return None
+            self._index.move_to_end(key)
+            self.stats.hits[endpoint] += 1
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """
+        Stores an entry, evicting the least recently used ones to stay within the bounds.
+
+        Entries larger than `max_bytes` are not stored.
+
+        Args:
+            key (str): The key from `cache_key`.
+            entry (CachedResponse): The entry to store.
+        """
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._save(key, entry)
+            self._track(key, entry.size)
+            self.stats.stores += 1
+            while len(self._index) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._index))
+                self._drop(oldest)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._index:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._index):
+                self._drop(key)
+
+
+class MemoryCache(ResponseCache):
+    """
+    An in-process cache backend.
+
+    Args:
+        max_entries (int, optional): The maximum number of entries. Defaults to 1024.
+        max_bytes (int, optional): The maximum total size of the bodies. Defaults to 64 MiB.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 2**20):
+        super().__init__(max_entries, max_bytes)
+        self._entries: Dict[str, CachedResponse] = {}
+
+    def _load(self, key: str) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    def _save(self, key: str, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+
+    def _delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class DiskCache(ResponseCache):
+    """
+    A cache backend storing every entry as two files in a directory.
+
+    The status, URL, headers, encoding and expiry of an entry go to a JSON header file
+    and the body to a raw file beside it, so nothing read back from the directory is
+    ever unpickled. Entries found in the directory are picked up on creation, least
+    recently used first by modification time, which every hit refreshes.
+
+    Args:
+        directory (Union[str, Path]): The directory to keep the entries in, created if missing.
+        max_entries (int, optional): The maximum number of entries. Defaults to 1024.
+        max_bytes (int, optional): The maximum total size of the bodies. Defaults to 256 MiB.
+    """
+
+    SUFFIX = ".json"
+    BODY_SUFFIX = ".body"
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_entries: int = 1024,
+        max_bytes: int = 256 * 2**20,
+    ):
+        super().__init__(max_entries, max_bytes)
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        found: List[Tuple[float, str, int]] = []
+        for path in self.directory.glob("*" + self.SUFFIX):
+            entry = self._read(path.stem)
+            if entry is None or entry.expired:
+                self._delete(path.stem)
+                continue
+            found.append((path.stat().st_mtime, path.stem, entry.size))
+        for path in self.directory.glob("*" + self.BODY_SUFFIX):
+            # a body whose header was never written
+            if not self._path(path.stem).exists():
+                path.unlink(missing_ok=True)
+        for _, key, size in sorted(found):
+            self._track(key, size)
+        while len(self._index) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._index)))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (key + self.SUFFIX)
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / (key + self.BODY_SUFFIX)
+
+    def _read(self, key: str) -> Optional[CachedResponse]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                header = json.load(f)
+            content = self._body_path(key).read_bytes()
+        except (OSError, ValueError):
+            return None
+        try:
+            if hashlib.sha256(content).hexdigest() != header["sha256"]:
+                # the body of a newer entry whose header is not written yet
+                return None
+            return CachedResponse(
+                int(header["status_code"]),
+                str(header["url"]),
+                dict(header["headers"]),
+                content,
+                header["encoding"],
+                float(header["expires"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _load(self, key: str) -> Optional[CachedResponse]:
+        entry = self._read(key)
+        if entry is None:
+            # removed behind our back, forget it
+            self._bytes -= self._index.pop(key, 0)
+            return None
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        return entry
+
+    def _write(self, path: Path, data: bytes) -> None:
+        # write and rename, so concurrent readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _save(self, key: str, entry: CachedResponse) -> None:
+        header = {
+            "status_code": entry.status_code,
+            "url": entry.url,
+            "headers": entry.headers,
+            "encoding": entry.encoding,
+            "expires": entry.expires,
+            "sha256": hashlib.sha256(entry.content).hexdigest(),
+        }
+        # the header goes last, an entry exists once it is in place
+        self._write(self._body_path(key), entry.content)
+        self._write(self._path(key), json.dumps(header).encode())
+
+    def _delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+        self._body_path(key).unlink(missing_ok=True)
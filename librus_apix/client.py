@@ -5,9 +5,14 @@ This module provides classes and functions for managing API tokens, handling HTT
 Classes:
     - Token: A class to manage and store API tokens.
     - Client: A class to handle HTTP operations using tokens.
+    - FetchRequest: A single request of a fetch_many batch.
+    - FetchResult: The response or error of a single fetch_many request.
+    - AsyncClient: An asyncio counterpart of Client built on aiohttp.
+    - AsyncResponse: A fully read response returned by AsyncClient.
 
 Functions:
     - new_client: Function to create a new instance of the Client class.
+    - new_async_client: Function to create a new instance of the AsyncClient class.
 
 Usage:
 ```python
@@ -18,18 +23,108 @@ _token: Token = my_client.get_token(username, password) # update the client toke
 #Alternatively, you can use the classes directly:
 my_token = Token(API_Key="your_api_key")
 my_client = Client(token=my_token)
+
+# Connections are kept alive and reused between calls.
+# Close them explicitly or use the client as a context manager.
+with new_client(token=my_token, pool_maxsize=4) as my_client:
+    ...
+
+# With credentials, a client logs in again by itself once its token expires.
+my_client = new_client(token=my_token, credentials=(username, password))
+
+# Rarely changing pages can be served from a cache, see librus_apix.cache.
+from librus_apix.cache import MemoryCache
+my_client = new_client(token=my_token, cache=MemoryCache())
+
+# AsyncClient shares one aiohttp session between all calls on an event loop.
+async with new_async_client(token=my_token, limit_per_host=4) as my_async_client:
+    response = await my_async_client.get(my_async_client.INDEX_URL)
 ```
 """
 
-from typing import Dict, Optional
+import asyncio
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import copy_context
+from dataclasses import dataclass
+from http.cookiejar import http2time
+from http.cookies import Morsel
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlsplit
 
-from requests import Session
+from aiohttp import (
+    ClientConnectionError,
+    ClientError,
+    ClientSession,
+    ClientTimeout,
+    CookieJar,
+    TCPConnector,
+)
+from requests import HTTPError, Session
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import RequestException, Timeout
+from requests.adapters import HTTPAdapter
+from requests.cookies import remove_cookie_by_name
 from requests.models import Response
 from requests.sessions import RequestsCookieJar
-from requests.utils import cookiejar_from_dict, dict_from_cookiejar
+from requests.utils import cookiejar_from_dict, dict_from_cookiejar, select_proxy
 
+import librus_apix.deadline as deadlines
 import librus_apix.urls as urls
-from librus_apix.exceptions import AuthorizationError, MaintananceError, TokenKeyError
+from librus_apix.cache import (
+    CachedResponse,
+    CachePolicy,
+    CacheRule,
+    ResponseCache,
+    cache_key,
+    default_cache_policy,
+)
+from librus_apix.concurrency import AdaptiveLimit, token_rejected
+from librus_apix.compression import (
+    ACCEPT_ENCODING,
+    ASYNC_ACCEPT_ENCODING,
+    TransferStats,
+    decode_body,
+)
+from librus_apix.exceptions import (
+    ArgumentError,
+    AuthorizationError,
+    MaintananceError,
+    TokenKeyError,
+)
+from librus_apix.hedge import HedgePolicy
+from librus_apix.proxies import ProxyPool
+from librus_apix.ratelimit import RateLimiter, limiter_key
+from librus_apix.retry import CircuitBreaker, RetryPolicy
+from librus_apix.singleflight import AsyncSingleFlight, SingleFlight
+
+# (username, password), or a callback returning them when a login is needed
+Credentials = Union[Tuple[str, str], Callable[[], Tuple[str, str]]]
+
+
+def _resolve_credentials(credentials: Credentials) -> Tuple[str, str]:
+    return credentials() if callable(credentials) else credentials
+
+
+# how long an oauth token is assumed to be valid when Librus doesn't say
+OAUTH_LIFETIME = 600.0
+# how long before its expiry an oauth token is refreshed in the background
+OAUTH_REFRESH_AHEAD = 60.0
 
 
 class Token:
@@ -42,8 +137,14 @@ class Token:
         API_Key (str): The combined API key.
         csrf_token (str): CSRF token for the session.
         oauth (str): OAuth token for the session.
+        oauth_obtained (float): The `time.time()` the oauth token was obtained at, 0 if unknown.
+        oauth_lifetime (float): Seconds the oauth token is valid for after it was obtained.
 
     Methods:
+        set_oauth(oauth: str, lifetime: Optional[float] = None) -> None:
+            Stores a freshly obtained oauth token.
+        oauth_expires_in -> float:
+            Seconds until the oauth token expires.
         _parse_api_key(API_Key: str) -> dict:
             Parses the API key and returns a dictionary with the tokens used for cookies.
         Raises:
@@ -74,6 +175,8 @@ class Token:
         self.API_Key = key
         self.csrf_token = ""
         self.oauth = ""
+        self.oauth_obtained = 0.0
+        self.oauth_lifetime = OAUTH_LIFETIME
 
     def __repr__(self) -> str:
         """
@@ -84,6 +187,31 @@ class Token:
         """
         return self.API_Key
 
+    def set_oauth(self, oauth: str, lifetime: Optional[float] = None) -> None:
+        """
+        Stores a freshly obtained oauth token.
+
+        Args:
+            oauth (str): The oauth token.
+            lifetime (float, optional): Seconds it is valid for. Defaults to OAUTH_LIFETIME.
+        """
+        self.oauth = oauth
+        self.oauth_obtained = time.time()
+        self.oauth_lifetime = OAUTH_LIFETIME if lifetime is None else lifetime
+
+    @property
+    def oauth_expires_in(self) -> float:
+        """
+        Seconds until the oauth token expires.
+
+        0 without an oauth token, infinity for one of unknown age, e.g. assigned to `oauth` directly.
+        """
+        if not self.oauth:
+            return 0.0
+        if not self.oauth_obtained:
+            return math.inf
+        return self.oauth_obtained + self.oauth_lifetime - time.time()
+
     def _parse_api_key(self, API_Key: str) -> dict:
         """
         Parses the API Key string into a dictionary.
@@ -116,10 +244,82 @@ class Token:
         return cookiejar_from_dict(self._parse_api_key(self.API_Key))
 
 
+class _LockedCookieJar(RequestsCookieJar):
+    """
+    A RequestsCookieJar that can be iterated while other threads store cookies.
+
+    CookieJar guards writes with `_cookies_lock` but iterates its dict unlocked, which
+    raises "dictionary changed size during iteration" when a response sets a cookie
+    while another request is copying the jar.
+    """
+
+    def __iter__(self):
+        with self._cookies_lock:
+            return iter(list(super().__iter__()))
+
+
+@dataclass(frozen=True)
+class FetchRequest:
+    """
+    A single request of a `fetch_many` batch.
+
+    Attributes:
+        url (str): The URL to request.
+        method (str): "GET" or "POST". Defaults to "GET".
+        data (Dict[str, Any], optional): Form data of a POST request.
+    """
+
+    url: str
+    method: str = "GET"
+    data: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class FetchResult:
+    """
+    The outcome of a single request of a `fetch_many` batch.
+
+    Exactly one of `response` and `error` is set.
+
+    Attributes:
+        request (FetchRequest): The request this result belongs to.
+        response (Response | AsyncResponse, optional): The response, if the request completed.
+        error (Exception, optional): The exception the request raised, if any.
+    """
+
+    request: FetchRequest
+    response: Optional[Any] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _as_fetch_request(request: Union[str, FetchRequest]) -> FetchRequest:
+    return FetchRequest(request) if isinstance(request, str) else request
+
+
+def _cookie_expires(morsel: Morsel) -> Optional[float]:
+    # Max-Age wins over Expires, as in the cookie jar of the sync client
+    if morsel["max-age"]:
+        try:
+            return time.time() + int(morsel["max-age"])
+        except ValueError:
+            return None
+    return http2time(morsel["expires"]) if morsel["expires"] else None
+
+
 class Client:
     """
     A class to handle HTTP operations using the tokens.
 
+    A Client can be shared between threads, e.g. by a ThreadPoolExecutor fanning out
+    timetable weeks or message pages. Headers are set on the session once, the token
+    cookies are applied once per token change and cookie jar access is locked, so
+    concurrent calls only share the connection pool. Size `pool_maxsize` to the number
+    of threads to keep every connection alive.
+
     Attributes:
         token (Token): The Token object containing the API key and tokens.
         proxy (dict): The proxy settings for the session.
@@ -141,16 +341,38 @@ class Client:
         RECIPIENTS_URL (str): The URL for recipients.
         RECIPIENT_GROUPS_URL (str): The URL for recipient groups.
         INDEX_URL (str): Url for student index
-        cookies (RequestsCookieJar): additional cookies
+        cookies (RequestsCookieJar): The session cookie jar, holding the extra cookies, the token cookies and cookies set by the server.
+        keep_alive (bool): Whether connections are kept open and reused between calls.
+        transfer_stats (TransferStats): Wire and decoded byte counters of the received responses.
+        cache (ResponseCache | None): The cache rarely changing pages are served from, if any.
+        cache_policy (CachePolicy): The rules deciding which requests are cached and for how long.
+        single_flight (SingleFlight | None): Shares one call between identical concurrent GETs and scraper calls.
+        rate_limiter (RateLimiter | None): Throttles requests per host and proxy, if set.
+        retry_policy (RetryPolicy | None): Retries failed GETs with jittered backoff, if set.
+        circuit_breaker (CircuitBreaker | None): Fails requests fast while Librus is down, if set.
+        timeout (float | Tuple[float, float] | None): The connect and read timeout of every request.
+        proxy_pool (ProxyPool | None): Spreads requests over healthy proxies in place of `proxy`, if set.
+        credentials (Credentials | None): Logs in again when the token is rejected, if set.
+        reauthentications (int): The logins made after the token was rejected.
+        on_reauth (Callable[[Token], None] | None): Called with the new token after every
+            such login, e.g. to store it.
         _session (Session): The requests session for making HTTP calls.
 
     Methods:
         refresh_oauth() -> str:
             Refreshes the OAuth token then returns it.
+        ensure_oauth(rejected: Optional[str] = None, refresh_ahead: float = OAUTH_REFRESH_AHEAD) -> str:
+            Returns a valid OAuth token, refreshing it only when it expired or was rejected.
         post(url: str, data: Dict[str, str]) -> Response:
             Makes a POST request to the specified URL with the given data.
         get(url: str) -> Response:
             Makes a GET request to the specified URL.
+        fetch_many(requests: Iterable[Union[str, FetchRequest]], max_concurrency: Union[int, AdaptiveLimit] = 8, deadline: Optional[float] = None) -> List[FetchResult]:
+            Runs a batch of requests concurrently, keeping the input order.
+        reauthenticate(stale_key: Optional[str] = None) -> Token:
+            Logs in again with the client's credentials, once for all concurrent callers.
+        close() -> None:
+            Closes all pooled connections.
     """
 
     def __init__(
@@ -177,7 +399,19 @@ class Client:
         refresh_oauth_url: str = urls.REFRESH_OAUTH_URL,
         index_url: str = urls.INDEX_URL,
         proxy: Dict[str, str] = {},
-        extra_cookies: RequestsCookieJar = RequestsCookieJar(),
+        extra_cookies: Optional[RequestsCookieJar] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        cache: Optional[ResponseCache] = None,
+        cache_policy: Optional[CachePolicy] = None,
+        coalesce: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeout: Optional[deadlines.Timeout] = (10.0, 30.0),
+        proxy_pool: Optional[ProxyPool] = None,
+        credentials: Optional[Credentials] = None,
     ):
         self.token = token
         self.proxy = proxy
@@ -201,8 +435,37 @@ class Client:
         self.RECIPIENT_GROUPS_URL = recipient_groups_url
         self.REFRESH_URL = refresh_oauth_url
         self.INDEX_URL = index_url
-        self.cookies = extra_cookies
+        self.cookies: RequestsCookieJar = _LockedCookieJar()
+        if extra_cookies is not None:
+            self.cookies.update(extra_cookies)
+        self.keep_alive = keep_alive
+        self.transfer_stats = TransferStats()
+        self.cache = cache
+        self.cache_policy = (
+            cache_policy if cache_policy is not None else default_cache_policy(self)
+        )
+        self.single_flight = SingleFlight() if coalesce else None
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.timeout = timeout
+        self.proxy_pool = proxy_pool
+        self.credentials = credentials
+        self.reauthentications = 0
+        self.on_reauth: Optional[Callable[[Token], None]] = None
+        self._logins = SingleFlight()
+        self._oauth_refresher: Optional[threading.Thread] = None
+        self._headers = {**urls.HEADERS, "Accept-Encoding": ACCEPT_ENCODING}
         self._session = Session()
+        self._session.headers = self._headers
+        self._session.cookies = self.cookies
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._state_lock = threading.Lock()
+        self._applied_key: Optional[str] = None
         """
         Initializes a new instance of Client.
 
@@ -227,8 +490,79 @@ class Client:
             gateway_api_attendance (str, optional): The URL of the gateway API attendance endpoint. Defaults to urls.GATEWAY_API_ATTENDANCE.
             refresh_oauth_url (str, optional): The URL of the refresh OAuth endpoint. Defaults to urls.REFRESH_OAUTH_URL.
             proxy (Dict[str, str], optional): A dictionary containing proxy settings. Defaults to an empty dictionary.
+            extra_cookies (RequestsCookieJar, optional): Additional cookies sent with every request, copied into `cookies`.
+            pool_connections (int, optional): The number of hosts to keep connection pools for. Defaults to 10.
+            pool_maxsize (int, optional): The maximum number of kept-alive connections per host. Defaults to 10.
+            keep_alive (bool, optional): Reuse connections between calls. If False every call
+                closes its connections like a fresh session would. Defaults to True.
+            cache (ResponseCache, optional): A cache to serve rarely changing pages from. Defaults to None.
+            cache_policy (CachePolicy, optional): Which requests are cached and for how long.
+                Defaults to `default_cache_policy` for this client's URLs.
+            coalesce (bool, optional): Let identical concurrent GETs and scraper calls share one
+                request, see `librus_apix.singleflight`. Defaults to True.
+            rate_limiter (RateLimiter, optional): Throttles requests per host and proxy, see
+                `librus_apix.ratelimit`. Share one between clients to share the budget. Defaults to None.
+            retry_policy (RetryPolicy, optional): Retries failed GETs, see `librus_apix.retry`. Defaults to None.
+            circuit_breaker (CircuitBreaker, optional): Fails requests fast while Librus is in
+                maintenance or blocking, see `librus_apix.retry`. Defaults to None.
+            timeout (float | Tuple[float, float], optional): The (connect, read) timeout of every
+                request in seconds, capped by the current `librus_apix.deadline`. None waits forever.
+                Defaults to (10, 30).
+            proxy_pool (ProxyPool, optional): Sends every request through a healthy proxy of the pool
+                instead of `proxy`, see `librus_apix.proxies`. Defaults to None.
+            credentials (Credentials, optional): A (username, password) pair or a callback returning
+                one. When a response is the "Brak dostępu" page, the client logs in again once,
+                shared by every request that was rejected meanwhile, and replays the request.
+                Defaults to None.
          """
 
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes all pooled connections.
+
+        The client stays usable afterwards, new connections are opened on demand.
+        """
+        self._session.close()
+
+    def _release(self) -> None:
+        if not self.keep_alive:
+            self._session.close()
+
+    def _throttle(self, url: str, proxies: Dict[str, str]) -> None:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(limiter_key(url, select_proxy(url, proxies)))
+
+    def _proxies(self) -> Dict[str, str]:
+        """Returns the proxy settings of the next request, from the pool if there is one."""
+        if self.proxy_pool is None:
+            return self.proxy
+        proxy = self.proxy_pool.choose()
+        return {"http": proxy, "https": proxy}
+
+    def _session_for_request(self) -> Session:
+        """
+        Returns the session after bringing it up to date with the client state.
+
+        The token cookies are only written when the token changed since the last call, and
+        a reassigned `cookies` jar is picked up, so steady-state calls do not mutate shared state.
+        """
+        s = self._session
+        with self._state_lock:
+            if s.cookies is not self.cookies:
+                s.cookies = self.cookies
+                self._applied_key = None
+            key = self.token.API_Key
+            if key != self._applied_key:
+                self.cookies.update(self.token.access_cookies())
+                self._applied_key = key
+        return s
+
     def get_token(
         self,
         username: str,
@@ -248,29 +582,64 @@ class Client:
             MaintananceError: If the API returns a maintenance status code or message.
             AuthorizationError: If there is an error during the authorization process.
         """
-        with self._session as s:
-            s.headers = urls.HEADERS
-            maint_check = s.get(self.API_URL, proxies=self.proxy)
+        s = self._session
+        with self._state_lock:
+            # the cookies of the old token would shadow the ones set by the login
+            for name in ("DZIENNIKSID", "SDZIENNIKSID"):
+                remove_cookie_by_name(self.cookies, name)
+            # put back by the next request if the login fails
+            self._applied_key = None
+        breaker = self.circuit_breaker
+        probe = False
+        try:
+            if breaker is not None:
+                probe = breaker.before_request()
+            # the whole login goes through one proxy
+            proxies = self._proxies()
+            self._throttle(self.API_URL, proxies)
+            try:
+                maint_check = s.get(
+                    self.API_URL,
+                    proxies=proxies,
+                    timeout=deadlines.request_timeout(self.timeout),
+                )
+            except RequestException as e:
+                if breaker is not None:
+                    probe = False
+                    breaker.record_failure(type(e).__name__)
+                raise
+            if breaker is not None:
+                probe = False
+                breaker.record(maint_check)
             if maint_check.status_code == 503:
                 message_list = maint_check.json().get("Message")
                 if not message_list:
                     # during recent maintenance there were no messages (empty list)
                     raise MaintananceError("maintenance")
                 raise MaintananceError(message_list[0]["description"])
+            self._throttle(self.API_URL, proxies)
             s.get(
                 self.API_URL
                 + "/OAuth/Authorization?client_id=46&response_type=code&scope=mydata",
-                proxies=self.proxy,
+                proxies=proxies,
+                timeout=deadlines.request_timeout(self.timeout),
             )
+            self._throttle(self.API_URL, proxies)
             response = s.post(
                 self.API_URL + "/OAuth/Authorization?client_id=46",
                 data={"action": "login", "login": username, "pass": password},
-                proxies=self.proxy,
+                proxies=proxies,
+                timeout=deadlines.request_timeout(self.timeout),
             )
             if response.json()["status"] == "error":
                 raise AuthorizationError(response.json()["errors"][0]["message"])
 
-            s.get(self.API_URL + response.json().get("goTo"), proxies=self.proxy)
+            self._throttle(self.API_URL, proxies)
+            s.get(
+                self.API_URL + response.json().get("goTo"),
+                proxies=proxies,
+                timeout=deadlines.request_timeout(self.timeout),
+            )
 
             cookies: Dict = dict_from_cookiejar(s.cookies)
             dzienniks = cookies.get("DZIENNIKSID")
@@ -281,6 +650,11 @@ class Client:
             token = Token(dzienniks=dzienniks, sdzienniks=sdzienniks)
             self.token = token
             return token
+        finally:
+            if probe:
+                # failed before Librus answered, e.g. on the deadline or the proxy pool
+                breaker.release_probe()
+            self._release()
 
     def refresh_oauth(self) -> str:
         """
@@ -292,19 +666,80 @@ class Client:
         Raises:
             AuthorizationError: If the token cannot be refreshed.
         """
-        self.cookies.update(self.token.access_cookies())
-        with self._session as s:
-            s.headers = urls.HEADERS
-            s.cookies = self.cookies
-            response: Response = s.get(self.REFRESH_URL, proxies=self.proxy)
-            if response.status_code == 200:
-                oauth = response.cookies.get("oauth_token")
-                self.token.oauth = oauth
-                return oauth
+        s = self._session_for_request()
+        proxies = self._proxies()
+        self._throttle(self.REFRESH_URL, proxies)
+        try:
+            response: Response = s.get(
+                self.REFRESH_URL,
+                proxies=proxies,
+                timeout=deadlines.request_timeout(self.timeout),
+            )
+        finally:
+            self._release()
+        self.transfer_stats.record(response)
+        if response.status_code == 200:
+            oauth = response.cookies.get("oauth_token")
+            lifetime = None
+            for cookie in response.cookies:
+                if cookie.name == "oauth_token" and cookie.expires:
+                    lifetime = cookie.expires - time.time()
+            self.token.set_oauth(oauth, lifetime)
+            return oauth
         raise AuthorizationError(
             f"Error while refreshing oauth token {response.content}"
         )
 
+    def ensure_oauth(
+        self,
+        rejected: Optional[str] = None,
+        refresh_ahead: float = OAUTH_REFRESH_AHEAD,
+    ) -> str:
+        """
+        Returns a valid oauth token, refreshing it only when needed.
+
+        An expired or `rejected` token is refreshed once for all concurrent callers. A token
+        expiring within `refresh_ahead` seconds is still returned and refreshed in the background.
+        The token is also set as the `oauth_token` cookie the gateway API expects.
+
+        Args:
+            rejected (str, optional): An oauth token the gateway API refused. Defaults to None.
+            refresh_ahead (float, optional): Seconds before expiry to refresh in the background.
+                Defaults to OAUTH_REFRESH_AHEAD.
+
+        Returns:
+            str: The oauth token.
+
+        Raises:
+            AuthorizationError: If the token cannot be refreshed.
+        """
+        token = self.token
+        oauth = token.oauth
+        if token.oauth_expires_in <= 0 or (rejected is not None and oauth == rejected):
+            oauth = self._logins.do(("oauth", oauth), lambda: self._refresh_oauth(oauth))
+        elif token.oauth_expires_in <= refresh_ahead:
+            self._refresh_oauth_in_background(oauth)
+        self.cookies["oauth_token"] = oauth
+        return oauth
+
+    def _refresh_oauth(self, stale: str) -> str:
+        if self.token.oauth != stale:
+            return self.token.oauth
+        return self.refresh_oauth()
+
+    def _refresh_oauth_in_background(self, stale: str) -> None:
+        def refresh() -> None:
+            try:
+                self._logins.do(("oauth", stale), lambda: self._refresh_oauth(stale))
+            except Exception:
+                pass  # the next call past the expiry refreshes and reports the error
+
+        with self._state_lock:
+            if self._oauth_refresher is not None and self._oauth_refresher.is_alive():
+                return
+            self._oauth_refresher = threading.Thread(target=refresh, daemon=True)
+            self._oauth_refresher.start()
+
     def post(self, url: str, data: Dict[str, str]) -> Response:
         """
         Makes a POST request to the specified URL with the given data.
@@ -316,12 +751,7 @@ class Client:
         Returns:
             Response: The response from the server.
         """
-        self.cookies.update(self.token.access_cookies())
-        with self._session as s:
-            s.headers = urls.HEADERS
-            s.cookies = self.cookies
-            response: Response = s.post(url, data=data, proxies=self.proxy)
-            return response
+        return self._authorized(lambda: self._request("POST", url, data))
 
     def get(self, url: str) -> Response:
         """
@@ -333,12 +763,248 @@ class Client:
         Returns:
             Response: The response from the server.
         """
-        self.cookies.update(self.token.access_cookies())
-        with self._session as s:
-            s.headers = urls.HEADERS
-            s.cookies = self.cookies
-            response: Response = s.get(url, proxies=self.proxy)
+        return self._authorized(lambda: self._request("GET", url))
+
+    @contextmanager
+    def stream(
+        self, method: str, url: str, data: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Response]:
+        """
+        Sends a request and hands over its response before the body is read.
+
+        The body can then be parsed while it downloads, through `response.iter_content`.
+        Streamed requests go through the rate limiter, proxies, circuit breaker, retries and
+        the current deadline like any other, but they are never cached, shared between
+        callers or replayed after a login, and are left out of `transfer_stats`.
+
+        Args:
+            method (str): "GET" or "POST".
+            url (str): The URL to send the request to.
+            data (Dict[str, Any], optional): The form data of a POST request.
+
+        Yields:
+            Response: The response, closed when the block exits.
+        """
+        response = self._send(method, url, data, None, stream=True)
+        try:
+            yield response
+        finally:
+            response.close()
+            self._release()
+
+    def _authorized(self, send: Callable[[], Response]) -> Response:
+        """Sends a request, logging in again and replaying it once if the token was rejected."""
+        stale = self.token.API_Key
+        response = send()
+        if self.credentials is None or not token_rejected(response.content):
             return response
+        self.reauthenticate(stale)
+        return send()
+
+    def reauthenticate(self, stale_key: Optional[str] = None) -> Token:
+        """
+        Logs in again with `credentials`, once for all callers holding the same stale token.
+
+        Concurrent callers wait for the login in flight and share its token or exception; a
+        caller whose stale token was already replaced gets the current token without a login.
+
+        Args:
+            stale_key (str, optional): The API key that was rejected. Defaults to the current one.
+
+        Returns:
+            Token: The new token.
+
+        Raises:
+            ArgumentError: If the client has no credentials.
+            MaintananceError: If Librus is under maintenance.
+            AuthorizationError: If the login fails.
+        """
+        if self.credentials is None:
+            raise ArgumentError("The client has no credentials to log in with")
+        stale = self.token.API_Key if stale_key is None else stale_key
+        return self._logins.do(stale, lambda: self._login(stale))
+
+    def _login(self, stale: str) -> Token:
+        if self.token.API_Key != stale:
+            return self.token
+        token = self.get_token(*_resolve_credentials(self.credentials))
+        self.reauthentications += 1
+        if self.on_reauth is not None:
+            self.on_reauth(token)
+        return token
+
+    def _cache_rule(
+        self, method: str, url: str, data: Optional[Dict[str, Any]]
+    ) -> Optional[CacheRule]:
+        if self.cache is None:
+            return None
+        return self.cache_policy.match(method, url, data)
+
+    def _request(
+        self, method: str, url: str, data: Optional[Dict[str, Any]] = None
+    ) -> Response:
+        rule = self._cache_rule(method, url, data)
+        if rule is not None:
+            key = cache_key(method, url, data, self.token.API_Key)
+            cached = self.cache.get(key, rule.name)
+            if cached is not None:
+                return cached.to_response()
+        if method == "GET" and self.single_flight is not None:
+            # POSTs may have side effects, e.g. sending a message, and are never shared
+            return self.single_flight.do(
+                (method, url, self.token.API_Key),
+                lambda: self._send(method, url, data, rule),
+            )
+        return self._send(method, url, data, rule)
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict[str, Any]],
+        rule: Optional[CacheRule],
+        stream: bool = False,
+    ) -> Response:
+        s = self._session_for_request()
+        breaker = self.circuit_breaker
+        attempt = 0
+        while True:
+            probe = breaker is not None and breaker.before_request()
+            try:
+                proxies = self._proxies()
+                self._throttle(url, proxies)
+                timeout = deadlines.request_timeout(self.timeout)
+                started = time.monotonic()
+                response: Response = s.request(
+                    method,
+                    url,
+                    data=data,
+                    proxies=proxies,
+                    timeout=timeout,
+                    stream=stream,
+                )
+            except (RequestsConnectionError, Timeout) as e:
+                if self.proxy_pool is not None:
+                    self.proxy_pool.record(proxies["https"], started, error=e)
+                if breaker is not None:
+                    breaker.record_failure(type(e).__name__)
+                delay = self._retry_delay(method, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except RequestException as e:
+                # e.g. a broken body
+                if breaker is not None:
+                    breaker.record_failure(type(e).__name__)
+                raise
+            except BaseException:
+                # failed before reaching Librus, e.g. on the deadline or the proxy pool
+                if probe:
+                    breaker.release_probe()
+                raise
+            finally:
+                # a streamed response holds its connection until `stream` closes it
+                if not stream:
+                    self._release()
+            if breaker is not None:
+                breaker.record(response, self.retry_policy)
+            if self.proxy_pool is not None:
+                self.proxy_pool.record(
+                    proxies["https"], started, response, read_body=not stream
+                )
+            if not stream:
+                self.transfer_stats.record(response)
+            delay = self._retry_delay(method, attempt, response)
+            if delay is None:
+                break
+            if stream:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+        if (
+            rule is not None
+            and response.status_code == 200
+            and not token_rejected(response.content)
+        ):
+            key = cache_key(method, url, data, self.token.API_Key)
+            self.cache.set(key, CachedResponse.from_response(response, rule.ttl))
+        return response
+
+    def _retry_delay(
+        self, method: str, attempt: int, response: Optional[Any] = None
+    ) -> Optional[float]:
+        """Returns how long to wait before retrying a failed attempt, None to give up."""
+        policy = self.retry_policy
+        if policy is None or not policy.retries(method, attempt):
+            return None
+        if response is not None and not policy.retryable(response):
+            return None
+        # once the breaker opened, further attempts would only be refused
+        breaker = self.circuit_breaker
+        if breaker is not None and breaker.state != CircuitBreaker.CLOSED:
+            return None
+        delay = policy.delay(attempt, response)
+        return delay if deadlines.allows_wait(delay) else None
+
+    def _fetch(
+        self, request: FetchRequest, limit: Optional[AdaptiveLimit] = None
+    ) -> FetchResult:
+        token = limit.acquire() if limit is not None else 0
+        started = time.monotonic()
+        result = FetchResult(request)
+        try:
+            if request.method.upper() == "POST":
+                result.response = self.post(request.url, data=request.data or {})
+            else:
+                result.response = self.get(request.url)
+        except Exception as e:
+            result.error = e
+        finally:
+            if limit is not None:
+                limit.release(token, started, result.response, result.error)
+        return result
+
+    def fetch_many(
+        self,
+        requests: Iterable[Union[str, FetchRequest]],
+        max_concurrency: Union[int, AdaptiveLimit] = 8,
+        deadline: Optional[float] = None,
+    ) -> List[FetchResult]:
+        """
+        Runs a batch of requests concurrently on a thread pool.
+
+        A failing request does not abort the batch, its exception is reported in its result.
+        Keep `max_concurrency` at or below `pool_maxsize`, otherwise the extra connections are
+        opened and discarded for every request. An AdaptiveLimit adapts the concurrency to
+        Librus' response times and overload signals instead, see `librus_apix.concurrency`.
+
+        The worker threads inherit the caller's `librus_apix.deadline`. Once it has passed,
+        requests that did not start yet fail with DeadlineExceededError.
+
+        Args:
+            requests (Iterable[Union[str, FetchRequest]]): The requests; plain strings are GET URLs.
+            max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight.
+                Defaults to 8.
+            deadline (float, optional): Seconds the whole batch may take. Defaults to None.
+
+        Returns:
+            List[FetchResult]: One result per request, in input order.
+        """
+        batch = [_as_fetch_request(request) for request in requests]
+        if not batch:
+            return []
+        limit = max_concurrency if isinstance(max_concurrency, AdaptiveLimit) else None
+        workers = limit.max_limit if limit is not None else max_concurrency
+        scope = deadlines.deadline(deadline) if deadline is not None else nullcontext()
+        with scope, ThreadPoolExecutor(min(workers, len(batch))) as executor:
+            # every task runs in its own copy of the caller's context
+            futures = [
+                executor.submit(copy_context().run, self._fetch, request, limit)
+                for request in batch
+            ]
+            return [future.result() for future in futures]
 
 
 def new_client(
@@ -364,6 +1030,18 @@ def new_client(
     refresh_oauth_url: str = urls.REFRESH_OAUTH_URL,
     index_url: str = urls.INDEX_URL,
     proxy: dict[str, str] = {},
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    keep_alive: bool = True,
+    cache: Optional[ResponseCache] = None,
+    cache_policy: Optional[CachePolicy] = None,
+    coalesce: bool = True,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    timeout: Optional[deadlines.Timeout] = (10.0, 30.0),
+    proxy_pool: Optional[ProxyPool] = None,
+    credentials: Optional[Credentials] = None,
 ):
     """
     Creates a new instance of the Client class.
@@ -390,6 +1068,18 @@ def new_client(
         refresh_oauth_url (str, optional): The URL of the refresh OAuth endpoint. Defaults to urls.REFRESH_OAUTH_URL.
         index_url (str, optional): The url for student index
         proxy (dict[str, str], optional): A dictionary containing proxy settings. Defaults to an empty dictionary.
+        pool_connections (int, optional): The number of hosts to keep connection pools for. Defaults to 10.
+        pool_maxsize (int, optional): The maximum number of kept-alive connections per host. Defaults to 10.
+        keep_alive (bool, optional): Reuse connections between calls. Defaults to True.
+        cache (ResponseCache, optional): A cache to serve rarely changing pages from. Defaults to None.
+        cache_policy (CachePolicy, optional): Which requests are cached and for how long. Defaults to `default_cache_policy`.
+        coalesce (bool, optional): Let identical concurrent GETs and scraper calls share one request. Defaults to True.
+        rate_limiter (RateLimiter, optional): Throttles requests per host and proxy. Defaults to None.
+        retry_policy (RetryPolicy, optional): Retries failed GETs with jittered backoff. Defaults to None.
+        circuit_breaker (CircuitBreaker, optional): Fails requests fast while Librus is down. Defaults to None.
+        timeout (float | Tuple[float, float], optional): The (connect, read) timeout of every request. Defaults to (10, 30).
+        proxy_pool (ProxyPool, optional): Spreads requests over the healthy proxies of a pool. Defaults to None.
+        credentials (Credentials, optional): Logs in again and replays requests rejected with an expired token. Defaults to None.
 
     Returns:
         Client: A new instance of the Client class.
@@ -419,4 +1109,911 @@ def new_client(
         refresh_oauth_url,
         index_url,
         proxy,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        keep_alive=keep_alive,
+        cache=cache,
+        cache_policy=cache_policy,
+        coalesce=coalesce,
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        circuit_breaker=circuit_breaker,
+        timeout=timeout,
+        proxy_pool=proxy_pool,
+        credentials=credentials,
+    )
+
+
+class AsyncResponse:
+    """
+    A fully read response returned by AsyncClient.
+
+    It mirrors the parts of `requests.Response` the scrapers rely on, so the same parsing code works for both clients.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        url (str): The final URL of the response.
+        headers (Dict[str, str]): The response headers.
+        cookies (Dict[str, str]): Cookies set by the response.
+        content (bytes): The response body, decoded from its Content-Encoding.
+        encoding (str | None): The charset declared by the server, if any.
+        wire_bytes (int): The size of the body as received on the wire.
+        cookie_expires (Dict[str, float]): The `time.time()` at which each cookie
+            declaring an expiry runs out.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        url: str,
+        headers: Dict[str, str],
+        cookies: Dict[str, str],
+        content: bytes,
+        encoding: Optional[str] = None,
+        wire_bytes: Optional[int] = None,
+        cookie_expires: Optional[Dict[str, float]] = None,
+    ):
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers
+        self.cookies = cookies
+        self.content = content
+        self.encoding = encoding
+        self.wire_bytes = len(content) if wire_bytes is None else wire_bytes
+        self.cookie_expires = cookie_expires or {}
+
+    def __repr__(self) -> str:
+        return f"<AsyncResponse [{self.status_code}]>"
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class AsyncClient:
+    """
+    An asyncio counterpart of Client built on a single long-lived aiohttp session.
+
+    The session is created lazily inside the running event loop and has to be closed with
+    `await client.close()` or by using the client as an async context manager.
+
+    Attributes:
+        token (Token): The Token object containing the API key and tokens.
+        proxy (dict): The proxy settings, picked per request by URL scheme.
+        cookies (Dict[str, str]): additional cookies
+        limit (int): The maximum number of open connections.
+        limit_per_host (int): The maximum number of open connections per host.
+        transfer_stats (TransferStats): Wire and decoded byte counters of the received responses.
+        cache (ResponseCache | None): The cache rarely changing pages are served from, if any.
+        cache_policy (CachePolicy): The rules deciding which requests are cached and for how long.
+        single_flight (AsyncSingleFlight | None): Shares one call between identical concurrent GETs and scraper calls.
+        rate_limiter (RateLimiter | None): Throttles requests per host and proxy, if set.
+        retry_policy (RetryPolicy | None): Retries failed GETs with jittered backoff, if set.
+        circuit_breaker (CircuitBreaker | None): Fails requests fast while Librus is down, if set.
+        timeout (float | Tuple[float, float] | None): The connect and read timeout of every request.
+        hedge_policy (HedgePolicy | None): Re-sends slow GETs to cut tail latency, if set.
+        proxy_pool (ProxyPool | None): Spreads requests over healthy proxies in place of `proxy`, if set.
+        credentials (Credentials | None): Logs in again when the token is rejected, if set.
+        reauthentications (int): The logins made after the token was rejected.
+        on_reauth (Callable[[Token], None] | None): Called with the new token after every
+            such login, e.g. to store it.
+        *_URL (str): The same endpoint attributes as in Client.
+
+    Methods:
+        get_token(username: str, password: str) -> Token:
+            Logs in and returns a new Token.
+        refresh_oauth() -> str:
+            Refreshes the OAuth token then returns it.
+        ensure_oauth(rejected: Optional[str] = None, refresh_ahead: float = OAUTH_REFRESH_AHEAD) -> str:
+            Returns a valid OAuth token, refreshing it only when it expired or was rejected.
+        post(url: str, data: Dict[str, str]) -> AsyncResponse:
+            Makes a POST request to the specified URL with the given data.
+        get(url: str) -> AsyncResponse:
+            Makes a GET request to the specified URL.
+        fetch_many(requests: Iterable[Union[str, FetchRequest]], max_concurrency: Union[int, AdaptiveLimit] = 8, deadline: Optional[float] = None) -> List[FetchResult]:
+            Runs a batch of requests concurrently, keeping the input order.
+        reauthenticate(stale_key: Optional[str] = None) -> Token:
+            Logs in again with the client's credentials, once for all concurrent callers.
+        close() -> None:
+            Closes the underlying aiohttp session.
+    """
+
+    def __init__(
+        self,
+        token: Token,
+        base_url: str = urls.BASE_URL,
+        api_url: str = urls.API_URL,
+        grades_url: str = urls.GRADES_URL,
+        timetable_url: str = urls.TIMETABLE_URL,
+        announcements_url: str = urls.ANNOUNCEMENTS_URL,
+        message_url: str = urls.MESSAGE_URL,
+        send_message_url: str = urls.SEND_MESSAGE_URL,
+        attendance_url: str = urls.ATTENDANCE_URL,
+        attendance_details_url: str = urls.ATTENDANCE_DETAILS_URL,
+        schedule_url: str = urls.SCHEDULE_URL,
+        recent_schedule_url: str = urls.RECENT_SCHEDULE_URL,
+        homework_url: str = urls.HOMEWORK_URL,
+        homework_details_url: str = urls.HOMEWORK_DETAILS_URL,
+        info_url: str = urls.INFO_URL,
+        recipients_url: str = urls.RECIPIENTS_URL,
+        recipient_groups_url: str = urls.RECIPIENT_GROUPS_URL,
+        completed_lessons_url: str = urls.COMPLETED_LESSONS_URL,
+        gateway_api_attendance: str = urls.GATEWAY_API_ATTENDANCE,
+        refresh_oauth_url: str = urls.REFRESH_OAUTH_URL,
+        index_url: str = urls.INDEX_URL,
+        proxy: Optional[Dict[str, str]] = None,
+        extra_cookies: Optional[Dict[str, str]] = None,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        cache: Optional[ResponseCache] = None,
+        cache_policy: Optional[CachePolicy] = None,
+        coalesce: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeout: Optional[deadlines.Timeout] = (10.0, 30.0),
+        hedge_policy: Optional[HedgePolicy] = None,
+        proxy_pool: Optional[ProxyPool] = None,
+        credentials: Optional[Credentials] = None,
+    ):
+        """
+        Initializes a new instance of AsyncClient.
+
+        Args:
+            token (Token): The authentication token required for API access.
+            base_url ... index_url (str, optional): Endpoint overrides, see Client.
+            proxy (Dict[str, str], optional): Proxy settings in the requests format ({"https": "http://..."}).
+            extra_cookies (Dict[str, str], optional): Additional cookies sent with every request.
+            limit (int, optional): The maximum number of open connections. Defaults to 100.
+            limit_per_host (int, optional): The maximum number of open connections per host. Defaults to 10.
+            cache (ResponseCache, optional): A cache to serve rarely changing pages from. Defaults to None.
+            cache_policy (CachePolicy, optional): Which requests are cached and for how long.
+                Defaults to `default_cache_policy` for this client's URLs.
+            coalesce (bool, optional): Let identical concurrent GETs and scraper calls share one
+                request, see `librus_apix.singleflight`. Defaults to True.
+            rate_limiter (RateLimiter, optional): Throttles requests per host and proxy, see
+                `librus_apix.ratelimit`. Defaults to None.
+            retry_policy (RetryPolicy, optional): Retries failed GETs, see `librus_apix.retry`. Defaults to None.
+            circuit_breaker (CircuitBreaker, optional): Fails requests fast while Librus is in
+                maintenance or blocking, see `librus_apix.retry`. Defaults to None.
+            timeout (float | Tuple[float, float], optional): The (connect, read) timeout of every
+                request in seconds. Inside a `librus_apix.deadline` the whole request is also
+                bounded by the remaining budget. None waits forever. Defaults to (10, 30).
+            hedge_policy (HedgePolicy, optional): Sends a second copy of GETs slower than a latency
+                percentile and uses the first answer, see `librus_apix.hedge`. Defaults to None.
+            proxy_pool (ProxyPool, optional): Sends every request through a healthy proxy of the pool
+                instead of `proxy`, see `librus_apix.proxies`. Defaults to None.
+            credentials (Credentials, optional): Logs in again and replays the request when the
+                token is rejected, see Client. Defaults to None.
+        """
+        self.token = token
+        self.proxy = proxy if proxy is not None else {}
+        self.BASE_URL = base_url
+        self.API_URL = api_url
+        self.GRADES_URL = grades_url
+        self.TIMETABLE_URL = timetable_url
+        self.ANNOUNCEMENTS_URL = announcements_url
+        self.MESSAGE_URL = message_url
+        self.SEND_MESSAGE_URL = send_message_url
+        self.ATTENDANCE_URL = attendance_url
+        self.ATTENDANCE_DETAILS_URL = attendance_details_url
+        self.SCHEDULE_URL = schedule_url
+        self.RECENT_SCHEDULE_URL = recent_schedule_url
+        self.HOMEWORK_URL = homework_url
+        self.HOMEWORK_DETAILS_URL = homework_details_url
+        self.INFO_URL = info_url
+        self.COMPLETED_LESSONS_URL = completed_lessons_url
+        self.GATEWAY_API_ATTENDANCE = gateway_api_attendance
+        self.RECIPIENTS_URL = recipients_url
+        self.RECIPIENT_GROUPS_URL = recipient_groups_url
+        self.REFRESH_URL = refresh_oauth_url
+        self.INDEX_URL = index_url
+        self.cookies: Dict[str, str] = dict(extra_cookies or {})
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.transfer_stats = TransferStats()
+        self.cache = cache
+        self.cache_policy = (
+            cache_policy if cache_policy is not None else default_cache_policy(self)
+        )
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.timeout = timeout
+        self.hedge_policy = hedge_policy
+        self.proxy_pool = proxy_pool
+        self.credentials = credentials
+        self.reauthentications = 0
+        self.on_reauth: Optional[Callable[[Token], None]] = None
+        self._logins = AsyncSingleFlight()
+        self._oauth_refresher: Optional["asyncio.Future[None]"] = None
+        self._session: Optional[ClientSession] = None
+
+    @classmethod
+    def from_client(cls, client: Client, **kwargs) -> "AsyncClient":
+        """
+        Creates an AsyncClient sharing the token, urls, proxy, cookies and cache of a sync Client.
+
+        The credentials and the `on_reauth` hook are shared too, so a login the AsyncClient
+        makes is stored like one of the Client.
+
+        Args:
+            client (Client): The client to copy the settings from.
+            **kwargs: Connection limits or cache settings passed to AsyncClient.
+
+        Returns:
+            AsyncClient: A new, not yet connected AsyncClient.
+        """
+        async_client = cls(
+            client.token,
+            client.BASE_URL,
+            client.API_URL,
+            client.GRADES_URL,
+            client.TIMETABLE_URL,
+            client.ANNOUNCEMENTS_URL,
+            client.MESSAGE_URL,
+            client.SEND_MESSAGE_URL,
+            client.ATTENDANCE_URL,
+            client.ATTENDANCE_DETAILS_URL,
+            client.SCHEDULE_URL,
+            client.RECENT_SCHEDULE_URL,
+            client.HOMEWORK_URL,
+            client.HOMEWORK_DETAILS_URL,
+            client.INFO_URL,
+            client.RECIPIENTS_URL,
+            client.RECIPIENT_GROUPS_URL,
+            client.COMPLETED_LESSONS_URL,
+            client.GATEWAY_API_ATTENDANCE,
+            client.REFRESH_URL,
+            client.INDEX_URL,
+            proxy=dict(client.proxy),
+            extra_cookies=dict_from_cookiejar(client.cookies),
+            **{
+                "cache": client.cache,
+                "cache_policy": client.cache_policy,
+                "coalesce": client.single_flight is not None,
+                "rate_limiter": client.rate_limiter,
+                "retry_policy": client.retry_policy,
+                "circuit_breaker": client.circuit_breaker,
+                "timeout": client.timeout,
+                "proxy_pool": client.proxy_pool,
+                "credentials": client.credentials,
+                **kwargs,
+            },
+        )
+        async_client.on_reauth = client.on_reauth
+        return async_client
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the underlying aiohttp session.
+
+        The client stays usable afterwards, a new session is opened on demand.
+        """
+        if self._oauth_refresher is not None and not self._oauth_refresher.done():
+            self._oauth_refresher.cancel()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(
+                headers={**urls.HEADERS, "Accept-Encoding": ASYNC_ACCEPT_ENCODING},
+                connector=TCPConnector(
+                    limit=self.limit, limit_per_host=self.limit_per_host
+                ),
+                cookie_jar=CookieJar(unsafe=True),
+                # bodies are decoded in _request so their wire size can be counted
+                auto_decompress=False,
+            )
+        return self._session
+
+    def _proxy_for(self, url: str) -> Optional[str]:
+        scheme = urlsplit(url).scheme
+        return self.proxy.get(scheme) or self.proxy.get("all")
+
+    def _request_cookies(self) -> Dict[str, str]:
+        cookies = dict(self.cookies)
+        if self.token.API_Key:
+            cookies.update(self.token._parse_api_key(self.token.API_Key))
+        return cookies
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict[str, Any]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+    ) -> AsyncResponse:
+        rule = self._cache_rule(method, url, data)
+        if rule is not None:
+            key = cache_key(method, url, data, self.token.API_Key)
+            cached = self.cache.get(key, rule.name)
+            if cached is not None:
+                return AsyncResponse(
+                    cached.status_code,
+                    cached.url,
+                    dict(cached.headers),
+                    {},
+                    cached.content,
+                    cached.encoding,
+                )
+        breaker = self.circuit_breaker
+        attempt = 0
+        while True:
+            probe = breaker is not None and breaker.before_request()
+            try:
+                timeout = self._client_timeout()
+                result = await self._send_hedged(method, url, data, cookies, timeout)
+            except (ClientConnectionError, asyncio.TimeoutError) as e:
+                if breaker is not None:
+                    breaker.record_failure(type(e).__name__)
+                delay = self._retry_delay(method, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except ClientError as e:
+                # e.g. a broken body
+                if breaker is not None:
+                    breaker.record_failure(type(e).__name__)
+                raise
+            except BaseException:
+                # failed before reaching Librus or cancelled, e.g. on the deadline
+                if probe:
+                    breaker.release_probe()
+                raise
+            if breaker is not None:
+                breaker.record(result, self.retry_policy)
+            self.transfer_stats.record(result)
+            delay = self._retry_delay(method, attempt, result)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+        if (
+            rule is not None
+            and result.status_code == 200
+            and not token_rejected(result.content)
+        ):
+            key = cache_key(method, url, data, self.token.API_Key)
+            self.cache.set(key, CachedResponse.from_response(result, rule.ttl))
+        return result
+
+    async def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict[str, Any]],
+        cookies: Optional[Dict[str, str]],
+        timeout: ClientTimeout,
+    ) -> AsyncResponse:
+        policy = self.hedge_policy
+        if policy is None or not policy.hedges(method):
+            return await self._send(method, url, data, cookies, timeout)
+        policy.started()
+        started = time.monotonic()
+        primary = asyncio.ensure_future(self._send(method, url, data, cookies, timeout))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=policy.delay())
+            if not done and deadlines.allows_wait(0) and policy.try_hedge():
+                tasks.append(
+                    asyncio.ensure_future(
+                        self._send(method, url, data, cookies, timeout)
+                    )
+                )
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # the first success wins, an error only counts once both copies failed
+                successes = [task for task in done if task.exception() is None]
+                if successes or not pending:
+                    task = min(successes or done, key=tasks.index)
+                    result = task.result()
+                    policy.record(time.monotonic() - started)
+                    if task is not primary:
+                        policy.won()
+                    return result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict[str, Any]],
+        cookies: Optional[Dict[str, str]],
+        timeout: ClientTimeout,
+        proxy: Optional[str] = None,
+    ) -> AsyncResponse:
+        pool = self.proxy_pool
+        if proxy is None:
+            proxy = pool.choose() if pool is not None else self._proxy_for(url)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(limiter_key(url, proxy))
+        session = self._get_session()
+        started = time.monotonic()
+        try:
+            async with session.request(
+                method, url, data=data, cookies=cookies, proxy=proxy, timeout=timeout
+            ) as response:
+                body = await response.read()
+                content = decode_body(
+                    body, response.headers.get("Content-Encoding", "")
+                )
+                result = AsyncResponse(
+                    response.status,
+                    str(response.url),
+                    dict(response.headers),
+                    {key: morsel.value for key, morsel in response.cookies.items()},
+                    content,
+                    response.charset,
+                    len(body),
+                    {
+                        key: expires
+                        for key, expires in (
+                            (key, _cookie_expires(morsel))
+                            for key, morsel in response.cookies.items()
+                        )
+                        if expires is not None
+                    },
+                )
+        except (ClientConnectionError, asyncio.TimeoutError) as e:
+            if pool is not None:
+                pool.record(proxy, started, error=e)
+            raise
+        if pool is not None:
+            pool.record(proxy, started, result)
+        return result
+
+    def _retry_delay(
+        self, method: str, attempt: int, response: Optional[Any] = None
+    ) -> Optional[float]:
+        """Returns how long to wait before retrying a failed attempt, None to give up."""
+        policy = self.retry_policy
+        if policy is None or not policy.retries(method, attempt):
+            return None
+        if response is not None and not policy.retryable(response):
+            return None
+        # once the breaker opened, further attempts would only be refused
+        breaker = self.circuit_breaker
+        if breaker is not None and breaker.state != CircuitBreaker.CLOSED:
+            return None
+        delay = policy.delay(attempt, response)
+        return delay if deadlines.allows_wait(delay) else None
+
+    def _client_timeout(self) -> ClientTimeout:
+        """The aiohttp timeout of the next request, bounded by the current deadline."""
+        timeout = deadlines.request_timeout(self.timeout)
+        current = deadlines.current_deadline()
+        total = current.remaining if current is not None else None
+        if timeout is None:
+            return ClientTimeout(total=total)
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        return ClientTimeout(total=total, connect=connect, sock_read=read)
+
+    def _cache_rule(
+        self, method: str, url: str, data: Optional[Dict[str, Any]]
+    ) -> Optional[CacheRule]:
+        if self.cache is None:
+            return None
+        return self.cache_policy.match(method, url, data)
+
+    async def get_token(self, username: str, password: str) -> Token:
+        """
+        Retrieves an authentication Token for the provided username and password.
+
+        Args:
+            username (str): The username for authentication.
+            password (str): The password for authentication.
+
+        Returns:
+            Token: An authentication token containing 'DZIENNIKSID' and 'SDZIENNIKSID' cookies.
+
+        Raises:
+            MaintananceError: If the API returns a maintenance status code or message.
+            AuthorizationError: If there is an error during the authorization process.
+        """
+        # the login is never hedged or retried: the code of `goTo` only works once
+
+        async def send(
+            method: str, url: str, data: Optional[Dict[str, Any]] = None
+        ) -> AsyncResponse:
+            timeout = self._client_timeout()
+            return await self._send(method, url, data, None, timeout, proxy)
+
+        breaker = self.circuit_breaker
+        probe = False
+        try:
+            if breaker is not None:
+                probe = breaker.before_request()
+            # the whole login goes through one proxy
+            pool = self.proxy_pool
+            proxy = pool.choose() if pool is not None else None
+            try:
+                maint_check = await send("GET", self.API_URL)
+            except (ClientError, asyncio.TimeoutError) as e:
+                if breaker is not None:
+                    probe = False
+                    breaker.record_failure(type(e).__name__)
+                raise
+            if breaker is not None:
+                probe = False
+                breaker.record(maint_check)
+            if maint_check.status_code == 503:
+                message_list = maint_check.json().get("Message")
+                if not message_list:
+                    raise MaintananceError("maintenance")
+                raise MaintananceError(message_list[0]["description"])
+            await send(
+                "GET",
+                self.API_URL
+                + "/OAuth/Authorization?client_id=46&response_type=code&scope=mydata",
+            )
+            response = await send(
+                "POST",
+                self.API_URL + "/OAuth/Authorization?client_id=46",
+                data={"action": "login", "login": username, "pass": password},
+            )
+            if response.json()["status"] == "error":
+                raise AuthorizationError(response.json()["errors"][0]["message"])
+            await send("GET", self.API_URL + response.json().get("goTo"))
+        finally:
+            if probe:
+                # failed before Librus answered, e.g. on the deadline or the proxy pool
+                breaker.release_probe()
+
+        cookies = {
+            cookie.key: cookie.value for cookie in self._get_session().cookie_jar
+        }
+        dzienniks = cookies.get("DZIENNIKSID")
+        sdzienniks = cookies.get("SDZIENNIKSID")
+        if dzienniks is None or sdzienniks is None:
+            raise AuthorizationError("Authorization cookies were not found")
+
+        token = Token(dzienniks=dzienniks, sdzienniks=sdzienniks)
+        self.token = token
+        return token
+
+    async def refresh_oauth(self) -> str:
+        """
+        Refreshes the OAuth token.
+
+        Returns:
+            str: The new OAuth token.
+
+        Raises:
+            AuthorizationError: If the token cannot be refreshed.
+        """
+        response = await self._request(
+            "GET", self.REFRESH_URL, cookies=self._request_cookies()
+        )
+        oauth = response.cookies.get("oauth_token")
+        if response.status_code == 200 and oauth is not None:
+            lifetime = None
+            expires = response.cookie_expires.get("oauth_token")
+            if expires:
+                lifetime = expires - time.time()
+            self.token.set_oauth(oauth, lifetime)
+            self.cookies["oauth_token"] = oauth
+            return oauth
+        raise AuthorizationError(
+            f"Error while refreshing oauth token {response.content!r}"
+        )
+
+    async def ensure_oauth(
+        self,
+        rejected: Optional[str] = None,
+        refresh_ahead: float = OAUTH_REFRESH_AHEAD,
+    ) -> str:
+        """
+        Returns a valid oauth token, refreshing it only when needed.
+
+        See Client.ensure_oauth; the background refresh runs as a task on the current loop.
+
+        Args:
+            rejected (str, optional): An oauth token the gateway API refused. Defaults to None.
+            refresh_ahead (float, optional): Seconds before expiry to refresh in the background.
+                Defaults to OAUTH_REFRESH_AHEAD.
+
+        Returns:
+            str: The oauth token.
+
+        Raises:
+            AuthorizationError: If the token cannot be refreshed.
+        """
+        token = self.token
+        oauth = token.oauth
+        if token.oauth_expires_in <= 0 or (rejected is not None and oauth == rejected):
+            oauth = await self._logins.do(
+                ("oauth", oauth), lambda: self._refresh_oauth(oauth)
+            )
+        elif token.oauth_expires_in <= refresh_ahead:
+            self._refresh_oauth_in_background(oauth)
+        self.cookies["oauth_token"] = oauth
+        return oauth
+
+    async def _refresh_oauth(self, stale: str) -> str:
+        if self.token.oauth != stale:
+            return self.token.oauth
+        return await self.refresh_oauth()
+
+    def _refresh_oauth_in_background(self, stale: str) -> None:
+        async def refresh() -> None:
+            try:
+                await self._logins.do(
+                    ("oauth", stale), lambda: self._refresh_oauth(stale)
+                )
+            except Exception:
+                pass  # the next call past the expiry refreshes and reports the error
+
+        if self._oauth_refresher is None or self._oauth_refresher.done():
+            self._oauth_refresher = asyncio.ensure_future(refresh())
+
+    async def post(self, url: str, data: Dict[str, Any]) -> AsyncResponse:
+        """
+        Makes a POST request to the specified URL with the given data.
+
+        Args:
+            url (str): The URL to send the POST request to.
+            data (Dict[str, Any]): The data to include in the POST request.
+
+        Returns:
+            AsyncResponse: The fully read response from the server.
+        """
+        return await self._authorized(
+            lambda: self._request("POST", url, data, self._request_cookies())
+        )
+
+    async def get(self, url: str) -> AsyncResponse:
+        """
+        Makes a GET request to the specified URL.
+
+        Args:
+            url (str): The URL to send the GET request to.
+
+        Returns:
+            AsyncResponse: The fully read response from the server.
+        """
+        if self.single_flight is None:
+            return await self._authorized(
+                lambda: self._request("GET", url, cookies=self._request_cookies())
+            )
+        # POSTs may have side effects, e.g. sending a message, and are never shared
+        return await self._authorized(
+            lambda: self.single_flight.do(
+                ("GET", url, self.token.API_Key),
+                lambda: self._request("GET", url, cookies=self._request_cookies()),
+            )
+        )
+
+    async def _authorized(
+        self, send: Callable[[], Awaitable[AsyncResponse]]
+    ) -> AsyncResponse:
+        """Sends a request, logging in again and replaying it once if the token was rejected."""
+        stale = self.token.API_Key
+        response = await send()
+        if self.credentials is None or not token_rejected(response.content):
+            return response
+        await self.reauthenticate(stale)
+        return await send()
+
+    async def reauthenticate(self, stale_key: Optional[str] = None) -> Token:
+        """
+        Logs in again with `credentials`, once for all callers holding the same stale token.
+
+        Args:
+            stale_key (str, optional): The API key that was rejected. Defaults to the current one.
+
+        Returns:
+            Token: The new token.
+
+        Raises:
+            ArgumentError: If the client has no credentials.
+            MaintananceError: If Librus is under maintenance.
+            AuthorizationError: If the login fails.
+        """
+        if self.credentials is None:
+            raise ArgumentError("The client has no credentials to log in with")
+        stale = self.token.API_Key if stale_key is None else stale_key
+        return await self._logins.do(stale, lambda: self._login(stale))
+
+    async def _login(self, stale: str) -> Token:
+        if self.token.API_Key != stale:
+            return self.token
+        token = await self.get_token(*_resolve_credentials(self.credentials))
+        self.reauthentications += 1
+        if self.on_reauth is not None:
+            self.on_reauth(token)
+        return token
+
+    async def _fetch(
+        self, request: FetchRequest, limit: Union[asyncio.Semaphore, AdaptiveLimit]
+    ) -> FetchResult:
+        if isinstance(limit, asyncio.Semaphore):
+            async with limit:
+                return await self._fetch_one(request)
+        token = await limit.acquire_async()
+        started = time.monotonic()
+        result = FetchResult(request)
+        try:
+            result = await self._fetch_one(request)
+        finally:
+            limit.release(token, started, result.response, result.error)
+        return result
+
+    async def _fetch_one(self, request: FetchRequest) -> FetchResult:
+        try:
+            if request.method.upper() == "POST":
+                response = await self.post(request.url, data=request.data or {})
+            else:
+                response = await self.get(request.url)
+        except Exception as e:
+            return FetchResult(request, error=e)
+        return FetchResult(request, response)
+
+    async def fetch_many(
+        self,
+        requests: Iterable[Union[str, FetchRequest]],
+        max_concurrency: Union[int, AdaptiveLimit] = 8,
+        deadline: Optional[float] = None,
+    ) -> List[FetchResult]:
+        """
+        Runs a batch of requests concurrently on the event loop.
+
+        A failing request does not abort the batch, its exception is reported in its result.
+        An AdaptiveLimit adapts the concurrency to Librus' response times and overload signals,
+        see `librus_apix.concurrency`.
+        Once the `librus_apix.deadline` in effect has passed, requests that did not start
+        yet fail with DeadlineExceededError.
+
+        Args:
+            requests (Iterable[Union[str, FetchRequest]]): The requests; plain strings are GET URLs.
+            max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight.
+                Defaults to 8.
+            deadline (float, optional): Seconds the whole batch may take. Defaults to None.
+
+        Returns:
+            List[FetchResult]: One result per request, in input order.
+        """
+        limit = (
+            max_concurrency
+            if isinstance(max_concurrency, AdaptiveLimit)
+            else asyncio.Semaphore(max_concurrency)
+        )
+        scope = deadlines.deadline(deadline) if deadline is not None else nullcontext()
+        with scope:
+            # the tasks are created here, inheriting the deadline
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._fetch(_as_fetch_request(request), limit)
+                        for request in requests
+                    )
+                )
+            )
+
+
+def new_async_client(
+    token: Token = Token(),
+    base_url: str = urls.BASE_URL,
+    api_url: str = urls.API_URL,
+    grades_url: str = urls.GRADES_URL,
+    timetable_url: str = urls.TIMETABLE_URL,
+    announcements_url: str = urls.ANNOUNCEMENTS_URL,
+    message_url: str = urls.MESSAGE_URL,
+    send_message_url: str = urls.SEND_MESSAGE_URL,
+    attendance_url: str = urls.ATTENDANCE_URL,
+    attendance_details_url: str = urls.ATTENDANCE_DETAILS_URL,
+    schedule_url: str = urls.SCHEDULE_URL,
+    recent_schedule_url: str = urls.RECENT_SCHEDULE_URL,
+    homework_url: str = urls.HOMEWORK_URL,
+    homework_details_url: str = urls.HOMEWORK_DETAILS_URL,
+    info_url: str = urls.INFO_URL,
+    recipients_url: str = urls.RECIPIENTS_URL,
+    recipient_groups_url: str = urls.RECIPIENT_GROUPS_URL,
+    completed_lessons_url: str = urls.COMPLETED_LESSONS_URL,
+    gateway_api_attendance: str = urls.GATEWAY_API_ATTENDANCE,
+    refresh_oauth_url: str = urls.REFRESH_OAUTH_URL,
+    index_url: str = urls.INDEX_URL,
+    proxy: dict[str, str] = {},
+    limit: int = 100,
+    limit_per_host: int = 10,
+    cache: Optional[ResponseCache] = None,
+    cache_policy: Optional[CachePolicy] = None,
+    coalesce: bool = True,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    timeout: Optional[deadlines.Timeout] = (10.0, 30.0),
+    hedge_policy: Optional[HedgePolicy] = None,
+    proxy_pool: Optional[ProxyPool] = None,
+    credentials: Optional[Credentials] = None,
+) -> AsyncClient:
+    """
+    Creates a new instance of the AsyncClient class.
+
+    Accepts the same url overrides as new_client.
+
+    Args:
+        token (Optional[Token], optional): The authentication token. Defaults to an empty Token.
+        base_url ... index_url (str, optional): Endpoint overrides, see new_client.
+        proxy (dict[str, str], optional): A dictionary containing proxy settings. Defaults to an empty dictionary.
+        limit (int, optional): The maximum number of open connections. Defaults to 100.
+        limit_per_host (int, optional): The maximum number of open connections per host. Defaults to 10.
+        cache (ResponseCache, optional): A cache to serve rarely changing pages from. Defaults to None.
+        cache_policy (CachePolicy, optional): Which requests are cached and for how long. Defaults to `default_cache_policy`.
+        coalesce (bool, optional): Let identical concurrent GETs and scraper calls share one request. Defaults to True.
+        rate_limiter (RateLimiter, optional): Throttles requests per host and proxy. Defaults to None.
+        retry_policy (RetryPolicy, optional): Retries failed GETs with jittered backoff. Defaults to None.
+        circuit_breaker (CircuitBreaker, optional): Fails requests fast while Librus is down. Defaults to None.
+        timeout (float | Tuple[float, float], optional): The (connect, read) timeout of every request. Defaults to (10, 30).
+        hedge_policy (HedgePolicy, optional): Re-sends GETs slower than a latency percentile. Defaults to None.
+        proxy_pool (ProxyPool, optional): Spreads requests over the healthy proxies of a pool. Defaults to None.
+        credentials (Credentials, optional): Logs in again and replays requests rejected with an expired token. Defaults to None.
+
+    Returns:
+        AsyncClient: A new instance of the AsyncClient class.
+    """
+    if not isinstance(token, Token):
+        token = Token()
+    return AsyncClient(
+        token,
+        base_url,
+        api_url,
+        grades_url,
+        timetable_url,
+        announcements_url,
+        message_url,
+        send_message_url,
+        attendance_url,
+        attendance_details_url,
+        schedule_url,
+        recent_schedule_url,
+        homework_url,
+        homework_details_url,
+        info_url,
+        recipients_url,
+        recipient_groups_url,
+        completed_lessons_url,
+        gateway_api_attendance,
+        refresh_oauth_url,
+        index_url,
+        dict(proxy),
+        limit=limit,
+        limit_per_host=limit_per_host,
+        cache=cache,
+        cache_policy=cache_policy,
+        coalesce=coalesce,
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        circuit_breaker=circuit_breaker,
+        timeout=timeout,
+        hedge_policy=hedge_policy,
+        proxy_pool=proxy_pool,
+        credentials=credentials,
     )
@@ -0,0 +1,390 @@
+"""
+This module runs work for many accounts, each with its own Client, within fixed bounds.
+
+Syncing thousands of accounts needs one Client and Token per account, but keeping thousands of
+sessions open is not an option. A ClientPool keeps the tokens of every account and creates
+their clients on demand; at most `max_clients` exist at a time, the least recently used idle
+one is closed to make room, and clients idle for `idle_timeout` seconds are closed as well,
+by the idle workers once the timeout runs out.
+Open connections are bounded by `max_clients` times the `pool_maxsize` of each client.
+
+Work is submitted per account and run by `max_workers` threads that take turns between the
+accounts in weighted round-robin, so an account with forty message pages queued only gets
+its share of the workers while the others keep moving.
+
+Classes:
+    - ClientPool: Lazily created clients for many accounts with fair scheduling of their work.
+
+Usage:
+```python
+from librus_apix.client import Token
+from librus_apix.client_pool import ClientPool
+from librus_apix.grades import get_grades
+from librus_apix.messages import get_received
+
+with ClientPool(max_clients=200, max_workers=16, idle_timeout=300) as pool:
+    for account_id, api_key in stored_keys.items():
+        pool.add(account_id, Token(API_Key=api_key))
+    grades = pool.run(get_grades, stored_keys)  # {account_id: grades or the exception}
+    # one account's pages are interleaved with the others' work
+    pages = [pool.submit("big-account", get_received, page) for page in range(1, 41)]
+```
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import Context, copy_context
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from librus_apix.client import Client, Token, new_client
+
+_Task = Tuple[Future, Context, Callable[..., Any], tuple, dict]
+
+
+@dataclass
+class _Account:
+    token: Token
+    weight: int = 1
+    queue: Deque[_Task] = field(default_factory=deque)
+    running: int = 0
+    credit: int = 0
+
+
+@dataclass
+class _Lease:
+    client: Client
+    users: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ClientPool:
+    """
+    Lazily created clients for many accounts with fair scheduling of their work.
+
+    Attributes:
+        max_clients (int): The most clients open at a time.
+        max_workers (int): The threads running submitted work.
+        max_per_account (int): The most tasks of one account running at a time.
+        idle_timeout (float): Seconds after which an unused client is closed.
+        created (int): The clients created so far.
+        evicted (int): The clients closed to stay within the bounds.
+    """
+
+    def __init__(
+        self,
+        max_clients: int = 100,
+        max_workers: int = 8,
+        max_per_account: int = 1,
+        idle_timeout: float = 300.0,
+        client_factory: Optional[Callable[[Token], Client]] = None,
+        **client_kwargs: Any,
+    ):
+        """
+        Args:
+            max_clients (int, optional): The most clients open at a time. Defaults to 100.
+            max_workers (int, optional): The threads running submitted work. Defaults to 8.
+            max_per_account (int, optional): The most tasks of one account running at a time. Defaults to 1.
+            idle_timeout (float, optional): Seconds after which an unused client is closed. Defaults to 300.
+            client_factory (Callable[[Token], Client], optional): Creates the client of a token.
+                Defaults to `new_client(token=token, pool_maxsize=2, **client_kwargs)`.
+            **client_kwargs: Passed to `new_client` by the default factory, e.g. a shared
+                `rate_limiter` or `cache`.
+        """
+        if max_clients < max_workers:
+            raise ValueError("max_clients must be at least max_workers")
+        self.max_clients = max_clients
+        self.max_workers = max_workers
+        self.max_per_account = max_per_account
+        self.idle_timeout = idle_timeout
+        self.created = 0
+        self.evicted = 0
+        self._factory = client_factory or self._default_factory
+        self._client_kwargs = {"pool_maxsize": 2, **client_kwargs}
+        self._accounts: Dict[str, _Account] = {}
+        self._leases: "OrderedDict[str, _Lease]" = OrderedDict()
+        # accounts with queued work, in round-robin order
+        self._ring: Deque[str] = deque()
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f"<ClientPool {len(self._accounts)} accounts, {len(self._leases)} clients>"
+
+    def __enter__(self) -> "ClientPool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _default_factory(self, token: Token) -> Client:
+        return new_client(token=token, **self._client_kwargs)
+
+    def add(self, account_id: str, token: Token, weight: int = 1) -> None:
+        """
+        Registers an account, or updates its token and weight.
+
+        Args:
+            account_id (str): The account's identifier.
+            token (Token): The account's token.
+            weight (int, optional): Tasks the account may start per scheduling round. Defaults to 1.
+        """
+        with self._cond:
+            account = self._accounts.get(account_id)
+            if account is None:
+                self._accounts[account_id] = _Account(token, weight, credit=weight)
+            else:
+                account.token = token
+                account.weight = weight
+            # a client left running by a removed account serves the new one
+            lease = self._leases.get(account_id)
+            if lease is not None:
+                lease.client.token = token
+
+    def remove(self, account_id: str) -> None:
+        """Unregisters an account, closing its client once its running work is done."""
+        with self._cond:
+            account = self._accounts.pop(account_id, None)
+            if account is None:
+                return
+            for future, *_ in account.queue:
+                future.cancel()
+            if account_id in self._ring:
+                self._ring.remove(account_id)
+            lease = self._leases.get(account_id)
+            if lease is not None and lease.users == 0:
+                self._evict(account_id)
+
+    def token(self, account_id: str) -> Token:
+        """Returns the current token of an account, including refreshes made by its client."""
+        with self._cond:
+            lease = self._leases.get(account_id)
+            if lease is not None:
+                return lease.client.token
+            return self._accounts[account_id].token
+
+    @property
+    def open_clients(self) -> int:
+        return len(self._leases)
+
+    @contextmanager
+    def checkout(self, account_id: str) -> Iterator[Client]:
+        """
+        Lends the client of an account, creating it if needed.
+
+        Blocks while `max_clients` clients are in use.
+
+        Args:
+            account_id (str): A registered account.
+
+        Yields:
+            Client: The account's client.
+        """
+        client = self._acquire(account_id)
+        try:
+            yield client
+        finally:
+            self._return(account_id)
+
+    def _acquire(self, account_id: str) -> Client:
+        with self._cond:
+            self._evict_idle()
+            while True:
+                lease = self._leases.get(account_id)
+                if lease is not None:
+                    break
+                if len(self._leases) < self.max_clients or self._evict_lru():
+                    token = self._accounts[account_id].token
+                    lease = _Lease(self._factory(token))
+                    self._leases[account_id] = lease
+                    self.created += 1
+                    break
+                self._cond.wait()
+            self._leases.move_to_end(account_id)
+            lease.users += 1
+            return lease.client
+
+    def _return(self, account_id: str) -> None:
+        with self._cond:
+            lease = self._leases[account_id]
+            lease.users -= 1
+            lease.last_used = time.monotonic()
+            if account_id not in self._accounts and lease.users == 0:
+                self._evict(account_id)
+            self._cond.notify_all()
+
+    def _evict(self, account_id: str) -> None:
+        lease = self._leases.pop(account_id)
+        account = self._accounts.get(account_id)
+        if account is not None:
+            # keep what the client learned, e.g. a refreshed oauth token
+            account.token = lease.client.token
+        lease.client.close()
+        self.evicted += 1
+
+    def _evict_lru(self) -> bool:
+        for account_id, lease in self._leases.items():
+            if lease.users == 0:
+                self._evict(account_id)
+                return True
+        return False
+
+    def _evict_idle(self) -> Optional[float]:
+        """Closes the idle clients, returns the seconds until the next one times out."""
+        now = time.monotonic()
+        idle = [
+            account_id
+            for account_id, lease in self._leases.items()
+            if lease.users == 0 and lease.last_used + self.idle_timeout <= now
+        ]
+        for account_id in idle:
+            self._evict(account_id)
+        unused = [
+            lease.last_used + self.idle_timeout - now
+            for lease in self._leases.values()
+            if lease.users == 0
+        ]
+        return min(unused) if unused else None
+
+    def evict_idle(self) -> None:
+        """Closes the clients unused for `idle_timeout` seconds."""
+        with self._cond:
+            self._evict_idle()
+
+    def submit(
+        self, account_id: str, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> "Future[Any]":
+        """
+        Queues `fn(client, *args, **kwargs)` for an account.
+
+        The task runs in a copy of the caller's context, so a `librus_apix.deadline` applies.
+
+        Args:
+            account_id (str): A registered account.
+            fn (Callable[..., Any]): Called with the account's client first, e.g. `get_grades`.
+
+        Returns:
+            Future: Resolves to what `fn` returned or raised.
+        """
+        future: "Future[Any]" = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("The pool is closed")
+            account = self._accounts[account_id]
+            account.queue.append((future, copy_context(), fn, args, kwargs))
+            if account_id not in self._ring:
+                self._ring.append(account_id)
+            self._evict_idle()
+            self._start_workers()
+            self._cond.notify()
+        return future
+
+    def run(
+        self,
+        fn: Callable[..., Any],
+        account_ids: Iterable[str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Runs `fn(client, *args, **kwargs)` for every account and waits for all of them.
+
+        Args:
+            fn (Callable[..., Any]): Called with each account's client first.
+            account_ids (Iterable[str]): Registered accounts.
+
+        Returns:
+            Dict[str, Any]: What `fn` returned, or the exception it raised, per account.
+        """
+        futures = {
+            account_id: self.submit(account_id, fn, *args, **kwargs)
+            for account_id in account_ids
+        }
+        results: Dict[str, Any] = {}
+        for account_id, future in futures.items():
+            error = future.exception()
+            results[account_id] = future.result() if error is None else error
+        return results
+
+    def _start_workers(self) -> None:
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _next_task(self) -> Optional[Tuple[str, _Account, _Task]]:
+        """Takes the next task in weighted round-robin order, skipping busy accounts."""
+        for _ in range(len(self._ring)):
+            account_id = self._ring[0]
+            account = self._accounts[account_id]
+            if account.running >= self.max_per_account:
+                self._ring.rotate(-1)
+                continue
+            task = account.queue.popleft()
+            account.running += 1
+            account.credit -= 1
+            if not account.queue:
+                self._ring.popleft()
+                account.credit = account.weight
+            elif account.credit <= 0:
+                self._ring.rotate(-1)
+                account.credit = account.weight
+            return account_id, account, task
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    picked = self._next_task()
+                    if picked is not None:
+                        break
+                    # wake up to close the clients that time out meanwhile
+                    self._cond.wait(self._evict_idle())
+            account_id, account, (future, context, fn, args, kwargs) = picked
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        with self.checkout(account_id) as client:
+                            result = context.run(fn, client, *args, **kwargs)
+                    except BaseException as e:
+                        future.set_exception(e)
+                    else:
+                        future.set_result(result)
+            finally:
+                with self._cond:
+                    # the account picked from, even if it was removed and added again
+                    account.running -= 1
+                    self._cond.notify_all()
+
+    def close(self) -> None:
+        """Cancels queued work, waits for running work and closes every client."""
+        with self._cond:
+            self._closed = True
+            for account in self._accounts.values():
+                while account.queue:
+                    account.queue.popleft()[0].cancel()
+            self._ring.clear()
+            self._cond.notify_all()
+        for worker in self._workers:
+            if worker is not threading.current_thread():
+                worker.join()
+        with self._cond:
+            for account_id in list(self._leases):
+                self._evict(account_id)
@@ -7,6 +7,11 @@ Classes:
 Functions:
     - get_max_page_number: Retrieves the maximum page number for completed lessons within a specified date range.
     - get_completed: Retrieves completed lessons within a specified date range and page number.
+    - get_completed_pages: Retrieves many pages of completed lessons concurrently.
+    - parse_max_page_number: Parses the maximum page number from an already fetched page.
+    - parse_completed: Parses completed lessons from an already fetched page.
+
+    Every fetching function above has an `*_async` counterpart taking an AsyncClient.
 
 Usage:
 ```python
@@ -27,11 +32,26 @@ completed_lessons = get_completed(client, date_from, date_to, page=page_number)
 ```
 """
 
-from typing import List
+from typing import Any, Dict, Iterable, List, Optional, Union
 from dataclasses import dataclass
-from bs4 import BeautifulSoup, Tag
-from librus_apix.client import Client
-from librus_apix.helpers import no_access_check
+from bs4 import Tag
+from lxml import etree, html
+from librus_apix.client import AsyncClient, Client, FetchRequest
+from librus_apix.concurrency import AdaptiveLimit
+from librus_apix.helpers import (
+    class_is,
+    current_parser_backend,
+    has_class,
+    make_soup,
+    make_tree,
+    no_access_check,
+    node_text,
+    page_region,
+    parse_results,
+    response_encoding,
+    tree_no_access_check,
+)
+from librus_apix.singleflight import coalesced, coalesced_async
 from librus_apix.exceptions import ParseError
 import re
 
@@ -64,31 +84,33 @@ class Lesson:
     date: str
 
 
-def get_max_page_number(client: Client, date_from: str, date_to: str) -> int:
+def _completed_payload(date_from: str, date_to: str, page: int = 0) -> Dict[str, Any]:
+    return {
+        "data1": date_from,
+        "data2": date_to,
+        "filtruj_id_przedmiotu": -1,
+        "numer_strony1001": page,
+        "porcjowanie_pojemnik1001": 1001,
+    }
+
+
+def parse_max_page_number(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> int:
     """
-    Retrieves the maximum page number for completed lessons within a specified date range.
+    Parses the maximum page number from an already fetched completed lessons page.
 
     Args:
-        client (Client): The client object used to fetch completed lesson data.
-        date_from (str): The start date of the date range (in format "YYYY-MM-DD").
-        date_to (str): The end date of the date range (in format "YYYY-MM-DD").
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
 
     Returns:
-        int: The maximum page number for the completed lessons within the specified date range.
+        int: The maximum page number for the completed lessons.
 
     Raises:
         ParseError: If there is an error while trying to retrieve the maximum page number.
     """
-    data = {
-        "data1": date_from,
-        "data2": date_to,
-        "filtruj_id_przedmiotu": -1,
-        "numer_strony1001": 0,
-        "porcjowanie_pojemnik1001": 1001,
-    }
-    soup = no_access_check(
-        BeautifulSoup(client.post(client.COMPLETED_LESSONS_URL, data=data).text, "lxml")
-    )
+    soup = no_access_check(make_soup(document, encoding))
     try:
         pages = soup.select_one("div.pagination > span")
         if not pages:
@@ -106,6 +128,50 @@ def get_max_page_number(client: Client, date_from: str, date_to: str) -> int:
     return max_pages_number
 
 
+@coalesced
+def get_max_page_number(client: Client, date_from: str, date_to: str) -> int:
+    """
+    Retrieves the maximum page number for completed lessons within a specified date range.
+
+    Args:
+        client (Client): The client object used to fetch completed lesson data.
+        date_from (str): The start date of the date range (in format "YYYY-MM-DD").
+        date_to (str): The end date of the date range (in format "YYYY-MM-DD").
+
+    Returns:
+        int: The maximum page number for the completed lessons within the specified date range.
+
+    Raises:
+        ParseError: If there is an error while trying to retrieve the maximum page number.
+    """
+    data = _completed_payload(date_from, date_to)
+    response = client.post(client.COMPLETED_LESSONS_URL, data=data)
+    return parse_max_page_number(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def get_max_page_number_async(
+    client: AsyncClient, date_from: str, date_to: str
+) -> int:
+    """
+    Async counterpart of get_max_page_number.
+
+    Args:
+        client (AsyncClient): The async client object used to fetch completed lesson data.
+        date_from (str): The start date of the date range (in format "YYYY-MM-DD").
+        date_to (str): The end date of the date range (in format "YYYY-MM-DD").
+
+    Returns:
+        int: The maximum page number for the completed lessons within the specified date range.
+
+    Raises:
+        ParseError: If there is an error while trying to retrieve the maximum page number.
+    """
+    data = _completed_payload(date_from, date_to)
+    response = await client.post(client.COMPLETED_LESSONS_URL, data=data)
+    return parse_max_page_number(response.content, response_encoding(response))
+
+
 def _sanitize_onclick(onclick: str) -> str:
     href = (
         onclick.replace("otworz_w_nowym_oknie(", "")
@@ -132,10 +198,34 @@ def _create_lesson(line: Tag):
         ParseError: If there is an error while parsing the completed lesson data.
     """
     date = line.select_one('td[class="center small"]')
-    date = date.text if date is not None else "01-01-2000"
     weekday = line.select_one("td.tiny")
-    weekday = weekday.text if weekday is not None else ""
-    data = [td.text.strip() for td in line.find_all("td", attrs={"class": None})]
+    attendance_href = line.select_one("td > p.box > a")
+    return _lesson_from_cells(
+        date.text if date is not None else "01-01-2000",
+        weekday.text if weekday is not None else "",
+        [td.text.strip() for td in line.find_all("td", attrs={"class": None})],
+        None if attendance_href is None else attendance_href.attrs.get("onclick", ""),
+    )
+
+
+def _lesson_from_cells(
+    date: str, weekday: str, data: List[str], onclick: Optional[str]
+) -> Lesson:
+    """
+    Creates a Lesson object from the contents of a completed lesson's row.
+
+    Args:
+        date (str): The text of the date cell.
+        weekday (str): The text of the weekday cell.
+        data (List[str]): The stripped texts of the cells without a class.
+        onclick (str, optional): The onclick of the attendance anchor, None if there is none.
+
+    Returns:
+        Lesson: A Lesson object representing the completed lesson.
+
+    Raises:
+        ParseError: If there is an error while parsing the completed lesson data.
+    """
     if len(data) < 5:
         raise ParseError(
             "Error while parsing Completed lesson's data. (data isn't 5 element long)"
@@ -146,12 +236,7 @@ def _create_lesson(line: Tag):
         subject, teacher = (subject_and_teacher[0], subject_and_teacher[0])
     else:
         subject, teacher = subject_and_teacher
-    attendance_href = line.select_one("td > p.box > a")
-    if attendance_href is not None:
-        onclick = attendance_href.attrs.get("onclick", "")
-        attendance_href = _sanitize_onclick(onclick)
-    else:
-        attendance_href = ""
+    attendance_href = _sanitize_onclick(onclick) if onclick is not None else ""
 
     return Lesson(
         subject,
@@ -166,6 +251,55 @@ def _create_lesson(line: Tag):
     )
 
 
+_REGION = page_region("table")
+_LINES = etree.XPath(f"//table[{class_is('decorated')}]/tbody/tr")
+_DATE = etree.XPath(f"(.//td[{class_is('center small')}])[1]")
+_WEEKDAY = etree.XPath(f"(.//td[{has_class('tiny')}])[1]")
+_DATA = etree.XPath(".//td[not(@class)]")
+_ATTENDANCE_ANCHOR = etree.XPath(f"(.//a[parent::p[{has_class('box')}]/parent::td])[1]")
+
+
+def _create_lesson_lxml(line: html.HtmlElement) -> Lesson:
+    # the lxml counterpart of _create_lesson, keep the two in sync
+    date = _DATE(line)
+    weekday = _WEEKDAY(line)
+    attendance_href = _ATTENDANCE_ANCHOR(line)
+    return _lesson_from_cells(
+        node_text(date[0]) if date else "01-01-2000",
+        node_text(weekday[0]) if weekday else "",
+        [node_text(td).strip() for td in _DATA(line)],
+        attendance_href[0].get("onclick", "") if attendance_href else None,
+    )
+
+
+def parse_completed(
+    document: Union[str, bytes],
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> List[Lesson]:
+    """
+    Parses completed lessons from an already fetched completed lessons page.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+        backend (str, optional): "bs4" or "lxml". Defaults to the backend in effect,
+            see `librus_apix.helpers.parser_backend`.
+
+    Returns:
+        List[Lesson]: A list of Lesson objects representing the completed lessons.
+    """
+    if current_parser_backend(backend) == "lxml":
+        root = tree_no_access_check(make_tree(document, encoding))
+        return [_create_lesson_lxml(line) for line in _LINES(root)]
+    soup = no_access_check(make_soup(document, encoding, _REGION))
+
+    lines = soup.select('table[class="decorated"] > tbody > tr')
+    completed_lessons = list(map(_create_lesson, lines))
+    return completed_lessons
+
+
+@coalesced
 def get_completed(
     client: Client, date_from: str, date_to: str, page: int = 0
 ) -> List[Lesson]:
@@ -190,18 +324,100 @@ def get_completed(
 
     """
 
-    data = {
-        "data1": date_from,
-        "data2": date_to,
-        "filtruj_id_przedmiotu": -1,
-        "numer_strony1001": page,
-        "porcjowanie_pojemnik1001": 1001,
-    }
-    completed_lessons = []
-    soup = no_access_check(
-        BeautifulSoup(client.post(client.COMPLETED_LESSONS_URL, data=data).text, "lxml")
+    data = _completed_payload(date_from, date_to, page)
+    response = client.post(client.COMPLETED_LESSONS_URL, data=data)
+    return parse_completed(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def get_completed_async(
+    client: AsyncClient, date_from: str, date_to: str, page: int = 0
+) -> List[Lesson]:
+    """
+    Async counterpart of get_completed.
+
+    Args:
+        client (AsyncClient): The async client object used to fetch completed lesson data.
+        date_from (str): The start date of the date range (in format "YYYY-MM-DD").
+        date_to (str): The end date of the date range (in format "YYYY-MM-DD").
+        page (int, optional): The page number of the completed lessons to retrieve.
+            Defaults to 0.
+
+    Returns:
+        List[Lesson]: A list of Lesson objects representing the completed lessons.
+    """
+    data = _completed_payload(date_from, date_to, page)
+    response = await client.post(client.COMPLETED_LESSONS_URL, data=data)
+    return parse_completed(response.content, response_encoding(response))
+
+
+def get_completed_pages(
+    client: Client,
+    date_from: str,
+    date_to: str,
+    pages: Iterable[int],
+    max_concurrency: Union[int, AdaptiveLimit] = 8,
+) -> List[Union[List[Lesson], Exception]]:
+    """
+    Batch form of get_completed, fetching pages of completed lessons concurrently.
+
+    Args:
+        client (Client): The client object used to make the requests.
+        date_from (str): The start date of the date range (in format "YYYY-MM-DD").
+        date_to (str): The end date of the date range (in format "YYYY-MM-DD").
+        pages (Iterable[int]): The page numbers to retrieve.
+        max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight,
+            or an adaptive limit. Defaults to 8.
+
+    Returns:
+        List[Union[List[Lesson], Exception]]: The result of every request in input order,
+            or the exception it raised.
+    """
+    results = client.fetch_many(
+        [
+            FetchRequest(
+                client.COMPLETED_LESSONS_URL,
+                "POST",
+                _completed_payload(date_from, date_to, page),
+            )
+            for page in pages
+        ],
+        max_concurrency,
     )
+    return parse_results(results, parse_completed)
 
-    lines = soup.select('table[class="decorated"] > tbody > tr')
-    completed_lessons = list(map(_create_lesson, lines))
-    return completed_lessons
+
+async def get_completed_pages_async(
+    client: AsyncClient,
+    date_from: str,
+    date_to: str,
+    pages: Iterable[int],
+    max_concurrency: Union[int, AdaptiveLimit] = 8,
+) -> List[Union[List[Lesson], Exception]]:
+    """
+    Async counterpart of get_completed_pages.
+
+    Args:
+        client (AsyncClient): The async client object used to make the requests.
+        date_from (str): The start date of the date range (in format "YYYY-MM-DD").
+        date_to (str): The end date of the date range (in format "YYYY-MM-DD").
+        pages (Iterable[int]): The page numbers to retrieve.
+        max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight,
+            or an adaptive limit. Defaults to 8.
+
+    Returns:
+        List[Union[List[Lesson], Exception]]: The result of every request in input order,
+            or the exception it raised.
+    """
+    results = await client.fetch_many(
+        [
+            FetchRequest(
+                client.COMPLETED_LESSONS_URL,
+                "POST",
+                _completed_payload(date_from, date_to, page),
+            )
+            for page in pages
+        ],
+        max_concurrency,
+    )
+    return parse_results(results, parse_completed)
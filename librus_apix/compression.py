@@ -0,0 +1,168 @@
+"""
+This module negotiates compressed transfers and keeps count of the bytes they save.
+
+Librus pages are large, highly compressible tables, so both clients ask for compressed
+bodies and record how many bytes came over the wire and how many they decoded to.
+
+Constants:
+    - ACCEPT_ENCODING: Accept-Encoding sent by Client, everything urllib3 can decode.
+    - ASYNC_ACCEPT_ENCODING: Accept-Encoding sent by AsyncClient, everything decode_body can decode.
+
+Classes:
+    - TransferStats: Cumulative wire and decoded byte counters of a client.
+
+Functions:
+    - decode_body: Decodes a response body according to its Content-Encoding header.
+    - transfer_sizes: Returns the wire and decoded size of a single response.
+
+Usage:
+```python
+from librus_apix.client import new_client
+from librus_apix.compression import transfer_sizes
+
+client = new_client(token=token)
+response = client.get(client.GRADES_URL)
+wire, decoded = transfer_sizes(response)
+print(client.transfer_stats.saved_bytes, client.transfer_stats.ratio)
+```
+"""
+
+import gzip
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Tuple
+
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ACCEPT_ENCODING = DEFAULT_ACCEPT_ENCODING
+ASYNC_ACCEPT_ENCODING = ", ".join(
+    ["gzip", "deflate"]
+    + (["br"] if brotli is not None else [])
+    + (["zstd"] if zstandard is not None else [])
+)
+
+
+def _inflate(body: bytes) -> bytes:
+    try:
+        return zlib.decompress(body)
+    except zlib.error:
+        # some servers send raw deflate streams without the zlib header
+        return zlib.decompress(body, -zlib.MAX_WBITS)
+
+
+def decode_body(body: bytes, content_encoding: str) -> bytes:
+    """
+    Decodes a response body according to its Content-Encoding header.
+
+    Args:
+        body (bytes): The body as received on the wire.
+        content_encoding (str): The Content-Encoding header value, e.g. "gzip" or "gzip, br".
+
+    Returns:
+        bytes: The decoded body.
+
+    Raises:
+        ValueError: If an encoding is not supported or the body is corrupt.
+    """
+    codings = [c.strip().lower() for c in content_encoding.split(",") if c.strip()]
+    # codings are listed in the order they were applied
+    for coding in reversed(codings):
+        try:
+            if coding in ("gzip", "x-gzip"):
+                body = gzip.decompress(body)
+            elif coding == "deflate":
+                body = _inflate(body)
+            elif coding == "br" and brotli is not None:
+                body = brotli.decompress(body)
+            elif coding == "zstd" and zstandard is not None:
+                body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+            elif coding != "identity":
+                raise ValueError(f"Unsupported content encoding: {coding}")
+        except (OSError, EOFError, zlib.error) as e:
+            raise ValueError(f"Could not decode {coding} body: {e}") from e
+    return body
+
+
+def transfer_sizes(response: Any) -> Tuple[int, int]:
+    """
+    Returns how many bytes a fully read response took on the wire and after decoding.
+
+    Args:
+        response (Any): A `requests.Response` or `librus_apix.client.AsyncResponse`.
+
+    Returns:
+        Tuple[int, int]: The wire size and the decoded size of the body.
+    """
+    decoded = len(response.content)
+    wire = getattr(response, "wire_bytes", None)
+    if wire is None:
+        raw = getattr(response, "raw", None)
+        # urllib3 counts the bytes read from the socket, before decompression
+        wire = raw.tell() if hasattr(raw, "tell") else decoded
+    return wire, decoded
+
+
+@dataclass
+class TransferStats:
+    """
+    Cumulative byte counters of the responses a client received.
+
+    Attributes:
+        requests (int): The number of recorded responses.
+        wire_bytes (int): Body bytes received on the wire, before content decoding.
+        decoded_bytes (int): Body bytes after content decoding.
+    """
+
+    requests: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @property
+    def saved_bytes(self) -> int:
+        """Bytes that did not have to be transferred thanks to compression."""
+        return self.decoded_bytes - self.wire_bytes
+
+    @property
+    def ratio(self) -> float:
+        """Wire bytes per decoded byte, 1.0 when nothing was compressed."""
+        return self.wire_bytes / self.decoded_bytes if self.decoded_bytes else 1.0
+
+    def record(self, response: Any) -> Tuple[int, int]:
+        """
+        Adds a fully read response to the counters.
+
+        Args:
+            response (Any): A `requests.Response` or `librus_apix.client.AsyncResponse`.
+
+        Returns:
+            Tuple[int, int]: The wire size and the decoded size of the response body.
+        """
+        wire, decoded = transfer_sizes(response)
+        with self._lock:
+            self.requests += 1
+            self.wire_bytes += wire
+            self.decoded_bytes += decoded
+        return wire, decoded
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.wire_bytes = 0
+            self.decoded_bytes = 0
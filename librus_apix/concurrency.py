@@ -0,0 +1,246 @@
+"""
+This module adapts the concurrency of bulk fetches to how Librus is coping.
+
+A fixed concurrency limit is either too timid or gets the client throttled. An adaptive
+limit grows additively while response times stay close to their long-term average, and is
+cut multiplicatively (AIMD) when Librus signals overload: a 429 or 503 response, a timeout
+or a "Brak dostępu" page. The current limit and the history of its changes are kept as
+metrics.
+
+Pass an AdaptiveLimit as `max_concurrency` to `fetch_many` or to any of the batch helpers,
+and keep reusing it so what it learned carries over between batches.
+
+Classes:
+    - AdaptiveLimit: An AIMD concurrency limit shared by threads and event loops.
+
+Functions:
+    - overload_reason: Returns why a response or error signals overload, if it does.
+    - token_rejected: Tells whether a page is the "Brak dostępu" page of a rejected token.
+
+Usage:
+```python
+from librus_apix.concurrency import AdaptiveLimit
+from librus_apix.messages import message_contents
+
+limit = AdaptiveLimit(initial=4, max_limit=16)
+contents = message_contents(client, hrefs, max_concurrency=limit)
+print(limit.current, limit.history[-3:])
+```
+"""
+
+import asyncio
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+from requests.exceptions import Timeout
+
+NO_ACCESS = "Brak dostępu".encode()
+OVERLOAD_STATUSES = (429, 503)
+# the element `helpers.no_access_check` raises TokenError on
+_NO_ACCESS_PAGE = re.compile(rb'<h2 class="inside">\s*' + re.escape(NO_ACCESS))
+# responses faster than this, e.g. served from a cache, always count as flat latency
+MIN_BASELINE = 0.01
+
+
+def token_rejected(content: bytes) -> bool:
+    """
+    Tells whether a page is the "Brak dostępu" page Librus serves for a rejected token.
+
+    Args:
+        content (bytes): The response body.
+
+    Returns:
+        bool: True if the page holds the header `helpers.no_access_check` raises TokenError on.
+    """
+    return NO_ACCESS in content and _NO_ACCESS_PAGE.search(content) is not None
+
+
+def overload_reason(
+    response: Optional[Any] = None, error: Optional[BaseException] = None
+) -> Optional[str]:
+    """
+    Returns why a response or error signals overload.
+
+    Args:
+        response (Any, optional): A `requests.Response` or `librus_apix.client.AsyncResponse`.
+        error (BaseException, optional): The exception the request raised.
+
+    Returns:
+        str | None: "timeout", "status <code>" or "no access", None for a healthy outcome.
+    """
+    if isinstance(error, (Timeout, asyncio.TimeoutError)):
+        return "timeout"
+    if response is None:
+        return None
+    if response.status_code in OVERLOAD_STATUSES:
+        return f"status {response.status_code}"
+    if token_rejected(response.content):
+        return "no access"
+    return None
+
+
+def _wake(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class AdaptiveLimit:
+    """
+    An AIMD concurrency limit shared by threads and event loops.
+
+    Each completed request that kept the limit saturated and answered within `tolerance`
+    times the average response time adds `1 / limit`, i.e. about one slot per round of
+    requests. An overload signal multiplies the limit by `backoff`; requests that were
+    already in flight when it was cut don't cut it again.
+
+    Attributes:
+        limit (float): The current limit; `current` is the number of slots it allows.
+        min_limit (int): The lowest limit.
+        max_limit (int): The highest limit.
+        inflight (int): The requests holding a slot.
+        baseline (float | None): The long-term average response time in seconds.
+        successes (int): The healthy responses seen.
+        overloads (int): The overload signals seen.
+        history (Deque[Tuple[float, int, str]]): (`time.time()`, slots, reason) of every change.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        backoff: float = 0.5,
+        tolerance: float = 2.0,
+        smoothing: float = 0.05,
+        history: int = 1000,
+    ):
+        """
+        Args:
+            initial (int, optional): The starting limit. Defaults to 4.
+            min_limit (int, optional): The lowest limit. Defaults to 1.
+            max_limit (int, optional): The highest limit. Defaults to 32.
+            backoff (float, optional): The factor the limit is multiplied by on overload. Defaults to 0.5.
+            tolerance (float, optional): How many times the average response time still counts
+                as flat latency. Defaults to 2.
+            smoothing (float, optional): The weight of a new response time in the average. Defaults to 0.05.
+            history (int, optional): How many limit changes are kept. Defaults to 1000.
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= initial <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.inflight = 0
+        self.baseline: Optional[float] = None
+        self.successes = 0
+        self.overloads = 0
+        self.history: Deque[Tuple[float, int, str]] = deque(maxlen=history)
+        self._epoch = 0
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+
+    def __repr__(self) -> str:
+        return f"<AdaptiveLimit {self.inflight}/{self.current}>"
+
+    @property
+    def current(self) -> int:
+        """The number of requests the limit allows in flight."""
+        return max(self.min_limit, int(self.limit))
+
+    def _try_acquire(self) -> Optional[int]:
+        if self.inflight >= self.current:
+            return None
+        self.inflight += 1
+        return self._epoch
+
+    def acquire(self) -> int:
+        """
+        Blocks until a slot is free and takes it.
+
+        Returns:
+            int: The token to pass to `release`.
+        """
+        with self._cond:
+            while True:
+                token = self._try_acquire()
+                if token is not None:
+                    return token
+                self._cond.wait()
+
+    async def acquire_async(self) -> int:
+        """
+        Waits without blocking the event loop until a slot is free and takes it.
+
+        Returns:
+            int: The token to pass to `release`.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                token = self._try_acquire()
+                if token is not None:
+                    return token
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            await waiter
+
+    def release(
+        self,
+        token: int,
+        started: float,
+        response: Optional[Any] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Frees a slot and adapts the limit to the outcome of its request.
+
+        Args:
+            token (int): The token returned by `acquire`.
+            started (float): The `time.monotonic()` the request was sent at.
+            response (Any, optional): Its response, if it got one.
+            error (BaseException, optional): The exception it raised, if any.
+        """
+        reason = overload_reason(response, error)
+        latency = time.monotonic() - started
+        with self._cond:
+            saturated = self.inflight >= self.current
+            self.inflight -= 1
+            if reason is not None:
+                self.overloads += 1
+                if token == self._epoch:
+                    self._epoch += 1
+                    self._set(max(self.min_limit, self.limit * self.backoff), reason)
+            elif response is not None and error is None:
+                self.successes += 1
+                flat = (
+                    self.baseline is None
+                    or latency <= max(self.baseline, MIN_BASELINE) * self.tolerance
+                )
+                self.baseline = (
+                    latency
+                    if self.baseline is None
+                    else self.baseline + self.smoothing * (latency - self.baseline)
+                )
+                if saturated and flat:
+                    self._set(min(self.max_limit, self.limit + 1 / self.limit), "increase")
+            self._cond.notify_all()
+            waiters, self._waiters = self._waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:  # the loop is closed
+                pass
+
+    def _set(self, limit: float, reason: str) -> None:
+        before = self.current
+        self.limit = limit
+        if self.current != before or reason != "increase":
+            self.history.append((time.time(), self.current, reason))
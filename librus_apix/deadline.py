@@ -0,0 +1,145 @@
+"""
+This module bounds how long a whole high-level call may take.
+
+A deadline is set for a block of code with `deadline(seconds)` and applies to every
+request the clients make inside it, including the requests of `fetch_many` worker
+threads and of asyncio tasks started in the block. Each request's timeout is capped by
+the remaining budget, and once it is spent no new request is sent: DeadlineExceededError
+is raised instead, and batches report it per unfinished item so finished pages are kept.
+
+Classes:
+    - Deadline: A point in time a call has to finish by.
+
+Functions:
+    - deadline: Context manager setting a deadline for the requests made inside it.
+    - current_deadline: Returns the deadline in effect, if any.
+    - remaining: Returns the seconds left on the current deadline, if any.
+    - request_timeout: Caps a request timeout by the current deadline.
+    - allows_wait: Checks whether a wait, e.g. before a retry, fits the current deadline.
+
+Usage:
+```python
+from librus_apix.deadline import deadline
+from librus_apix.exceptions import DeadlineExceededError
+from librus_apix.grades import get_grades
+from librus_apix.messages import message_contents
+
+with deadline(10):
+    grades = get_grades(client)
+
+# stops issuing requests after 30 seconds, unfinished messages hold DeadlineExceededError
+with deadline(30):
+    contents = message_contents(client, hrefs)
+done = [c for c in contents if not isinstance(c, Exception)]
+```
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple, Union
+
+from librus_apix.exceptions import DeadlineExceededError
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class Deadline:
+    """
+    A point in time a call has to finish by.
+
+    Attributes:
+        expires_at (float): The `time.monotonic()` the budget runs out at.
+    """
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def __repr__(self) -> str:
+        return f"<Deadline {self.remaining:.3f}s left>"
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """
+        Raises:
+            DeadlineExceededError: If the deadline has passed.
+        """
+        if self.expired:
+            raise DeadlineExceededError("Deadline exceeded before the request was sent")
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("librus_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Returns the deadline in effect, if any."""
+    return _current.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left on the deadline in effect, or None without one."""
+    current = _current.get()
+    return None if current is None else current.remaining
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """
+    Sets a deadline for the requests made inside the block.
+
+    Nested deadlines can only shorten the budget, never extend it.
+
+    Args:
+        seconds (float): The budget of the block.
+
+    Yields:
+        Deadline: The deadline in effect inside the block.
+    """
+    new = Deadline(seconds)
+    outer = _current.get()
+    if outer is not None and outer.expires_at < new.expires_at:
+        new = outer
+    token = _current.set(new)
+    try:
+        yield new
+    finally:
+        _current.reset(token)
+
+
+def request_timeout(timeout: Optional[Timeout]) -> Optional[Timeout]:
+    """
+    Caps a request timeout by the remaining budget of the current deadline.
+
+    Args:
+        timeout (Timeout, optional): The client's timeout, a number or a (connect, read) tuple.
+
+    Returns:
+        Timeout | None: The timeout to use for the request.
+
+    Raises:
+        DeadlineExceededError: If the deadline has already passed.
+    """
+    current = _current.get()
+    if current is None:
+        return timeout
+    current.check()
+    remaining = current.remaining
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(min(part, remaining) for part in timeout)
+    return min(timeout, remaining)
+
+
+def allows_wait(seconds: float) -> bool:
+    """Whether waiting `seconds`, e.g. before a retry, still fits the current deadline."""
+    current = _current.get()
+    return current is None or current.remaining > seconds
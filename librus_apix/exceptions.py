@@ -9,6 +9,9 @@ Exceptions:
     - ParseError: Raised when there is an error parsing data.
     - DateError: Raised for errors related to date handling.
     - MaintananceError: Raised when the API is under maintenance.
+    - CircuitOpenError: Raised instead of sending a request while the circuit breaker is open.
+    - DeadlineExceededError: Raised instead of sending a request once the call's deadline has passed.
+    - ProxyPoolExhaustedError: Raised instead of sending a request while every proxy of the pool is in quarantine.
 """
 
 
@@ -38,3 +41,33 @@ class DateError(Exception):
 
 class MaintananceError(Exception):
     pass
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while the client's circuit breaker is open.
+
+    Attributes:
+        retry_after (float): Seconds until the breaker lets a request through again.
+    """
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(Exception):
+    pass
+
+
+class ProxyPoolExhaustedError(Exception):
+    """
+    Raised instead of sending a request while every proxy of the client's pool is in quarantine.
+
+    Attributes:
+        retry_after (float): Seconds until the first proxy leaves quarantine.
+    """
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -8,6 +8,10 @@ Classes:
 
 Functions:
     - get_grades: Fetches and returns the grades, semestral averages, and descriptive grades from Librus.
+    - get_grades_async: Async counterpart of get_grades taking an AsyncClient.
+    - parse_grades: Parses grades from an already fetched page.
+    - iter_grades: Streams the grades page, yielding each numeric grade as soon as its row is downloaded.
+    - iter_parse_grades: Parses the numeric grades of a page read in chunks, yielding them as their rows close.
 
 Usage:
 ```python
@@ -30,13 +34,41 @@ except ParseError as e:
 import re
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import DefaultDict, List, Tuple, Union
-
-from bs4 import BeautifulSoup, Tag
-
-from librus_apix.client import Client
+from typing import (
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import soupsieve as sv
+from bs4 import Tag
+from lxml import etree, html
+
+from librus_apix.client import AsyncClient, Client
 from librus_apix.exceptions import ArgumentError, ParseError
-from librus_apix.helpers import no_access_check
+from librus_apix.helpers import (
+    class_is,
+    current_parser_backend,
+    has_class,
+    iter_closed,
+    make_soup,
+    make_tree,
+    no_access_check,
+    node_text,
+    page_region,
+    response_encoding,
+    run_parser,
+    run_parser_async,
+    stream_records,
+    tree_no_access_check,
+)
+from librus_apix.singleflight import coalesced, coalesced_async
 
 
 @dataclass
@@ -120,6 +152,67 @@ class GradeDescriptive:
     teacher: str
 
 
+_SORT = {
+    "all": "zmiany_logowanie_wszystkie",
+    "week": "zmiany_logowanie_tydzien",
+    "last_login": "zmiany_logowanie",
+}
+
+
+# the soup is limited to the rows, the only elements the bs4 path reads
+_REGION = page_region("tr")
+
+
+def _grades_payload(sort_by: str) -> Dict[str, str]:
+    if sort_by not in _SORT.keys():
+        raise ArgumentError(
+            "Wrong value for sort_by it can be either all, week or last_login"
+        )
+    return {_SORT[sort_by]: "1"}
+
+
+def parse_grades(
+    document: Union[str, bytes],
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> Tuple[
+    List[DefaultDict[str, List[Grade]]],
+    DefaultDict[str, List[Gpa]],
+    List[DefaultDict[str, List[GradeDescriptive]]],
+]:
+    """
+    Parses grades from an already fetched grades page.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+        backend (str, optional): "bs4" or "lxml". Defaults to the backend in effect,
+            see `librus_apix.helpers.parser_backend`.
+
+    Returns:
+        Tuple[List[DefaultDict[str, List[Grade]]], DefaultDict[str, List[Gpa]], List[DefaultDict[str, List[GradeDescriptive]]]]:
+            A tuple containing the numeric grades, the average grades and the descriptive grades.
+
+    Raises:
+        ArgumentError: If the backend is unknown.
+        ParseError: If there is an error parsing the grades.
+    """
+    if current_parser_backend(backend) == "lxml":
+        rows = _ROWS(tree_no_access_check(make_tree(document, encoding)))
+        if len(rows) < 1:
+            raise ParseError("Error in parsing grades")
+        return _extract_grades_lxml(rows)
+
+    tr = no_access_check(make_soup(document, encoding, _REGION)).find_all(
+        "tr", attrs={"class": ["line0", "line1"], "id": None}
+    )
+    if len(tr) < 1:
+        raise ParseError("Error in parsing grades")
+
+    return _extract_grades(tr)
+
+
+@coalesced
 def get_grades(client: Client, sort_by: str = "all") -> Tuple[
     List[DefaultDict[str, List[Grade]]],
     DefaultDict[str, List[Gpa]],
@@ -139,40 +232,104 @@ def get_grades(client: Client, sort_by: str = "all") -> Tuple[
         ArgumentError: If an invalid sort_by value is provided.
         ParseError: If there is an error in parsing the grades.
     """
-    SORT = {
-        "all": "zmiany_logowanie_wszystkie",
-        "week": "zmiany_logowanie_tydzien",
-        "last_login": "zmiany_logowanie",
-    }
-    if sort_by not in SORT.keys():
-        raise ArgumentError(
-            "Wrong value for sort_by it can be either all, week or last_login"
-        )
+    payload = _grades_payload(sort_by)
+    response = client.post(client.GRADES_URL, data=payload)
+    return run_parser(parse_grades, response.content, response_encoding(response))
 
-    tr = no_access_check(
-        BeautifulSoup(
-            client.post(client.GRADES_URL, data={SORT[sort_by]: "1"}).text,
-            "lxml",
-        )
-    ).find_all("tr", attrs={"class": ["line0", "line1"], "id": None})
-    if len(tr) < 1:
+
+@coalesced_async
+async def get_grades_async(client: AsyncClient, sort_by: str = "all") -> Tuple[
+    List[DefaultDict[str, List[Grade]]],
+    DefaultDict[str, List[Gpa]],
+    List[DefaultDict[str, List[GradeDescriptive]]],
+]:
+    """
+    Async counterpart of get_grades.
+
+    Args:
+        client (AsyncClient): The async client object used to interact with the server.
+        sort_by (str): The criteria to sort grades. Can be 'all', 'week', or 'last_login'.
+
+    Returns:
+        Tuple: A tuple containing lists of numeric and descriptive grades, and GPA information.
+
+    Raises:
+        ArgumentError: If an invalid sort_by value is provided.
+        ParseError: If there is an error in parsing the grades.
+    """
+    payload = _grades_payload(sort_by)
+    response = await client.post(client.GRADES_URL, data=payload)
+    return await run_parser_async(
+        parse_grades, response.content, response_encoding(response)
+    )
+
+
+def iter_parse_grades(
+    chunks: Iterable[bytes], encoding: Optional[str] = None
+) -> Iterator[Grade]:
+    """
+    Parses the numeric grades of a grades page read in chunks, yielding them as their rows close.
+
+    The grades come in the order of `parse_grades`' rows, subject by subject, the first
+    semester's before the second's. Averages and descriptive grades are left out.
+
+    Args:
+        chunks (Iterable[bytes]): The raw page, e.g. `response.iter_content()`.
+        encoding (str, optional): Encoding of the page. Defaults to UTF-8.
+
+    Yields:
+        Grade: The numeric grades.
+
+    Raises:
+        TokenError: If the page says "Brak dostępu".
+        ParseError: If there is an error parsing the grades.
+    """
+    seen = 0
+    for outer in iter_closed(chunks, "tr", _OUTERMOST_ROW, encoding):
+        for box in _ROWS_WITHIN(outer):
+            seen += 1
+            row = _numeric_row_lxml(box)
+            if row is None:
+                continue
+            for semester in row[1]:
+                yield from semester
+    if seen < 1:
         raise ParseError("Error in parsing grades")
 
-    sem_grades, avg_grades = _extract_grades_numeric(tr)
-    sem_grades_desc = _extract_grades_descriptive(tr)
-    return sem_grades, avg_grades, sem_grades_desc
+
+def iter_grades(client: Client, sort_by: str = "all") -> Iterator[Grade]:
+    """
+    Streams the grades page and yields each numeric grade as soon as its row is downloaded.
+
+    The page is parsed while it downloads and what was already yielded is dropped, so the
+    first grades arrive before the page is complete and memory stays flat. The request is
+    never cached or coalesced with other callers.
+
+    Args:
+        client (Client): The client object used to interact with the server.
+        sort_by (str): The criteria to sort grades. Can be 'all', 'week', or 'last_login'.
+
+    Returns:
+        Iterator[Grade]: The numeric grades, in the order of `iter_parse_grades`.
+
+    Raises:
+        ArgumentError: If an invalid sort_by value is provided.
+        ParseError: If there is an error in parsing the grades, once the page is read.
+    """
+    payload = _grades_payload(sort_by)
+    return stream_records(client, "POST", client.GRADES_URL, payload, iter_parse_grades)
 
 
 def _handle_subject(semester_grades) -> str:
     return semester_grades[0].text.replace("\n", "").strip()
 
 
-def _get_desc_and_counts(a: Tag, grade: str, subject: str) -> Tuple[str, bool]:
+def _get_desc_and_counts(title: str, grade: str, subject: str) -> Tuple[str, bool]:
     desc = f"Ocena: {grade}\nPrzedmiot: {subject}\n"
     desc += re.sub(
         r"<br*>",
         "\n",
-        a.attrs.get("title", "").replace("<br/>", "").replace("<br />", "\n"),
+        title.replace("<br/>", "").replace("<br />", "\n"),
     )
     gpacount = re.search("Licz do średniej: [a-zA-Z]{3}", desc)
     counts = False
@@ -184,14 +341,15 @@ def _get_desc_and_counts(a: Tag, grade: str, subject: str) -> Tuple[str, bool]:
 
 
 def _extract_grade_info(
-    a: Tag, subject: str
+    attrs: Mapping[str, str], text: str, subject: str
 ) -> Tuple[str, str, str, str, bool, str, str, int]:
-    date = re.search("Data:.{11}", a.attrs.get("title", ""))
+    """Extracts a grade from the attributes and text of its anchor, a bs4 Tag or an lxml element."""
+    date = re.search("Data:.{11}", attrs.get("title", ""))
     if date is None:
         raise ParseError("Error in getting grade's date.")
 
     attr_dict = {}
-    for attr in a.attrs["title"].replace("<br/>", "<br>").split("<br>"):
+    for attr in attrs["title"].replace("<br/>", "<br>").split("<br>"):
         if len(attr.strip()) >= 2:
             key, value = attr.split(": ", 1)
             attr_dict[key] = value
@@ -199,14 +357,14 @@ def _extract_grade_info(
     teacher: str = attr_dict.get("Nauczyciel", "")
     weight: int = int(attr_dict.get("Waga", 0))
 
-    grade = a.text.replace("\xa0", "").replace("\n", "")
-    desc, counts = _get_desc_and_counts(a, grade, subject)
+    grade = text.replace("\xa0", "").replace("\n", "")
+    desc, counts = _get_desc_and_counts(attrs.get("title", ""), grade, subject)
     date = date.group().split(" ")
     date = date[1] if len(date) >= 2 else " ".join(date)
     return (
         grade,
         date,
-        a.attrs.get("href", ""),
+        attrs.get("href", ""),
         desc,
         counts,
         category,
@@ -215,165 +373,386 @@ def _extract_grade_info(
     )
 
 
-def _extract_grades_numeric(
-    table_rows: List[Tag],
-) -> Tuple[List[DefaultDict[str, List[Grade]]], DefaultDict[str, List[Gpa]]]:
-    # list containing two dicts (for each semester)
-    # key of each semester dict is subject, in each subject there is list of grades
-    sem_grades: List[DefaultDict[str, List[Grade]]] = [
-        defaultdict(list) for _ in range(2)
-    ]  # 2 semesters
-    avg_grades: DefaultDict[str, List[Gpa]] = defaultdict(list)
+# the class attribute of the cell marking a row of numeric or descriptive grades
+_NUMERIC_MARKER = "center micro screen-only"
+_DESCRIPTIVE_MARKER = "micro center screen-only"
+# compiled once, `Tag.select` would parse the selector again on every call
+_GRADE_LINK = sv.compile("td[class!='center'] > span.grade-box > a")
+_IMPROVED_GRADE_LINK = sv.compile("td[class!='center'] > span > span.grade-box > a")
 
-    for box in table_rows:
-        if box.select_one("td[class='center micro screen-only']") is None:
-            # row without grade data - skip
-            continue
-        semester_grades = box.select('td[class!="center micro screen-only"]')
-        if len(semester_grades) < 9:
-            continue
-        average_grades = list(map(lambda x: x.text, box.select("td.right")))
-        semesters = [semester_grades[1:4], semester_grades[4:7]]
-        subject = _handle_subject(semester_grades)
-        for semester_number, semester in enumerate(semesters):
-            if subject not in sem_grades[semester_number]:
-                sem_grades[semester_number][subject] = []
-            for sg in semester:
-                grade_a_improved = sg.select(
-                    "td[class!='center'] > span > span.grade-box > a"
-                )
-                grade_a = (
-                    sg.select("td[class!='center'] > span.grade-box > a")
-                    + grade_a_improved
-                )
-                for a in grade_a:
-                    (
-                        _grade,
-                        date,
-                        _href,
-                        desc,
-                        counts,
-                        category,
-                        teacher,
-                        weight,
-                    ) = _extract_grade_info(a, subject)
-                    g = Grade(
-                        subject,
-                        _grade,
-                        counts,
-                        date,
-                        a.attrs.get("href", ""),
-                        desc,
-                        semester_number + 1,
-                        category,
-                        teacher,
-                        weight,
-                    )
-                    sem_grades[semester_number][subject].append(g)
-            avg_gr = (
-                average_grades[semester_number]
-                if len(average_grades) >= semester_number
-                else 0.0
-            )  # might happen that the list is empty
-            gpa = Gpa(semester_number + 1, avg_gr, subject)
-            avg_grades[subject].append(gpa)
-        avg_gr = (
-            average_grades[-1] if len(average_grades) > 0 else 0.0
-        )  # might happen that the list is empty
-        avg_grades[subject].append(Gpa(0, avg_gr, subject))
 
-    return sem_grades, avg_grades
+def _class_attr(tag: Tag) -> str:
+    """The class attribute of a tag the way `[class=...]` selectors compare it."""
+    value = tag.get("class")
+    if not value:
+        return ""
+    return value if isinstance(value, str) else " ".join(value)
+
 
+def _extract_grades(table_rows: List[Tag]) -> Tuple[
+    List[DefaultDict[str, List[Grade]]],
+    DefaultDict[str, List[Gpa]],
+    List[DefaultDict[str, List[GradeDescriptive]]],
+]:
+    """
+    Extracts the numeric, average and descriptive grades in a single pass over the rows.
 
-def _extract_grades_descriptive(
-    table_rows: List[Tag],
-) -> List[DefaultDict[str, List[GradeDescriptive]]]:
+    The cells of every row are looked up once and classified by their class attribute;
+    the rows are then handled by the numeric, the descriptive and the semester summary
+    extraction, each of which ignores the rows that aren't its own.
+    """
     # list containing two dicts (for each semester)
     # key of each semester dict is subject, in each subject there is list of grades
-    sem_grades_desc: List[DefaultDict[str, List[GradeDescriptive]]] = [
+    sem_grades: List[DefaultDict[str, List[Grade]]] = [
         defaultdict(list) for _ in range(2)
     ]  # 2 semesters
+    avg_grades: DefaultDict[str, List[Gpa]] = defaultdict(list)
+    sem_grades_desc: List[DefaultDict[str, List[GradeDescriptive]]] = [
+        defaultdict(list) for _ in range(2)
+    ]
+    summary = _SemesterSummary()
 
     for box in table_rows:
-        if box.select_one("td[class='micro center screen-only']") is None:
-            # row without descriptive grade data - skip
-            continue
-        semester_grades = box.select('td[class!="micro center screen-only"]')
-        if len(semester_grades) < 3:
-            continue
-        semesters = [semester_grades[1], semester_grades[2]]
-        subject = semester_grades[0].text.replace("\n", "").strip()
-        for sem_index, sg in enumerate(semesters):
-            grade_a = sg.select("td[class!='center'] > span.grade-box > a")
+        cells: List[Tag] = box.find_all("td")
+        classes = [_class_attr(td) for td in cells]
+        if _NUMERIC_MARKER in classes:
+            _add_numeric_row(sem_grades, avg_grades, cells, classes)
+        if _DESCRIPTIVE_MARKER in classes:
+            _add_descriptive_row(sem_grades_desc, cells, classes)
+        summary.feed(box)
+
+    # added last, after every descriptive grade of its subject
+    if summary.found:
+        _add_semester_summary(
+            sem_grades_desc, summary.title, summary.date, summary.teacher, summary.desc
+        )
+    return sem_grades, avg_grades, sem_grades_desc
+
+
+def _add_numeric_row(
+    sem_grades: List[DefaultDict[str, List[Grade]]],
+    avg_grades: DefaultDict[str, List[Gpa]],
+    cells: List[Tag],
+    classes: List[str],
+) -> None:
+    semester_grades = [td for td, c in zip(cells, classes) if c != _NUMERIC_MARKER]
+    if len(semester_grades) < 9:
+        return
+    average_grades = [td.text for td in cells if "right" in (td.get("class") or ())]
+    semesters = [semester_grades[1:4], semester_grades[4:7]]
+    subject = _handle_subject(semester_grades)
+    for semester_number, semester in enumerate(semesters):
+        if subject not in sem_grades[semester_number]:
+            sem_grades[semester_number][subject] = []
+        for sg in semester:
+            grade_a = _GRADE_LINK.select(sg) + _IMPROVED_GRADE_LINK.select(sg)
             for a in grade_a:
+                (
+                    _grade,
+                    date,
+                    _href,
+                    desc,
+                    counts,
+                    category,
+                    teacher,
+                    weight,
+                ) = _extract_grade_info(a.attrs, a.text, subject)
+                g = Grade(
+                    subject,
+                    _grade,
+                    counts,
+                    date,
+                    a.attrs.get("href", ""),
+                    desc,
+                    semester_number + 1,
+                    category,
+                    teacher,
+                    weight,
+                )
+                sem_grades[semester_number][subject].append(g)
+        avg_gr = (
+            average_grades[semester_number]
+            if len(average_grades) >= semester_number
+            else 0.0
+        )  # might happen that the list is empty
+        gpa = Gpa(semester_number + 1, avg_gr, subject)
+        avg_grades[subject].append(gpa)
+    avg_gr = (
+        average_grades[-1] if len(average_grades) > 0 else 0.0
+    )  # might happen that the list is empty
+    avg_grades[subject].append(Gpa(0, avg_gr, subject))
+
+
+def _add_descriptive_row(
+    sem_grades_desc: List[DefaultDict[str, List[GradeDescriptive]]],
+    cells: List[Tag],
+    classes: List[str],
+) -> None:
+    semester_grades = [
+        td for td, c in zip(cells, classes) if c != _DESCRIPTIVE_MARKER
+    ]
+    if len(semester_grades) < 3:
+        return
+    semesters = [semester_grades[1], semester_grades[2]]
+    subject = semester_grades[0].text.replace("\n", "").strip()
+    for sem_index, sg in enumerate(semesters):
+        for a in _GRADE_LINK.select(sg):
+            (
+                _grade,
+                date,
+                href,
+                desc,
+                _,
+                _category,
+                teacher,
+                _weight,
+            ) = _extract_grade_info(a.attrs, a.text, subject)
+            if "javascript" in href:
+                # javascript content is not standard href - clear it
+                href = ""
+            g = GradeDescriptive(
+                subject, _grade, date, href, desc, sem_index + 1, teacher
+            )
+            sem_grades_desc[sem_index][subject].append(g)
+
+
+class _SemesterSummary:
+    """Finds the descriptive semester grade: a header row, then a row of paragraphs."""
+
+    def __init__(self):
+        self.found = False
+        self.title = ""
+        self.desc = ""
+        self.date = ""
+        self.teacher = ""
+        self._parse_next_row = False
+
+    def feed(self, box: Tag) -> None:
+        if self.found:
+            # There is no more grades for now (for first semester). Maybe there will be grade for
+            # second semester, but the format (structure) of web page is unknown for the moment.
+            # #TODO: implement the case for second semester (in future)
+            return
+        if self._parse_next_row:
+            paragraphs = box.find_all("p")
+            text_list = [par.text.strip() for par in paragraphs]
+            self.desc = "\n".join(text_list).strip()
+            self.found = True
+            return
+
+        header = box.find("th")
+        if header is None:
+            return
+        title_tag = header.find("strong")
+        if title_tag is None:
+            return
+        # header row found - next row will contain the description
+        self._parse_next_row = True
+        info = title_tag.next_sibling
+        if info is None:
+            return
+        self.title = title_tag.text.strip()
+        self.date = re.findall(r"opublikowano: (.+?) ", info.text)[0]  # get date only
+        self.teacher = re.findall(r"nauczyciel: (.+?)\)", info.text)[0]
+
+
+def _add_semester_summary(
+    sem_grades_desc: List[DefaultDict[str, List[GradeDescriptive]]],
+    title: str,
+    date: str,
+    teacher: str,
+    desc: str,
+) -> None:
+    sem_index = 0
+    semester_summary = GradeDescriptive(
+        title,
+        "",
+        date,
+        "",
+        desc,
+        sem_index + 1,
+        teacher,
+    )
+    if title not in sem_grades_desc[sem_index]:
+        sem_grades_desc[sem_index][title] = []
+    sem_grades_desc[sem_index][title].append(semester_summary)
+
+
+_ROWS = etree.XPath(f"//tr[{has_class('line0')} or {has_class('line1')}][not(@id)]")
+_HAS_NUMERIC = etree.XPath(f"boolean(.//td[{class_is('center micro screen-only')}])")
+_NUMERIC_CELLS = etree.XPath(f".//td[not({class_is('center micro screen-only')})]")
+_AVERAGES = etree.XPath(f".//td[{has_class('right')}]")
+_GRADE_LINKS = etree.XPath(
+    f".//a[parent::span[{has_class('grade-box')}]"
+    f"/parent::td[not({class_is('center')})]]"
+)
+_IMPROVED_GRADE_LINKS = etree.XPath(
+    f".//a[parent::span[{has_class('grade-box')}]"
+    f"/parent::span/parent::td[not({class_is('center')})]]"
+)
+_HAS_DESCRIPTIVE = etree.XPath(f"boolean(.//td[{class_is('micro center screen-only')}])")
+_DESCRIPTIVE_CELLS = etree.XPath(f".//td[not({class_is('micro center screen-only')})]")
+_HEADER_TITLE = etree.XPath("(.//th)[1]/descendant::strong[1]")
+_PARAGRAPHS = etree.XPath(".//p")
+# while streaming, rows nested in other rows are handled with the row that holds them
+_OUTERMOST_ROW = etree.XPath("not(ancestor::tr)")
+_ROWS_WITHIN = etree.XPath(
+    f"descendant-or-self::tr[{has_class('line0')} or {has_class('line1')}][not(@id)]"
+)
+
+
+def _numeric_row_lxml(
+    box: html.HtmlElement,
+) -> Optional[Tuple[str, List[List[Grade]]]]:
+    """Returns the subject of a numeric grades row and its grades per semester, None for other rows."""
+    if not _HAS_NUMERIC(box):
+        return None
+    semester_grades = _NUMERIC_CELLS(box)
+    if len(semester_grades) < 9:
+        return None
+    subject = node_text(semester_grades[0]).replace("\n", "").strip()
+    grades: List[List[Grade]] = []
+    for semester_number, semester in enumerate(
+        [semester_grades[1:4], semester_grades[4:7]]
+    ):
+        semester_list: List[Grade] = []
+        for sg in semester:
+            for a in _GRADE_LINKS(sg) + _IMPROVED_GRADE_LINKS(sg):
                 (
                     _grade,
                     date,
                     href,
                     desc,
-                    _,
-                    _category,
+                    counts,
+                    category,
                     teacher,
-                    _weight,
-                ) = _extract_grade_info(a, subject)
-                if "javascript" in href:
-                    # javascript content is not standard href - clear it
-                    href = ""
-                g = GradeDescriptive(
-                    subject, _grade, date, href, desc, sem_index + 1, teacher
+                    weight,
+                ) = _extract_grade_info(a.attrib, node_text(a), subject)
+                g = Grade(
+                    subject,
+                    _grade,
+                    counts,
+                    date,
+                    href,
+                    desc,
+                    semester_number + 1,
+                    category,
+                    teacher,
+                    weight,
                 )
-                sem_grades_desc[sem_index][subject].append(g)
+                semester_list.append(g)
+        grades.append(semester_list)
+    return subject, grades
 
-    # get semester descriptive grade
-    found_grade = False
-    summary_title = ""
-    summary_desc = ""
-    summary_date = ""
-    summary_teacher = ""
 
+def _extract_grades_lxml(table_rows: List[html.HtmlElement]) -> Tuple[
+    List[DefaultDict[str, List[Grade]]],
+    DefaultDict[str, List[Gpa]],
+    List[DefaultDict[str, List[GradeDescriptive]]],
+]:
+    # the lxml counterpart of _extract_grades, keep the two in sync
+    sem_grades: List[DefaultDict[str, List[Grade]]] = [
+        defaultdict(list) for _ in range(2)
+    ]
+    avg_grades: DefaultDict[str, List[Gpa]] = defaultdict(list)
+    sem_grades_desc: List[DefaultDict[str, List[GradeDescriptive]]] = [
+        defaultdict(list) for _ in range(2)
+    ]
+    summary: Optional[Tuple[str, str, str, str]] = None
+    summary_title = summary_date = summary_teacher = ""
     parse_next_row = False
+
     for box in table_rows:
+        _add_numeric_row_lxml(sem_grades, avg_grades, box)
+        _add_descriptive_row_lxml(sem_grades_desc, box)
+        if summary is not None:
+            continue
         if parse_next_row:
-            parse_next_row = False
-            paragraphs = box.find_all("p")
-            text_list = [par.text.strip() for par in paragraphs]
-            summary_desc = "\n".join(text_list).strip()
-            found_grade = True
-            # description found - break
-            # There is no more grades for now (for first semester). Maybe there will be grade for
-            # second semester, but the format (structure) of web page is unknown for the moment.
-            # #TODO: implement the case for second semester (in future)
-            break
+            paragraphs = [node_text(p).strip() for p in _PARAGRAPHS(box)]
+            summary = (
+                summary_title,
+                summary_date,
+                summary_teacher,
+                "\n".join(paragraphs).strip(),
+            )
+            continue
 
-        header = box.select_one("th")
-        if header and header.select_one("strong") is not None:
-            # header row found - next row will contain the description
+        title_tag = _HEADER_TITLE(box)
+        if title_tag:
             parse_next_row = True
-            title_tag = header.select_one("strong")
-            if title_tag is None:
-                continue
-            info = title_tag.next_sibling
+            info = _next_sibling_text(title_tag[0])
             if info is None:
                 continue
-            summary_title = title_tag.text.strip()
-            summary_date = re.findall(r"opublikowano: (.+?) ", info.text)[
-                0
-            ]  # get date only
-            summary_teacher = re.findall(r"nauczyciel: (.+?)\)", info.text)[0]
-
-    if found_grade:
-        sem_index = 0
-        semester_summary = GradeDescriptive(
-            summary_title,
-            "",
-            summary_date,
-            "",
-            summary_desc,
-            sem_index + 1,
-            summary_teacher,
-        )
-        if summary_title not in sem_grades_desc[sem_index]:
-            sem_grades_desc[sem_index][summary_title] = []
-        sem_grades_desc[sem_index][summary_title].append(semester_summary)
+            summary_title = node_text(title_tag[0]).strip()
+            summary_date = re.findall(r"opublikowano: (.+?) ", info)[0]
+            summary_teacher = re.findall(r"nauczyciel: (.+?)\)", info)[0]
 
-    return sem_grades_desc
+    if summary is not None:
+        _add_semester_summary(sem_grades_desc, *summary)
+    return sem_grades, avg_grades, sem_grades_desc
+
+
+def _add_numeric_row_lxml(
+    sem_grades: List[DefaultDict[str, List[Grade]]],
+    avg_grades: DefaultDict[str, List[Gpa]],
+    box: html.HtmlElement,
+) -> None:
+    row = _numeric_row_lxml(box)
+    if row is None:
+        return
+    subject, grades = row
+    average_grades = [node_text(td) for td in _AVERAGES(box)]
+    for semester_number, semester in enumerate(grades):
+        sem_grades[semester_number][subject].extend(semester)
+        avg_gr = (
+            average_grades[semester_number]
+            if len(average_grades) >= semester_number
+            else 0.0
+        )
+        avg_grades[subject].append(Gpa(semester_number + 1, avg_gr, subject))
+    avg_gr = average_grades[-1] if len(average_grades) > 0 else 0.0
+    avg_grades[subject].append(Gpa(0, avg_gr, subject))
+
+
+def _add_descriptive_row_lxml(
+    sem_grades_desc: List[DefaultDict[str, List[GradeDescriptive]]],
+    box: html.HtmlElement,
+) -> None:
+    if not _HAS_DESCRIPTIVE(box):
+        return
+    semester_grades = _DESCRIPTIVE_CELLS(box)
+    if len(semester_grades) < 3:
+        return
+    semesters = [semester_grades[1], semester_grades[2]]
+    subject = node_text(semester_grades[0]).replace("\n", "").strip()
+    for sem_index, sg in enumerate(semesters):
+        for a in _GRADE_LINKS(sg):
+            (
+                _grade,
+                date,
+                href,
+                desc,
+                _,
+                _category,
+                teacher,
+                _weight,
+            ) = _extract_grade_info(a.attrib, node_text(a), subject)
+            if "javascript" in href:
+                href = ""
+            g = GradeDescriptive(
+                subject, _grade, date, href, desc, sem_index + 1, teacher
+            )
+            sem_grades_desc[sem_index][subject].append(g)
+
+
+def _next_sibling_text(element: html.HtmlElement) -> Optional[str]:
+    """The `.text` of what BeautifulSoup sees as the element's `next_sibling`."""
+    if element.tail:
+        return element.tail
+    sibling = element.getnext()
+    if sibling is None:
+        return None
+    if not isinstance(sibling.tag, str):
+        # a comment, whose text BeautifulSoup leaves out
+        return ""
+    return node_text(sibling)
@@ -0,0 +1,131 @@
+"""
+This module cuts the tail latency of slow Librus responses with hedged requests.
+
+Librus response times are long-tailed: most pages load in a fraction of a second, some take
+many times as long. With a hedge policy, an AsyncClient GET still running after a latency
+percentile of the recent responses is sent a second time; whichever copy answers first is
+used and the other one is cancelled. Only a bounded fraction of the requests may be hedged,
+so the extra load on Librus stays capped even when it slows down as a whole.
+
+Classes:
+    - HedgePolicy: When a request is hedged, with the latency window and the hedging budget.
+
+Usage:
+```python
+from librus_apix.client import new_async_client
+from librus_apix.hedge import HedgePolicy
+from librus_apix.announcements import get_announcements_async
+
+policy = HedgePolicy(percentile=95, max_extra=0.05)
+async with new_async_client(token=token, hedge_policy=policy) as client:
+    announcements = await get_announcements_async(client)
+print(policy.hedged, policy.hedge_wins, policy.delay())
+```
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Tuple
+
+
+class HedgePolicy:
+    """
+    When a request is hedged, with the latency window and the hedging budget.
+
+    The hedge delay is the `percentile` of the last `window` response times, clamped
+    between `min_delay` and `max_delay`, or `initial_delay` until `min_samples` responses
+    were seen. A hedge is only sent while the hedges stay below `max_extra` of the requests,
+    plus `burst` hedges to start with.
+
+    Share one policy between clients to share the budget; its latency window then mixes
+    their responses.
+
+    Attributes:
+        percentile (float): The latency percentile, 0-100, after which a request is hedged.
+        max_extra (float): The fraction of extra requests hedging may add.
+        methods (Tuple[str, ...]): The methods that may be hedged.
+        requests (int): The requests sent under this policy, hedges excluded.
+        hedged (int): The hedges sent.
+        hedge_wins (int): The hedges that answered before the original request.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_extra: float = 0.05,
+        window: int = 200,
+        min_samples: int = 20,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        max_delay: float = 10.0,
+        burst: int = 1,
+        methods: Tuple[str, ...] = ("GET",),
+    ):
+        """
+        Args:
+            percentile (float, optional): The latency percentile after which a request is hedged. Defaults to 95.
+            max_extra (float, optional): The fraction of extra requests hedging may add. Defaults to 0.05.
+            window (int, optional): How many recent response times are kept. Defaults to 200.
+            min_samples (int, optional): Response times needed before the percentile is used. Defaults to 20.
+            initial_delay (float, optional): The hedge delay until then, in seconds. Defaults to 1.
+            min_delay (float, optional): The shortest hedge delay in seconds. Defaults to 0.05.
+            max_delay (float, optional): The longest hedge delay in seconds. Defaults to 10.
+            burst (int, optional): Hedges allowed on top of the `max_extra` budget. Defaults to 1.
+            methods (Tuple[str, ...], optional): The methods that may be hedged; they must be idempotent.
+                Defaults to GET.
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.burst = burst
+        self.methods = tuple(method.upper() for method in methods)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<HedgePolicy p{self.percentile:g} {self.hedged}/{self.requests} hedged>"
+
+    def hedges(self, method: str) -> bool:
+        """Whether requests of `method` may be hedged."""
+        return method.upper() in self.methods
+
+    def delay(self) -> float:
+        """Returns how long a request may run before it is hedged."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._latencies)
+        # nearest rank
+        rank = max(0, -(-len(ordered) * self.percentile // 100) - 1)
+        return min(self.max_delay, max(self.min_delay, ordered[int(rank)]))
+
+    def record(self, latency: float) -> None:
+        """Adds the response time of a request to the latency window."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def started(self) -> None:
+        """Counts a request sent under this policy."""
+        with self._lock:
+            self.requests += 1
+
+    def try_hedge(self) -> bool:
+        """Takes a hedge from the budget, returns False if it is spent."""
+        with self._lock:
+            if self.hedged >= self.max_extra * self.requests + self.burst:
+                return False
+            self.hedged += 1
+            return True
+
+    def won(self) -> None:
+        """Counts a hedge that answered first."""
+        with self._lock:
+            self.hedge_wins += 1
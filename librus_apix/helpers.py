@@ -1,13 +1,261 @@
 """
-This module defines a function for checking access to Librus resources by examining the content of a BeautifulSoup object.
+This module defines helpers shared by the scrapers for turning fetched pages into parsed trees.
+
+Pages are parsed with one of two backends. "bs4" builds a BeautifulSoup object and selects
+with soupsieve; "lxml" runs the same extraction on an `lxml.html` tree with precompiled
+XPath, skipping the Python object tree BeautifulSoup builds on top of lxml. Both produce
+identical results, "bs4" is the default.
 
 Functions:
     - no_access_check: Checks for access to Librus resources by examining the content of a BeautifulSoup object.
+    - make_soup: Builds a BeautifulSoup object from page text or raw bytes without guessing the encoding.
+    - page_region: Returns a SoupStrainer limiting the soup to the elements a parser reads.
+    - tree_no_access_check: Counterpart of no_access_check for lxml trees.
+    - make_tree: Builds an lxml.html tree from page text or raw bytes without guessing the encoding.
+    - node_text: Returns the text of an lxml element the way BeautifulSoup's `.text` does.
+    - has_class, class_is: Build XPath predicates matching the class attribute like CSS selectors do.
+    - set_parser_backend: Sets the process-wide parser backend.
+    - parser_backend: Context manager selecting the parser backend inside a block.
+    - current_parser_backend: Returns the parser backend in effect.
+    - set_parse_executor: Sets the process-wide executor page parsers run in.
+    - parse_executor: Context manager selecting the parse executor inside a block.
+    - current_parse_executor: Returns the parse executor in effect.
+    - run_parser, run_parser_async: Run a page parser, in the parse executor if one is set.
+    - iter_closed: Parses a page chunk by chunk, yielding the selected elements as soon as they close.
+    - stream_records: Streams a page and yields the records a chunk parser finds while it downloads.
+    - response_encoding: Returns the charset declared by a response, falling back to Librus' UTF-8.
+    - parse_results: Parses every response of a fetch_many batch, keeping errors per item.
+
+Usage:
+```python
+from librus_apix.grades import get_grades, parse_grades
+from librus_apix.helpers import parser_backend, set_parser_backend
+
+set_parser_backend("lxml")  # every parser in the process
+with parser_backend("bs4"):  # or just inside a block
+    grades = get_grades(client)
+grades = parse_grades(document, backend="lxml")  # or a single call
+
+# parse in worker processes, so threads fetching for many accounts use every core
+from concurrent.futures import ProcessPoolExecutor
+from librus_apix.helpers import set_parse_executor
 
+set_parse_executor(ProcessPoolExecutor())
+```
 """
 
-from bs4 import BeautifulSoup
-from librus_apix.exceptions import TokenError
+import asyncio
+import codecs
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html
+from librus_apix.client import Client, FetchResult
+from librus_apix.exceptions import ArgumentError, TokenError
+
+DEFAULT_ENCODING = "utf-8"
+STREAM_CHUNK_SIZE = 16 * 1024
+PARSER_BACKENDS = ("bs4", "lxml")
+
+T = TypeVar("T")
+
+_default_backend = "bs4"
+_backend: ContextVar[Optional[str]] = ContextVar("librus_parser_backend", default=None)
+# the default of `_executor` outside any `parse_executor` block, where None means "inline"
+_UNSET: Any = object()
+_default_executor: Optional[Executor] = None
+_executor: ContextVar[Optional[Executor]] = ContextVar(
+    "librus_parse_executor", default=_UNSET
+)
+
+
+def _checked_backend(backend: str) -> str:
+    if backend not in PARSER_BACKENDS:
+        raise ArgumentError(
+            f"Unknown parser backend {backend!r}, it can be either bs4 or lxml"
+        )
+    return backend
+
+
+def set_parser_backend(backend: str) -> None:
+    """
+    Sets the parser backend used by every thread that doesn't select one itself.
+
+    Args:
+        backend (str): Either "bs4" or "lxml".
+
+    Raises:
+        ArgumentError: If the backend is unknown.
+    """
+    global _default_backend
+    _default_backend = _checked_backend(backend)
+
+
+@contextmanager
+def parser_backend(backend: str) -> Iterator[str]:
+    """
+    Selects the parser backend for the pages parsed inside the block.
+
+    Like a deadline, it carries over to `fetch_many` worker threads and asyncio tasks started in the block.
+
+    Args:
+        backend (str): Either "bs4" or "lxml".
+
+    Yields:
+        str: The backend in effect inside the block.
+
+    Raises:
+        ArgumentError: If the backend is unknown.
+    """
+    token = _backend.set(_checked_backend(backend))
+    try:
+        yield backend
+    finally:
+        _backend.reset(token)
+
+
+def current_parser_backend(backend: Optional[str] = None) -> str:
+    """
+    Returns the parser backend in effect.
+
+    Args:
+        backend (str, optional): A backend chosen for a single call, which takes precedence.
+
+    Returns:
+        str: The backend chosen for the call, else the one of the enclosing `parser_backend`
+            block, else the process-wide one.
+
+    Raises:
+        ArgumentError: If the backend chosen for the call is unknown.
+    """
+    if backend is not None:
+        return _checked_backend(backend)
+    return _backend.get() or _default_backend
+
+
+def set_parse_executor(executor: Optional[Executor]) -> None:
+    """
+    Sets the executor the page parsers of every thread run in, unless one selects its own.
+
+    Parsing is CPU-bound and holds the GIL, so threads fetching for many accounts share one
+    core while they parse. With a `ProcessPoolExecutor` (or an `InterpreterPoolExecutor`)
+    the raw page goes to a worker and only the parsed records come back. The executor is
+    not shut down by the library.
+
+    Args:
+        executor (Executor | None): The executor, None to parse in the calling thread again.
+    """
+    global _default_executor
+    _default_executor = executor
+
+
+@contextmanager
+def parse_executor(executor: Optional[Executor]) -> Iterator[Optional[Executor]]:
+    """
+    Selects the executor the pages fetched inside the block are parsed in.
+
+    Like the parser backend, it carries over to `fetch_many` and `ClientPool` worker threads
+    and asyncio tasks started in the block.
+
+    Args:
+        executor (Executor | None): The executor, None to parse in the calling thread.
+
+    Yields:
+        Executor | None: The executor in effect inside the block.
+    """
+    token = _executor.set(executor)
+    try:
+        yield executor
+    finally:
+        _executor.reset(token)
+
+
+def current_parse_executor() -> Optional[Executor]:
+    """
+    Returns the parse executor in effect.
+
+    Returns:
+        Executor | None: The executor of the enclosing `parse_executor` block, else the
+            process-wide one, None if pages are parsed in the calling thread.
+    """
+    executor = _executor.get()
+    if executor is _UNSET:
+        return _default_executor
+    return executor
+
+
+def _parse_with_backend(
+    parser: Callable[..., T],
+    document: Union[str, bytes],
+    encoding: Optional[str],
+    backend: str,
+) -> T:
+    with parser_backend(backend):
+        return parser(document, encoding)
+
+
+def _submit_parser(
+    executor: Executor,
+    parser: Callable[..., T],
+    document: Union[str, bytes],
+    encoding: Optional[str],
+) -> "Future[T]":
+    # worker processes don't see this thread's backend selection, so it is passed along
+    return executor.submit(
+        _parse_with_backend, parser, document, encoding, current_parser_backend()
+    )
+
+
+def run_parser(
+    parser: Callable[..., T],
+    document: Union[str, bytes],
+    encoding: Optional[str] = None,
+) -> T:
+    """
+    Runs a page parser, in the parse executor if one is set.
+
+    Args:
+        parser (Callable[..., T]): A module level `parse_*` function taking the document
+            and its encoding.
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document. Defaults to UTF-8.
+
+    Returns:
+        T: What the parser returns. Exceptions it raises are raised here.
+    """
+    executor = current_parse_executor()
+    if executor is None:
+        return parser(document, encoding)
+    return _submit_parser(executor, parser, document, encoding).result()
+
+
+async def run_parser_async(
+    parser: Callable[..., T],
+    document: Union[str, bytes],
+    encoding: Optional[str] = None,
+) -> T:
+    """
+    Async counterpart of `run_parser`, which waits for the executor without blocking the event loop.
+    """
+    executor = current_parse_executor()
+    if executor is None:
+        return parser(document, encoding)
+    return await asyncio.wrap_future(
+        _submit_parser(executor, parser, document, encoding)
+    )
 
 
 def no_access_check(soup: BeautifulSoup) -> BeautifulSoup:
@@ -19,3 +267,325 @@ def no_access_check(soup: BeautifulSoup) -> BeautifulSoup:
         raise TokenError("Malformed or expired token.")
     else:
         return soup
+
+
+def page_region(*names: str) -> SoupStrainer:
+    """
+    Returns a SoupStrainer keeping only the named elements, and the header `no_access_check` reads.
+
+    Kept elements keep everything inside them, so a parser's selectors run unchanged on the
+    smaller soup as long as the region contains every element they look at, ancestors
+    matched by `>` included. Only tag names are matched: how a strainer matches the class
+    attribute differs between BeautifulSoup versions.
+
+    Args:
+        *names (str): The tag names of the elements the parser reads.
+
+    Returns:
+        SoupStrainer: The strainer to pass to `make_soup`.
+    """
+    return SoupStrainer([*names, "h2"])
+
+
+def make_soup(
+    document: Union[str, bytes],
+    encoding: Optional[str] = None,
+    parse_only: Optional[SoupStrainer] = None,
+) -> BeautifulSoup:
+    """
+    Builds a BeautifulSoup object from page text or raw bytes.
+
+    Raw bytes are handed to lxml together with `encoding`, so the body is decoded once
+    and never run through charset detection.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document. Defaults to UTF-8, which Librus serves.
+        parse_only (SoupStrainer, optional): Builds only the elements it keeps, see `page_region`.
+            Defaults to the whole page.
+
+    Returns:
+        BeautifulSoup: The parsed document.
+    """
+    if isinstance(document, bytes):
+        return BeautifulSoup(
+            document,
+            "lxml",
+            from_encoding=encoding or DEFAULT_ENCODING,
+            parse_only=parse_only,
+        )
+    return BeautifulSoup(document, "lxml", parse_only=parse_only)
+
+
+_SKIPS_TEXT = etree.XPath("boolean(.//script | .//style | .//template)")
+_VISIBLE_TEXT = etree.XPath(
+    "descendant-or-self::text()[not(ancestor::script | ancestor::style | ancestor::template)]"
+)
+_NO_ACCESS_HEADER = etree.XPath(
+    "(//h2[contains(concat(' ', normalize-space(@class), ' '), ' inside ')])[1]"
+)
+
+
+def make_tree(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> html.HtmlElement:
+    """
+    Builds an lxml.html tree from page text or raw bytes.
+
+    The lxml counterpart of `make_soup`, decoding raw bytes with `encoding` the same way.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document. Defaults to UTF-8, which Librus serves.
+
+    Returns:
+        html.HtmlElement: The root element of the parsed document.
+    """
+    parser = None
+    if isinstance(document, bytes):
+        parser = html.HTMLParser(encoding=encoding or DEFAULT_ENCODING)
+    try:
+        return html.document_fromstring(document, parser=parser)
+    except etree.ParserError:
+        # an empty document, which BeautifulSoup turns into an empty soup
+        return html.Element("html")
+
+
+def tree_no_access_check(root: html.HtmlElement) -> html.HtmlElement:
+    """
+    Counterpart of `no_access_check` for trees built by `make_tree`.
+
+    Raises:
+        TokenError: If the page says "Brak dostępu".
+    """
+    no_access = _NO_ACCESS_HEADER(root)
+    if no_access and "Brak dostępu" in node_text(no_access[0]):
+        raise TokenError("Malformed or expired token.")
+    return root
+
+
+def node_text(element: Any) -> str:
+    """
+    Returns the text of an lxml element exactly like BeautifulSoup's `.text`.
+
+    Comments and the contents of script, style and template elements are left out.
+
+    Args:
+        element (Any): An lxml element.
+
+    Returns:
+        str: The concatenated text of the element and its descendants.
+    """
+    if _SKIPS_TEXT(element):
+        return "".join(_VISIBLE_TEXT(element))
+    return "".join(element.itertext())
+
+
+_INSIDE_HEADER = etree.XPath(
+    "boolean(self::h2[contains(concat(' ', normalize-space(@class), ' '), ' inside ')])"
+)
+
+
+def iter_closed(
+    chunks: Iterable[bytes],
+    tag: str,
+    select: Callable[[html.HtmlElement], Any],
+    encoding: Optional[str] = None,
+) -> Iterator[html.HtmlElement]:
+    """
+    Parses a page chunk by chunk and yields the selected elements as soon as they close.
+
+    Only the part of the page read so far is in the tree, and every yielded element is
+    emptied, together with the siblings before it, once the consumer asks for the next one,
+    so memory stays flat however long the page is. The header `tree_no_access_check`
+    reads is checked the moment it closes.
+
+    Args:
+        chunks (Iterable[bytes]): The raw page, e.g. `response.iter_content()`.
+        tag (str): The tag name of the elements to yield.
+        select (Callable[[html.HtmlElement], Any]): Called on every closed `tag` element,
+            which is yielded if it returns a truthy value. Its ancestors are already in the
+            tree, its following siblings are not.
+        encoding (str, optional): Encoding of the page. Defaults to UTF-8, which Librus serves.
+
+    Yields:
+        html.HtmlElement: The selected elements, in the order they close.
+
+    Raises:
+        TokenError: If the page says "Brak dostępu".
+    """
+    parser = etree.HTMLPullParser(
+        events=("end",), tag=(tag, "h2"), encoding=encoding or DEFAULT_ENCODING
+    )
+    parser.set_element_class_lookup(html.HtmlElementClassLookup())
+    checked = False
+
+    def closed() -> Iterator[html.HtmlElement]:
+        nonlocal checked
+        for _, element in parser.read_events():
+            if element.tag != tag:
+                if not checked and _INSIDE_HEADER(element):
+                    checked = True
+                    if "Brak dostępu" in node_text(element):
+                        raise TokenError("Malformed or expired token.")
+                continue
+            if not select(element):
+                continue
+            yield element
+            element.clear(keep_tail=True)
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from closed()
+    try:
+        parser.close()
+    except etree.ParserError:
+        # an empty document, which holds nothing to yield
+        return
+    yield from closed()
+
+
+def stream_records(
+    client: Client,
+    method: str,
+    url: str,
+    data: Optional[Dict[str, Any]],
+    parser: Callable[[Iterable[bytes], str], Iterator[T]],
+) -> Iterator[T]:
+    """
+    Streams a page and yields the records `parser` finds in it while it downloads.
+
+    Like `Client.get` and `Client.post`, a rejected token is replaced by a new login and the
+    page requested again once, if the client has credentials and nothing was yielded yet.
+
+    Args:
+        client (Client): The client to send the request with.
+        method (str): "GET" or "POST".
+        url (str): The URL of the page.
+        data (Dict[str, Any], optional): The form data of a POST request.
+        parser (Callable[[Iterable[bytes], str], Iterator[T]]): An `iter_parse_*` function
+            taking the raw chunks and their encoding.
+
+    Yields:
+        T: The records, as soon as the parser finds them.
+
+    Raises:
+        TokenError: If the token was rejected and couldn't be replaced.
+    """
+    stale = client.token.API_Key
+    yielded = False
+    try:
+        with client.stream(method, url, data) as response:
+            chunks = response.iter_content(STREAM_CHUNK_SIZE)
+            for record in parser(chunks, response_encoding(response)):
+                yielded = True
+                yield record
+        return
+    except TokenError:
+        if yielded or client.credentials is None:
+            raise
+    client.reauthenticate(stale)
+    with client.stream(method, url, data) as response:
+        chunks = response.iter_content(STREAM_CHUNK_SIZE)
+        yield from parser(chunks, response_encoding(response))
+
+
+def has_class(name: str) -> str:
+    """Returns an XPath predicate matching elements with a class, like the CSS `.name`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def class_is(value: str) -> str:
+    """Returns an XPath predicate matching the whole class attribute, like the CSS `[class="value"]`."""
+    return f"normalize-space(@class) = '{value}'"
+
+
+def response_encoding(response: Any) -> str:
+    """
+    Returns the charset declared in a response's Content-Type header.
+
+    Unlike `requests.Response.text` it never inspects the body; a missing or unknown charset yields UTF-8.
+
+    Args:
+        response (Any): A `requests.Response` or `librus_apix.client.AsyncResponse`.
+
+    Returns:
+        str: The encoding to decode the response content with.
+    """
+    content_type = ""
+    for key, value in response.headers.items():
+        if key.lower() == "content-type":
+            content_type = value
+            break
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() != "charset":
+            continue
+        charset = value.strip().strip("\"'")
+        try:
+            return codecs.lookup(charset).name
+        except LookupError:
+            break
+    return DEFAULT_ENCODING
+
+
+def parse_results(
+    results: List[FetchResult], parser: Callable[..., T]
+) -> List[Union[T, Exception]]:
+    """
+    Parses every response of a `fetch_many` batch, keeping errors per item.
+
+    With a parse executor set, the pages are all submitted before the first result is awaited.
+
+    Args:
+        results (List[FetchResult]): The batch results.
+        parser (Callable[..., T]): A `parse_*` function taking the document and its encoding.
+
+    Returns:
+        List[Union[T, Exception]]: The parsed result, or the exception raised while fetching
+            or parsing it, for every request in input order.
+    """
+    executor = current_parse_executor()
+    if executor is not None:
+        return _parse_results_in(executor, results, parser)
+    parsed: List[Union[T, Exception]] = []
+    for result in results:
+        if result.error is not None:
+            parsed.append(result.error)
+            continue
+        response = result.response
+        try:
+            parsed.append(parser(response.content, response_encoding(response)))
+        except Exception as e:
+            parsed.append(e)
+    return parsed
+
+
+def _parse_results_in(
+    executor: Executor, results: List[FetchResult], parser: Callable[..., T]
+) -> List[Union[T, Exception]]:
+    pending: List[Union[Exception, "Future[T]"]] = []
+    for result in results:
+        if result.error is not None:
+            pending.append(result.error)
+            continue
+        response = result.response
+        pending.append(
+            _submit_parser(
+                executor, parser, response.content, response_encoding(response)
+            )
+        )
+    parsed: List[Union[T, Exception]] = []
+    for item in pending:
+        if isinstance(item, Exception):
+            parsed.append(item)
+            continue
+        try:
+            parsed.append(item.result())
+        except Exception as e:
+            parsed.append(e)
+    return parsed
@@ -6,7 +6,12 @@ Classes:
 
 Functions:
     - homework_detail: Retrieves detailed information about a specific homework assignment.
+    - homework_details: Retrieves many homework details concurrently.
     - get_homework: Retrieves homework assignments within a specified date range.
+    - parse_homework_detail: Parses homework details from an already fetched page.
+    - parse_homework: Parses homework assignments from an already fetched page.
+
+    Every fetching function above has an `*_async` counterpart taking an AsyncClient.
 
 Usage:
 ```python
@@ -27,10 +32,17 @@ for homework in homework_assignments:
 ```
 """
 
-from typing import List, Dict
-from bs4 import BeautifulSoup, NavigableString
-from librus_apix.client import Client
-from librus_apix.helpers import no_access_check
+from typing import Dict, Iterable, List, Optional, Union
+from bs4 import NavigableString
+from librus_apix.client import AsyncClient, Client
+from librus_apix.concurrency import AdaptiveLimit
+from librus_apix.helpers import (
+    make_soup,
+    no_access_check,
+    parse_results,
+    response_encoding,
+)
+from librus_apix.singleflight import coalesced, coalesced_async
 from librus_apix.exceptions import ParseError
 from dataclasses import dataclass
 
@@ -70,6 +82,7 @@ def _sanitize_onclick_href(onclick: str) -> str:
     return href[3]
 
 
+@coalesced
 def homework_detail(client: Client, detail_url: str) -> Dict[str, str]:
     """
     Fetches and parses detailed information about a specific homework assignment.
@@ -85,10 +98,95 @@ def homework_detail(client: Client, detail_url: str) -> Dict[str, str]:
     Raises:
         ParseError: If there is an error in parsing the homework details.
     """
-    h_desc = {}
-    soup = no_access_check(
-        BeautifulSoup(client.get(client.HOMEWORK_DETAILS_URL + detail_url).text, "lxml")
+    response = client.get(client.HOMEWORK_DETAILS_URL + detail_url)
+    return parse_homework_detail(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def homework_detail_async(client: AsyncClient, detail_url: str) -> Dict[str, str]:
+    """
+    Async counterpart of homework_detail.
+
+    Args:
+        client (AsyncClient): The async client object used to interact with the server.
+        detail_url (str): The URL suffix to fetch the detailed homework information.
+
+    Returns:
+        Dict[str, str]: A dictionary containing detailed homework information.
+
+    Raises:
+        ParseError: If there is an error in parsing the homework details.
+    """
+    response = await client.get(client.HOMEWORK_DETAILS_URL + detail_url)
+    return parse_homework_detail(response.content, response_encoding(response))
+
+
+def homework_details(
+    client: Client,
+    detail_urls: Iterable[str],
+    max_concurrency: Union[int, AdaptiveLimit] = 8,
+) -> List[Union[Dict[str, str], Exception]]:
+    """
+    Batch form of homework_detail, fetching homework details concurrently.
+
+    Args:
+        client (Client): The client object used to make the requests.
+        detail_urls (Iterable[str]): The URL suffixes of the homework details.
+        max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight,
+            or an adaptive limit. Defaults to 8.
+
+    Returns:
+        List[Union[Dict[str, str], Exception]]: The result of every request in input order,
+            or the exception it raised.
+    """
+    results = client.fetch_many(
+        [client.HOMEWORK_DETAILS_URL + url for url in detail_urls], max_concurrency
     )
+    return parse_results(results, parse_homework_detail)
+
+
+async def homework_details_async(
+    client: AsyncClient,
+    detail_urls: Iterable[str],
+    max_concurrency: Union[int, AdaptiveLimit] = 8,
+) -> List[Union[Dict[str, str], Exception]]:
+    """
+    Async counterpart of homework_details.
+
+    Args:
+        client (AsyncClient): The async client object used to make the requests.
+        detail_urls (Iterable[str]): The URL suffixes of the homework details.
+        max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight,
+            or an adaptive limit. Defaults to 8.
+
+    Returns:
+        List[Union[Dict[str, str], Exception]]: The result of every request in input order,
+            or the exception it raised.
+    """
+    results = await client.fetch_many(
+        [client.HOMEWORK_DETAILS_URL + url for url in detail_urls], max_concurrency
+    )
+    return parse_results(results, parse_homework_detail)
+
+
+def parse_homework_detail(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Parses an already fetched homework detail page.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+
+    Returns:
+        Dict[str, str]: A dictionary containing detailed homework information.
+
+    Raises:
+        ParseError: If there is an error in parsing the homework details.
+    """
+    h_desc = {}
+    soup = no_access_check(make_soup(document, encoding))
     div = soup.find("div", attrs={"class": "container-background"})
     if div is None or isinstance(div, NavigableString):
         raise ParseError("Error in parsing Homework details.")
@@ -101,35 +199,32 @@ def homework_detail(client: Client, detail_url: str) -> Dict[str, str]:
     return h_desc
 
 
-def get_homework(client: Client, date_from: str, date_to: str) -> List[Homework]:
+def _homework_payload(date_from: str, date_to: str) -> Dict[str, str]:
+    return {
+        "dataOd": date_from,
+        "dataDo": date_to,
+        "przedmiot": "-1",
+        "status": "-1",
+    }
+
+
+def parse_homework(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> List[Homework]:
     """
-    Fetches and parses the list of homework assignments within a specified date range.
+    Parses homework assignments from an already fetched homework page.
 
     Args:
-        client (Client): The client object used to interact with the server.
-        date_from (str): The start date for fetching homework assignments (format: 'YYYY-MM-DD').
-        date_to (str): The end date for fetching homework assignments (format: 'YYYY-MM-DD').
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
 
     Returns:
-        List[Homework]: A list of Homework objects representing the homework assignments within the specified date range.
+        List[Homework]: A list of Homework objects representing the homework assignments.
 
     Raises:
         ParseError: If there is an error in parsing the homework assignments.
     """
-    soup_base = no_access_check(
-        BeautifulSoup(
-            client.post(
-                client.HOMEWORK_URL,
-                data={
-                    "dataOd": date_from,
-                    "dataDo": date_to,
-                    "przedmiot": "-1",
-                    "status": "-1",
-                },
-            ).text,
-            "lxml",
-        )
-    )
+    soup_base = no_access_check(make_soup(document, encoding))
     soup = soup_base.find("table", attrs={"class": "decorated myHomeworkTable"})
     if soup is None or isinstance(soup, NavigableString):
         # no proper content found - error or no data
@@ -161,3 +256,47 @@ def get_homework(client: Client, date_from: str, date_to: str) -> List[Homework]
         )
         hw.append(h)
     return hw
+
+
+@coalesced
+def get_homework(client: Client, date_from: str, date_to: str) -> List[Homework]:
+    """
+    Fetches and parses the list of homework assignments within a specified date range.
+
+    Args:
+        client (Client): The client object used to interact with the server.
+        date_from (str): The start date for fetching homework assignments (format: 'YYYY-MM-DD').
+        date_to (str): The end date for fetching homework assignments (format: 'YYYY-MM-DD').
+
+    Returns:
+        List[Homework]: A list of Homework objects representing the homework assignments within the specified date range.
+
+    Raises:
+        ParseError: If there is an error in parsing the homework assignments.
+    """
+    payload = _homework_payload(date_from, date_to)
+    response = client.post(client.HOMEWORK_URL, data=payload)
+    return parse_homework(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def get_homework_async(
+    client: AsyncClient, date_from: str, date_to: str
+) -> List[Homework]:
+    """
+    Async counterpart of get_homework.
+
+    Args:
+        client (AsyncClient): The async client object used to interact with the server.
+        date_from (str): The start date for fetching homework assignments (format: 'YYYY-MM-DD').
+        date_to (str): The end date for fetching homework assignments (format: 'YYYY-MM-DD').
+
+    Returns:
+        List[Homework]: A list of Homework objects representing the homework assignments within the specified date range.
+
+    Raises:
+        ParseError: If there is an error in parsing the homework assignments.
+    """
+    payload = _homework_payload(date_from, date_to)
+    response = await client.post(client.HOMEWORK_URL, data=payload)
+    return parse_homework(response.content, response_encoding(response))
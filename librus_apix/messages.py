@@ -10,9 +10,15 @@ Functions:
     - get_recipients: Retrieves the recipients belonging to a specific group.
     - send_message: Sends a message to selected recipients.
     - message_content: Retrieves the content of a message.
+    - message_contents: Retrieves the contents of many messages concurrently.
     - get_max_page_number: Retrieves the maximum page number of messages.
     - get_received: Retrieves received messages from a specific page.
     - get_sent: Retrieves sent messages from a specific page.
+    - parse_recipient_groups, parse_recipients, parse_message_content, parse_max_page_number:
+      Parse the matching pages from an already fetched document.
+    - parse, parse_sent: Parse received/sent message lists from a document or a BeautifulSoup object.
+
+    Each fetching function has an `*_async` counterpart taking an AsyncClient.
 
 Usage:
     ```py
@@ -44,11 +50,28 @@ Usage:
     ```
 """
 
-from typing import List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from bs4 import BeautifulSoup, Tag
-from librus_apix.client import Client
+from lxml import etree, html
+from librus_apix.client import AsyncClient, Client
+from librus_apix.concurrency import AdaptiveLimit
 from librus_apix.exceptions import ParseError
-from librus_apix.helpers import no_access_check
+from librus_apix.helpers import (
+    class_is,
+    current_parser_backend,
+    has_class,
+    make_soup,
+    make_tree,
+    no_access_check,
+    node_text,
+    page_region,
+    parse_results,
+    response_encoding,
+    run_parser,
+    run_parser_async,
+    tree_no_access_check,
+)
+from librus_apix.singleflight import coalesced, coalesced_async
 from dataclasses import dataclass
 import re
 
@@ -93,6 +116,7 @@ class Message:
     has_attachment: bool
 
 
+@coalesced
 def recipient_groups(client: Client) -> List[str]:
     """
     Retrieves the list of recipient groups available for sending messages.
@@ -103,9 +127,39 @@ def recipient_groups(client: Client) -> List[str]:
     Returns:
         List[str]: A list of recipient group identifiers.
     """
-    soup = no_access_check(
-        BeautifulSoup(client.get(client.RECIPIENT_GROUPS_URL).text, "lxml")
-    )
+    response = client.get(client.RECIPIENT_GROUPS_URL)
+    return parse_recipient_groups(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def recipient_groups_async(client: AsyncClient) -> List[str]:
+    """
+    Async counterpart of recipient_groups.
+
+    Args:
+        client (AsyncClient): The async client object for making HTTP requests.
+
+    Returns:
+        List[str]: A list of recipient group identifiers.
+    """
+    response = await client.get(client.RECIPIENT_GROUPS_URL)
+    return parse_recipient_groups(response.content, response_encoding(response))
+
+
+def parse_recipient_groups(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> List[str]:
+    """
+    Parses recipient groups from an already fetched message form.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+
+    Returns:
+        List[str]: A list of recipient group identifiers.
+    """
+    soup = no_access_check(make_soup(document, encoding))
     groups = []
     trs = soup.select("table.message-recipients > tbody > tr")
     for tr in trs:
@@ -116,6 +170,7 @@ def recipient_groups(client: Client) -> List[str]:
     return groups
 
 
+@coalesced
 def get_recipients(client: Client, group: str):
     """
     Retrieves the recipients belonging to a specific group.
@@ -127,16 +182,52 @@ def get_recipients(client: Client, group: str):
     Returns:
         dict: A dictionary mapping teacher names to their IDs.
     """
-    payload = {
+    payload = _recipients_payload(group)
+    response = client.post(client.RECIPIENTS_URL, data=payload)
+    return parse_recipients(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def get_recipients_async(client: AsyncClient, group: str):
+    """
+    Async counterpart of get_recipients.
+
+    Args:
+        client (AsyncClient): The async client object for making HTTP requests.
+        group (str): The identifier of the recipient group.
+
+    Returns:
+        dict: A dictionary mapping teacher names to their IDs.
+    """
+    payload = _recipients_payload(group)
+    response = await client.post(client.RECIPIENTS_URL, data=payload)
+    return parse_recipients(response.content, response_encoding(response))
+
+
+def _recipients_payload(group: str) -> Dict[str, Any]:
+    return {
         "typAdresata": group,
         "poprzednia": "5",
         "tabZaznaczonych": "",
         "czyWirtualneKlasy": False,
         "idGrupy": "0",
     }
-    soup = no_access_check(
-        BeautifulSoup(client.post(client.RECIPIENTS_URL, data=payload).text, "lxml")
-    )
+
+
+def parse_recipients(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Parses recipients of a group from an already fetched recipient list.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+
+    Returns:
+        Dict[str, str]: A dictionary mapping teacher names to their IDs.
+    """
+    soup = no_access_check(make_soup(document, encoding))
     labels = soup.select("label")
     teachers = {}
     for label in labels:
@@ -165,7 +256,43 @@ def send_message(
         Tuple[bool, str]: A tuple indicating whether the message was sent successfully
         and the result message.
     """
-    payload = {
+    payload = _message_payload(title, content, recipient_ids)
+    response = client.post(client.SEND_MESSAGE_URL, data=payload)
+    return _parse_send_result(
+        response.content, response.status_code, response_encoding(response)
+    )
+
+
+async def send_message_async(
+    client: AsyncClient,
+    title: str,
+    content: str,
+    recipient_ids: list[str],
+) -> Tuple[bool, str]:
+    """
+    Async counterpart of send_message.
+
+    Args:
+        client (AsyncClient): The async client object for making HTTP requests.
+        title (str): The title of the message.
+        content (str): The content of the message.
+        recipient_ids (list[str]): The list of recipient IDs.
+
+    Returns:
+        Tuple[bool, str]: A tuple indicating whether the message was sent successfully
+        and the result message.
+    """
+    payload = _message_payload(title, content, recipient_ids)
+    response = await client.post(client.SEND_MESSAGE_URL, data=payload)
+    return _parse_send_result(
+        response.content, response.status_code, response_encoding(response)
+    )
+
+
+def _message_payload(
+    title: str, content: str, recipient_ids: list[str]
+) -> Dict[str, Any]:
+    return {
         "filtrUzytkownikow": "0",
         "idPojemnika": "",
         "DoKogo": recipient_ids,
@@ -176,16 +303,19 @@ def send_message(
         "fileStorageIdentifier": "",
         "wyslij": "Wyślij",
     }
-    sent_message = no_access_check(
-        BeautifulSoup(client.post(client.SEND_MESSAGE_URL, data=payload).text, "lxml")
-    )
+
+
+def _parse_send_result(
+    document: bytes, status_code: int, encoding: Optional[str] = None
+) -> Tuple[bool, str]:
+    sent_message = no_access_check(make_soup(document, encoding))
     result = sent_message.select_one("div.container-background > p")
     if result is None:
         raise ParseError("Error getting the result of the message!")
     result = result.text
     if "nie zostala" in result:
         return False, result
-    if sent_message.status_code == 200:
+    if status_code == 200:
         return True, result
     return False, result
 
@@ -195,6 +325,7 @@ def unwrap_message_data(tr: Tag) -> str:
     return value.text if value is not None else ""
 
 
+@coalesced
 def message_content(client: Client, content_url: str) -> MessageData:
     """
     Retrieves the content of a message.
@@ -206,9 +337,131 @@ def message_content(client: Client, content_url: str) -> MessageData:
     Returns:
         MessageData: An object containing the message details.
     """
-    soup = no_access_check(
-        BeautifulSoup(client.get(client.MESSAGE_URL + "/" + content_url).text, "lxml")
+    response = client.get(client.MESSAGE_URL + "/" + content_url)
+    return run_parser(
+        parse_message_content, response.content, response_encoding(response)
+    )
+
+
+@coalesced_async
+async def message_content_async(client: AsyncClient, content_url: str) -> MessageData:
+    """
+    Async counterpart of message_content.
+
+    Args:
+        client (AsyncClient): The async client object for making HTTP requests.
+        content_url (str): The URL of the message content.
+
+    Returns:
+        MessageData: An object containing the message details.
+    """
+    response = await client.get(client.MESSAGE_URL + "/" + content_url)
+    return await run_parser_async(
+        parse_message_content, response.content, response_encoding(response)
+    )
+
+
+def message_contents(
+    client: Client,
+    content_urls: Iterable[str],
+    max_concurrency: Union[int, AdaptiveLimit] = 8,
+) -> List[Union[MessageData, Exception]]:
+    """
+    Batch form of message_content, fetching message contents concurrently.
+
+    Args:
+        client (Client): The client object used to make the requests.
+        content_urls (Iterable[str]): The URLs of the message contents.
+        max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight,
+            or an adaptive limit. Defaults to 8.
+
+    Returns:
+        List[Union[MessageData, Exception]]: The result of every request in input order,
+            or the exception it raised.
+    """
+    results = client.fetch_many(
+        [client.MESSAGE_URL + "/" + url for url in content_urls], max_concurrency
+    )
+    return parse_results(results, parse_message_content)
+
+
+async def message_contents_async(
+    client: AsyncClient,
+    content_urls: Iterable[str],
+    max_concurrency: Union[int, AdaptiveLimit] = 8,
+) -> List[Union[MessageData, Exception]]:
+    """
+    Async counterpart of message_contents.
+
+    Args:
+        client (AsyncClient): The async client object used to make the requests.
+        content_urls (Iterable[str]): The URLs of the message contents.
+        max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight,
+            or an adaptive limit. Defaults to 8.
+
+    Returns:
+        List[Union[MessageData, Exception]]: The result of every request in input order,
+            or the exception it raised.
+    """
+    results = await client.fetch_many(
+        [client.MESSAGE_URL + "/" + url for url in content_urls], max_concurrency
+    )
+    return parse_results(results, parse_message_content)
+
+
+_MESSAGE_DATA = etree.XPath(f"(//table[{class_is('stretch')}])[1]")
+_ROWS = etree.XPath(".//tr")
+_LEFT_CELL = etree.XPath(f"(.//td[{class_is('left')}])[1]")
+_MESSAGE_CONTENT = etree.XPath(f"(//div[{has_class('container-message-content')}])[1]")
+
+
+def _unwrap_message_data_lxml(tr: html.HtmlElement) -> str:
+    value = _LEFT_CELL(tr)
+    return node_text(value[0]) if value else ""
+
+
+def _parse_message_content_lxml(root: html.HtmlElement) -> MessageData:
+    # the lxml counterpart of parse_message_content, keep the two in sync
+    message_data = _MESSAGE_DATA(root)
+    if not message_data:
+        raise ParseError("Error in parsing message data.")
+    trs = _ROWS(message_data[0])
+    if len(trs) < 3:
+        raise ParseError("Not enough values to unpack from message_data")
+    author, title, date = trs[:3]
+    content = _MESSAGE_CONTENT(root)
+    if not content:
+        raise ParseError("Error in parsing message content.")
+    return MessageData(
+        _unwrap_message_data_lxml(author),
+        _unwrap_message_data_lxml(title),
+        node_text(content[0]),
+        _unwrap_message_data_lxml(date),
     )
+
+
+def parse_message_content(
+    document: Union[str, bytes],
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> MessageData:
+    """
+    Parses an already fetched message page.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+        backend (str, optional): "bs4" or "lxml". Defaults to the backend in effect,
+            see `librus_apix.helpers.parser_backend`.
+
+    Returns:
+        MessageData: An object containing the message details.
+    """
+    if current_parser_backend(backend) == "lxml":
+        return _parse_message_content_lxml(
+            tree_no_access_check(make_tree(document, encoding))
+        )
+    soup = no_access_check(make_soup(document, encoding))
     message_data = soup.select_one("table[class='stretch']")
     if message_data is None:
         raise ParseError("Error in parsing message data.")
@@ -233,16 +486,75 @@ def _sanitize_href(href: str) -> str:
     return ""
 
 
-def parse_sent(message_soup: BeautifulSoup) -> List[Message]:
+_MESSAGES_REGION = page_region("table")
+_MESSAGE_TABLE = etree.XPath(f"(//table[{class_is('decorated stretch')}])[1]")
+_TBODY = etree.XPath("(.//tbody)[1]")
+_MESSAGE_ROWS = etree.XPath(f".//tr[{has_class('line0')} or {has_class('line1')}]")
+_CELLS = etree.XPath(".//td")
+_HAS_IMAGE = etree.XPath("boolean(.//img)")
+_FIRST_ANCHOR = etree.XPath("(.//a)[1]")
+
+
+def _parse_messages_lxml(root: html.HtmlElement, sent: bool) -> List[Message]:
+    # the lxml counterpart of parse and parse_sent, keep them in sync
+    table = _MESSAGE_TABLE(root)
+    if not table:
+        raise ParseError("Error in parsing messages.")
+    tbody = _TBODY(table[0])
+    if not tbody:
+        raise ParseError("Error in parsing messages (tbody).")
+    rows = _MESSAGE_ROWS(tbody[0])
+    if node_text(rows[0]).strip() == "Brak wiadomości":
+        return []
+    columns = 7 if sent else 6
+    msgs: List[Message] = []
+    for row in rows:
+        message_data = _CELLS(row)
+        if len(message_data) < columns:
+            raise ParseError(f"Message data has less than {columns} elements")
+        attachment, author, title, date = message_data[1:5]
+        # parse_sent compares the whole "unread" cell to "NIE", which never matches
+        unread = not sent and "font-weight: bold" in title.get("style", "")
+        author_a = _FIRST_ANCHOR(author)
+        href = _sanitize_href(author_a[0].get("href", "")) if author_a else ""
+        msgs.append(
+            Message(
+                node_text(author),
+                node_text(title),
+                node_text(date),
+                href,
+                unread,
+                _HAS_IMAGE(attachment),
+            )
+        )
+    return msgs
+
+
+def parse_sent(
+    message_soup: Union[BeautifulSoup, str, bytes],
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> List[Message]:
     """
     Parses sent messages from the message soup.
 
     Args:
-        message_soup (BeautifulSoup): The BeautifulSoup object containing message data.
+        message_soup (Union[BeautifulSoup, str, bytes]): The BeautifulSoup object containing message data,
+            or the page HTML as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+        backend (str, optional): "bs4" or "lxml" for page HTML. Defaults to the backend in effect,
+            see `librus_apix.helpers.parser_backend`.
 
     Returns:
         List[Message]: A list of Message objects representing sent messages.
     """
+    if not isinstance(message_soup, BeautifulSoup):
+        if current_parser_backend(backend) == "lxml":
+            root = tree_no_access_check(make_tree(message_soup, encoding))
+            return _parse_messages_lxml(root, sent=True)
+        message_soup = no_access_check(
+            make_soup(message_soup, encoding, _MESSAGES_REGION)
+        )
     msgs: List[Message] = []
     hasAttachment = False
     soup = message_soup.find("table", attrs={"class": "decorated stretch"})
@@ -276,16 +588,31 @@ def parse_sent(message_soup: BeautifulSoup) -> List[Message]:
     return msgs
 
 
-def parse(message_soup: BeautifulSoup) -> List[Message]:
+def parse(
+    message_soup: Union[BeautifulSoup, str, bytes],
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> List[Message]:
     """
     Parses received messages from the message soup.
 
     Args:
-        message_soup (BeautifulSoup): The BeautifulSoup object containing message data.
+        message_soup (Union[BeautifulSoup, str, bytes]): The BeautifulSoup object containing message data,
+            or the page HTML as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+        backend (str, optional): "bs4" or "lxml" for page HTML. Defaults to the backend in effect,
+            see `librus_apix.helpers.parser_backend`.
 
     Returns:
         List[Message]: A list of Message objects representing received messages.
     """
+    if not isinstance(message_soup, BeautifulSoup):
+        if current_parser_backend(backend) == "lxml":
+            root = tree_no_access_check(make_tree(message_soup, encoding))
+            return _parse_messages_lxml(root, sent=False)
+        message_soup = no_access_check(
+            make_soup(message_soup, encoding, _MESSAGES_REGION)
+        )
     msgs: List[Message] = []
     hasAttachment = False
     soup = message_soup.find("table", attrs={"class": "decorated stretch"})
@@ -326,17 +653,20 @@ def parse(message_soup: BeautifulSoup) -> List[Message]:
     return msgs
 
 
-def get_max_page_number(client: Client) -> int:
+def parse_max_page_number(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> int:
     """
-    Retrieves the maximum page number of messages.
+    Parses the maximum page number from an already fetched message list.
 
     Args:
-        client (Client): The client object for making HTTP requests.
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
 
     Returns:
         int: The maximum page number.
     """
-    soup = no_access_check(BeautifulSoup(client.get(client.MESSAGE_URL).text, "lxml"))
+    soup = no_access_check(make_soup(document, encoding))
     try:
         pages = soup.select_one("div.pagination > span")
         if not pages:
@@ -351,6 +681,44 @@ def get_max_page_number(client: Client) -> int:
     return max_pages_number - 1
 
 
+@coalesced
+def get_max_page_number(client: Client) -> int:
+    """
+    Retrieves the maximum page number of messages.
+
+    Args:
+        client (Client): The client object for making HTTP requests.
+
+    Returns:
+        int: The maximum page number.
+    """
+    response = client.get(client.MESSAGE_URL)
+    return parse_max_page_number(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def get_max_page_number_async(client: AsyncClient) -> int:
+    """
+    Async counterpart of get_max_page_number.
+
+    Args:
+        client (AsyncClient): The async client object for making HTTP requests.
+
+    Returns:
+        int: The maximum page number.
+    """
+    response = await client.get(client.MESSAGE_URL)
+    return parse_max_page_number(response.content, response_encoding(response))
+
+
+def _page_payload(page: int) -> Dict[str, Any]:
+    return {
+        "numer_strony105": page,
+        "porcjowanie_pojemnik105": "105",
+    }
+
+
+@coalesced
 def get_received(client: Client, page: int) -> List[Message]:
     """
     Retrieves received messages from a specific page.
@@ -362,16 +730,28 @@ def get_received(client: Client, page: int) -> List[Message]:
     Returns:
         List[Message]: A list of received Message objects.
     """
-    payload = {
-        "numer_strony105": page,
-        "porcjowanie_pojemnik105": "105",
-    }
-    response = client.post(client.MESSAGE_URL, data=payload)
-    soup = no_access_check(BeautifulSoup(response.text, "lxml"))
-    received_msgs = parse(soup)
+    response = client.post(client.MESSAGE_URL, data=_page_payload(page))
+    received_msgs = run_parser(parse, response.content, response_encoding(response))
     return received_msgs
 
 
+@coalesced_async
+async def get_received_async(client: AsyncClient, page: int) -> List[Message]:
+    """
+    Async counterpart of get_received.
+
+    Args:
+        client (AsyncClient): The async client object for making HTTP requests.
+        page (int): The page number of messages to retrieve.
+
+    Returns:
+        List[Message]: A list of received Message objects.
+    """
+    response = await client.post(client.MESSAGE_URL, data=_page_payload(page))
+    return await run_parser_async(parse, response.content, response_encoding(response))
+
+
+@coalesced
 def get_sent(client: Client, page: int) -> List[Message]:
     """
     Retrieves sent messages from a specific page.
@@ -383,11 +763,26 @@ def get_sent(client: Client, page: int) -> List[Message]:
     Returns:
         List[Message]: A list of sent Message objects.
     """
-    payload = {
-        "numer_strony105": page,
-        "porcjowanie_pojemnik105": "105",
-    }
-    response = client.post(client.SEND_MESSAGE_URL, data=payload)
-    soup = no_access_check(BeautifulSoup(response.text, "lxml"))
-    received_msgs = parse_sent(soup)
+    response = client.post(client.SEND_MESSAGE_URL, data=_page_payload(page))
+    received_msgs = run_parser(
+        parse_sent, response.content, response_encoding(response)
+    )
     return received_msgs
+
+
+@coalesced_async
+async def get_sent_async(client: AsyncClient, page: int) -> List[Message]:
+    """
+    Async counterpart of get_sent.
+
+    Args:
+        client (AsyncClient): The async client object for making HTTP requests.
+        page (int): The page number of messages to retrieve.
+
+    Returns:
+        List[Message]: A list of sent Message objects.
+    """
+    response = await client.post(client.SEND_MESSAGE_URL, data=_page_payload(page))
+    return await run_parser_async(
+        parse_sent, response.content, response_encoding(response)
+    )
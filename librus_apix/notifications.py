@@ -10,6 +10,7 @@ Classes:
     - NotificationIds: Represents the IDs of various notifications to track seen notifications.
 
 Functions:
+    - parse_notification_amounts(document: Union[str, bytes]) -> List[NotificationAmount]: Parses notification amounts from an already fetched dashboard page.
     - get_initial_notification_data(client: Client) -> Tuple[NotificationData, NotificationIds]: Fetches and parses the initial notification data and their IDs for a new token.
     - get_new_notification_data(client: Client, seen_notifications: NotificationIds) -> Tuple[NotificationData, NotificationIds]: Fetches and parses new notifications using NotificationIds, returns data and updates seen notification IDs.
 """
@@ -17,16 +18,17 @@ Functions:
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from hashlib import md5
-from typing import Any, DefaultDict, List, Tuple
+from typing import Any, DefaultDict, List, Optional, Tuple, Union
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
 
 from librus_apix.announcements import Announcement, get_announcements
 from librus_apix.attendance import Attendance, get_attendance
 from librus_apix.client import Client
 from librus_apix.exceptions import ParseError
 from librus_apix.grades import Grade, get_grades
-from librus_apix.helpers import no_access_check
+from librus_apix.helpers import make_soup, no_access_check, response_encoding
+from librus_apix.singleflight import coalesced
 from librus_apix.homework import Homework, get_homework
 from librus_apix.messages import Message, get_received
 from librus_apix.schedule import RecentEvent, get_recently_added_schedule
@@ -48,6 +50,7 @@ class NotificationAmount:
     amount: int
 
 
+@coalesced
 def get_new_token_notification_amounts(client: Client) -> List[NotificationAmount]:
     """
     Fetches and parses notification amounts from the user's dashboard on the Librus platform.
@@ -58,7 +61,24 @@ def get_new_token_notification_amounts(client: Client) -> List[NotificationAmoun
     Returns:
         List[NotificationAmount]: A list of `NotificationAmount` objects representing the notifications found on the user's dashboard.
     """
-    soup = no_access_check(BeautifulSoup(client.get(client.INDEX_URL).text, "lxml"))
+    response = client.get(client.INDEX_URL)
+    return parse_notification_amounts(response.content, response_encoding(response))
+
+
+def parse_notification_amounts(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> List[NotificationAmount]:
+    """
+    Parses notification amounts from an already fetched dashboard page.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+
+    Returns:
+        List[NotificationAmount]: A list of `NotificationAmount` objects representing the notifications found on the dashboard.
+    """
+    soup = no_access_check(make_soup(document, encoding))
     notifications = []
     circles = soup.select("div#graphic-menu > ul > li > a[class!='button counter']")
     for circle in circles:
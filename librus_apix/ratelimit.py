@@ -0,0 +1,262 @@
+"""
+This module throttles requests with token buckets shared between clients and processes.
+
+Librus blocks addresses that send bursts of requests, so a client given a rate limiter
+waits for a token before every request. Buckets are keyed by host and by the proxy the
+request goes through, so clients behind the same egress address share one budget.
+
+Waiting is reservation based: every request reserves the next free slot and sleeps until
+it comes, so once the burst is spent a bulk operation like `fetch_many` is spread evenly
+at `rate` requests per second instead of arriving in bursts. Inside a
+`librus_apix.deadline`, a request whose slot comes after the deadline fails at once with
+DeadlineExceededError instead of sleeping first.
+
+Classes:
+    - RateLimiter: Base class of the limiters, computing token bucket reservations.
+    - MemoryRateLimiter: Buckets shared by the clients of one process.
+    - SQLiteRateLimiter: Buckets in an SQLite file, shared by every process on the machine.
+
+Functions:
+    - limiter_key: Returns the bucket key of a request.
+
+Usage:
+```python
+from librus_apix.client import new_client
+from librus_apix.ratelimit import MemoryRateLimiter, SQLiteRateLimiter
+
+limiter = MemoryRateLimiter(rate=2, burst=5)
+first = new_client(token=first_token, rate_limiter=limiter)
+second = new_client(token=second_token, rate_limiter=limiter)  # same budget
+
+# every worker process of the fleet
+limiter = SQLiteRateLimiter("/var/tmp/librus_ratelimit.sqlite", rate=2, burst=5)
+client = new_client(token=token, rate_limiter=limiter)
+```
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import librus_apix.deadline as deadlines
+from librus_apix.exceptions import DeadlineExceededError
+
+
+def limiter_key(url: str, proxy: Optional[str] = None) -> str:
+    """
+    Returns the bucket key of a request.
+
+    Args:
+        url (str): The requested URL.
+        proxy (str, optional): The proxy the request goes through, None for a direct connection.
+
+    Returns:
+        str: "<host>|<proxy>", with "direct" in place of a missing proxy.
+    """
+    return f"{urlsplit(url).hostname or ''}|{proxy or 'direct'}"
+
+
+class RateLimiter:
+    """
+    Base class of the limiters.
+
+    Each key has a bucket holding up to `burst` tokens, refilled at `rate` tokens per
+    second. Subclasses only store the bucket state and make `_reserve` atomic.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        burst (float): The bucket capacity, i.e. how many requests may be sent at once.
+        host_limits (Dict[str, Tuple[float, float]]): Per-host (rate, burst) overrides.
+    """
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        burst: float = 5.0,
+        host_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+    ):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.host_limits = dict(host_limits or {})
+
+    def limits(self, key: str) -> Tuple[float, float]:
+        """Returns the (rate, burst) of the bucket of `key`."""
+        host = key.partition("|")[0]
+        return self.host_limits.get(host, (self.rate, self.burst))
+
+    def _take(
+        self, key: str, state: Optional[Tuple[float, float]], now: float
+    ) -> Tuple[Tuple[float, float], float]:
+        """
+        Takes a token from a bucket, going into debt when it is empty.
+
+        Args:
+            key (str): The bucket key.
+            state (Tuple[float, float], optional): The stored (tokens, updated) of the bucket.
+            now (float): The current `time.time()`.
+
+        Returns:
+            Tuple[Tuple[float, float], float]: The new bucket state and the seconds to wait.
+        """
+        rate, burst = self.limits(key)
+        tokens, updated = state if state is not None else (burst, now)
+        tokens = min(burst, tokens + (now - updated) * rate) - 1
+        delay = -tokens / rate if tokens < 0 else 0.0
+        return (tokens, now), delay
+
+    def _reserve(self, key: str) -> float:
+        raise NotImplementedError
+
+    async def _reserve_async(self, key: str) -> float:
+        return self._reserve(key)
+
+    @staticmethod
+    def _check_deadline(delay: Optional[float] = None) -> None:
+        """Raises DeadlineExceededError if the deadline passed or comes within `delay`."""
+        current = deadlines.current_deadline()
+        if current is None:
+            return
+        current.check()
+        if delay is not None and delay > current.remaining:
+            raise DeadlineExceededError(
+                f"Deadline exceeded before the rate limiter's slot in {delay:.2f}s"
+            )
+
+    def acquire(self, key: str) -> float:
+        """
+        Blocks until a request under `key` may be sent.
+
+        Args:
+            key (str): The bucket key, see `limiter_key`.
+
+        Returns:
+            float: The seconds waited.
+
+        Raises:
+            DeadlineExceededError: If the current deadline passes before the request's slot.
+        """
+        self._check_deadline()
+        delay = self._reserve(key)
+        self._check_deadline(delay)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, key: str) -> float:
+        """
+        Waits without blocking the event loop until a request under `key` may be sent.
+
+        Args:
+            key (str): The bucket key, see `limiter_key`.
+
+        Returns:
+            float: The seconds waited.
+
+        Raises:
+            DeadlineExceededError: If the current deadline passes before the request's slot.
+        """
+        self._check_deadline()
+        delay = await self._reserve_async(key)
+        self._check_deadline(delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    Token buckets shared by every client given the same instance.
+
+    Args:
+        rate (float, optional): Requests per second. Defaults to 2.
+        burst (float, optional): Requests that may be sent at once. Defaults to 5.
+        host_limits (Dict[str, Tuple[float, float]], optional): Per-host (rate, burst) overrides.
+    """
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        burst: float = 5.0,
+        host_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+    ):
+        super().__init__(rate, burst, host_limits)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def _reserve(self, key: str) -> float:
+        with self._lock:
+            self._buckets[key], delay = self._take(
+                key, self._buckets.get(key), time.time()
+            )
+        return delay
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Token buckets stored in an SQLite file, shared by every process using the same path.
+
+    Reservations run in an immediate transaction, so concurrent processes take turns.
+    `acquire_async` makes them in a worker thread, so waiting for the database lock does not
+    block the event loop.
+
+    Args:
+        path (Union[str, Path]): The database file, created if missing.
+        rate (float, optional): Requests per second. Defaults to 2.
+        burst (float, optional): Requests that may be sent at once. Defaults to 5.
+        host_limits (Dict[str, Tuple[float, float]], optional): Per-host (rate, burst) overrides.
+        timeout (float, optional): Seconds to wait for the database lock. Defaults to 30.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        rate: float = 2.0,
+        burst: float = 5.0,
+        host_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        timeout: float = 30.0,
+    ):
+        super().__init__(rate, burst, host_limits)
+        self.path = Path(path).expanduser()
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS buckets"
+                " (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            # autocommit, transactions are opened explicitly
+            db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.db = db
+        return db
+
+    def _reserve(self, key: str) -> float:
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            (tokens, updated), delay = self._take(key, row, time.time())
+            db.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, tokens, updated),
+            )
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+        return delay
+
+    async def _reserve_async(self, key: str) -> float:
+        # waiting for the lock of a busy database may take up to `timeout`
+        return await asyncio.to_thread(self._reserve, key)
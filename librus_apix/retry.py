@@ -0,0 +1,223 @@
+"""
+This module retries failed requests and stops sending them while Librus is unavailable.
+
+Librus goes into maintenance for hours and blocks addresses for hours, and during those
+periods every request fails the same way. A retry policy rides out short hiccups with
+jittered exponential backoff, and a circuit breaker shared by the clients behind one
+address fails calls immediately once the service is known to be down, instead of letting
+thousands of queued calls pile up on it.
+
+Classes:
+    - RetryPolicy: Which requests are retried, how often and how long to wait in between.
+    - CircuitBreaker: Fails calls fast after repeated failures or a maintenance response.
+
+Usage:
+```python
+from librus_apix.client import new_client
+from librus_apix.exceptions import CircuitOpenError
+from librus_apix.retry import CircuitBreaker, RetryPolicy
+
+breaker = CircuitBreaker(failure_threshold=5, reset_timeout=300)
+client = new_client(token=token, retry_policy=RetryPolicy(attempts=4), circuit_breaker=breaker)
+try:
+    grades = get_grades(client)
+except CircuitOpenError as e:
+    print(breaker.state, e.retry_after)
+```
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from librus_apix.exceptions import CircuitOpenError
+
+MAINTENANCE_STATUS = 503
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Which requests are retried, how often and how long to wait in between.
+
+    Only idempotent methods are retried, after a connection error or a response with one
+    of `statuses`. The n-th retry waits a random time between 0 and
+    `min(max_backoff, backoff * 2**n)` ("full jitter"), or the server's Retry-After if longer.
+
+    Attributes:
+        attempts (int): The maximum number of attempts, including the first one. Defaults to 3.
+        backoff (float): The base delay in seconds. Defaults to 0.5.
+        max_backoff (float): The delay cap in seconds. Defaults to 30.
+        statuses (Tuple[int, ...]): Response statuses worth retrying. Defaults to 429 and 5xx gateway errors.
+        methods (Tuple[str, ...]): The methods that may be retried. Defaults to GET.
+    """
+
+    attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    methods: Tuple[str, ...] = ("GET",)
+
+    def retries(self, method: str, attempt: int) -> bool:
+        """Whether a failed `attempt` (counted from 0) of a `method` request may be retried."""
+        return method.upper() in self.methods and attempt + 1 < self.attempts
+
+    def retryable(self, response: Any) -> bool:
+        """Whether a response's status is worth retrying."""
+        return response.status_code in self.statuses
+
+    def delay(self, attempt: int, response: Optional[Any] = None) -> float:
+        """
+        Returns how long to wait before retrying a failed attempt.
+
+        Args:
+            attempt (int): The failed attempt, counted from 0.
+            response (Any, optional): Its response, whose Retry-After header is honoured.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None and retry_after.strip().isdigit():
+            delay = max(delay, min(self.max_backoff, float(retry_after)))
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast after repeated failures or a maintenance response.
+
+    The breaker starts "closed". After `failure_threshold` consecutive failures, or at once
+    on a maintenance (503) response, it "opens" and every call raises CircuitOpenError
+    without touching the network. After `reset_timeout` seconds it lets a single probe
+    through ("half_open"); a success closes it again, a failure reopens it.
+
+    Share one breaker between the clients behind one address, so a block seen by one of
+    them stops all of them.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds the breaker stays open before probing.
+        failures (int): The current number of consecutive failures.
+        opened_at (float | None): The `time.monotonic()` the breaker last opened at.
+        reason (str): Why the breaker last opened.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.reason = ""
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<CircuitBreaker {self.state}>"
+
+    @property
+    def state(self) -> str:
+        """ "closed", "open" or "half_open"."""
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a probe through, 0 unless it is open."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def before_request(self) -> bool:
+        """
+        Checks that a request may be sent.
+
+        Returns:
+            bool: True if the request is the half-open probe. Its outcome must then be
+                recorded, or the probe given up with `release_probe`.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half open with a probe already in flight.
+        """
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return False
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            raise CircuitOpenError(
+                f"Circuit open after {self.reason}", self.retry_after
+            )
+
+    def release_probe(self) -> None:
+        """
+        Gives up the half-open probe without counting it, e.g. when the call failed before
+        reaching Librus, so the next request can probe instead.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        """
+        Counts a successful request.
+
+        While the breaker is open, a success can only come from a request sent before it
+        opened and is ignored; otherwise the breaker closes.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                return
+            self._close()
+
+    def _close(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self, reason: str, trip: bool = False) -> None:
+        """
+        Counts a failed request.
+
+        Args:
+            reason (str): What went wrong, reported by CircuitOpenError.
+            trip (bool, optional): Open the breaker regardless of the failure count.
+        """
+        with self._lock:
+            self.failures += 1
+            if trip or self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self.reason = reason
+            self._probing = False
+
+    def record(self, response: Any, retry_policy: Optional[RetryPolicy] = None) -> None:
+        """
+        Counts a response as a success or a failure.
+
+        Maintenance responses open the breaker at once, other retryable statuses count as failures.
+
+        Args:
+            response (Any): A `requests.Response` or `librus_apix.client.AsyncResponse`.
+            retry_policy (RetryPolicy, optional): Decides which statuses are failures. Defaults to RetryPolicy().
+        """
+        status = response.status_code
+        if status == MAINTENANCE_STATUS:
+            self.record_failure("maintenance (503)", trip=True)
+        elif (retry_policy or RetryPolicy()).retryable(response):
+            self.record_failure(f"status {status}")
+        else:
+            self.record_success()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._close()
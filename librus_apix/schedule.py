@@ -6,7 +6,14 @@ Classes:
 
 Functions:
     - schedule_detail: Fetches detailed schedule information for a specific prefix and detail URL suffix.
+    - schedule_details: Fetches many event details concurrently.
     - get_schedule: Fetches the schedule for a specific month and year.
+    - get_recently_added_schedule: Fetches events added since the last login.
+    - parse_schedule_detail: Parses event details from an already fetched page.
+    - parse_schedule: Parses a month of events from an already fetched page.
+    - parse_recently_added_schedule: Parses recently added events from an already fetched page.
+
+    Every fetching function above has an `*_async` counterpart taking an AsyncClient.
 
 Usage:
     ```python
@@ -33,13 +40,26 @@ Usage:
 import re
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import DefaultDict, Dict, List, Union
+from typing import DefaultDict, Dict, Iterable, List, Optional, Union
 
-from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4 import NavigableString, Tag
+from lxml import etree, html
 
-from librus_apix.client import Client
+from librus_apix.client import AsyncClient, Client
+from librus_apix.concurrency import AdaptiveLimit
 from librus_apix.exceptions import ParseError
-from librus_apix.helpers import no_access_check
+from librus_apix.helpers import (
+    current_parser_backend,
+    has_class,
+    make_soup,
+    make_tree,
+    no_access_check,
+    node_text,
+    parse_results,
+    response_encoding,
+    tree_no_access_check,
+)
+from librus_apix.singleflight import coalesced, coalesced_async
 
 
 @dataclass
@@ -66,24 +86,26 @@ class Event:
     href: str
 
 
-def schedule_detail(client: Client, prefix: str, detail_url: str) -> Dict[str, str]:
+def parse_schedule_detail(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> Dict[str, str]:
     """
-    Fetches the detailed schedule information for a specific prefix and detail URL suffix.
+    Parses an already fetched schedule event page.
 
     Args:
-        client (Client): The client object for making HTTP requests.
-        prefix (str): The prefix of the schedule URL.
-        detail_url (str): The detail URL of the schedule.
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
 
     Returns:
-        Dict[str, str]: A dictionary containing schedule details.
+        Dict[str, str]: A dictionary containing the detailed schedule information.
+
+    Raises:
+        ParseError: If there is an error parsing the schedule details.
     """
     schedule = {}
-    div = no_access_check(
-        BeautifulSoup(
-            client.get(client.SCHEDULE_URL + prefix + "/" + detail_url).text, "lxml"
-        )
-    ).find("div", attrs={"class": "container-background"})
+    div = no_access_check(make_soup(document, encoding)).find(
+        "div", attrs={"class": "container-background"}
+    )
 
     if div is None or isinstance(div, NavigableString):
         raise ParseError("Error in parsing schedule details.")
@@ -97,6 +119,96 @@ def schedule_detail(client: Client, prefix: str, detail_url: str) -> Dict[str, s
     return schedule
 
 
+@coalesced
+def schedule_detail(client: Client, prefix: str, detail_url: str) -> Dict[str, str]:
+    """
+    Fetches the detailed schedule information for a specific prefix and detail URL suffix.
+
+    Args:
+        client (Client): The client object for making HTTP requests.
+        prefix (str): The prefix of the schedule URL.
+        detail_url (str): The detail URL of the schedule.
+
+    Returns:
+        Dict[str, str]: A dictionary containing schedule details.
+    """
+    response = client.get(client.SCHEDULE_URL + prefix + "/" + detail_url)
+    return parse_schedule_detail(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def schedule_detail_async(
+    client: AsyncClient, prefix: str, detail_url: str
+) -> Dict[str, str]:
+    """
+    Async counterpart of schedule_detail.
+
+    Args:
+        client (AsyncClient): The async client object for making HTTP requests.
+        prefix (str): The prefix of the schedule URL.
+        detail_url (str): The detail URL of the schedule.
+
+    Returns:
+        Dict[str, str]: A dictionary containing schedule details.
+    """
+    response = await client.get(client.SCHEDULE_URL + prefix + "/" + detail_url)
+    return parse_schedule_detail(response.content, response_encoding(response))
+
+
+def schedule_details(
+    client: Client,
+    prefix: str,
+    detail_urls: Iterable[str],
+    max_concurrency: Union[int, AdaptiveLimit] = 8,
+) -> List[Union[Dict[str, str], Exception]]:
+    """
+    Batch form of schedule_detail, fetching event details concurrently.
+
+    Args:
+        client (Client): The client object used to make the requests.
+        prefix (str): The prefix of the schedule URL.
+        detail_urls (Iterable[str]): The detail URLs of the events.
+        max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight,
+            or an adaptive limit. Defaults to 8.
+
+    Returns:
+        List[Union[Dict[str, str], Exception]]: The result of every request in input order,
+            or the exception it raised.
+    """
+    results = client.fetch_many(
+        [client.SCHEDULE_URL + prefix + "/" + url for url in detail_urls],
+        max_concurrency,
+    )
+    return parse_results(results, parse_schedule_detail)
+
+
+async def schedule_details_async(
+    client: AsyncClient,
+    prefix: str,
+    detail_urls: Iterable[str],
+    max_concurrency: Union[int, AdaptiveLimit] = 8,
+) -> List[Union[Dict[str, str], Exception]]:
+    """
+    Async counterpart of schedule_details.
+
+    Args:
+        client (AsyncClient): The async client object used to make the requests.
+        prefix (str): The prefix of the schedule URL.
+        detail_urls (Iterable[str]): The detail URLs of the events.
+        max_concurrency (int | AdaptiveLimit, optional): The maximum number of requests in flight,
+            or an adaptive limit. Defaults to 8.
+
+    Returns:
+        List[Union[Dict[str, str], Exception]]: The result of every request in input order,
+            or the exception it raised.
+    """
+    results = await client.fetch_many(
+        [client.SCHEDULE_URL + prefix + "/" + url for url in detail_urls],
+        max_concurrency,
+    )
+    return parse_results(results, parse_schedule_detail)
+
+
 def _parse_title_into_pairs(title: str) -> Dict[str, str]:
     additional_data = {}
     pairs = [pair.split(":", 1) for pair in title.split("<br />")]
@@ -110,28 +222,128 @@ def _parse_title_into_pairs(title: str) -> Dict[str, str]:
     return additional_data
 
 
-def get_schedule(
-    client: Client, month: str, year: str, include_empty: bool = False
-) -> DefaultDict[int, List[Event]]:
+_DELIMITER = "###"
+_UNKNOWN_TITLE = "Nauczyciel: unknown<br />Opis: unknown"
+
+
+def _create_event(title: str, subject: str, text: str, onclick: str, day: int) -> Event:
     """
-    Fetches the schedule for a specific month and year.
+    Creates an Event from a schedule cell.
 
     Args:
-        client (Client): The client object for making HTTP requests.
-        month (str): The month for which the schedule is requested.
-        year (str): The year for which the schedule is requested.
-        include_empty (bool, optional): Flag to include empty schedules. Defaults to False.
+        title (str): The title attribute of the cell.
+        subject (str): The text of the cell's span, "unspecified" if it has none.
+        text (str): The text of the cell without the span, with line breaks replaced by `_DELIMITER`.
+        onclick (str): The onclick attribute of the cell.
+        day (int): The day of the month.
 
     Returns:
-        DefaultDict[int, List[Event]]: A dictionary containing the schedule for each day of the month.
+        Event: The parsed event.
     """
+    additional_data = _parse_title_into_pairs(title)
+    data = (
+        text.replace("\xa0", " ")
+        .replace(", ", "")
+        .replace("\n", "")
+        .strip()
+        .split(_DELIMITER)
+    )
+    if subject == "unspecified":
+        subject = data[0]
+    if len(data) >= 2:
+        title = data[1]
+    else:
+        title = data[0]
+
+    number = "unknown"
+    hour = "unknown"
+    try:
+        number = int(re.findall(r": ?[0-99]?[0-99]", text)[0].replace(": ", ""))
+    except ValueError:
+        hour = re.findall(r" ?[0-2]?[0-9]:?[0-5]?[0-9]", text)[0]
+    except IndexError:
+        pass
+    href = onclick.split("'")[1].split("/")
+    if len(href) >= 2:
+        href = "/".join(href[2:])
+    else:
+        href = ""
+
+    return Event(title, subject, additional_data, str(day), number, hour, href)
+
+
+_DAYS = etree.XPath(f"//div[{has_class('kalendarz-dzien')}]")
+_DAY_NUMBER = etree.XPath(f"(.//div[{has_class('kalendarz-numer-dnia')}])[1]")
+_EVENT_CELLS = etree.XPath(".//tr/descendant::td[1]")
+_SPAN = etree.XPath("(.//span)[1]")
+_BREAKS = etree.XPath(".//br")
+
+
+def _parse_schedule_lxml(
+    root: html.HtmlElement, include_empty: bool
+) -> DefaultDict[int, List[Event]]:
+    # the lxml counterpart of parse_schedule, keep the two in sync
     schedule = defaultdict(list)
-    soup = no_access_check(
-        BeautifulSoup(
-            client.post(client.SCHEDULE_URL, data={"rok": year, "miesiac": month}).text,
-            "lxml",
+    days = _DAYS(root)
+    if len(days) < 1:
+        raise ParseError("Error in parsing days of the schedule.")
+    for day in days:
+        try:
+            d = int(node_text(_DAY_NUMBER(day)[0]))
+        except (IndexError, ValueError):
+            raise ParseError("Error while parsing day number")
+        if include_empty == True:
+            schedule[d] = []
+        for td in _EVENT_CELLS(day):
+            subject = "unspecified"
+            span = _SPAN(td)
+            if span:
+                subject = node_text(span[0])
+                # unlike remove(), keeps the text following the span
+                span[0].drop_tree()
+            for line in _BREAKS(td):
+                line.tail = _DELIMITER + (line.tail or "")
+            schedule[d].append(
+                _create_event(
+                    td.get("title", _UNKNOWN_TITLE),
+                    subject,
+                    node_text(td),
+                    td.get("onclick", "'"),
+                    d,
+                )
+            )
+    return schedule
+
+
+def parse_schedule(
+    document: Union[str, bytes],
+    include_empty: bool = False,
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> DefaultDict[int, List[Event]]:
+    """
+    Parses events from an already fetched monthly schedule page.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        include_empty (bool, optional): Whether to include days without events. Defaults to False.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+        backend (str, optional): "bs4" or "lxml". Defaults to the backend in effect,
+            see `librus_apix.helpers.parser_backend`.
+
+    Returns:
+        DefaultDict[int, List[Event]]: A dictionary mapping days of the month to lists of Event objects.
+
+    Raises:
+        ArgumentError: If the backend is unknown.
+        ParseError: If there is an error parsing the schedule.
+    """
+    if current_parser_backend(backend) == "lxml":
+        return _parse_schedule_lxml(
+            tree_no_access_check(make_tree(document, encoding)), include_empty
         )
-    )
+    schedule = defaultdict(list)
+    soup = no_access_check(make_soup(document, encoding))
     days = soup.find_all("div", attrs={"class": "kalendarz-dzien"})
     if len(days) < 1:
         raise ParseError("Error in parsing days of the schedule.")
@@ -147,56 +359,68 @@ def get_schedule(
             td = event.find("td")
             if td is None or isinstance(td, NavigableString):
                 continue
-            title = td.attrs.get("title", "Nauczyciel: unknown<br />Opis: unknown")
-            additional_data = _parse_title_into_pairs(title)
             subject = "unspecified"
             span = td.find("span")
             if span is not None:
                 subject = span.text
                 span.extract()
 
-            delimeter = "###"
             for line in td.select("br"):
-                line.replaceWith(delimeter)
-            data = (
-                td.text.replace("\xa0", " ")
-                .replace(", ", "")
-                .replace("\n", "")
-                .strip()
-                .split(delimeter)
-            )
-            if subject == "unspecified":
-                subject = data[0]
-            if len(data) >= 2:
-                title = data[1]
-            else:
-                title = data[0]
-
-            number = "unknown"
-            hour = "unknown"
-            number_td = event.find("td")
-            if number_td is None or isinstance(number_td, NavigableString):
-                raise ParseError("Error while parsing td_number schedule.")
-            try:
-                number = int(
-                    re.findall(r": ?[0-99]?[0-99]", number_td.text)[0].replace(": ", "")
+                line.replaceWith(_DELIMITER)
+            schedule[d].append(
+                _create_event(
+                    td.attrs.get("title", _UNKNOWN_TITLE),
+                    subject,
+                    td.text,
+                    td.attrs.get("onclick", "'"),
+                    d,
                 )
-            except ValueError:
-                hour = re.findall(r" ?[0-2]?[0-9]:?[0-5]?[0-9]", number_td.text)[0]
-            except IndexError:
-                pass
-            onclick = number_td.attrs.get("onclick", "'")
-            href = onclick.split("'")[1].split("/")
-            if len(href) >= 2:
-                href = "/".join(href[2:])
-            else:
-                href = ""
-
-            event = Event(title, subject, additional_data, str(d), number, hour, href)
-            schedule[d].append(event)
+            )
     return schedule
 
 
+@coalesced
+def get_schedule(
+    client: Client, month: str, year: str, include_empty: bool = False
+) -> DefaultDict[int, List[Event]]:
+    """
+    Fetches the schedule for a specific month and year.
+
+    Args:
+        client (Client): The client object for making HTTP requests.
+        month (str): The month for which the schedule is requested.
+        year (str): The year for which the schedule is requested.
+        include_empty (bool, optional): Flag to include empty schedules. Defaults to False.
+
+    Returns:
+        DefaultDict[int, List[Event]]: A dictionary containing the schedule for each day of the month.
+    """
+    response = client.post(client.SCHEDULE_URL, data={"rok": year, "miesiac": month})
+    return parse_schedule(response.content, include_empty, response_encoding(response))
+
+
+@coalesced_async
+async def get_schedule_async(
+    client: AsyncClient, month: str, year: str, include_empty: bool = False
+) -> DefaultDict[int, List[Event]]:
+    """
+    Async counterpart of get_schedule.
+
+    Args:
+        client (AsyncClient): The async client object for making HTTP requests.
+        month (str): The month for which the schedule is requested.
+        year (str): The year for which the schedule is requested.
+        include_empty (bool, optional): Flag to include empty schedules. Defaults to False.
+
+    Returns:
+        DefaultDict[int, List[Event]]: A dictionary containing the schedule for each day of the month.
+    """
+    response = await client.post(
+        client.SCHEDULE_URL, data={"rok": year, "miesiac": month}
+    )
+    return parse_schedule(response.content, include_empty, response_encoding(response))
+
+
 @dataclass
 class RecentEvent:
     """
@@ -219,18 +443,24 @@ def _sanitize_data(data: str) -> str:
     )
 
 
-def get_recently_added_schedule(client: Client) -> List[RecentEvent]:
+def parse_recently_added_schedule(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> List[RecentEvent]:
     """
-    Events can be viewed only once here, any subsequent call won't have same events
-    Made blindly based on a screenshot, still untested...
+    Parses recently added events from an already fetched schedule page.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+
+    Returns:
+        List[RecentEvent]: A list of RecentEvent objects.
+
+    Raises:
+        ParseError: If there is an error parsing the events.
     """
     events = []
-    soup = no_access_check(
-        BeautifulSoup(
-            client.get(client.RECENT_SCHEDULE_URL).text,
-            "lxml",
-        )
-    )
+    soup = no_access_check(make_soup(document, encoding))
     bg = soup.select_one("div.container-background")
     if bg is None:
         raise ParseError("Unable to locate recent schedule container-background")
@@ -250,3 +480,22 @@ def get_recently_added_schedule(client: Client) -> List[RecentEvent]:
         event = RecentEvent(date_added.text.strip(), _type.text.strip(), data)
         events.append(event)
     return events
+
+
+@coalesced
+def get_recently_added_schedule(client: Client) -> List[RecentEvent]:
+    """
+    Events can be viewed only once here, any subsequent call won't have same events
+    Made blindly based on a screenshot, still untested...
+    """
+    response = client.get(client.RECENT_SCHEDULE_URL)
+    return parse_recently_added_schedule(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def get_recently_added_schedule_async(client: AsyncClient) -> List[RecentEvent]:
+    """
+    Async counterpart of get_recently_added_schedule.
+    """
+    response = await client.get(client.RECENT_SCHEDULE_URL)
+    return parse_recently_added_schedule(response.content, response_encoding(response))
@@ -0,0 +1,236 @@
+"""
+This module lets identical concurrent calls share one execution.
+
+When several threads or tasks ask the same client for the same page at the same moment,
+only the first one (the leader) fetches and parses it; the others wait for the leader
+and receive the same result or exception. A waiter gives up with DeadlineExceededError
+once its own deadline runs out, while the leader carries on for the others. Nothing is
+remembered once the call finishes, later calls fetch again.
+
+Classes:
+    - SingleFlight: Coalesces identical calls made from threads.
+    - AsyncSingleFlight: Coalesces identical calls made from asyncio tasks.
+
+Functions:
+    - coalesced: Decorates a scraper taking a Client so identical concurrent calls share one run.
+    - coalesced_async: The same for scrapers taking an AsyncClient.
+
+Usage:
+```python
+from concurrent.futures import ThreadPoolExecutor
+from librus_apix.grades import get_grades
+
+with ThreadPoolExecutor(8) as pool:
+    # one request and one parse, every caller gets the same result
+    results = list(pool.map(lambda _: get_grades(client), range(8)))
+print(client.single_flight.shared)
+```
+"""
+
+import asyncio
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+import librus_apix.deadline as deadlines
+from librus_apix.exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical calls made from threads.
+
+    Attributes:
+        calls (int): Calls that ran their function.
+        shared (int): Calls that waited for another caller's result instead.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Runs `fn`, unless a call with the same key is in flight, then waits for its result.
+
+        Args:
+            key (Hashable): Identifies calls that are interchangeable.
+            fn (Callable[[], T]): The function to run.
+
+        Returns:
+            T: The result of `fn`, possibly the one returned to another caller.
+
+        Raises:
+            Exception: Whatever `fn` raised, re-raised in every waiting caller.
+            DeadlineExceededError: If the current deadline passes while waiting.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            if not call.done.wait(deadlines.remaining()):
+                raise DeadlineExceededError(
+                    "Deadline exceeded while waiting for a coalesced call"
+                )
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces identical calls made from asyncio tasks.
+
+    The shared coroutine runs in its own task, so cancelling one waiter does not cancel
+    the call for the others.
+
+    Attributes:
+        calls (int): Calls that ran their coroutine.
+        shared (int): Calls that waited for another caller's result instead.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._tasks: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Awaits `fn()`, unless a call with the same key is in flight, then waits for its result.
+
+        Args:
+            key (Hashable): Identifies calls that are interchangeable.
+            fn (Callable[[], Awaitable[T]]): Returns the coroutine to run.
+
+        Returns:
+            T: The result of the coroutine, possibly the one returned to another caller.
+
+        Raises:
+            Exception: Whatever the coroutine raised, re-raised in every waiting caller.
+            DeadlineExceededError: If the current deadline passes while waiting.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            self.calls += 1
+
+            def forget(done: "asyncio.Future[Any]") -> None:
+                if self._tasks.get(key) is done:
+                    del self._tasks[key]
+
+            task.add_done_callback(forget)
+            # the task runs under the leader's deadline already
+            return await asyncio.shield(task)
+        self.shared += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadlines.remaining())
+        except asyncio.TimeoutError:
+            if task.done():
+                # finished while the wait was being cancelled, or timed out itself
+                return task.result()
+            raise DeadlineExceededError(
+                "Deadline exceeded while waiting for a coalesced call"
+            ) from None
+
+
+def _call_key(fn: Callable, client: Any, args: tuple, kwargs: dict) -> Hashable:
+    key = (
+        fn.__module__,
+        fn.__qualname__,
+        client.token.API_Key,
+        args,
+        tuple(sorted(kwargs.items())),
+    )
+    hash(key)
+    return key
+
+
+def coalesced(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Makes identical concurrent calls of a scraper share one fetch and parse.
+
+    Calls are identical when they get the same arguments and the client has the same token.
+    Calls with unhashable arguments, or on a client without a `single_flight`, run normally.
+    Coalesced callers receive the same result object, so they must not mutate it.
+
+    Args:
+        fn (Callable[..., T]): A function taking a Client as its first argument.
+
+    Returns:
+        Callable[..., T]: The coalescing function.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(client: Any, *args: Any, **kwargs: Any) -> T:
+        flight = getattr(client, "single_flight", None)
+        if flight is None:
+            return fn(client, *args, **kwargs)
+        try:
+            key = _call_key(fn, client, args, kwargs)
+        except TypeError:
+            return fn(client, *args, **kwargs)
+        return flight.do(key, lambda: fn(client, *args, **kwargs))
+
+    return wrapper
+
+
+def coalesced_async(
+    fn: Callable[..., Awaitable[T]]
+) -> Callable[..., Awaitable[T]]:
+    """
+    Makes identical concurrent calls of an async scraper share one fetch and parse.
+
+    See `coalesced`.
+
+    Args:
+        fn (Callable[..., Awaitable[T]]): A coroutine function taking an AsyncClient as its first argument.
+
+    Returns:
+        Callable[..., Awaitable[T]]: The coalescing coroutine function.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(client: Any, *args: Any, **kwargs: Any) -> T:
+        flight = getattr(client, "single_flight", None)
+        if flight is None:
+            return await fn(client, *args, **kwargs)
+        try:
+            key = _call_key(fn, client, args, kwargs)
+        except TypeError:
+            return await fn(client, *args, **kwargs)
+        return await flight.do(key, lambda: fn(client, *args, **kwargs))
+
+    return wrapper
@@ -6,6 +6,8 @@ Classes:
 
 Functions:
     - get_student_information: Retrieves student information from Librus.
+    - get_student_information_async: The same, using an AsyncClient.
+    - parse_student_information: Parses student information from an already fetched page.
 
 Usage:
     ```python
@@ -26,12 +28,12 @@ Usage:
     ```
 """
 
-from typing import Union
-from bs4 import BeautifulSoup
+from typing import Optional, Union
 from dataclasses import dataclass
 from librus_apix.exceptions import ParseError
-from librus_apix.helpers import no_access_check
-from librus_apix.client import Client
+from librus_apix.helpers import make_soup, no_access_check, response_encoding
+from librus_apix.singleflight import coalesced, coalesced_async
+from librus_apix.client import AsyncClient, Client
 
 
 @dataclass
@@ -56,6 +58,7 @@ class StudentInformation:
     lucky_number: Union[int, str]
 
 
+@coalesced
 def get_student_information(client: Client):
     """
     Retrieves student information from librus.
@@ -69,12 +72,45 @@ def get_student_information(client: Client):
     Raises:
         ParseError: If there is an error while parsing or retrieving student information.
     """
-    soup = no_access_check(
-        BeautifulSoup(
-            client.get(client.INFO_URL).text,
-            "lxml",
-        )
-    )
+    response = client.get(client.INFO_URL)
+    return parse_student_information(response.content, response_encoding(response))
+
+
+@coalesced_async
+async def get_student_information_async(client: AsyncClient):
+    """
+    Async counterpart of get_student_information.
+
+    Args:
+        client (AsyncClient): The async client object for making HTTP requests.
+
+    Returns:
+        StudentInformation: An object containing the student's information.
+
+    Raises:
+        ParseError: If there is an error while parsing or retrieving student information.
+    """
+    response = await client.get(client.INFO_URL)
+    return parse_student_information(response.content, response_encoding(response))
+
+
+def parse_student_information(
+    document: Union[str, bytes], encoding: Optional[str] = None
+) -> StudentInformation:
+    """
+    Parses student information from an already fetched student page.
+
+    Args:
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+
+    Returns:
+        StudentInformation: An object containing the student's information.
+
+    Raises:
+        ParseError: If there is an error while parsing student information.
+    """
+    soup = no_access_check(make_soup(document, encoding))
     try:
         lucky_number = soup.select_one("span.luckyNumber > b")
         if lucky_number is None:
@@ -9,6 +9,8 @@ Classes:
 
 Functions:
     - get_timetable: Retrieves the timetable for a given week starting from a Monday date.
+    - get_timetable_async: Async counterpart of get_timetable taking an AsyncClient.
+    - parse_timetable: Parses a week of periods from an already fetched page.
 
 Exceptions:
     - DateError: Raised when the provided date is not a Monday.
@@ -33,12 +35,26 @@ except ParseError as e:
 ```
 """
 
-from typing import List, Dict
-from librus_apix.client import Client
+from typing import Dict, List, Optional, Union
+from lxml import etree, html
+from librus_apix.client import AsyncClient, Client
 from librus_apix.exceptions import ParseError, DateError
-from librus_apix.helpers import no_access_check
+from librus_apix.helpers import (
+    class_is,
+    current_parser_backend,
+    has_class,
+    make_soup,
+    make_tree,
+    no_access_check,
+    node_text,
+    page_region,
+    response_encoding,
+    run_parser,
+    run_parser_async,
+    tree_no_access_check,
+)
+from librus_apix.singleflight import coalesced, coalesced_async
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
 from dataclasses import dataclass
 
 
@@ -72,28 +88,152 @@ class Period:
     next_recess_to: str | None
 
 
-def get_timetable(client: Client, monday_date: datetime) -> List[List[Period]]:
+def _week_payload(monday_date: datetime) -> Dict[str, str]:
+    if monday_date.strftime("%A") != "Monday":
+        raise DateError("You must input a Monday date.")
+    sunday = monday_date + timedelta(days=6)
+    week = f"{monday_date.strftime('%Y-%m-%d')}_{sunday.strftime('%Y-%m-%d')}"
+    return {"tydzien": week}
+
+
+def _recess(text: str) -> List[str]:
+    return [x.strip() for x in text.replace("&nbsp;", "").strip().split("-", 1)]
+
+
+def _swap_info(title: Optional[str]) -> Union[str, Dict[str, str]]:
+    """Parses the title of a substitution's anchor, an empty string for a tooltip without one."""
+    if title is None:
+        return ""
+    attr_dict = {}
+    for attr in (
+        title.replace("<b>", "")
+        .replace("</b>", "")
+        .replace("\xa0", " ")
+        .split("<br>")
+    ):
+        if len(attr.strip()) > 2:
+            key, value = attr.split(": ", 1)
+            attr_dict[key] = value
+
+    return {
+        "teacher_swap": attr_dict.get("Nauczyciel", ""),
+        "subject_swap": attr_dict.get("Przedmiot", ""),
+        "classroom_swap": attr_dict.get("Sala", ""),
+        "date_added": attr_dict.get("Data dodania", ""),
+    }
+
+
+def _teacher_and_classroom(text: str) -> str:
+    teacher_and_classroom = (
+        text.replace("\xa0", " ").replace("\n", "").replace("&nbsp", "").split("-")
+    )
+    if len(teacher_and_classroom) >= 2:
+        return "-".join(teacher_and_classroom[1:])
+    return ""
+
+
+_REGION = page_region("table")
+_PERIODS = etree.XPath(
+    f"//table[{has_class('decorated')} and {has_class('plan-lekcji')}]/tr[{has_class('line1')}]"
+)
+_RECESSES = etree.XPath(
+    f"//table[{has_class('decorated')} and {has_class('plan-lekcji')}]/tr[{has_class('line0')}]"
+)
+_RECESS_CENTER = etree.XPath(f"(.//td[{has_class('center')}])[1]")
+_LESSONS = etree.XPath(f".//td[@id = 'timetableEntryBox'][{class_is('line1')}]")
+_LESSON_NUMBER = etree.XPath(f"(.//td[{class_is('center')}])[1]")
+_TOOLTIP = etree.XPath(
+    f"(.//div[{has_class('center')} and {has_class('plan-lekcji-info')}])[1]"
+)
+_FIRST_ANCHOR = etree.XPath("(.//a)[1]")
+_LESSON_TEXT = etree.XPath(f"(.//div[{has_class('text')}])[1]")
+_SUBJECT = etree.XPath("(.//b)[1]")
+
+
+def _parse_timetable_lxml(root: html.HtmlElement) -> List[List[Period]]:
+    # the lxml counterpart of parse_timetable, keep the two in sync
+    timetable: List[List[Period]] = []
+    periods = _PERIODS(root)
+    if len(periods) < 1:
+        raise ParseError("Error in parsing timetable.")
+    recess = _RECESSES(root)
+    for weekday in range(7):
+        timetable.append([])
+        for period in range(len(periods)):
+            [recess_from, recess_to] = [None, None]
+            if period <= len(recess) - 1:
+                center = _RECESS_CENTER(recess[period])
+                if not center:
+                    raise ParseError("Error while parsing timetable (center)")
+                [recess_from, recess_to] = _recess(node_text(center[0]))
+            lesson = _LESSONS(periods[period])[weekday]
+            td_center = _LESSON_NUMBER(periods[period])
+            if not td_center:
+                raise ParseError("Error while parsing lesson_number of period")
+            lesson_number = int(node_text(td_center[0]))
+            tooltip = _TOOLTIP(lesson)
+            info = {}
+            if tooltip:
+                a_href = _FIRST_ANCHOR(lesson)
+                info[node_text(tooltip[0]).strip()] = _swap_info(
+                    a_href[0].attrib["title"] if a_href else None
+                )
+            date, date_from, date_to = [
+                val for key, val in lesson.attrib.items() if key.startswith("data")
+            ]
+            text = _LESSON_TEXT(lesson)
+            if not text:
+                subject = ""
+                teacher_and_classroom = ""
+            else:
+                subject = _SUBJECT(text[0])
+                subject = node_text(subject[0]) if subject else ""
+                teacher_and_classroom = _teacher_and_classroom(node_text(text[0]))
+
+            weekday_str = datetime.strptime(date, "%Y-%m-%d").strftime("%A")
+            timetable[weekday].append(
+                Period(
+                    subject,
+                    teacher_and_classroom,
+                    date,
+                    date_from,
+                    date_to,
+                    weekday_str,
+                    info,
+                    lesson_number,
+                    recess_from,
+                    recess_to,
+                )
+            )
+    return timetable
+
+
+def parse_timetable(
+    document: Union[str, bytes],
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> List[List[Period]]:
     """
-    Retrieves the timetable for a given week starting from a Monday date.
+    Parses a week of periods from an already fetched timetable page.
 
     Args:
-        client (Client): An instance of the client class for fetching data.
-        monday_date (datetime): The Monday date for the week's timetable.
+        document (Union[str, bytes]): The page HTML, as text or raw bytes.
+        encoding (str, optional): Encoding of a bytes document, used instead of detecting it. Defaults to UTF-8.
+        backend (str, optional): "bs4" or "lxml". Defaults to the backend in effect,
+            see `librus_apix.helpers.parser_backend`.
 
     Returns:
-        List[List[Period]]: A nested list containing periods for each day of the week.
+        List[List[Period]]: A list of lists, one per weekday, of Period objects.
 
     Raises:
-        DateError: If the provided date is not a Monday.
-        ParseError: If there's an error while parsing the timetable.
+        ArgumentError: If the backend is unknown.
+        ParseError: If there is an error parsing the timetable.
     """
+    if current_parser_backend(backend) == "lxml":
+        tree = tree_no_access_check(make_tree(document, encoding))
+        return _parse_timetable_lxml(tree)
     timetable: List[List[Period]] = []
-    if monday_date.strftime("%A") != "Monday":
-        raise DateError("You must input a Monday date.")
-    sunday = monday_date + timedelta(days=6)
-    week = f"{monday_date.strftime('%Y-%m-%d')}_{sunday.strftime('%Y-%m-%d')}"
-    post = client.post(client.TIMETABLE_URL, data={"tydzien": week})
-    soup = no_access_check(BeautifulSoup(post.text, "lxml"))
+    soup = no_access_check(make_soup(document, encoding, _REGION))
     periods = soup.select("table.decorated.plan-lekcji > tr.line1")
     if len(periods) < 1:
         raise ParseError("Error in parsing timetable.")
@@ -106,10 +246,7 @@ def get_timetable(client: Client, monday_date: datetime) -> List[List[Period]]:
                 center = recess[period].select_one("td.center")
                 if center is None:
                     raise ParseError("Error while parsing timetable (center)")
-                [recess_from, recess_to] = [
-                    x.strip()
-                    for x in center.text.replace("&nbsp;", "").strip().split("-", 1)
-                ]
+                [recess_from, recess_to] = _recess(center.text)
             lesson = periods[period].select(
                 'td[id="timetableEntryBox"][class="line1"]'
             )[weekday]
@@ -121,27 +258,9 @@ def get_timetable(client: Client, monday_date: datetime) -> List[List[Period]]:
             a_href = lesson.select_one("a")
             info = {}
             if tooltip is not None:
-                if a_href is None:
-                    info[tooltip.text.strip()] = ""
-                else:
-                    attr_dict = {}
-                    for attr in (
-                        a_href.attrs["title"]
-                        .replace("<b>", "")
-                        .replace("</b>", "")
-                        .replace("\xa0", " ")
-                        .split("<br>")
-                    ):
-                        if len(attr.strip()) > 2:
-                            key, value = attr.split(": ", 1)
-                            attr_dict[key] = value
-
-                    info[tooltip.text.strip()] = {
-                        "teacher_swap": attr_dict.get("Nauczyciel", ""),
-                        "subject_swap": attr_dict.get("Przedmiot", ""),
-                        "classroom_swap": attr_dict.get("Sala", ""),
-                        "date_added": attr_dict.get("Data dodania", ""),
-                    }
+                info[tooltip.text.strip()] = _swap_info(
+                    None if a_href is None else a_href.attrs["title"]
+                )
             date, date_from, date_to = [
                 val for key, val in lesson.attrs.items() if key.startswith("data")
             ]
@@ -152,16 +271,7 @@ def get_timetable(client: Client, monday_date: datetime) -> List[List[Period]]:
             else:
                 subject = lesson.select_one("b")
                 subject = subject.text if subject is not None else ""
-                teacher_and_classroom = (
-                    lesson.text.replace("\xa0", " ")
-                    .replace("\n", "")
-                    .replace("&nbsp", "")
-                    .split("-")
-                )
-                if len(teacher_and_classroom) >= 2:
-                    teacher_and_classroom = "-".join(teacher_and_classroom[1:])
-                else:
-                    teacher_and_classroom = ""
+                teacher_and_classroom = _teacher_and_classroom(lesson.text)
 
             weekday_str = datetime.strptime(date, "%Y-%m-%d").strftime("%A")
             p = Period(
@@ -178,3 +288,49 @@ def get_timetable(client: Client, monday_date: datetime) -> List[List[Period]]:
             )
             timetable[weekday].append(p)
     return timetable
+
+
+@coalesced
+def get_timetable(client: Client, monday_date: datetime) -> List[List[Period]]:
+    """
+    Retrieves the timetable for a given week starting from a Monday date.
+
+    Args:
+        client (Client): An instance of the client class for fetching data.
+        monday_date (datetime): The Monday date for the week's timetable.
+
+    Returns:
+        List[List[Period]]: A nested list containing periods for each day of the week.
+
+    Raises:
+        DateError: If the provided date is not a Monday.
+        ParseError: If there's an error while parsing the timetable.
+    """
+    payload = _week_payload(monday_date)
+    response = client.post(client.TIMETABLE_URL, data=payload)
+    return run_parser(parse_timetable, response.content, response_encoding(response))
+
+
+@coalesced_async
+async def get_timetable_async(
+    client: AsyncClient, monday_date: datetime
+) -> List[List[Period]]:
+    """
+    Async counterpart of get_timetable.
+
+    Args:
+        client (AsyncClient): The async client used for fetching data.
+        monday_date (datetime): The Monday date for the week's timetable.
+
+    Returns:
+        List[List[Period]]: A nested list containing periods for each day of the week.
+
+    Raises:
+        DateError: If the provided date is not a Monday.
+        ParseError: If there's an error while parsing the timetable.
+    """
+    payload = _week_payload(monday_date)
+    response = await client.post(client.TIMETABLE_URL, data=payload)
+    return await run_parser_async(
+        parse_timetable, response.content, response_encoding(response)
+    )
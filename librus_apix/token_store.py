@@ -0,0 +1,416 @@
+"""
+This module keeps tokens between runs, so workers only log in when a token stopped working.
+
+Logging in with `Client.get_token` takes four requests: a maintenance probe, the OAuth
+authorization page, the login form and its redirect. A token store keeps the API key and
+oauth token of every account together with their age. `login` reuses the stored token,
+checks it at most every `check_after` seconds by fetching a lightweight page and looking
+for the "Brak dostępu" page `no_access_check` raises on, and logs in again only when the
+stored token is missing, too old or rejected. A client with `credentials` that logs in
+again by itself later on stores its new token through its `on_reauth` hook, which `login`
+installs.
+
+Classes:
+    - StoredToken: A stored token of one account and its age.
+    - TokenStore: Base class of the token store backends.
+    - FileTokenStore: Stores every account's token as a JSON file in a directory.
+    - SQLiteTokenStore: Stores the tokens in an SQLite file.
+
+Functions:
+    - token_valid: Checks whether a client's token is still accepted.
+    - token_valid_async: An asyncio counterpart of token_valid.
+    - login: Returns a working token for an account, logging in only when needed.
+    - login_async: An asyncio counterpart of login.
+
+Usage:
+```python
+from librus_apix.client import new_client
+from librus_apix.grades import get_grades
+from librus_apix.token_store import SQLiteTokenStore, login
+
+store = SQLiteTokenStore("/var/lib/worker/tokens.sqlite")
+client = new_client()
+login(client, store, "jan.kowalski", username, password)
+grades = get_grades(client)
+
+# keep a refreshed oauth token as well
+client.refresh_oauth()
+store.put("jan.kowalski", client.token)
+```
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+from librus_apix.cache import cache_key
+from librus_apix.client import AsyncClient, Client, Token
+from librus_apix.exceptions import TokenError
+from librus_apix.helpers import make_soup, no_access_check, response_encoding
+
+
+@dataclass
+class StoredToken:
+    """
+    A stored token of one account and its age.
+
+    Attributes:
+        account_id (str): The account the token belongs to.
+        api_key (str): The "DZIENNIKSID:SDZIENNIKSID" API key.
+        oauth (str): The oauth token, empty if it was never refreshed.
+        created (float): The `time.time()` of the login the API key comes from.
+        oauth_created (float): The `time.time()` the oauth token was refreshed at, 0 without one.
+        checked (float): The `time.time()` the token was last known to work.
+    """
+
+    account_id: str
+    api_key: str
+    oauth: str = ""
+    created: float = field(default_factory=time.time)
+    oauth_created: float = 0.0
+    checked: float = field(default_factory=time.time)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the login the API key comes from."""
+        return time.time() - self.created
+
+    @property
+    def oauth_age(self) -> Optional[float]:
+        """Seconds since the oauth token was refreshed, None without one."""
+        return time.time() - self.oauth_created if self.oauth else None
+
+    def to_token(self) -> Token:
+        """Returns a Token with the stored API key and oauth token."""
+        token = Token(API_Key=self.api_key)
+        token.oauth = self.oauth
+        token.oauth_obtained = self.oauth_created
+        return token
+
+
+class TokenStore:
+    """
+    Base class of the token store backends.
+
+    Subclasses only load, save and delete entries; `put` keeps the ages of the parts of a
+    token that did not change.
+    """
+
+    def load(self, account_id: str) -> Optional[StoredToken]:
+        """Returns the stored token of an account, None if there is none."""
+        raise NotImplementedError
+
+    def save(self, entry: StoredToken) -> None:
+        """Stores an entry, replacing the account's previous one."""
+        raise NotImplementedError
+
+    def delete(self, account_id: str) -> None:
+        """Forgets the token of an account."""
+        raise NotImplementedError
+
+    def accounts(self) -> List[str]:
+        """Returns the accounts with a stored token."""
+        raise NotImplementedError
+
+    def put(self, account_id: str, token: Token) -> StoredToken:
+        """
+        Stores the current token of an account.
+
+        Args:
+            account_id (str): The account the token belongs to.
+            token (Token): The token, e.g. `client.token` after a login or `refresh_oauth`.
+
+        Returns:
+            StoredToken: The stored entry.
+        """
+        now = time.time()
+        entry = StoredToken(account_id, token.API_Key, token.oauth, now, 0.0, now)
+        previous = self.load(account_id)
+        if previous is not None and previous.api_key == token.API_Key:
+            entry.created = previous.created
+            if previous.oauth == token.oauth:
+                entry.oauth_created = previous.oauth_created
+        if entry.oauth and not entry.oauth_created:
+            entry.oauth_created = token.oauth_obtained or now
+        self.save(entry)
+        return entry
+
+
+def _account_digest(account_id: str) -> str:
+    return hashlib.sha256(account_id.encode()).hexdigest()
+
+
+class FileTokenStore(TokenStore):
+    """
+    Stores the token of every account as a JSON file in a directory.
+
+    File names are hashes of the account ids and the files are only readable by their owner.
+
+    Args:
+        directory (Union[str, Path]): The directory to keep the tokens in, created if missing.
+    """
+
+    SUFFIX = ".json"
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"<FileTokenStore {self.directory}>"
+
+    def _path(self, account_id: str) -> Path:
+        return self.directory / (_account_digest(account_id) + self.SUFFIX)
+
+    @staticmethod
+    def _read(path: Path) -> Optional[StoredToken]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return StoredToken(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def load(self, account_id: str) -> Optional[StoredToken]:
+        entry = self._read(self._path(account_id))
+        if entry is None or entry.account_id != account_id:
+            return None
+        return entry
+
+    def save(self, entry: StoredToken) -> None:
+        # write and rename, so concurrent readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(asdict(entry), f)
+            os.replace(tmp, self._path(entry.account_id))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def delete(self, account_id: str) -> None:
+        self._path(account_id).unlink(missing_ok=True)
+
+    def accounts(self) -> List[str]:
+        entries = (self._read(path) for path in self.directory.glob("*" + self.SUFFIX))
+        return sorted(entry.account_id for entry in entries if entry is not None)
+
+
+class SQLiteTokenStore(TokenStore):
+    """
+    Stores the tokens in an SQLite file, shared by every process using the same path.
+
+    Args:
+        path (Union[str, Path]): The database file, created if missing.
+        timeout (float, optional): Seconds to wait for the database lock. Defaults to 30.
+    """
+
+    def __init__(self, path: Union[str, Path], timeout: float = 30.0):
+        self.path = Path(path).expanduser()
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS tokens (account TEXT PRIMARY KEY,"
+            " api_key TEXT NOT NULL, oauth TEXT NOT NULL, created REAL NOT NULL,"
+            " oauth_created REAL NOT NULL, checked REAL NOT NULL)"
+        )
+
+    def __repr__(self) -> str:
+        return f"<SQLiteTokenStore {self.path}>"
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.db = db
+        return db
+
+    def load(self, account_id: str) -> Optional[StoredToken]:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT account, api_key, oauth, created, oauth_created, checked"
+                " FROM tokens WHERE account = ?",
+                (account_id,),
+            )
+            .fetchone()
+        )
+        return StoredToken(*row) if row is not None else None
+
+    def save(self, entry: StoredToken) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO tokens"
+            " (account, api_key, oauth, created, oauth_created, checked)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                entry.account_id,
+                entry.api_key,
+                entry.oauth,
+                entry.created,
+                entry.oauth_created,
+                entry.checked,
+            ),
+        )
+
+    def delete(self, account_id: str) -> None:
+        self._connect().execute("DELETE FROM tokens WHERE account = ?", (account_id,))
+
+    def accounts(self) -> List[str]:
+        rows = self._connect().execute("SELECT account FROM tokens ORDER BY account")
+        return [account for account, in rows]
+
+
+def _probe_url(client: Any, url: Optional[str]) -> str:
+    url = url or client.INFO_URL
+    if client.cache is not None and client.cache_policy.match("GET", url, None):
+        # a cached page says nothing about the token now
+        client.cache.delete(cache_key("GET", url, None, client.token.API_Key))
+    return url
+
+
+def _accepted(response: Any) -> bool:
+    try:
+        no_access_check(make_soup(response.content, response_encoding(response)))
+    except TokenError:
+        return False
+    return True
+
+
+def token_valid(client: Client, url: Optional[str] = None) -> bool:
+    """
+    Checks whether a client's token is still accepted.
+
+    Args:
+        client (Client): The client with the token to check.
+        url (str, optional): A lightweight page to fetch. Defaults to `client.INFO_URL`.
+
+    Returns:
+        bool: False if Librus answers with the "Brak dostępu" page.
+    """
+    url = _probe_url(client, url)
+    return _accepted(client.get(url))
+
+
+async def token_valid_async(client: AsyncClient, url: Optional[str] = None) -> bool:
+    """
+    Checks whether an async client's token is still accepted.
+
+    Args:
+        client (AsyncClient): The client with the token to check.
+        url (str, optional): A lightweight page to fetch. Defaults to `client.INFO_URL`.
+
+    Returns:
+        bool: False if Librus answers with the "Brak dostępu" page.
+    """
+    url = _probe_url(client, url)
+    return _accepted(await client.get(url))
+
+
+def _reusable(
+    entry: Optional[StoredToken], max_age: Optional[float]
+) -> Optional[StoredToken]:
+    if entry is None or (max_age is not None and entry.age >= max_age):
+        return None
+    return entry
+
+
+def login(
+    client: Client,
+    store: TokenStore,
+    account_id: str,
+    username: str,
+    password: str,
+    check_after: float = 60.0,
+    max_age: Optional[float] = None,
+    url: Optional[str] = None,
+) -> Token:
+    """
+    Gives a client a working token for an account, logging in only when needed.
+
+    A stored token checked less than `check_after` seconds ago is used as is, an older one
+    is checked first. A missing, rejected or too old token is replaced by a new login. The
+    client's `on_reauth` is set to store the tokens of the logins it makes by itself later.
+
+    Args:
+        client (Client): The client to authenticate.
+        store (TokenStore): The store keeping the account's token.
+        account_id (str): The account's key in the store.
+        username (str): The username to log in with when needed.
+        password (str): The password to log in with when needed.
+        check_after (float, optional): Seconds a token is trusted without a check. Defaults to 60.
+        max_age (float, optional): Seconds after which a token is replaced without a check. Defaults to None.
+        url (str, optional): The page the token is checked on. Defaults to `client.INFO_URL`.
+
+    Returns:
+        Token: The token the client now uses.
+
+    Raises:
+        MaintananceError: If Librus is under maintenance during a login.
+        AuthorizationError: If the login fails.
+    """
+    client.on_reauth = lambda token: store.put(account_id, token)
+    entry = _reusable(store.load(account_id), max_age)
+    if entry is not None:
+        client.token = entry.to_token()
+        if time.time() - entry.checked < check_after:
+            return client.token
+        if token_valid(client, url):
+            entry.checked = time.time()
+            store.save(entry)
+            return client.token
+    token = client.get_token(username, password)
+    store.put(account_id, token)
+    return token
+
+
+async def login_async(
+    client: AsyncClient,
+    store: TokenStore,
+    account_id: str,
+    username: str,
+    password: str,
+    check_after: float = 60.0,
+    max_age: Optional[float] = None,
+    url: Optional[str] = None,
+) -> Token:
+    """
+    Gives an async client a working token for an account, logging in only when needed.
+
+    See `login`; the store is accessed synchronously, its operations are small.
+
+    Args:
+        client (AsyncClient): The client to authenticate.
+        store (TokenStore): The store keeping the account's token.
+        account_id (str): The account's key in the store.
+        username (str): The username to log in with when needed.
+        password (str): The password to log in with when needed.
+        check_after (float, optional): Seconds a token is trusted without a check. Defaults to 60.
+        max_age (float, optional): Seconds after which a token is replaced without a check. Defaults to None.
+        url (str, optional): The page the token is checked on. Defaults to `client.INFO_URL`.
+
+    Returns:
+        Token: The token the client now uses.
+
+    Raises:
+        MaintananceError: If Librus is under maintenance during a login.
+        AuthorizationError: If the login fails.
+    """
+    client.on_reauth = lambda token: store.put(account_id, token)
+    entry = _reusable(store.load(account_id), max_age)
+    if entry is not None:
+        client.token = entry.to_token()
+        if time.time() - entry.checked < check_after:
+            return client.token
+        if await token_valid_async(client, url):
+            entry.checked = time.time()
+            store.save(entry)
+            return client.token
+    token = await client.get_token(username, password)
+    store.put(account_id, token)
+    return token
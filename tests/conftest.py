@@ -1,6 +1,10 @@
+import asyncio
 import pytest
-from librus_apix.client import Client, Token
+from librus_apix.client import AsyncClient, Client, Token
 import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from mock_server import MockServer
 
 
 @pytest.fixture(scope="session")
@@ -58,3 +62,57 @@ def client(request) -> Client:
         )
     else:
         return Client(token)
+
+
+@pytest.fixture(scope="session")
+def _mock_server():
+    with MockServer() as server:
+        yield server
+
+
+@pytest.fixture
+def mock_server(_mock_server: MockServer) -> MockServer:
+    _mock_server.reset()
+    return _mock_server
+
+
+def _pages_urls(base: str) -> Dict[str, str]:
+    return dict(
+        base_url=base,
+        grades_url=base + "/grades",
+        timetable_url=base + "/timetable",
+        message_url=base + "/messages",
+        send_message_url=base + "/sent_messages",
+        announcements_url=base + "/announcements",
+        attendance_url=base + "/attendance",
+        attendance_details_url=base + "/attendance_details/",
+        completed_lessons_url=base + "/completed",
+        schedule_url=base + "/schedule",
+        info_url=base + "/student_info",
+        homework_url=base + "/homework",
+        homework_details_url=base + "/homework/",
+    )
+
+
+@pytest.fixture
+def pages_client(mock_server: MockServer) -> Client:
+    """A Client reading the static pages in `tests/pages`."""
+    return Client(Token(API_Key="what:ever"), **_pages_urls(mock_server.url))
+
+
+@pytest.fixture
+def run_pages_async(
+    mock_server: MockServer,
+) -> Callable[[Callable[[AsyncClient], Awaitable[Any]]], Any]:
+    """Runs `scraper(async_client)` against the static pages in `tests/pages`."""
+
+    def run(scraper: Callable[[AsyncClient], Awaitable[Any]]) -> Any:
+        async def main():
+            async with AsyncClient(
+                Token(API_Key="what:ever"), **_pages_urls(mock_server.url)
+            ) as client:
+                return await scraper(client)
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,200 @@
+"""
+A tiny in-process stand-in for synergia.librus.pl used by the transport tests and benchmarks.
+
+It serves static pages from `tests/pages` (`/grades` serves `grades.html`), lets tests register their own routes
+and counts both hits per path and accepted connections (i.e. TCP/TLS handshakes).
+"""
+
+import gzip
+import ssl
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+PAGES_DIR = Path(__file__).parent / "pages"
+
+
+@dataclass
+class MockRequest:
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    headers: Dict[str, str]
+    cookies: Dict[str, str]
+    form: Dict[str, List[str]]
+
+
+@dataclass
+class MockResponse:
+    status: int = 200
+    body: bytes = b""
+    headers: Dict[str, str] = field(
+        default_factory=lambda: {"Content-Type": "text/html; charset=UTF-8"}
+    )
+    cookies: Dict[str, str] = field(default_factory=dict)
+
+
+Route = Callable[[MockRequest], MockResponse]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def setup(self):
+        super().setup()
+        with self.server.mock.lock:
+            self.server.mock.connections += 1
+
+    def log_message(self, *_):
+        pass
+
+    def _request(self) -> MockRequest:
+        split = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode() if length else ""
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return MockRequest(
+            self.command,
+            split.path,
+            parse_qs(split.query),
+            dict(self.headers.items()),
+            {key: morsel.value for key, morsel in cookie.items()},
+            parse_qs(body),
+        )
+
+    def _serve(self):
+        mock = self.server.mock
+        request = self._request()
+        with mock.lock:
+            mock.hits[request.path] += 1
+            mock.requests.append(request)
+        delay = mock.delay_for(request.path)
+        if delay:
+            time.sleep(delay)
+        response = mock.respond(request)
+        body = response.body
+        headers = dict(response.headers)
+        coding = mock.compression
+        if coding and coding in request.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body) if coding == "gzip" else zlib.compress(body)
+            headers["Content-Encoding"] = coding
+        self.send_response(response.status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        for key, value in response.cookies.items():
+            self.send_header("Set-Cookie", f"{key}={value}; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _serve
+    do_POST = _serve
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockServer"
+
+    def handle_error(self, request, client_address):
+        # clients that timed out hang up before delayed responses are written
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class MockServer:
+    """
+    Threaded HTTP/1.1 server with keep-alive.
+
+    Args:
+        pages_dir (Path): Directory with static pages served under `/<name>`.
+        certfile (str, optional): Certificate for serving HTTPS.
+        keyfile (str, optional): Private key for serving HTTPS.
+
+    Attributes:
+        compression (str, optional): "gzip" or "deflate" to compress bodies for clients accepting it.
+    """
+
+    def __init__(
+        self,
+        pages_dir: Path = PAGES_DIR,
+        certfile: Optional[str] = None,
+        keyfile: Optional[str] = None,
+    ):
+        self.pages_dir = pages_dir
+        self.lock = threading.Lock()
+        self.hits: Counter = Counter()
+        self.requests: List[MockRequest] = []
+        self.connections = 0
+        self.routes: Dict[str, Route] = {}
+        self.delays: Dict[str, Tuple[float, ...]] = {}
+        self.compression: Optional[str] = None
+        self._httpd = _Server(("127.0.0.1", 0), _Handler)
+        self._httpd.mock = self
+        scheme = "http"
+        if certfile is not None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self._httpd.socket = context.wrap_socket(
+                self._httpd.socket, server_side=True
+            )
+            scheme = "https"
+        host, port = self._httpd.server_address[:2]
+        self.url = f"{scheme}://{host}:{port}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self) -> "MockServer":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.hits.clear()
+            self.requests.clear()
+            self.connections = 0
+            self.routes.clear()
+            self.delays.clear()
+            self.compression = None
+
+    def route(self, path: str, handler: Route) -> None:
+        self.routes[path] = handler
+
+    def delay(self, path: str, *seconds: float) -> None:
+        """Delays the n-th hit of `path` by `seconds[n]` (the last value repeats)."""
+        self.delays[path] = seconds
+
+    def delay_for(self, path: str) -> float:
+        delays = self.delays.get(path)
+        if not delays:
+            return 0.0
+        with self.lock:
+            nth = self.hits[path] - 1
+        return delays[min(nth, len(delays) - 1)]
+
+    def respond(self, request: MockRequest) -> MockResponse:
+        handler = self.routes.get(request.path)
+        if handler is not None:
+            return handler(request)
+        page = self.pages_dir / request.path.lstrip("/")
+        for candidate in (page, page.with_name(page.name + ".html")):
+            if candidate.is_file():
+                return MockResponse(body=candidate.read_bytes())
+        return MockResponse(404, b"not found")
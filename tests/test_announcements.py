@@ -1,7 +1,11 @@
 from logging import Logger
 import pytest
 
-from librus_apix.announcements import Announcement, get_announcements
+from librus_apix.announcements import (
+    Announcement,
+    get_announcements,
+    get_announcements_async,
+)
 from librus_apix.client import Client
 
 
@@ -19,3 +23,9 @@ def test_get_announcements(client: Client, log: Logger):
     for a in announcements:
         assert isinstance(a, Announcement)
         _test_announcement_data(a, log)
+
+
+def test_get_announcements_async(pages_client: Client, run_pages_async):
+    announcements = get_announcements(pages_client)
+    assert announcements
+    assert run_pages_async(get_announcements_async) == announcements
@@ -1,9 +1,27 @@
-from librus_apix.exceptions import ArgumentError
+import asyncio
+import json
+from librus_apix.exceptions import ArgumentError, ParseError
 from logging import Logger
+from typing import Callable, List, Optional
 import pytest
+from requests import HTTPError
 
-from librus_apix.attendance import Attendance, get_attendance
-from librus_apix.client import Client
+from librus_apix.attendance import (
+    Attendance,
+    get_attendance,
+    get_attendance_async,
+    get_detail,
+    get_detail_async,
+    get_subject_frequency,
+    get_subject_frequency_async,
+    iter_attendance,
+    iter_parse_attendance,
+    parse_attendance,
+)
+from librus_apix.client import AsyncClient, Client, Token
+from librus_apix.concurrency import AdaptiveLimit
+from librus_apix.retry import RetryPolicy
+from mock_server import PAGES_DIR, MockRequest, MockResponse, MockServer
 
 
 def _test_attendance_data(attendance: Attendance, log: Logger):
@@ -34,3 +52,218 @@ def test_get_attendance(client: Client, opt: str, log: Logger):
 def test_wrong_opt(client: Client):
     with pytest.raises(ArgumentError):
         get_attendance(client, "this should fail")
+
+
+def _gateway_routes(mock_server: MockServer, oauth: Optional[str] = None):
+    """Routes the gateway API, answering 401 unless the `oauth` token is sent, if given."""
+    attendances = [
+        {"Lesson": {"Id": 1}, "Type": {"Id": 100}},
+        {"Lesson": {"Id": 1}, "Type": {"Id": 1}},
+        {"Lesson": {"Id": 2}, "Type": {"Id": 2}},
+    ]
+    gateway = "/gateway/api/2.0"
+
+    def as_json(data) -> Callable[[MockRequest], MockResponse]:
+        def handler(request: MockRequest) -> MockResponse:
+            if oauth is not None and request.cookies.get("oauth_token") != oauth:
+                return MockResponse(401, b'{"Code": "TokenIsExpired"}')
+            return MockResponse(body=json.dumps(data).encode())
+
+        return handler
+
+    mock_server.route(
+        "/refreshToken", lambda _: MockResponse(cookies={"oauth_token": "fresh"})
+    )
+    mock_server.route(gateway + "/Attendances", as_json({"Attendances": attendances}))
+    mock_server.route(
+        gateway + "/Lessons/1", as_json({"Lesson": {"Subject": {"Id": 7}}})
+    )
+    mock_server.route(
+        gateway + "/Lessons/2", as_json({"Lesson": {"Subject": {"Id": 7}}})
+    )
+    mock_server.route(
+        gateway + "/Subjects/7", as_json({"Subject": {"Name": "Matematyka"}})
+    )
+
+
+def _gateway_client(mock_server: MockServer) -> Client:
+    return Client(
+        Token(API_Key="what:ever"),
+        base_url=mock_server.url,
+        gateway_api_attendance=mock_server.url + "/gateway/api/2.0/Attendances",
+        refresh_oauth_url=mock_server.url + "/refreshToken",
+    )
+
+
+def test_subject_frequency(mock_server: MockServer):
+    _gateway_routes(mock_server)
+    client = _gateway_client(mock_server)
+    assert get_subject_frequency(client) == {"Matematyka": 66.67}
+    assert client.token.oauth == "fresh"
+    assert mock_server.requests[-1].cookies["oauth_token"] == "fresh"
+
+
+def test_gateway_oauth_reused_until_refused(mock_server: MockServer):
+    _gateway_routes(mock_server, oauth="fresh")
+    client = _gateway_client(mock_server)
+    for _ in range(3):
+        assert get_subject_frequency(client) == {"Matematyka": 66.67}
+    assert mock_server.hits["/refreshToken"] == 1
+
+    # a token the API refuses is refreshed once and the request replayed
+    client.token.set_oauth("revoked")
+    assert get_subject_frequency(client) == {"Matematyka": 66.67}
+    assert mock_server.hits["/refreshToken"] == 2
+    assert mock_server.hits["/gateway/api/2.0/Attendances"] == 5
+
+
+def test_oauth_refreshed_ahead_of_expiry(mock_server: MockServer):
+    _gateway_routes(mock_server)
+    client = _gateway_client(mock_server)
+    client.token.set_oauth("old", lifetime=30)
+    assert client.ensure_oauth() == "old"
+    client._oauth_refresher.join(5)
+    assert client.token.oauth == "fresh"
+    assert client.token.oauth_expires_in > 60
+    assert client.ensure_oauth() == "fresh"
+    assert mock_server.hits["/refreshToken"] == 1
+
+    client.token.set_oauth("expired", lifetime=0)
+    assert client.ensure_oauth() == "fresh"
+    assert mock_server.hits["/refreshToken"] == 2
+
+
+def test_oauth_lifetime_from_cookie(mock_server: MockServer):
+    mock_server.route(
+        "/refreshToken",
+        lambda _: MockResponse(cookies={"oauth_token": "fresh; Max-Age=1800"}),
+    )
+    client = _gateway_client(mock_server)
+    assert client.refresh_oauth() == "fresh"
+    assert 1790 < client.token.oauth_expires_in <= 1800
+
+    async def run():
+        async with AsyncClient.from_client(client) as async_client:
+            async_client.token.set_oauth("old", lifetime=30)
+            assert await async_client.refresh_oauth() == "fresh"
+            return async_client.token.oauth_expires_in
+
+    assert 1790 < asyncio.run(run()) <= 1800
+
+
+def test_subject_frequency_login_reaches_client(mock_server: MockServer):
+    _gateway_routes(mock_server)
+    attendances = mock_server.routes["/gateway/api/2.0/Attendances"]
+    no_access = (PAGES_DIR / "no_access.html").read_bytes()
+    mock_server.route(
+        "/gateway/api/2.0/Attendances",
+        lambda request: attendances(request)
+        if request.cookies.get("DZIENNIKSID") == "relogged"
+        else MockResponse(body=no_access),
+    )
+    authorization = b'{"status": "ok", "goTo": "/OAuth/2FA"}'
+    mock_server.route("/api", lambda _: MockResponse(body=b"{}"))
+    mock_server.route(
+        "/api/OAuth/Authorization", lambda _: MockResponse(body=authorization)
+    )
+    mock_server.route(
+        "/api/OAuth/2FA",
+        lambda _: MockResponse(cookies={"DZIENNIKSID": "relogged", "SDZIENNIKSID": "s"}),
+    )
+    client = _gateway_client(mock_server)
+    client.API_URL = mock_server.url + "/api"
+    client.credentials = ("user", "secret")
+    stored: List[str] = []
+    client.on_reauth = lambda token: stored.append(token.API_Key)
+    assert get_subject_frequency(client) == {"Matematyka": 66.67}
+    assert client.token.API_Key == "relogged:s"
+    assert client.token.oauth == "fresh"
+    assert stored == ["relogged:s"]
+
+
+def test_subject_frequency_adaptive_lookups(mock_server: MockServer):
+    _gateway_routes(mock_server)
+    limit = AdaptiveLimit(initial=1, max_limit=2)
+    client = _gateway_client(mock_server)
+    assert get_subject_frequency(client, concurrency=limit) == {"Matematyka": 66.67}
+    # both lessons and the subject, the repeated lesson is coalesced
+    assert limit.successes >= 3
+    assert limit.inflight == 0
+
+
+def test_subject_frequency_retried_by_client_policy(mock_server: MockServer):
+    _gateway_routes(mock_server)
+    lesson = mock_server.routes["/gateway/api/2.0/Lessons/1"]
+    failures = iter([True, True])
+    mock_server.route(
+        "/gateway/api/2.0/Lessons/1",
+        lambda request: MockResponse(503) if next(failures, False) else lesson(request),
+    )
+    client = _gateway_client(mock_server)
+    with pytest.raises(HTTPError):
+        get_subject_frequency(client)
+    # no retries of its own on top of the client's
+    assert mock_server.hits["/gateway/api/2.0/Lessons/1"] == 1
+
+    client.retry_policy = RetryPolicy(attempts=3, backoff=0.01)
+    assert get_subject_frequency(client) == {"Matematyka": 66.67}
+    assert mock_server.hits["/gateway/api/2.0/Lessons/1"] == 3
+
+
+def test_subject_frequency_inside_running_loop(mock_server: MockServer):
+    _gateway_routes(mock_server)
+    client = _gateway_client(mock_server)
+
+    async def run():
+        return get_subject_frequency(client)
+
+    assert asyncio.run(run()) == {"Matematyka": 66.67}
+
+
+@pytest.mark.parametrize("opt", ["all", "week", "last_login"])
+def test_get_attendance_async(pages_client: Client, run_pages_async, opt: str):
+    attendance = get_attendance(pages_client, opt)
+    assert attendance[0]
+    assert run_pages_async(lambda c: get_attendance_async(c, opt)) == attendance
+
+
+def test_get_detail_async(pages_client: Client, run_pages_async):
+    detail = get_detail(pages_client, "5001")
+    assert detail
+    assert run_pages_async(lambda c: get_detail_async(c, "5001")) == detail
+
+
+def test_subject_frequency_async(mock_server: MockServer):
+    _gateway_routes(mock_server)
+    client = _gateway_client(mock_server)
+
+    async def run():
+        async with AsyncClient.from_client(client) as async_client:
+            return await get_subject_frequency_async(async_client)
+
+    assert asyncio.run(run()) == {"Matematyka": 66.67}
+
+
+def _grouped(records: list) -> list:
+    """Groups streamed records by semester like `parse_attendance` does."""
+    semesters = [[a for a in records if a.semester == s] for s in range(2)]
+    return semesters if max(a.semester for a in records) == 0 else semesters[::-1]
+
+
+def test_iter_parse_attendance():
+    page = (PAGES_DIR / "attendance.html").read_bytes()
+    chunks = (page[i : i + 500] for i in range(0, len(page), 500))
+    records = list(iter_parse_attendance(chunks))
+    assert _grouped(records) == parse_attendance(page)
+
+    with pytest.raises(ParseError):
+        list(iter_parse_attendance([b"<html><body></body></html>"]))
+
+
+def test_iter_attendance(pages_client: Client):
+    records = iter_attendance(pages_client)
+    assert isinstance(next(records), Attendance)
+    records.close()
+    assert _grouped(list(iter_attendance(pages_client))) == get_attendance(pages_client)
+    with pytest.raises(ArgumentError):
+        iter_attendance(pages_client, "this should fail")
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from librus_apix.cache import (
+    CachedResponse,
+    CachePolicy,
+    CacheRule,
+    DiskCache,
+    MemoryCache,
+    cache_key,
+    past_week,
+)
+from librus_apix.client import AsyncClient, Client, Token
+from librus_apix.ratelimit import MemoryRateLimiter
+from librus_apix.student_information import get_student_information
+from librus_apix.timetable import _week_payload
+from mock_server import PAGES_DIR, MockResponse, MockServer
+
+
+def _entry(body: bytes, ttl: float = 60) -> CachedResponse:
+    return CachedResponse(200, "http://x", {}, body, "utf-8", time.time() + ttl)
+
+
+def test_cache_key_identity():
+    key = cache_key("GET", "http://x/a", None, "a:b")
+    assert key == cache_key("get", "http://x/a", {}, "a:b")
+    assert key != cache_key("GET", "http://x/a", None, "c:d")
+    assert key != cache_key("POST", "http://x/a", None, "a:b")
+    assert cache_key("POST", "http://x", {"a": 1, "b": 2}, "") == cache_key(
+        "POST", "http://x", {"b": 2, "a": 1}, ""
+    )
+    assert "a:b" not in key
+
+
+def test_past_week():
+    monday = datetime.now() - timedelta(days=datetime.now().weekday())
+    assert past_week(_week_payload(monday - timedelta(weeks=1)))
+    assert not past_week(_week_payload(monday))
+    assert not past_week({})
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = MemoryCache(max_entries=3, max_bytes=10)
+    for key in "abc":
+        cache.set(key, _entry(b"xx"))
+    assert cache.get("a") is not None
+    cache.set("d", _entry(b"xx"))
+    assert cache.get("b") is None
+    assert len(cache) == 3 and cache.size == 6
+    cache.set("e", _entry(b"xxxxxx"))
+    assert [cache.get(key) is not None for key in "acde"] == [True, False, True, True]
+    assert (len(cache), cache.size, cache.stats.evictions) == (3, 10, 2)
+    cache.set("huge", _entry(b"x" * 11))
+    assert cache.get("huge") is None
+
+
+def test_expiry_and_stats():
+    cache = MemoryCache()
+    cache.set("a", _entry(b"x", ttl=-1))
+    assert cache.get("a", "info") is None
+    cache.set("a", _entry(b"x"))
+    assert cache.get("a", "info") is not None
+    stats = cache.stats
+    assert (stats.hits["info"], stats.misses["info"], stats.expirations) == (1, 1, 1)
+    assert stats.hit_ratio("info") == 0.5
+    assert stats.hit_ratio("other") == 0.0
+
+
+def test_disk_cache_survives_restart(tmp_path: Path):
+    cache = DiskCache(tmp_path, max_entries=2)
+    cache.set("a", _entry(b"first"))
+    cache.set("b", _entry(b"second"))
+    cache.set("stale", _entry(b"old", ttl=-1))
+    reopened = DiskCache(tmp_path, max_entries=2)
+    assert reopened.get("a") is None
+    assert reopened.get("b").content == b"second"
+    assert (len(reopened), reopened.size) == (1, len(b"second"))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["b.body", "b.json"]
+    header = json.loads((tmp_path / "b.json").read_text())
+    assert (header["status_code"], header["url"]) == (200, "http://x")
+
+    (tmp_path / "b.body").write_bytes(b"tampered")
+    (tmp_path / "orphan.body").write_bytes(b"no header")
+    reopened = DiskCache(tmp_path)
+    assert (len(reopened), list(tmp_path.iterdir())) == (0, [])
+
+
+def _cached_client(mock_server: MockServer, cache) -> Client:
+    return Client(
+        Token(API_Key="what:ever"),
+        base_url=mock_server.url,
+        info_url=mock_server.url + "/student_info",
+        grades_url=mock_server.url + "/grades",
+        cache=cache,
+    )
+
+
+def test_client_serves_policy_pages_from_cache(mock_server: MockServer):
+    client = _cached_client(mock_server, MemoryCache())
+    first = get_student_information(client)
+    assert get_student_information(client) == first
+    client.get(client.GRADES_URL)
+    client.get(client.GRADES_URL)
+    assert mock_server.hits["/student_info"] == 1
+    assert mock_server.hits["/grades"] == 2
+    assert client.transfer_stats.requests == 3
+    assert client.cache.stats.hits["student_information"] == 1
+
+    client.token = Token(API_Key="other:account")
+    get_student_information(client)
+    assert mock_server.hits["/student_info"] == 2
+
+
+def test_no_access_page_is_not_cached(mock_server: MockServer):
+    client = _cached_client(mock_server, MemoryCache())
+    no_access = (PAGES_DIR / "no_access.html").read_bytes()
+    mock_server.route("/student_info", lambda _: MockResponse(body=no_access))
+    client.get(client.INFO_URL)
+    assert len(client.cache) == 0
+
+    async def run():
+        async with AsyncClient.from_client(client) as async_client:
+            await async_client.get(async_client.INFO_URL)
+
+    asyncio.run(run())
+    assert len(client.cache) == 0
+    mock_server.routes.clear()
+    first = get_student_information(client)
+    assert get_student_information(client) == first
+    assert mock_server.hits["/student_info"] == 3
+
+
+def test_client_custom_policy(mock_server: MockServer):
+    client = _cached_client(mock_server, MemoryCache())
+    client.cache_policy = CachePolicy([CacheRule("grades", client.GRADES_URL, 60)])
+    for _ in range(3):
+        assert client.get(client.GRADES_URL).status_code == 200
+        client.get(client.INFO_URL)
+    assert mock_server.hits["/grades"] == 1
+    assert mock_server.hits["/student_info"] == 3
+
+
+def test_async_client_shares_cache(mock_server: MockServer):
+    client = _cached_client(mock_server, MemoryCache())
+    page = client.get(client.INFO_URL).content
+
+    async def run():
+        async with AsyncClient.from_client(client) as async_client:
+            return await async_client.get(async_client.INFO_URL)
+
+    response = asyncio.run(run())
+    assert response.content == page
+    assert mock_server.hits["/student_info"] == 1
+
+
+def test_async_cache_with_rate_limiter(mock_server: MockServer):
+    async def run():
+        async with AsyncClient(
+            Token(API_Key="what:ever"),
+            info_url=mock_server.url + "/student_info",
+            cache=MemoryCache(),
+            rate_limiter=MemoryRateLimiter(rate=100, burst=10),
+        ) as client:
+            for _ in range(3):
+                await client.get(client.INFO_URL)
+
+    asyncio.run(run())
+    assert mock_server.hits["/student_info"] == 1
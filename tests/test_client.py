@@ -1,10 +1,24 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from typing import Dict
 import pytest
 from requests.models import Response
 from requests.sessions import RequestsCookieJar
 
-from librus_apix.client import Client, Token
+from librus_apix.client import (
+    AsyncClient,
+    AsyncResponse,
+    Client,
+    FetchRequest,
+    Token,
+    new_async_client,
+)
+from librus_apix.compression import ACCEPT_ENCODING, transfer_sizes
+from librus_apix.exceptions import ArgumentError, AuthorizationError
+from mock_server import PAGES_DIR, MockRequest, MockResponse, MockServer
 
 
 def test_client_token(client: Client, log: Logger):
@@ -23,3 +37,381 @@ def test_get_base_url(client: Client):
     response = client.get(client.BASE_URL)
     assert isinstance(response, Response)
     assert response.status_code == 200
+
+
+def _local_client(mock_server: MockServer, **kwargs) -> Client:
+    return Client(Token(API_Key="what:ever"), base_url=mock_server.url, **kwargs)
+
+
+def test_connections_are_reused(mock_server: MockServer):
+    mock_server.route("/ping", lambda _: MockResponse(body=b"pong"))
+    with _local_client(mock_server) as client:
+        for _ in range(5):
+            assert client.get(client.BASE_URL + "/ping").content == b"pong"
+            client.post(client.BASE_URL + "/ping", data={"a": "b"})
+    assert mock_server.hits["/ping"] == 10
+    assert mock_server.connections == 1
+
+
+def test_connections_without_keep_alive(mock_server: MockServer):
+    mock_server.route("/ping", lambda _: MockResponse(body=b"pong"))
+    client = _local_client(mock_server, keep_alive=False)
+    for _ in range(3):
+        client.get(client.BASE_URL + "/ping")
+    assert mock_server.connections == 3
+
+
+def test_client_usable_after_close(mock_server: MockServer):
+    mock_server.route("/ping", lambda _: MockResponse(body=b"pong"))
+    client = _local_client(mock_server)
+    client.get(client.BASE_URL + "/ping")
+    client.close()
+    assert client.get(client.BASE_URL + "/ping").status_code == 200
+    assert mock_server.connections == 2
+
+
+def _login_routes(mock_server: MockServer):
+    def authorization(request: MockRequest) -> MockResponse:
+        if request.method == "POST":
+            if request.form.get("pass") != ["secret"]:
+                body = {"status": "error", "errors": [{"message": "bad password"}]}
+            else:
+                body = {"status": "ok", "goTo": "/OAuth/Authorization/2FA"}
+            return MockResponse(body=json.dumps(body).encode())
+        return MockResponse(body=b"{}")
+
+    mock_server.route("/api", lambda _: MockResponse(body=b"{}"))
+    mock_server.route("/api/OAuth/Authorization", authorization)
+    mock_server.route(
+        "/api/OAuth/Authorization/2FA",
+        lambda _: MockResponse(
+            cookies={"DZIENNIKSID": "L01~abc", "SDZIENNIKSID": "xyz"}
+        ),
+    )
+
+
+def test_async_client_get_post(mock_server: MockServer):
+    mock_server.route(
+        "/echo", lambda r: MockResponse(body=json.dumps(r.cookies).encode())
+    )
+
+    async def run():
+        async with AsyncClient(
+            Token(API_Key="what:ever"), base_url=mock_server.url
+        ) as client:
+            got = await client.get(client.BASE_URL + "/echo")
+            posted = await client.post(client.BASE_URL + "/echo", data={"a": "b"})
+            return got, posted
+
+    got, posted = asyncio.run(run())
+    assert isinstance(got, AsyncResponse)
+    assert got.status_code == 200
+    assert got.json() == {"DZIENNIKSID": "what", "SDZIENNIKSID": "ever"}
+    assert posted.json() == got.json()
+    assert mock_server.requests[-1].form == {"a": ["b"]}
+    assert mock_server.connections == 1
+
+
+def test_async_client_limit_per_host(mock_server: MockServer):
+    mock_server.route("/ping", lambda _: MockResponse(body=b"pong"))
+    mock_server.delay("/ping", 0.05)
+
+    async def run():
+        async with AsyncClient(
+            Token(API_Key="what:ever"), base_url=mock_server.url, limit_per_host=2
+        ) as client:
+            await asyncio.gather(
+                *[client.get(f"{client.BASE_URL}/ping?i={i}") for i in range(8)]
+            )
+
+    asyncio.run(run())
+    assert mock_server.hits["/ping"] == 8
+    assert mock_server.connections == 2
+
+
+def test_async_client_proxy_by_scheme():
+    client = new_async_client(proxy={"https": "http://proxy:3128"})
+    assert client._proxy_for("https://synergia.librus.pl") == "http://proxy:3128"
+    assert client._proxy_for("http://synergia.librus.pl") is None
+
+
+def test_async_client_from_client():
+    client = Client(
+        Token(API_Key="what:ever"), base_url="http://x", proxy={"https": "p"}
+    )
+    client.on_reauth = print
+    async_client = AsyncClient.from_client(client, limit_per_host=3)
+    assert async_client.token is client.token
+    assert async_client.on_reauth is print
+    assert async_client.BASE_URL == "http://x"
+    assert async_client.proxy == {"https": "p"}
+    assert async_client.limit_per_host == 3
+
+
+def test_get_token(mock_server: MockServer):
+    _login_routes(mock_server)
+    client = Client(Token(), api_url=mock_server.url + "/api")
+    token = client.get_token("user", "secret")
+    assert token.API_Key == "L01~abc:xyz"
+    assert client.token is token
+    with pytest.raises(AuthorizationError):
+        client.get_token("user", "wrong")
+
+
+def test_async_get_token(mock_server: MockServer):
+    _login_routes(mock_server)
+
+    async def run():
+        async with new_async_client(api_url=mock_server.url + "/api") as client:
+            return await client.get_token("user", "secret")
+
+    assert asyncio.run(run()).API_Key == "L01~abc:xyz"
+
+
+def _expiring_session(mock_server: MockServer) -> Dict[str, int]:
+    """Routes a login handing out "session<n>" keys and a /page accepting only the last one."""
+    state = {"logins": 0}
+    no_access = (PAGES_DIR / "no_access.html").read_bytes()
+
+    def authorization(request: MockRequest) -> MockResponse:
+        if request.method == "POST":
+            if request.form.get("pass") != ["secret"]:
+                body = {"status": "error", "errors": [{"message": "bad password"}]}
+            else:
+                body = {"status": "ok", "goTo": "/OAuth/Authorization/2FA"}
+            return MockResponse(body=json.dumps(body).encode())
+        return MockResponse(body=b"{}")
+
+    def redirect(_: MockRequest) -> MockResponse:
+        time.sleep(0.05)
+        state["logins"] += 1
+        session = f"session{state['logins']}"
+        return MockResponse(cookies={"DZIENNIKSID": session, "SDZIENNIKSID": "s"})
+
+    def page(request: MockRequest) -> MockResponse:
+        if request.cookies.get("DZIENNIKSID") != f"session{state['logins']}":
+            return MockResponse(body=no_access)
+        return MockResponse(body=b"ok")
+
+    mock_server.route("/api", lambda _: MockResponse(body=b"{}"))
+    mock_server.route("/api/OAuth/Authorization", authorization)
+    mock_server.route("/api/OAuth/Authorization/2FA", redirect)
+    mock_server.route("/page", page)
+    return state
+
+
+def test_reauthentication_shared_by_concurrent_requests(mock_server: MockServer):
+    _expiring_session(mock_server)
+    client = Client(
+        Token(API_Key="expired:s"),
+        api_url=mock_server.url + "/api",
+        credentials=lambda: ("user", "secret"),
+    )
+    pages = [f"{mock_server.url}/page?i={i}" for i in range(8)]
+    results = client.fetch_many(pages + [FetchRequest(pages[0], "POST", {})])
+    assert [r.response.content for r in results] == [b"ok"] * 9
+    assert mock_server.hits["/api/OAuth/Authorization/2FA"] == 1
+    assert client.reauthentications == 1
+    assert client.token.API_Key == "session1:s"
+    # rejected pages were replayed once, the ones sent after the login went through
+    assert 9 < mock_server.hits["/page"] <= 18
+
+
+def test_reauthentication_failure_is_shared(mock_server: MockServer):
+    _expiring_session(mock_server)
+    client = Client(
+        Token(API_Key="expired:s"),
+        api_url=mock_server.url + "/api",
+        credentials=("user", "wrong"),
+    )
+    results = client.fetch_many(
+        [f"{mock_server.url}/page?i={i}" for i in range(4)], max_concurrency=4
+    )
+    assert all(isinstance(r.error, AuthorizationError) for r in results)
+    assert mock_server.hits["/api/OAuth/Authorization"] < 8
+    # the failed login left the token and its cookies in place
+    client.credentials = None
+    client.get(f"{mock_server.url}/page")
+    assert mock_server.requests[-1].cookies["DZIENNIKSID"] == "expired"
+
+    # without credentials the rejected page is returned as is
+    plain = Client(Token(API_Key="expired:s"))
+    assert b"Brak dost" in plain.get(f"{mock_server.url}/page").content
+    with pytest.raises(ArgumentError):
+        plain.reauthenticate()
+
+
+def test_async_reauthentication(mock_server: MockServer):
+    state = _expiring_session(mock_server)
+
+    async def run():
+        async with new_async_client(
+            token=Token(API_Key="expired:s"),
+            api_url=mock_server.url + "/api",
+            credentials=("user", "secret"),
+        ) as client:
+            first = await asyncio.gather(
+                *[client.get(f"{mock_server.url}/page?i={i}") for i in range(6)]
+            )
+            state["logins"] += 1  # the new session expires as well
+            second = await client.post(f"{mock_server.url}/page", data={})
+            return client, first + [second]
+
+    client, responses = asyncio.run(run())
+    assert [r.content for r in responses] == [b"ok"] * 7
+    assert client.reauthentications == 2
+    assert client.token.API_Key == "session3:s"
+
+
+@pytest.mark.parametrize("coding", ["gzip", "deflate"])
+def test_compressed_transfer(mock_server: MockServer, pages_client: Client, coding):
+    mock_server.compression = coding
+    page = (PAGES_DIR / "grades.html").read_bytes()
+    response = pages_client.get(pages_client.GRADES_URL)
+    assert response.content == page
+    assert response.headers["Content-Encoding"] == coding
+    assert coding in mock_server.requests[-1].headers["Accept-Encoding"]
+    wire, decoded = transfer_sizes(response)
+    assert decoded == len(page)
+    assert wire < decoded / 3
+    stats = pages_client.transfer_stats
+    assert (stats.requests, stats.wire_bytes, stats.decoded_bytes) == (1, wire, decoded)
+    assert stats.saved_bytes == decoded - wire
+
+
+@pytest.mark.parametrize("coding", ["gzip", "deflate"])
+def test_async_compressed_transfer(mock_server: MockServer, coding):
+    mock_server.compression = coding
+    page = (PAGES_DIR / "grades.html").read_bytes()
+
+    async def run():
+        async with AsyncClient(Token(API_Key="what:ever")) as client:
+            response = await client.get(mock_server.url + "/grades")
+            return response, client.transfer_stats
+
+    response, stats = asyncio.run(run())
+    assert response.content == page
+    assert coding in mock_server.requests[-1].headers["Accept-Encoding"]
+    assert transfer_sizes(response) == (response.wire_bytes, len(page))
+    assert response.wire_bytes < len(page) / 3
+    assert (stats.wire_bytes, stats.decoded_bytes) == (response.wire_bytes, len(page))
+
+
+def test_uncompressed_transfer_counts_equal(
+    mock_server: MockServer, pages_client: Client
+):
+    response = pages_client.get(pages_client.GRADES_URL)
+    assert "Content-Encoding" not in response.headers
+    assert transfer_sizes(response) == (len(response.content), len(response.content))
+    assert pages_client.transfer_stats.saved_bytes == 0
+
+
+def test_stream_reads_body_in_chunks(mock_server: MockServer, pages_client: Client):
+    mock_server.compression = "gzip"
+    page = (PAGES_DIR / "grades.html").read_bytes()
+    with pages_client.stream("POST", pages_client.GRADES_URL, {}) as response:
+        chunks = list(response.iter_content(4096))
+    assert b"".join(chunks) == page
+    assert len(chunks) > 1
+    assert mock_server.requests[-1].method == "POST"
+    # streamed bodies aren't counted
+    assert pages_client.transfer_stats.requests == 0
+
+
+def test_thread_safe_stress(mock_server: MockServer):
+    threads, calls = 16, 800
+
+    def echo(request: MockRequest) -> MockResponse:
+        i = request.query["i"][0]
+        # every response also stores a cookie, racing with the jar copies of other threads
+        return MockResponse(body=i.encode(), cookies={f"seen{int(i) % 50}": i})
+
+    mock_server.route("/echo", echo)
+    client = _local_client(mock_server, pool_maxsize=threads)
+    with ThreadPoolExecutor(threads) as executor:
+        bodies = list(
+            executor.map(
+                lambda i: client.get(f"{mock_server.url}/echo?i={i}").text,
+                range(calls),
+            )
+        )
+    assert bodies == [str(i) for i in range(calls)]
+    assert len(mock_server.requests) == calls
+    for request in mock_server.requests:
+        assert request.cookies["DZIENNIKSID"] == "what"
+        assert request.cookies["SDZIENNIKSID"] == "ever"
+        assert request.headers["Accept-Encoding"] == ACCEPT_ENCODING
+    assert mock_server.connections <= threads
+    assert client.transfer_stats.requests == calls
+
+
+def test_token_change_applied_once(mock_server: MockServer):
+    mock_server.route("/page", lambda _: MockResponse(body=b"ok"))
+    client = _local_client(mock_server)
+    client.get(mock_server.url + "/page")
+    client.token = Token(API_Key="new:key")
+    client.get(mock_server.url + "/page")
+    client.get(mock_server.url + "/page")
+    first, *rest = mock_server.requests
+    assert first.cookies["DZIENNIKSID"] == "what"
+    assert [r.cookies["DZIENNIKSID"] for r in rest] == ["new", "new"]
+
+
+def test_extra_cookies_default_not_shared(mock_server: MockServer):
+    first, second = _local_client(mock_server), _local_client(mock_server)
+    first.cookies.set("only", "first")
+    assert "only" not in second.cookies
+
+
+def _batch_routes(mock_server: MockServer):
+    in_flight = {"now": 0, "max": 0}
+
+    def item(request: MockRequest) -> MockResponse:
+        with mock_server.lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.02)
+        with mock_server.lock:
+            in_flight["now"] -= 1
+        body = request.query.get("i", request.form.get("i", [""]))[0]
+        return MockResponse(body=body.encode())
+
+    mock_server.route("/item", item)
+    mock_server.delay("/slow", 0.2)
+    return in_flight
+
+
+def _batch(mock_server: MockServer):
+    return (
+        [mock_server.url + "/slow"]
+        + [f"{mock_server.url}/item?i={i}" for i in range(12)]
+        + [FetchRequest(mock_server.url + "/item", "POST", {"i": "posted"})]
+        + ["http://127.0.0.1:1/unreachable"]
+    )
+
+
+def _check_batch(results, in_flight):
+    assert [r.ok for r in results] == [True] * 14 + [False]
+    assert results[0].response.status_code == 404
+    assert [r.response.text for r in results[1:14]] == [str(i) for i in range(12)] + [
+        "posted"
+    ]
+    assert results[-1].request.url == "http://127.0.0.1:1/unreachable"
+    assert results[-1].error is not None
+    assert 1 < in_flight["max"] <= 4
+
+
+def test_fetch_many(mock_server: MockServer):
+    in_flight = _batch_routes(mock_server)
+    client = _local_client(mock_server)
+    _check_batch(client.fetch_many(_batch(mock_server), max_concurrency=4), in_flight)
+
+
+def test_async_fetch_many(mock_server: MockServer):
+    in_flight = _batch_routes(mock_server)
+
+    async def run():
+        async with AsyncClient(Token(API_Key="what:ever")) as client:
+            return await client.fetch_many(_batch(mock_server), max_concurrency=4)
+
+    _check_batch(asyncio.run(run()), in_flight)
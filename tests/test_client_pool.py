@@ -0,0 +1,142 @@
+import threading
+import time
+from typing import Callable, List
+
+import pytest
+
+from librus_apix.client import Client, Token
+from librus_apix.client_pool import ClientPool
+from librus_apix.deadline import deadline
+from librus_apix.exceptions import DeadlineExceededError
+from mock_server import MockServer
+
+
+def _block(pool: ClientPool, account_id: str) -> Callable[[], None]:
+    """Occupies a worker with a task of `account_id`, returns the function releasing it."""
+    started, gate = threading.Event(), threading.Event()
+
+    def blocker(_: Client):
+        started.set()
+        gate.wait()
+
+    future = pool.submit(account_id, blocker)
+    started.wait()
+
+    def release():
+        gate.set()
+        future.result()
+
+    return release
+
+
+def _pool(mock_server: MockServer, accounts: int, **kwargs) -> ClientPool:
+    pool = ClientPool(base_url=mock_server.url, **kwargs)
+    for i in range(accounts):
+        pool.add(f"acc{i}", Token(API_Key=f"{i}:key"))
+    return pool
+
+
+def test_run_gives_every_account_its_own_client(mock_server: MockServer):
+    with _pool(mock_server, 3, max_workers=2) as pool:
+        results = pool.run(
+            lambda client: client.token.API_Key, ["acc0", "acc1", "acc2"]
+        )
+        assert results == {"acc0": "0:key", "acc1": "1:key", "acc2": "2:key"}
+        errors = pool.run(lambda client: 1 / 0, ["acc0"])
+        assert isinstance(errors["acc0"], ZeroDivisionError)
+    assert pool.open_clients == 0
+
+
+def test_round_robin_does_not_starve_small_accounts(mock_server: MockServer):
+    order: List[str] = []
+    with _pool(mock_server, 3, max_workers=1) as pool:
+        # hold the only worker back until everything is queued
+        release = _block(pool, "acc1")
+        futures = [pool.submit("acc0", lambda _: order.append("acc0")) for _ in range(10)]
+        futures += [
+            pool.submit(account, lambda _, a=account: order.append(a))
+            for account in ("acc1", "acc2")
+        ]
+        release()
+        for future in futures:
+            future.result()
+    assert order[:4] == ["acc0", "acc1", "acc2", "acc0"]
+
+
+def test_weights(mock_server: MockServer):
+    order: List[str] = []
+    with _pool(mock_server, 0, max_workers=1) as pool:
+        pool.add("heavy", Token(API_Key="h:key"), weight=3)
+        pool.add("light", Token(API_Key="l:key"))
+        release = _block(pool, "light")
+        futures = [
+            pool.submit(account, lambda _, a=account: order.append(a))
+            for _ in range(4)
+            for account in ("heavy", "light")
+        ]
+        release()
+        for future in futures:
+            future.result()
+    assert order[:4] == ["heavy", "heavy", "heavy", "light"]
+
+
+def test_clients_bounded_and_evicted(mock_server: MockServer):
+    with _pool(mock_server, 5, max_clients=2, max_workers=2) as pool:
+        pool.run(
+            lambda client: client.get(mock_server.url + "/grades"),
+            [f"acc{i}" for i in range(5)],
+        )
+        assert pool.open_clients <= 2
+        assert pool.created == 5
+        assert pool.evicted == 3
+
+        pool.idle_timeout = 0
+        pool.evict_idle()
+        assert pool.open_clients == 0
+
+
+def test_idle_clients_closed_without_new_work(mock_server: MockServer):
+    with _pool(mock_server, 2, idle_timeout=0.1) as pool:
+        pool.run(lambda client: None, ["acc0", "acc1"])
+        assert pool.open_clients == 2
+        time.sleep(0.5)
+        assert (pool.open_clients, pool.evicted) == (0, 2)
+
+
+def test_account_added_again_while_running(mock_server: MockServer):
+    with _pool(mock_server, 1, max_workers=1) as pool:
+        release = _block(pool, "acc0")
+        pool.remove("acc0")
+        pool.add("acc0", Token(API_Key="new:key"))
+        release()
+        result = pool.run(lambda client: client.token.API_Key, ["acc0"])
+        assert result == {"acc0": "new:key"}
+        assert pool.created == 1
+    assert pool._accounts["acc0"].running == 0
+
+
+def test_token_changes_survive_eviction(mock_server: MockServer):
+    with _pool(mock_server, 2, max_clients=1, max_workers=1) as pool:
+        with pool.checkout("acc0") as client:
+            client.token.oauth = "refreshed"
+        with pool.checkout("acc1"):
+            pass
+        assert pool.evicted == 1
+        assert pool.token("acc0").oauth == "refreshed"
+        with pool.checkout("acc0") as client:
+            assert client.token.oauth == "refreshed"
+
+
+def test_tasks_inherit_deadline(mock_server: MockServer):
+    with _pool(mock_server, 1) as pool:
+        with deadline(0):
+            future = pool.submit(
+                "acc0", lambda client: client.get(mock_server.url + "/grades")
+            )
+        with pytest.raises(DeadlineExceededError):
+            future.result()
+        pool.remove("acc0")
+        with pytest.raises(KeyError):
+            pool.submit("acc0", lambda client: None)
+    with pytest.raises(ValueError):
+        ClientPool(max_clients=1, max_workers=2)
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from requests.exceptions import ReadTimeout
+
+from librus_apix.client import AsyncClient, AsyncResponse, Client, Token
+from librus_apix.concurrency import AdaptiveLimit, overload_reason
+from librus_apix.messages import message_contents
+from mock_server import MockRequest, MockResponse, MockServer
+
+
+def _capacity(mock_server: MockServer, capacity: int, latency: float = 0.02) -> str:
+    """Routes /pages to answer 429 while more than `capacity` requests are in flight."""
+    lock = threading.Lock()
+    inflight = [0]
+
+    def handler(_: MockRequest) -> MockResponse:
+        with lock:
+            inflight[0] += 1
+            overloaded = inflight[0] > capacity
+        time.sleep(latency)
+        with lock:
+            inflight[0] -= 1
+        return MockResponse(429) if overloaded else MockResponse(body=b"ok")
+
+    mock_server.route("/pages", handler)
+    return mock_server.url + "/pages"
+
+
+def _response(status: int = 200, body: bytes = b"ok") -> AsyncResponse:
+    return AsyncResponse(status, "", {}, {}, body)
+
+
+def test_overload_reasons():
+    assert overload_reason(_response(503)) == "status 503"
+    assert overload_reason(error=ReadTimeout()) == "timeout"
+    assert overload_reason(error=asyncio.TimeoutError()) == "timeout"
+    page = '<h2 class="inside">Brak dostępu</h2>'.encode()
+    assert overload_reason(_response(body=page)) == "no access"
+    quoted = "<p>Uczeń zgłosił: Brak dostępu do e-podręcznika</p>".encode()
+    assert overload_reason(_response(body=quoted)) is None
+    assert overload_reason(_response()) is None
+    assert overload_reason(error=ValueError()) is None
+
+
+def test_additive_increase_multiplicative_decrease():
+    limit = AdaptiveLimit(initial=2, max_limit=4)
+    ok = _response()
+    for _ in range(6):
+        tokens = [limit.acquire() for _ in range(limit.current)]
+        for token in tokens:
+            limit.release(token, time.monotonic(), ok)
+    assert limit.current == 4
+    assert [reason for _, _, reason in limit.history] == ["increase", "increase"]
+
+    first, second = limit.acquire(), limit.acquire()
+    limit.release(first, time.monotonic(), _response(429))
+    # already in flight when the limit was cut
+    limit.release(second, time.monotonic(), _response(503))
+    assert limit.current == 2
+    assert limit.history[-1][1:] == (2, "status 429")
+    assert limit.overloads == 2
+
+
+def test_no_increase_when_latency_grows():
+    limit = AdaptiveLimit(initial=1, tolerance=2)
+    limit.release(limit.acquire(), time.monotonic(), _response())
+    limit.release(limit.acquire(), time.monotonic() - 1, _response())
+    assert limit.limit == pytest.approx(2)
+    limit.baseline = 0.01
+    limit.release(limit.acquire(), time.monotonic() - 1, _response())
+    assert limit.limit == pytest.approx(2)
+    with pytest.raises(ValueError):
+        AdaptiveLimit(initial=8, max_limit=4)
+
+
+def test_fetch_many_grows_without_overload(mock_server: MockServer):
+    url = _capacity(mock_server, capacity=100)
+    limit = AdaptiveLimit(initial=2, max_limit=8)
+    client = Client(Token(API_Key="what:ever"), pool_maxsize=8)
+    results = client.fetch_many([f"{url}?i={i}" for i in range(60)], limit)
+    assert all(result.ok for result in results)
+    assert limit.current > 2
+    assert limit.inflight == 0
+
+
+def test_fetch_many_backs_off_on_429(mock_server: MockServer):
+    url = _capacity(mock_server, capacity=3)
+    limit = AdaptiveLimit(initial=8, max_limit=16)
+    client = Client(Token(API_Key="what:ever"), pool_maxsize=16)
+    client.fetch_many([f"{url}?i={i}" for i in range(60)], limit)
+    assert limit.overloads > 0
+    assert min(slots for _, slots, reason in limit.history if reason != "increase") <= 4
+    # growing back to 8 takes over 20 successes without a single 429
+    assert limit.current < 8
+
+
+def test_batch_helpers_take_a_limit(mock_server: MockServer):
+    limit = AdaptiveLimit(initial=1)
+    client = Client(
+        Token(API_Key="what:ever"), message_url=mock_server.url + "/wiadomosci"
+    )
+    contents = message_contents(client, ["1/5/1/f0", "1/5/2/f0"], limit)
+    assert len(contents) == 2
+    assert limit.inflight == 0
+
+
+def test_async_fetch_many_backs_off(mock_server: MockServer):
+    url = _capacity(mock_server, capacity=3)
+    limit = AdaptiveLimit(initial=8, max_limit=16)
+
+    async def run():
+        async with AsyncClient(Token(API_Key="what:ever")) as client:
+            return await client.fetch_many([f"{url}?i={i}" for i in range(60)], limit)
+
+    results = asyncio.run(run())
+    assert len(results) == 60
+    assert limit.overloads > 0
+    assert limit.history[0][1:] == (4, "status 429")
+    assert limit.current < 8
+    assert limit.inflight == 0
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import pytest
+from requests.exceptions import Timeout
+
+from librus_apix.client import AsyncClient, Client, Token
+from librus_apix.deadline import (
+    allows_wait,
+    current_deadline,
+    deadline,
+    request_timeout,
+)
+from librus_apix.exceptions import DeadlineExceededError
+from librus_apix.retry import RetryPolicy
+from mock_server import MockResponse, MockServer
+
+
+def _client(**kwargs) -> Client:
+    return Client(Token(API_Key="what:ever"), **kwargs)
+
+
+def test_request_timeout_capped_by_deadline():
+    assert request_timeout((10, 30)) == (10, 30)
+    with deadline(5):
+        connect, read = request_timeout((10, 30))
+        assert 4.9 < connect == read <= 5
+        assert request_timeout(1) == 1
+        assert 4.9 < request_timeout(None) <= 5
+        assert allows_wait(1) and not allows_wait(6)
+
+
+def test_nested_deadline_only_shortens():
+    with deadline(1) as outer:
+        with deadline(10) as inner:
+            assert inner is outer
+        with deadline(0.5) as inner:
+            assert current_deadline() is inner
+        assert current_deadline() is outer
+    assert current_deadline() is None
+
+
+def test_expired_deadline_stops_requests(mock_server: MockServer):
+    client = _client()
+    with deadline(0):
+        with pytest.raises(DeadlineExceededError):
+            client.get(mock_server.url + "/grades")
+    assert mock_server.hits["/grades"] == 0
+
+
+def test_slow_response_times_out(mock_server: MockServer):
+    mock_server.delay("/grades", 1)
+    client = _client()
+    started = time.monotonic()
+    with deadline(0.2):
+        with pytest.raises(Timeout):
+            client.get(mock_server.url + "/grades")
+    assert time.monotonic() - started < 0.9
+
+
+def test_retry_skipped_when_wait_exceeds_deadline(mock_server: MockServer):
+    mock_server.route(
+        "/flaky", lambda _: MockResponse(503, headers={"Retry-After": "5"})
+    )
+    client = _client(retry_policy=RetryPolicy(attempts=5))
+    with deadline(0.5):
+        assert client.get(mock_server.url + "/flaky").status_code == 503
+    assert mock_server.hits["/flaky"] == 1
+
+
+def test_fetch_many_reports_partial_progress(mock_server: MockServer):
+    mock_server.delay("/grades", 0, 0.4)
+    client = _client()
+    urls = [f"{mock_server.url}/grades?i={i}" for i in range(4)]
+    results = client.fetch_many(urls, max_concurrency=1, deadline=0.2)
+    assert results[0].ok
+    assert isinstance(results[1].error, Timeout)
+    assert all(isinstance(r.error, DeadlineExceededError) for r in results[2:])
+    assert mock_server.hits["/grades"] == 2
+
+
+def test_fetch_many_inherits_deadline(mock_server: MockServer):
+    client = _client()
+    with deadline(0):
+        results = client.fetch_many([mock_server.url + "/grades"])
+    assert isinstance(results[0].error, DeadlineExceededError)
+    assert mock_server.hits["/grades"] == 0
+
+
+def test_async_fetch_many_deadline(mock_server: MockServer):
+    mock_server.delay("/grades", 0, 0.4)
+
+    async def run():
+        async with AsyncClient(Token(API_Key="what:ever")) as client:
+            return await client.fetch_many(
+                [f"{mock_server.url}/grades?i={i}" for i in range(3)],
+                max_concurrency=1,
+                deadline=0.2,
+            )
+
+    results = asyncio.run(run())
+    assert results[0].ok
+    assert isinstance(results[1].error, asyncio.TimeoutError)
+    assert isinstance(results[2].error, DeadlineExceededError)
@@ -3,7 +3,13 @@ from logging import Logger
 from typing import Union
 import pytest
 
-from librus_apix.completed_lessons import Lesson, get_completed, get_max_page_number
+from librus_apix.completed_lessons import (
+    Lesson,
+    get_completed,
+    get_completed_async,
+    get_max_page_number,
+    get_max_page_number_async,
+)
 from librus_apix.client import Client
 
 
@@ -42,3 +48,11 @@ def test_get_completed_lessons(client: Client, log: Logger):
     for lesson in lessons:
         assert isinstance(lesson, Lesson)
         _test_completed_lesson_data(lesson, log)
+
+
+def test_get_completed_async(pages_client: Client, run_pages_async):
+    lessons = get_completed(pages_client, "", "")
+    assert lessons
+    assert run_pages_async(lambda c: get_completed_async(c, "", "")) == lessons
+    max_page = get_max_page_number(pages_client, "", "")
+    assert run_pages_async(lambda c: get_max_page_number_async(c, "", "")) == max_page
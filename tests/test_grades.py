@@ -1,8 +1,25 @@
 from logging import Logger
 from typing import DefaultDict, Union
+import json
+
 import pytest
-from librus_apix.client import Client
-from librus_apix.grades import Gpa, Grade, get_grades
+from lxml import html
+
+from librus_apix.client import Client, Token
+from librus_apix.exceptions import ArgumentError, TokenError
+from librus_apix.grades import (
+    Gpa,
+    Grade,
+    get_grades,
+    get_grades_async,
+    iter_grades,
+    iter_parse_grades,
+    parse_grades,
+)
+from mock_server import PAGES_DIR, MockRequest, MockResponse, MockServer
+
+GRADES_PAGE = (PAGES_DIR / "grades.html").read_bytes()
+NO_ACCESS_PAGE = (PAGES_DIR / "no_access.html").read_bytes()
 
 
 def _test_grade_data(grade: Grade, log: Logger):
@@ -35,3 +52,76 @@ def test_get_grades(client: Client, opt: str, log: Logger):
             assert isinstance(grade.gpa, Union[str, float])
             assert isinstance(grade.subject, str)
     assert all(isinstance(semester, dict) for semester in descriptive_grades)
+
+
+@pytest.mark.parametrize("opt", ["all", "week", "last_login"])
+def test_get_grades_async(pages_client: Client, run_pages_async, opt: str):
+    grades = get_grades(pages_client, opt)
+    assert grades[0]
+    assert run_pages_async(lambda c: get_grades_async(c, opt)) == grades
+
+
+def _in_row_order(grades) -> list:
+    """The numeric grades of `parse_grades` in the order `iter_parse_grades` yields them."""
+    return [g for subject in grades[0] for g in grades[0][subject] + grades[1][subject]]
+
+
+@pytest.mark.parametrize("size", [1, 100, 64 * 1024])
+def test_iter_parse_grades(size: int):
+    expected = _in_row_order(parse_grades(GRADES_PAGE)[0])
+    chunks = (GRADES_PAGE[i : i + size] for i in range(0, len(GRADES_PAGE), size))
+    assert list(iter_parse_grades(chunks)) == expected
+
+    with pytest.raises(TokenError):
+        list(iter_parse_grades([NO_ACCESS_PAGE]))
+
+
+def test_iter_grades(pages_client: Client):
+    grades = list(iter_grades(pages_client))
+    assert grades == _in_row_order(get_grades(pages_client)[0])
+    with pytest.raises(ArgumentError):
+        iter_grades(pages_client, "this should fail")
+
+
+def test_iter_grades_logs_in_again(mock_server: MockServer):
+    def authorization(request: MockRequest) -> MockResponse:
+        body = {"status": "ok", "goTo": "/OAuth/Authorization/2FA"}
+        return MockResponse(body=json.dumps(body).encode())
+
+    def grades(request: MockRequest) -> MockResponse:
+        valid = request.cookies.get("DZIENNIKSID") == "session"
+        return MockResponse(body=GRADES_PAGE if valid else NO_ACCESS_PAGE)
+
+    mock_server.route("/api", lambda _: MockResponse(body=b"{}"))
+    mock_server.route("/api/OAuth/Authorization", authorization)
+    mock_server.route(
+        "/api/OAuth/Authorization/2FA",
+        lambda _: MockResponse(cookies={"DZIENNIKSID": "session", "SDZIENNIKSID": "s"}),
+    )
+    mock_server.route("/grades", grades)
+    client = Client(
+        Token(API_Key="expired:s"),
+        api_url=mock_server.url + "/api",
+        grades_url=mock_server.url + "/grades",
+        credentials=("user", "secret"),
+    )
+    assert list(iter_grades(client)) == _in_row_order(parse_grades(GRADES_PAGE)[0])
+    assert client.reauthentications == 1
+    assert mock_server.hits["/grades"] == 2
+
+
+def test_semester_summary_comes_last():
+    expected = parse_grades(GRADES_PAGE)[2]
+    # put the summary header and its description before the descriptive grades
+    root = html.document_fromstring(GRADES_PAGE)
+    header = root.xpath("//tr[th/strong][following-sibling::tr]")[0]
+    description = header.getnext()
+    first_descriptive = root.xpath("//tr[td[@class='micro center screen-only']]")[0]
+    first_descriptive.addprevious(header)
+    first_descriptive.addprevious(description)
+    document = html.tostring(root, encoding="utf-8")
+
+    for backend in ("bs4", "lxml"):
+        descriptive = parse_grades(document, backend=backend)[2]
+        assert repr(descriptive) == repr(expected)
+        assert list(descriptive[0])[-1] == "Ocena śródroczna opisowa"
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from itertools import count
+
+import pytest
+
+from librus_apix.client import AsyncClient, Token
+from librus_apix.hedge import HedgePolicy
+from mock_server import MockRequest, MockResponse, MockServer
+
+
+def _tail(mock_server: MockServer, slow_every: int, slow: float) -> str:
+    """Routes /tail to answer every `slow_every`-th request after `slow` seconds."""
+    hits = count(1)
+
+    def handler(_: MockRequest) -> MockResponse:
+        if next(hits) % slow_every == 0:
+            time.sleep(slow)
+        return MockResponse(body=b"ok")
+
+    mock_server.route("/tail", handler)
+    return mock_server.url + "/tail"
+
+
+async def _latencies(url: str, n: int, policy=None, **kwargs):
+    async with AsyncClient(
+        Token(API_Key="what:ever"), hedge_policy=policy, **kwargs
+    ) as client:
+        latencies = []
+        for i in range(n):
+            started = time.monotonic()
+            response = await client.get(f"{url}?i={i}")
+            assert response.status_code == 200
+            latencies.append(time.monotonic() - started)
+        return latencies
+
+
+def test_delay_follows_percentile():
+    policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0, initial_delay=2)
+    assert policy.delay() == 2
+    for latency in range(1, 11):
+        policy.record(latency / 100)
+    assert policy.delay() == pytest.approx(0.09)
+    policy.record(5)
+    assert policy.delay() == pytest.approx(0.1)
+    with pytest.raises(ValueError):
+        HedgePolicy(percentile=100)
+
+
+def test_budget_caps_extra_load():
+    policy = HedgePolicy(max_extra=0.1, burst=1)
+    for _ in range(20):
+        policy.started()
+    assert sum(policy.try_hedge() for _ in range(10)) == 3
+    assert not policy.hedges("POST")
+
+
+def test_hedging_cuts_tail_latency(mock_server: MockServer):
+    url = _tail(mock_server, slow_every=5, slow=0.5)
+    plain = asyncio.run(_latencies(url, 10))
+    assert max(plain) >= 0.5
+
+    policy = HedgePolicy(initial_delay=0.05, max_extra=1)
+    hedged = asyncio.run(_latencies(url, 10, policy))
+    assert max(hedged) < 0.3
+    assert policy.hedged >= policy.hedge_wins >= 2
+    assert policy.requests == 10
+
+
+def test_hedges_stop_when_budget_spent(mock_server: MockServer):
+    url = _tail(mock_server, slow_every=1, slow=0.15)
+    policy = HedgePolicy(initial_delay=0.05, max_extra=0, burst=1)
+    asyncio.run(_latencies(url, 3, policy))
+    assert policy.hedged == 1
+    assert mock_server.hits["/tail"] == 4
+
+
+def test_post_not_hedged(mock_server: MockServer):
+    url = _tail(mock_server, slow_every=1, slow=0.1)
+    policy = HedgePolicy(initial_delay=0.01)
+
+    async def run():
+        async with AsyncClient(
+            Token(API_Key="what:ever"), hedge_policy=policy
+        ) as client:
+            return await client.post(url, data={})
+
+    assert asyncio.run(run()).status_code == 200
+    assert policy.hedged == 0
+    assert mock_server.hits["/tail"] == 1
+
+
+def test_login_not_hedged(mock_server: MockServer):
+    def code_exchange(_: MockRequest) -> MockResponse:
+        time.sleep(0.1)
+        return MockResponse(cookies={"DZIENNIKSID": "L01~abc", "SDZIENNIKSID": "xyz"})
+
+    mock_server.route("/api", lambda _: MockResponse(body=b"{}"))
+    mock_server.route(
+        "/api/OAuth/Authorization",
+        lambda _: MockResponse(body=b'{"status": "ok", "goTo": "/OAuth/2FA"}'),
+    )
+    mock_server.route("/api/OAuth/2FA", code_exchange)
+    policy = HedgePolicy(initial_delay=0.01)
+
+    async def run():
+        async with AsyncClient(
+            Token(), api_url=mock_server.url + "/api", hedge_policy=policy
+        ) as client:
+            return await client.get_token("user", "secret")
+
+    assert asyncio.run(run()).API_Key == "L01~abc:xyz"
+    assert policy.hedged == 0
+    assert mock_server.hits["/api/OAuth/2FA"] == 1
@@ -3,7 +3,15 @@ from logging import Logger
 import pytest
 
 from librus_apix.client import Client
-from librus_apix.homework import Homework, get_homework, homework_detail
+from librus_apix.homework import (
+    Homework,
+    get_homework,
+    get_homework_async,
+    homework_detail,
+    homework_detail_async,
+    homework_details,
+    homework_details_async,
+)
 
 
 def _test_homework_data(hw: Homework, log: Logger):
@@ -36,3 +44,23 @@ def test_get_homework_detail(_get_homework, client: Client):
         pytest.skip("No homework to check")
     content = homework_detail(client, _get_homework[0].href)
     assert isinstance(content, dict)
+
+
+def test_get_homework_async(pages_client: Client, run_pages_async):
+    homework = get_homework(pages_client, "", "")
+    assert homework
+    assert run_pages_async(lambda c: get_homework_async(c, "", "")) == homework
+    href = homework[0].href
+    detail = homework_detail(pages_client, href)
+    assert run_pages_async(lambda c: homework_detail_async(c, href)) == detail
+
+
+def test_homework_details(pages_client: Client, run_pages_async):
+    hrefs = ["300", "missing", "301"]
+    details = homework_details(pages_client, hrefs)
+    assert details[0] == homework_detail(pages_client, "300")
+    assert details[2] == homework_detail(pages_client, "301")
+    assert isinstance(details[1], Exception)
+    async_details = run_pages_async(lambda c: homework_details_async(c, hrefs))
+    assert async_details[::2] == details[::2]
+    assert isinstance(async_details[1], Exception)
@@ -9,6 +9,10 @@ from librus_apix.messages import (
     get_sent,
     get_max_page_number,
     message_content,
+    get_received_async,
+    get_sent_async,
+    get_max_page_number_async,
+    message_content_async,
 )
 
 
@@ -60,3 +64,16 @@ def test_message_content(
     for key, value in data.__dict__.items():
         if value == "":
             log.warning(f"{key} value is empty")
+
+
+def test_messages_async(pages_client: Client, run_pages_async):
+    received = get_received(pages_client, 0)
+    assert received
+    assert run_pages_async(lambda c: get_received_async(c, 0)) == received
+    sent = get_sent(pages_client, 0)
+    assert run_pages_async(lambda c: get_sent_async(c, 0)) == sent
+    max_page = get_max_page_number(pages_client)
+    assert run_pages_async(get_max_page_number_async) == max_page
+    href = received[0].href
+    content = message_content(pages_client, href)
+    assert run_pages_async(lambda c: message_content_async(c, href)) == content
@@ -0,0 +1,284 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable
+import pytest
+
+from librus_apix.announcements import (
+    get_announcements,
+    get_announcements_async,
+    parse_announcements,
+)
+from librus_apix.attendance import (
+    get_attendance,
+    get_attendance_async,
+    get_detail,
+    parse_attendance,
+    parse_attendance_detail,
+)
+from librus_apix.client import Client
+from librus_apix.completed_lessons import get_completed, parse_completed
+from librus_apix.exceptions import ArgumentError, TokenError
+from librus_apix.grades import get_grades, parse_grades
+from librus_apix.helpers import (
+    current_parse_executor,
+    current_parser_backend,
+    make_soup,
+    no_access_check,
+    page_region,
+    parse_executor,
+    parser_backend,
+    set_parse_executor,
+    set_parser_backend,
+)
+from librus_apix.homework import (
+    get_homework,
+    homework_detail,
+    parse_homework,
+    parse_homework_detail,
+)
+from librus_apix.messages import (
+    get_received,
+    get_sent,
+    message_content,
+    message_contents,
+    parse,
+    parse_message_content,
+    parse_sent,
+)
+from librus_apix.schedule import (
+    get_schedule,
+    parse_schedule,
+    parse_schedule_detail,
+    schedule_detail,
+)
+from librus_apix.student_information import (
+    get_student_information,
+    parse_student_information,
+)
+from librus_apix.timetable import get_timetable, parse_timetable
+from mock_server import PAGES_DIR, MockResponse, MockServer
+
+PAGES = [
+    ("grades.html", parse_grades, lambda c: get_grades(c)),
+    ("attendance.html", parse_attendance, lambda c: get_attendance(c)),
+    (
+        "attendance_details/5001.html",
+        parse_attendance_detail,
+        lambda c: get_detail(c, "5001"),
+    ),
+    (
+        "timetable.html",
+        parse_timetable,
+        lambda c: get_timetable(c, datetime(2024, 10, 14)),
+    ),
+    ("schedule.html", parse_schedule, lambda c: get_schedule(c, "10", "2024")),
+    (
+        "schedule/701.html",
+        parse_schedule_detail,
+        lambda c: schedule_detail(c, "", "701"),
+    ),
+    ("homework.html", parse_homework, lambda c: get_homework(c, "", "")),
+    ("homework/300.html", parse_homework_detail, lambda c: homework_detail(c, "300")),
+    ("completed.html", parse_completed, lambda c: get_completed(c, "", "")),
+    ("messages.html", parse, lambda c: get_received(c, 0)),
+    ("sent_messages.html", parse_sent, lambda c: get_sent(c, 0)),
+    (
+        "messages/40000.html",
+        parse_message_content,
+        lambda c: message_content(c, "40000"),
+    ),
+    ("announcements.html", parse_announcements, get_announcements),
+    ("student_info.html", parse_student_information, get_student_information),
+]
+
+
+@pytest.mark.parametrize("page, parser, fetch", PAGES)
+def test_parse_matches_fetch(
+    pages_client: Client,
+    page: str,
+    parser: Callable[[Any], Any],
+    fetch: Callable[[Client], Any],
+):
+    document = (PAGES_DIR / page).read_bytes()
+    parsed = parser(document)
+    assert parsed == parser(document.decode("utf-8"))
+    assert parsed == fetch(pages_client)
+
+
+@pytest.mark.parametrize("parser", [parser for _, parser, _ in PAGES])
+def test_parse_no_access(parser: Callable[[Any], Any]):
+    with pytest.raises(TokenError):
+        parser((PAGES_DIR / "no_access.html").read_bytes())
+
+
+LXML_PAGES = [
+    (page, parser, fetch)
+    for page, parser, fetch in PAGES
+    if parser
+    in (
+        parse_grades,
+        parse_attendance,
+        parse_timetable,
+        parse_schedule,
+        parse_completed,
+        parse,
+        parse_sent,
+        parse_message_content,
+    )
+]
+
+
+@pytest.mark.parametrize("page, parser, fetch", LXML_PAGES)
+def test_lxml_backend_matches_bs4(
+    pages_client: Client,
+    page: str,
+    parser: Callable[..., Any],
+    fetch: Callable[[Client], Any],
+):
+    document = (PAGES_DIR / page).read_bytes()
+    expected = parser(document, backend="bs4")
+    parsed = parser(document, backend="lxml")
+    # repr also tells apart values that compare equal, e.g. 1 and 1.0
+    assert repr(parsed) == repr(expected)
+    assert repr(parser(document.decode("utf-8"), backend="lxml")) == repr(expected)
+    with parser_backend("lxml"):
+        assert repr(fetch(pages_client)) == repr(expected)
+
+
+def test_lxml_backend_schedule_include_empty():
+    document = (PAGES_DIR / "schedule.html").read_bytes()
+    expected = parse_schedule(document, True, backend="bs4")
+    assert parse_schedule(document, True, backend="lxml") == expected
+
+
+@pytest.mark.parametrize("parser", [parser for _, parser, _ in LXML_PAGES])
+def test_lxml_backend_no_access(parser: Callable[..., Any]):
+    with pytest.raises(TokenError):
+        parser((PAGES_DIR / "no_access.html").read_bytes(), backend="lxml")
+
+
+def test_parser_backend_selection():
+    assert current_parser_backend() == "bs4"
+    with parser_backend("lxml"):
+        assert current_parser_backend() == "lxml"
+        assert current_parser_backend("bs4") == "bs4"
+    set_parser_backend("lxml")
+    try:
+        assert current_parser_backend() == "lxml"
+        with parser_backend("bs4"):
+            assert current_parser_backend() == "bs4"
+    finally:
+        set_parser_backend("bs4")
+    with pytest.raises(ArgumentError):
+        parser_backend("html5lib").__enter__()
+    with pytest.raises(ArgumentError):
+        parse_grades((PAGES_DIR / "grades.html").read_bytes(), backend="html5lib")
+
+
+def test_page_region():
+    document = (PAGES_DIR / "completed.html").read_bytes()
+    whole = make_soup(document)
+    region = make_soup(document, parse_only=page_region("table"))
+    assert region.find("head") is None
+    assert str(region.find_all("table")) == str(whole.find_all("table"))
+    no_access = (PAGES_DIR / "no_access.html").read_bytes()
+    with pytest.raises(TokenError):
+        no_access_check(make_soup(no_access, parse_only=page_region("table")))
+
+
+def test_declared_encoding(
+    mock_server: MockServer, pages_client: Client, run_pages_async
+):
+    document = (PAGES_DIR / "announcements.html").read_bytes()
+    expected = parse_announcements(document)
+    cp1250 = document.decode("utf-8").encode("cp1250")
+    mock_server.route(
+        "/announcements",
+        lambda _: MockResponse(
+            body=cp1250, headers={"Content-Type": "text/html; charset=windows-1250"}
+        ),
+    )
+    assert parse_announcements(cp1250, "cp1250") == expected
+    assert get_announcements(pages_client) == expected
+    assert run_pages_async(get_announcements_async) == expected
+
+
+EXECUTOR_PAGES = [
+    (page, parser, fetch)
+    for page, parser, fetch in PAGES
+    if parser
+    in (
+        parse_grades,
+        parse_attendance,
+        parse_timetable,
+        parse,
+        parse_sent,
+        parse_message_content,
+    )
+]
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(2)
+        self.submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("page, parser, fetch", EXECUTOR_PAGES)
+def test_parse_executor_matches_inline(
+    pages_client: Client,
+    process_pool: ProcessPoolExecutor,
+    page: str,
+    parser: Callable[..., Any],
+    fetch: Callable[[Client], Any],
+):
+    expected = fetch(pages_client)
+    with parse_executor(process_pool):
+        assert fetch(pages_client) == expected
+        # the backend selected here is the one the worker parses with
+        with parser_backend("lxml"):
+            assert repr(fetch(pages_client)) == repr(expected)
+
+
+def test_parse_executor_selection(
+    mock_server: MockServer, pages_client: Client, run_pages_async
+):
+    assert current_parse_executor() is None
+    executor = _CountingExecutor()
+    with parse_executor(executor):
+        assert current_parse_executor() is executor
+        contents = message_contents(pages_client, ["40000", "39999", "missing"])
+        assert executor.submitted == 3
+        assert isinstance(contents[2], Exception)
+        with parse_executor(None):
+            assert current_parse_executor() is None
+            assert contents[0] == message_content(pages_client, "40000")
+        assert executor.submitted == 3
+
+    set_parse_executor(executor)
+    try:
+        with parse_executor(None):
+            get_grades(pages_client)
+        assert executor.submitted == 3
+        attendance = run_pages_async(get_attendance_async)
+        assert executor.submitted == 4
+        assert attendance == get_attendance(pages_client)
+        mock_server.route(
+            "/grades",
+            lambda _: MockResponse(body=(PAGES_DIR / "no_access.html").read_bytes()),
+        )
+        with pytest.raises(TokenError):
+            get_grades(pages_client)
+    finally:
+        set_parse_executor(None)
+        executor.shutdown()
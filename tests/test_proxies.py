@@ -0,0 +1,154 @@
+import asyncio
+import time
+from typing import Iterator, List
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from librus_apix.client import AsyncClient, AsyncResponse, Client, Token
+from librus_apix.exceptions import ProxyPoolExhaustedError
+from librus_apix.proxies import ProxyPool
+from mock_server import MockResponse, MockServer
+
+# never resolved, the proxies answer in its place
+TARGET = "http://synergia.librus.invalid/grades"
+
+
+@pytest.fixture
+def proxies() -> Iterator[List[MockServer]]:
+    with MockServer() as first, MockServer() as second:
+        yield [first, second]
+
+
+def _response(status: int = 200, body: bytes = b"ok") -> AsyncResponse:
+    return AsyncResponse(status, "", {}, {}, body)
+
+
+def test_quarantine_on_block_and_backoff():
+    pool = ProxyPool(
+        ["http://a", "http://b"], quarantine=10, block_markers=(b"Denied",)
+    )
+    pool.record("http://a", time.monotonic(), _response(503))
+    assert pool.healthy() == ["http://b"]
+    assert all(pool.choose() == "http://b" for _ in range(10))
+
+    pool.record("http://b", time.monotonic(), _response(body=b"<h1>Denied</h1>"))
+    with pytest.raises(ProxyPoolExhaustedError) as e:
+        pool.choose()
+    assert 9 < e.value.retry_after <= 10
+
+    stats = {s.proxy: s for s in pool.stats()}
+    assert stats["http://b"].reason == "block page"
+    stats["http://a"].quarantined_until = 0
+    pool.record("http://a", time.monotonic(), _response(429))
+    assert stats["http://a"].quarantined_until - time.monotonic() > 19
+
+
+def test_rejected_token_is_not_a_block():
+    page = '<h2 class="inside">Brak dostępu</h2>'.encode()
+    for markers in ((), ("Brak dostępu".encode(),)):
+        pool = ProxyPool(["http://a"], block_markers=markers)
+        pool.record("http://a", time.monotonic(), _response(body=page))
+        assert pool.healthy() == ["http://a"]
+
+
+def test_connection_errors_quarantine_after_max_failures():
+    pool = ProxyPool(["http://a"], max_failures=2)
+    pool.record("http://a", time.monotonic(), error=ConnectionError())
+    assert pool.healthy() == ["http://a"]
+    pool.record("http://a", time.monotonic(), error=ConnectionError())
+    assert pool.healthy() == []
+    with pytest.raises(ValueError):
+        ProxyPool([])
+
+
+def test_failing_proxy_scores_below_working_one():
+    pool = ProxyPool(["http://dead", "http://ok"], max_failures=3)
+    for _ in range(2):
+        pool.record("http://dead", time.monotonic(), error=ConnectionError())
+    pool.record("http://ok", time.monotonic() - 0.2, _response())
+    assert all(pool.choose() == "http://ok" for _ in range(100))
+    assert [s.proxy for s in pool.stats()] == ["http://ok", "http://dead"]
+
+
+def test_prefers_faster_proxies():
+    pool = ProxyPool(["http://fast", "http://slow", "http://flaky"])
+    pool.record("http://fast", time.monotonic() - 0.1, _response())
+    pool.record("http://slow", time.monotonic() - 2, _response())
+    pool.record("http://flaky", time.monotonic() - 0.1, _response(500))
+    picks = [pool.choose() for _ in range(300)]
+    assert picks.count("http://fast") > picks.count("http://flaky") > 0
+    # the worst of three never wins a pair
+    assert picks.count("http://slow") == 0
+    assert [s.proxy for s in pool.stats()][0] == "http://fast"
+
+
+def test_client_rotates_and_skips_blocked_proxy(proxies: List[MockServer]):
+    blocked, healthy = proxies
+    blocked.route("/grades", lambda _: MockResponse(503))
+    pool = ProxyPool([server.url for server in proxies])
+    client = Client(Token(API_Key="what:ever"), proxy_pool=pool)
+    statuses = [client.get(f"{TARGET}?i={i}").status_code for i in range(10)]
+    assert blocked.hits["/grades"] == 1
+    assert healthy.hits["/grades"] == 9
+    assert statuses.count(503) == 1
+    assert pool.healthy() == [healthy.url]
+
+
+def test_token_refresh_goes_through_pool(proxies: List[MockServer]):
+    for server in proxies:
+        server.route(
+            "/refreshToken", lambda _: MockResponse(cookies={"oauth_token": "fresh"})
+        )
+    client = Client(
+        Token(API_Key="what:ever"),
+        refresh_oauth_url="http://synergia.librus.invalid/refreshToken",
+        proxy_pool=ProxyPool([server.url for server in proxies]),
+    )
+    assert client.refresh_oauth() == "fresh"
+    assert sum(server.hits["/refreshToken"] for server in proxies) == 1
+
+
+def test_async_client_uses_pool(proxies: List[MockServer]):
+    blocked, healthy = proxies
+    blocked.route("/grades", lambda _: MockResponse(429))
+    pool = ProxyPool([server.url for server in proxies])
+    client = Client(Token(API_Key="what:ever"), proxy_pool=pool)
+
+    async def run():
+        async with AsyncClient.from_client(client) as async_client:
+            assert async_client.proxy_pool is pool
+            return [
+                (await async_client.get(f"{TARGET}?i={i}")).status_code
+                for i in range(10)
+            ]
+
+    statuses = asyncio.run(run())
+    assert statuses.count(429) == blocked.hits["/grades"] == 1
+    assert healthy.hits["/grades"] == 9
+
+
+def test_async_login_through_one_proxy(proxies: List[MockServer]):
+    for server in proxies:
+        server.route("/api", lambda _: MockResponse(body=b"{}"))
+        server.route(
+            "/api/OAuth/Authorization",
+            lambda _: MockResponse(body=b'{"status": "ok", "goTo": "/OAuth/2FA"}'),
+        )
+        server.route(
+            "/api/OAuth/2FA",
+            lambda _: MockResponse(cookies={"DZIENNIKSID": "a", "SDZIENNIKSID": "b"}),
+        )
+    pool = ProxyPool([server.url for server in proxies])
+
+    async def run():
+        async with AsyncClient(
+            Token(), api_url="http://synergia.librus.invalid/api", proxy_pool=pool
+        ) as client:
+            for _ in range(5):
+                await client.get_token("user", "secret")
+
+    asyncio.run(run())
+    # every login hits the four steps on one of the proxies
+    hits = [sum(server.hits.values()) for server in proxies]
+    assert sum(hits) == 20 and all(count % 4 == 0 for count in hits)
@@ -0,0 +1,134 @@
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from librus_apix.client import AsyncClient, Client, Token
+from librus_apix.deadline import deadline
+from librus_apix.exceptions import DeadlineExceededError
+from librus_apix.ratelimit import MemoryRateLimiter, SQLiteRateLimiter, limiter_key
+from mock_server import MockServer
+
+
+def test_limiter_key():
+    url = "https://synergia.librus.pl/uczen/index"
+    assert limiter_key(url) == "synergia.librus.pl|direct"
+    assert limiter_key(url, "http://proxy:3128") == "synergia.librus.pl|http://proxy:3128"
+
+
+def test_reservations_spread_after_burst():
+    limiter = MemoryRateLimiter(rate=10, burst=2)
+    delays = [limiter._reserve("a|direct") for _ in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+    assert limiter._reserve("b|direct") == 0.0
+    assert limiter._reserve("a|http://proxy") == 0.0
+
+
+def test_host_limits():
+    limiter = MemoryRateLimiter(rate=10, burst=1, host_limits={"slow": (1, 1)})
+    limiter._reserve("slow|direct")
+    assert limiter._reserve("slow|direct") == pytest.approx(1.0, abs=0.01)
+    with pytest.raises(ValueError):
+        MemoryRateLimiter(rate=0)
+
+
+def test_sqlite_shared_between_instances(tmp_path: Path):
+    path = tmp_path / "buckets.sqlite"
+    first = SQLiteRateLimiter(path, rate=10, burst=2)
+    second = SQLiteRateLimiter(path, rate=10, burst=2)
+    assert [first._reserve("a|direct"), second._reserve("a|direct")] == [0.0, 0.0]
+    assert second._reserve("a|direct") == pytest.approx(0.1, abs=0.01)
+
+    def send_time(i):
+        delay = (first if i % 2 else second)._reserve("b|direct")
+        return time.time() + delay
+
+    started = time.time()
+    with ThreadPoolExecutor(4) as executor:
+        last = max(executor.map(send_time, range(6)))
+    # 2 requests in the burst, 4 more spaced 1 / rate apart
+    assert 0.4 - 0.01 <= last - started < 0.6
+
+
+def test_sqlite_lock_wait_does_not_block_loop(tmp_path: Path):
+    limiter = SQLiteRateLimiter(tmp_path / "buckets.sqlite")
+    # another process holding the database
+    other = sqlite3.connect(limiter.path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        acquired = asyncio.ensure_future(limiter.acquire_async("a|direct"))
+        await asyncio.sleep(0.2)
+        other.execute("COMMIT")
+        assert await acquired == 0.0
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(run()) >= 10
+
+
+def _local_client(mock_server: MockServer, limiter) -> Client:
+    return Client(
+        Token(API_Key="what:ever"), base_url=mock_server.url, rate_limiter=limiter
+    )
+
+
+def test_clients_share_budget(mock_server: MockServer):
+    limiter = MemoryRateLimiter(rate=20, burst=1)
+    first = _local_client(mock_server, limiter)
+    second = _local_client(mock_server, limiter)
+    started = time.monotonic()
+    first.fetch_many([f"{mock_server.url}/grades?i={i}" for i in range(3)])
+    second.fetch_many([f"{mock_server.url}/grades?i={i}" for i in range(3)])
+    assert time.monotonic() - started >= 0.25 - 0.01
+    assert mock_server.hits["/grades"] == 6
+
+
+def test_async_client_throttled(mock_server: MockServer):
+    limiter = MemoryRateLimiter(rate=20, burst=1)
+
+    async def run():
+        async with AsyncClient(
+            Token(API_Key="what:ever"), rate_limiter=limiter
+        ) as client:
+            started = time.monotonic()
+            await client.fetch_many(
+                [f"{mock_server.url}/grades?i={i}" for i in range(5)]
+            )
+            return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.2 - 0.01
+    assert mock_server.hits["/grades"] == 5
+
+
+def test_slot_past_deadline_fails_at_once(mock_server: MockServer):
+    limiter = MemoryRateLimiter(rate=1, burst=1)
+    client = _local_client(mock_server, limiter)
+    client.get(f"{mock_server.url}/grades")
+    started = time.monotonic()
+    with deadline(0.5), pytest.raises(DeadlineExceededError):
+        client.get(f"{mock_server.url}/grades")
+
+    async def run():
+        async with AsyncClient.from_client(client) as async_client:
+            with deadline(0.5):
+                await async_client.get(f"{mock_server.url}/grades")
+
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(run())
+    assert time.monotonic() - started < 0.2
+    assert mock_server.hits["/grades"] == 1
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import random
+import time
+from itertools import count
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from librus_apix.client import AsyncClient, AsyncResponse, Client, Token
+from librus_apix.deadline import deadline
+from librus_apix.exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    MaintananceError,
+)
+from librus_apix.retry import CircuitBreaker, RetryPolicy
+from mock_server import MockRequest, MockResponse, MockServer
+
+FAST = RetryPolicy(attempts=3, backoff=0.001)
+
+
+def _flaky(mock_server: MockServer, *statuses: int):
+    """Routes /flaky to answer with `statuses` in turn, then 200."""
+    hits = count()
+
+    def handler(_: MockRequest) -> MockResponse:
+        n = next(hits)
+        status = statuses[n] if n < len(statuses) else 200
+        return MockResponse(status, f"{status}".encode())
+
+    mock_server.route("/flaky", handler)
+    return mock_server.url + "/flaky"
+
+
+def _client(**kwargs) -> Client:
+    return Client(Token(API_Key="what:ever"), **kwargs)
+
+
+def test_delay_is_jittered_and_capped():
+    random.seed(1)
+    policy = RetryPolicy(backoff=1, max_backoff=4)
+    delays = [policy.delay(attempt) for attempt in range(6) for _ in range(20)]
+    assert all(0 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) == len(delays)
+    response = MockResponse(headers={"Retry-After": "3"})
+    assert policy.delay(0, response) == 3
+
+
+def test_retries_only_idempotent_methods():
+    assert FAST.retries("get", 1)
+    assert not FAST.retries("GET", 2)
+    assert not FAST.retries("POST", 0)
+
+
+def test_get_retried_until_success(mock_server: MockServer):
+    url = _flaky(mock_server, 502, 503)
+    response = _client(retry_policy=FAST).get(url)
+    assert response.status_code == 200
+    assert mock_server.hits["/flaky"] == 3
+
+
+def test_last_response_returned_when_attempts_run_out(mock_server: MockServer):
+    url = _flaky(mock_server, 500, 500, 500, 500)
+    client = _client(retry_policy=FAST)
+    assert client.get(url).status_code == 500
+    assert mock_server.hits["/flaky"] == 3
+    assert client.transfer_stats.requests == 3
+
+
+def test_post_and_client_errors_not_retried(mock_server: MockServer):
+    url = _flaky(mock_server, 502, 404)
+    client = _client(retry_policy=FAST)
+    assert client.post(url, {}).status_code == 502
+    assert client.get(url).status_code == 404
+    assert mock_server.hits["/flaky"] == 2
+
+
+def test_connection_errors_retried_and_counted():
+    breaker = CircuitBreaker(failure_threshold=5)
+    client = _client(retry_policy=FAST, circuit_breaker=breaker)
+    with pytest.raises(ConnectionError):
+        client.get("http://127.0.0.1:1/")
+    assert breaker.failures == 3
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_opens_on_maintenance_and_probes(mock_server: MockServer):
+    url = _flaky(mock_server, 503)
+    breaker = CircuitBreaker(reset_timeout=0.2)
+    client = _client(circuit_breaker=breaker)
+    assert client.get(url).status_code == 503
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as e:
+        client.get(url)
+    assert 0 < e.value.retry_after <= 0.2
+    assert mock_server.hits["/flaky"] == 1
+
+    time.sleep(0.2)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert client.get(url).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_threshold_and_failed_probe(mock_server: MockServer):
+    url = _flaky(mock_server, 500, 500, 500)
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    first, second = _client(circuit_breaker=breaker), _client(circuit_breaker=breaker)
+    first.get(url)
+    assert breaker.state == CircuitBreaker.CLOSED
+    second.get(url)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        first.get(url)
+
+    time.sleep(0.1)
+    assert second.get(url).status_code == 500
+    assert breaker.state == CircuitBreaker.OPEN
+    assert mock_server.hits["/flaky"] == 3
+
+
+def _response(status: int) -> AsyncResponse:
+    return AsyncResponse(status, "", {}, {}, b"")
+
+
+def test_late_success_does_not_close_open_breaker():
+    breaker = CircuitBreaker(reset_timeout=0.1)
+    breaker.record(_response(503))
+    # a request in flight when maintenance began answers afterwards
+    breaker.record(_response(200))
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.1)
+    assert breaker.before_request()
+    breaker.record(_response(200))
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record(_response(503))
+    breaker.reset()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_probe_released_on_local_errors(mock_server: MockServer):
+    url = _flaky(mock_server, 503)
+    breaker = CircuitBreaker(reset_timeout=0.1)
+    client = _client(circuit_breaker=breaker)
+    client.get(url)
+    time.sleep(0.1)
+
+    # the probe fails before reaching Librus, which neither counts nor keeps it
+    with deadline(0), pytest.raises(DeadlineExceededError):
+        client.get(url)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    async def run():
+        async with AsyncClient.from_client(client) as async_client:
+            with deadline(0), pytest.raises(DeadlineExceededError):
+                await async_client.get(url)
+
+    asyncio.run(run())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert client.get(url).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert mock_server.hits["/flaky"] == 2
+
+
+def test_get_token_probe_closes_breaker(mock_server: MockServer):
+    mock_server.route("/api", lambda _: MockResponse(200, b"{}"))
+    breaker = CircuitBreaker(reset_timeout=0.1)
+    breaker.record_failure("status 500", trip=True)
+    client = _client(api_url=mock_server.url + "/api", circuit_breaker=breaker)
+    time.sleep(0.1)
+    # the login fails later on, but Librus answered the probe
+    with pytest.raises(Exception):
+        client.get_token("user", "secret")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_get_token_opens_breaker(mock_server: MockServer):
+    mock_server.route(
+        "/api", lambda _: MockResponse(503, json.dumps({"Message": []}).encode())
+    )
+    breaker = CircuitBreaker()
+    client = _client(api_url=mock_server.url + "/api", circuit_breaker=breaker)
+    with pytest.raises(MaintananceError):
+        client.get_token("user", "secret")
+    with pytest.raises(CircuitOpenError):
+        client.get_token("user", "secret")
+    assert mock_server.hits["/api"] == 1
+
+
+def test_async_retry_and_breaker(mock_server: MockServer):
+    url = _flaky(mock_server, 502, 200, 503)
+    breaker = CircuitBreaker()
+
+    async def run():
+        async with AsyncClient(
+            Token(API_Key="what:ever"), retry_policy=FAST, circuit_breaker=breaker
+        ) as client:
+            first = await client.get(url)
+            second = await client.get(url + "?again")
+            with pytest.raises(CircuitOpenError):
+                await client.get(url)
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert first.status_code == 200
+    assert second.status_code == 503
+    assert mock_server.hits["/flaky"] == 3
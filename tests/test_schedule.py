@@ -4,7 +4,13 @@ from typing import Union
 import pytest
 
 from librus_apix.client import Client
-from librus_apix.schedule import Event, get_schedule
+from librus_apix.schedule import (
+    Event,
+    get_schedule,
+    get_schedule_async,
+    schedule_detail,
+    schedule_detail_async,
+)
 
 now = datetime.now()
 
@@ -43,3 +49,13 @@ def test_non_empty_schedule(client: Client, year, month, log: Logger):
     for day in schedule.values():
         assert len(day) > 0
         all(_test_event_data(event, log) for event in day)
+
+
+def test_get_schedule_async(pages_client: Client, run_pages_async):
+    schedule = get_schedule(pages_client, "10", "2024", include_empty=True)
+    assert schedule
+    assert (
+        run_pages_async(lambda c: get_schedule_async(c, "10", "2024", True)) == schedule
+    )
+    detail = schedule_detail(pages_client, "", "701")
+    assert run_pages_async(lambda c: schedule_detail_async(c, "", "701")) == detail
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from librus_apix.client import AsyncClient, Client, Token
+from librus_apix.deadline import deadline
+from librus_apix.exceptions import DeadlineExceededError
+from librus_apix.grades import get_grades, get_grades_async
+from librus_apix.singleflight import AsyncSingleFlight, SingleFlight
+from mock_server import MockResponse, MockServer
+
+THREADS = 8
+
+
+def _contended(fn):
+    barrier = threading.Barrier(THREADS)
+
+    def call(_):
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        return list(executor.map(call, range(THREADS)))
+
+
+def test_threads_share_fetch_and_parse(mock_server: MockServer, pages_client: Client):
+    mock_server.delay("/grades", 0.3)
+    results = _contended(lambda: get_grades(pages_client))
+    assert mock_server.hits["/grades"] == 1
+    assert all(result is results[0] for result in results)
+    assert pages_client.single_flight.shared == THREADS - 1
+    assert len(pages_client.single_flight) == 0
+
+    get_grades(pages_client)
+    assert mock_server.hits["/grades"] == 2
+
+
+def test_threads_share_get(mock_server: MockServer, pages_client: Client):
+    mock_server.delay("/student_info", 0.3)
+    responses = _contended(lambda: pages_client.get(pages_client.INFO_URL))
+    assert mock_server.hits["/student_info"] == 1
+    assert {response.status_code for response in responses} == {200}
+
+
+def test_posts_and_other_tokens_not_shared(
+    mock_server: MockServer, pages_client: Client
+):
+    mock_server.route("/send", lambda _: MockResponse(body=b"sent"))
+    mock_server.delay("/send", 0.1)
+    _contended(lambda: pages_client.post(mock_server.url + "/send", {"a": "b"}))
+    assert mock_server.hits["/send"] == THREADS
+
+    other = Client(Token(API_Key="other:key"), info_url=pages_client.INFO_URL)
+    mock_server.delay("/student_info", 0.3)
+    clients = iter([pages_client, other] * THREADS)
+    lock = threading.Lock()
+
+    def fetch():
+        with lock:
+            client = next(clients)
+        return client.get(client.INFO_URL)
+
+    _contended(fetch)
+    assert mock_server.hits["/student_info"] == 2
+
+
+def test_disabled(mock_server: MockServer, pages_client: Client):
+    pages_client.single_flight = None
+    mock_server.delay("/grades", 0.1)
+    _contended(lambda: get_grades(pages_client))
+    assert mock_server.hits["/grades"] == THREADS
+
+
+def test_error_reaches_every_waiter():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        threading.Event().wait(0.2)
+        raise ValueError("boom")
+
+    def call(_):
+        try:
+            flight.do("key", fail)
+        except ValueError as e:
+            return e
+
+    with ThreadPoolExecutor(4) as executor:
+        first = executor.submit(call, 0)
+        started.wait()
+        rest = [executor.submit(call, i) for i in range(3)]
+        errors = [future.result() for future in [first] + rest]
+    assert all(error is errors[0] for error in errors)
+    assert (flight.calls, flight.shared) == (1, 3)
+
+
+def test_waiter_honours_its_deadline():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    def wait_briefly():
+        with deadline(0.05):
+            return flight.do("key", slow)
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.do, "key", slow)
+        started.wait()
+        with pytest.raises(DeadlineExceededError):
+            executor.submit(wait_briefly).result(timeout=1)
+        release.set()
+        assert leader.result() == "done"
+
+
+def test_async_waiter_honours_its_deadline():
+    async def run():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        async def wait_briefly():
+            with deadline(0.05):
+                return await flight.do("key", work)
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        with pytest.raises(DeadlineExceededError):
+            await wait_briefly()
+        release.set()
+        return await first
+
+    assert asyncio.run(run()) == "done"
+
+
+def test_async_tasks_share_fetch_and_parse(mock_server: MockServer, run_pages_async):
+    mock_server.delay("/grades", 0.3)
+
+    async def scraper(client: AsyncClient):
+        results = await asyncio.gather(*[get_grades_async(client) for _ in range(8)])
+        return results, client.single_flight
+
+    results, flight = run_pages_async(scraper)
+    assert mock_server.hits["/grades"] == 1
+    assert all(result is results[0] for result in results)
+    assert (flight.calls, flight.shared) == (1, 7)
+
+
+def test_async_cancelled_waiter_does_not_cancel_call():
+    async def run():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, len(flight)
+
+    assert asyncio.run(run()) == ("done", 0)
@@ -2,7 +2,11 @@ from logging import Logger
 from typing import Union
 import pytest
 from librus_apix.client import Client
-from librus_apix.student_information import StudentInformation, get_student_information
+from librus_apix.student_information import (
+    StudentInformation,
+    get_student_information,
+    get_student_information_async,
+)
 
 
 def _test_student_data(si: StudentInformation, log: Logger):
@@ -21,3 +25,8 @@ def test_student_information(client: Client, log: Logger):
     info = get_student_information(client)
     assert isinstance(info, StudentInformation)
     _test_student_data(info, log)
+
+
+def test_get_student_information_async(pages_client: Client, run_pages_async):
+    info = get_student_information(pages_client)
+    assert run_pages_async(get_student_information_async) == info
@@ -4,7 +4,7 @@ import pytest
 from datetime import datetime, timedelta
 from librus_apix.client import Client
 from librus_apix.exceptions import DateError
-from librus_apix.timetable import get_timetable, Period
+from librus_apix.timetable import get_timetable, get_timetable_async, Period
 
 today = datetime.now()
 
@@ -48,3 +48,10 @@ def test_wrong_date_timetable(client: Client):
     non_monday = most_recent_monday + timedelta(days=1)
     with pytest.raises(DateError):
         get_timetable(client, non_monday)
+
+
+def test_get_timetable_async(pages_client: Client, run_pages_async):
+    monday = datetime(2024, 10, 14)
+    timetable = get_timetable(pages_client, monday)
+    assert timetable
+    assert run_pages_async(lambda c: get_timetable_async(c, monday)) == timetable
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from librus_apix.cache import MemoryCache
+from librus_apix.client import AsyncClient, Client, Token
+from librus_apix.token_store import (
+    FileTokenStore,
+    SQLiteTokenStore,
+    TokenStore,
+    login,
+    login_async,
+    token_valid,
+)
+from mock_server import PAGES_DIR, MockRequest, MockResponse, MockServer
+
+NO_ACCESS_PAGE = (PAGES_DIR / "no_access.html").read_bytes()
+INFO_PAGE = (PAGES_DIR / "student_info.html").read_bytes()
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path: Path) -> TokenStore:
+    if request.param == "file":
+        return FileTokenStore(tmp_path / "tokens")
+    return SQLiteTokenStore(tmp_path / "tokens.sqlite")
+
+
+def _reopen(store: TokenStore) -> TokenStore:
+    if isinstance(store, FileTokenStore):
+        return FileTokenStore(store.directory)
+    return SQLiteTokenStore(store.path)
+
+
+def _librus(mock_server: MockServer) -> dict:
+    """Routes a login flow handing out "session<n>" keys and an info page accepting the last one."""
+    state = {"logins": 0}
+
+    def authorization(request: MockRequest) -> MockResponse:
+        if request.method == "POST":
+            body = {"status": "ok", "goTo": "/OAuth/Authorization/2FA"}
+            return MockResponse(body=json.dumps(body).encode())
+        return MockResponse(body=b"{}")
+
+    def redirect(_: MockRequest) -> MockResponse:
+        state["logins"] += 1
+        session = f"session{state['logins']}"
+        return MockResponse(cookies={"DZIENNIKSID": session, "SDZIENNIKSID": "s"})
+
+    def info(request: MockRequest) -> MockResponse:
+        valid = request.cookies.get("DZIENNIKSID") == f"session{state['logins']}"
+        return MockResponse(body=INFO_PAGE if valid else NO_ACCESS_PAGE)
+
+    mock_server.route("/api", lambda _: MockResponse(body=b"{}"))
+    mock_server.route("/api/OAuth/Authorization", authorization)
+    mock_server.route("/api/OAuth/Authorization/2FA", redirect)
+    mock_server.route("/info", info)
+    return state
+
+
+def _client(mock_server: MockServer, **kwargs) -> Client:
+    return Client(
+        Token(),
+        api_url=mock_server.url + "/api",
+        info_url=mock_server.url + "/info",
+        **kwargs,
+    )
+
+
+def test_store_keeps_tokens_and_ages(store: TokenStore):
+    assert store.load("jan") is None
+    token = Token(API_Key="a:b")
+    first = store.put("jan", token)
+    assert first.oauth_age is None
+    assert first.age < 1
+
+    time.sleep(0.01)
+    token.oauth = "oauth1"
+    refreshed = store.put("jan", token)
+    assert refreshed.created == first.created
+    assert refreshed.oauth_age is not None and refreshed.oauth_age < refreshed.age
+
+    store.put("anna", Token(API_Key="c:d"))
+    reopened = _reopen(store)
+    assert reopened.accounts() == ["anna", "jan"]
+    loaded = reopened.load("jan")
+    assert loaded == refreshed
+    assert loaded.to_token().oauth == "oauth1"
+
+    relogged = reopened.put("jan", Token(API_Key="e:f"))
+    assert relogged.created > first.created
+    assert relogged.oauth == "" and relogged.oauth_created == 0
+    reopened.delete("jan")
+    assert store.load("jan") is None
+    assert store.accounts() == ["anna"]
+
+
+def test_login_only_when_needed(mock_server: MockServer, store: TokenStore):
+    state = _librus(mock_server)
+    token = login(_client(mock_server), store, "jan", "user", "secret")
+    assert token.API_Key == "session1:s"
+    assert mock_server.hits["/api/OAuth/Authorization/2FA"] == 1
+
+    # trusted without a check within check_after
+    client = _client(mock_server)
+    assert login(client, store, "jan", "user", "secret").API_Key == "session1:s"
+    assert client.token.API_Key == "session1:s"
+    assert mock_server.hits["/info"] == 0
+
+    # checked on the info page and kept
+    checked = store.load("jan").checked
+    login(_client(mock_server), store, "jan", "user", "secret", check_after=0)
+    assert mock_server.hits["/info"] == 1
+    assert mock_server.hits["/api/OAuth/Authorization/2FA"] == 1
+    assert store.load("jan").checked > checked
+
+    # rejected with "Brak dostępu", logged in again
+    state["logins"] += 1
+    token = login(_client(mock_server), store, "jan", "user", "secret", check_after=0)
+    assert token.API_Key == "session3:s"
+    assert store.load("jan").api_key == "session3:s"
+    assert mock_server.hits["/api/OAuth/Authorization/2FA"] == 2
+
+
+def test_login_replaces_old_tokens(mock_server: MockServer, store: TokenStore):
+    _librus(mock_server)
+    login(_client(mock_server), store, "jan", "user", "secret")
+    token = login(_client(mock_server), store, "jan", "user", "secret", max_age=0)
+    assert token.API_Key == "session2:s"
+    assert "/info" not in mock_server.hits
+
+
+def test_silent_reauth_is_stored(mock_server: MockServer, store: TokenStore):
+    state = _librus(mock_server)
+    client = _client(mock_server, credentials=("user", "secret"))
+    login(client, store, "jan", "user", "secret")
+    state["logins"] += 1
+    assert client.get(client.INFO_URL).content == INFO_PAGE
+    assert client.reauthentications == 1
+    assert store.load("jan").api_key == "session3:s"
+
+    async def run():
+        async with AsyncClient(
+            Token(),
+            api_url=mock_server.url + "/api",
+            info_url=mock_server.url + "/info",
+            credentials=("user", "secret"),
+        ) as async_client:
+            await login_async(async_client, store, "jan", "user", "secret")
+            state["logins"] += 1
+            return (await async_client.get(async_client.INFO_URL)).content
+
+    assert asyncio.run(run()) == INFO_PAGE
+    assert store.load("jan").api_key == "session5:s"
+
+
+def test_token_valid_skips_cache(mock_server: MockServer):
+    state = _librus(mock_server)
+    client = _client(mock_server, cache=MemoryCache())
+    client.token = Token(API_Key="session0:s")
+    assert token_valid(client)
+    state["logins"] += 1
+    assert not token_valid(client)
+    assert mock_server.hits["/info"] == 2
+    assert len(client.cache) == 0
+
+
+def test_login_async(mock_server: MockServer, tmp_path: Path):
+    _librus(mock_server)
+    store = SQLiteTokenStore(tmp_path / "tokens.sqlite")
+
+    async def run():
+        async with AsyncClient(
+            Token(),
+            api_url=mock_server.url + "/api",
+            info_url=mock_server.url + "/info",
+        ) as client:
+            first = await login_async(client, store, "jan", "user", "secret")
+            again = await login_async(
+                client, store, "jan", "user", "secret", check_after=0
+            )
+            return first, again
+
+    first, again = asyncio.run(run())
+    assert first.API_Key == again.API_Key == "session1:s"
+    assert mock_server.hits["/api/OAuth/Authorization/2FA"] == 1
+    assert mock_server.hits["/info"] == 1